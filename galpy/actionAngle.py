@@ -8,6 +8,7 @@ from galpy.actionAngle_src import actionAngleIsochrone
 from galpy.actionAngle_src import actionAngleIsochroneApprox
 from galpy.actionAngle_src import actionAngleSpherical
 from galpy.actionAngle_src import actionAngleTorus
+from galpy.actionAngle_src import actionAngleChunked
 
 #
 # Exceptions
@@ -20,6 +21,7 @@ UnboundError= actionAngle.UnboundError
 estimateDeltaStaeckel= actionAngleStaeckel.estimateDeltaStaeckel
 estimateBIsochrone= actionAngleIsochroneApprox.estimateBIsochrone
 dePeriod= actionAngleIsochroneApprox.dePeriod
+computeActionsChunked= actionAngleChunked.computeActionsChunked
 #
 # Classes
 #
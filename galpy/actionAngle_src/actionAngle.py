@@ -1,4 +1,10 @@
+import os
+import json
+import struct
+import hashlib
+import tempfile
 import math as m
+import numpy
 from galpy.util import config
 from galpy.util.bovy_conversion import physical_conversion_actionAngle, \
     actionAngle_physical_input
@@ -311,3 +317,79 @@ class UnboundError(Exception): #pragma: no cover
         self.value = value
     def __str__(self):
         return repr(self.value)
+
+# Binary file format for the tables of the grid-based actionAngle classes:
+# magic, version, length of a JSON header with the class, the fingerprint,
+# and the names, shapes, and offsets of the arrays, which follow
+# as little-endian doubles, each aligned to _GRIDFILE_ALIGN bytes
+_GRIDFILE_MAGIC= b'GALPYAAG'
+_GRIDFILE_VERSION= 1
+_GRIDFILE_ALIGN= 64
+def _grid_fingerprint(pot,*args):
+    """Hash of the parameters of the potential (with arrays hashed in full) and of the grid parameters args; None when some of them cannot be fingerprinted"""
+    from galpy.orbit_src.integratePlanarOrbit import _pot_fingerprint, \
+        _fingerprint_complete, _UNFINGERPRINTABLE #here bc otherwise there is an infinite loop
+    fingerprint= _pot_fingerprint((pot,args),
+                                  checksum=lambda x: hashlib.sha1(x).hexdigest(),
+                                  unknown=_UNFINGERPRINTABLE)
+    if not _fingerprint_complete(fingerprint):
+        return None
+    return hashlib.sha1(repr(fingerprint).encode('utf-8')).hexdigest()
+
+def _save_grid_tables(filename,classname,fingerprint,arrays):
+    """Save the arrays (dict) of a grid-based actionAngle object; the file is written under a temporary name and then renamed, such that processes building the same grid simultaneously never read partially written files"""
+    if fingerprint is None:
+        raise ValueError("Cannot save the grids of %s, because some parameters of the potential or of the grid cannot be fingerprinted, such that the saved grids could not be checked against the potential when they are restored" % classname)
+    names= sorted(arrays)
+    header= {'class':classname,'fingerprint':fingerprint,'arrays':[]}
+    offset= 0
+    for name in names:
+        header['arrays'].append([name,list(numpy.shape(arrays[name])),offset])
+        offset+= _GRIDFILE_ALIGN*int(numpy.ceil(8*numpy.size(arrays[name])
+                                                /float(_GRIDFILE_ALIGN)))
+    header= json.dumps(header).encode('utf-8')
+    # Start of the data, relative to which the offsets are given
+    start= _GRIDFILE_ALIGN*int(numpy.ceil((len(_GRIDFILE_MAGIC)+8+len(header))
+                                          /float(_GRIDFILE_ALIGN)))
+    dirname= os.path.dirname(os.path.abspath(filename))
+    fd, tmpname= tempfile.mkstemp(dir=dirname)
+    with os.fdopen(fd,'wb') as tmpfile:
+        tmpfile.write(_GRIDFILE_MAGIC)
+        tmpfile.write(struct.pack('<II',_GRIDFILE_VERSION,len(header)))
+        tmpfile.write(header)
+        for name, entry in zip(names,json.loads(header.decode('utf-8'))['arrays']):
+            tmpfile.seek(start+entry[2])
+            tmpfile.write(numpy.ascontiguousarray(arrays[name],
+                                                  dtype='<f8').tobytes())
+    if os.name == 'nt': #pragma: no cover, cannot rename onto existing file
+        if os.path.exists(filename): os.remove(filename)
+    os.rename(tmpname,filename)
+    return None
+
+def _load_grid_tables(filename,classname,fingerprint):
+    """Memory-map the arrays of a grid-based actionAngle object saved with _save_grid_tables, checking that the file was built for the same potential and grid parameters; the arrays are read-only and their pages are shared between processes"""
+    if fingerprint is None:
+        raise ValueError("Cannot restore the grids of %s from %s, because some parameters of the potential or of the grid cannot be fingerprinted, such that the saved grids cannot be checked against the potential" % (classname,filename))
+    with open(filename,'rb') as gridfile:
+        magic= gridfile.read(len(_GRIDFILE_MAGIC))
+        if magic != _GRIDFILE_MAGIC:
+            raise IOError("%s is not a grid file of a galpy actionAngle object" % filename)
+        version, headerlen= struct.unpack('<II',gridfile.read(8))
+        if version != _GRIDFILE_VERSION:
+            raise IOError("Grid file %s has version %i, but this version of galpy can only read version %i" % (filename,version,_GRIDFILE_VERSION))
+        header= json.loads(gridfile.read(headerlen).decode('utf-8'))
+    if header['class'] != classname:
+        raise IOError("Grid file %s holds the grids of %s, not of %s" % (filename,header['class'],classname))
+    if header['fingerprint'] != fingerprint:
+        raise IOError("Grid file %s was built for a different potential or different grid parameters" % filename)
+    start= _GRIDFILE_ALIGN*int(numpy.ceil((len(_GRIDFILE_MAGIC)+8+headerlen)
+                                          /float(_GRIDFILE_ALIGN)))
+    arrays= {}
+    for name, shape, offset in header['arrays']:
+        if numpy.prod(shape) == 0: # cannot memory-map empty arrays
+            arrays[name]= numpy.zeros(shape)
+        else:
+            arrays[name]= numpy.memmap(filename,dtype='<f8',mode='r',
+                                       offset=start+offset,
+                                       shape=tuple(shape))
+    return arrays
@@ -8,22 +8,26 @@
 #
 #      methods:
 #             __call__: returns (jr,lz,jz)
+#             save: save the grids to a file
 #
 ###############################################################################
 from __future__ import print_function
+import os
+import warnings
 import math
 import numpy
 from scipy import interpolate
 from galpy.actionAngle_src.actionAngleAdiabatic import actionAngleAdiabatic
-from galpy.actionAngle_src.actionAngle import actionAngle, UnboundError
+from galpy.actionAngle_src.actionAngle import actionAngle, UnboundError, \
+    _grid_fingerprint, _save_grid_tables, _load_grid_tables
 import galpy.potential
 from galpy.potential_src.Potential import _evaluatePotentials
-from galpy.util import multi
+from galpy.util import galpyWarning, multi
 _PRINTOUTSIDEGRID= False
 class actionAngleAdiabaticGrid(actionAngle):
     """Action-angle formalism for axisymmetric potentials using the adiabatic approximation, grid-based interpolation"""
     def __init__(self,pot=None,zmax=1.,gamma=1.,Rmax=5.,
-                 nR=16,nEz=16,nEr=31,nLz=31,numcores=1,
+                 nR=16,nEz=16,nEr=31,nLz=31,numcores=1,savefilename=None,
                  **kwargs):
         """
         NAME:
@@ -44,6 +48,8 @@ class actionAngleAdiabaticGrid(actionAngle):
 
            numcores= number of cpus to use to parallellize
 
+           savefilename= (None) if set, restore the grids from this file if it exists (memory-mapped read-only, such that processes share them; the file needs to have been built for the same potential and grid parameters) and otherwise compute the grids and save them to this file
+
            c= if True, use C to calculate actions
 
            ro= distance from vantage point to GC (kpc; can be Quantity)
@@ -60,6 +66,8 @@ class actionAngleAdiabaticGrid(actionAngle):
 
             2012-07-27 - Written - Bovy (IAS@MPIA)
 
+            2026-10-17 - Added savefilename
+
         """
         actionAngle.__init__(self,
                              ro=kwargs.get('ro',None),vo=kwargs.get('vo',None))
@@ -74,12 +82,74 @@ class actionAngleAdiabaticGrid(actionAngle):
         #Set up the actionAngleAdiabatic object that we will use to interpolate
         self._aA= actionAngleAdiabatic(pot=self._pot,gamma=self._gamma,
                                        c=self._c)
+        self._Lzmin= 0.01
+        self._Ramax= 99.
+        self._nR= nR
+        self._nEz= nEz
+        self._nEr= nEr
+        self._nLz= nLz
+        # Integration keywords that the grids depend on
+        self._gridkwargs= dict([(k,v) for k,v in kwargs.items()
+                                if not k in ['ro','vo']])
+        #Build grid, or restore it from savefilename
+        if not savefilename is None and self._fingerprint() is None:
+            warnings.warn("Not restoring or saving the grids of %s using %s, because some parameters of the potential or of the grid cannot be fingerprinted, such that saved grids could belong to a different potential" % (self.__class__.__name__,savefilename),galpyWarning)
+            savefilename= None
+        if not savefilename is None and os.path.exists(savefilename):
+            self._load_grid(savefilename)
+        else:
+            self._setup_grid(numcores,**kwargs)
+            if not savefilename is None:
+                self.save(savefilename)
+        self._EzZmaxsInterp= interpolate.InterpolatedUnivariateSpline(self._Rs,numpy.log(self._EzZmaxs),k=3)
+        #First interpolate Ez=Ezmax
+        self._jzEzmaxInterp= interpolate.InterpolatedUnivariateSpline(self._Rs,numpy.log(self._jzEzzmax+10.**-5.),k=3)
+        self._jzInterp= interpolate.RectBivariateSpline(self._Rs,
+                                                        numpy.linspace(0.,1.,nEz),
+                                                        self._jz,
+                                                        kx=3,ky=3,s=0.)
+        #JR grid
+        self._Lzmax= self._Lzs[-1]
+        self._RLInterp= interpolate.InterpolatedUnivariateSpline(self._Lzs,
+                                                                 self._RL,k=3)
+        self._ERRLmax= numpy.amax(self._ERRL)+1.
+        self._ERRLInterp= interpolate.InterpolatedUnivariateSpline(self._Lzs,
+                                                                   numpy.log(-(self._ERRL-self._ERRLmax)),k=3)
+        self._ERRamax= numpy.amax(self._ERRa)+1.
+        self._ERRaInterp= interpolate.InterpolatedUnivariateSpline(self._Lzs,
+                                                                   numpy.log(-(self._ERRa-self._ERRamax)),k=3)
+        #First interpolate Ez=Ezmax
+        self._jrERRaInterp= interpolate.InterpolatedUnivariateSpline(self._Lzs,
+                                                                     numpy.log(self._jrERRa+10.**-5.),k=3)
+        self._jrInterp= interpolate.RectBivariateSpline(self._Lzs,
+                                                        numpy.linspace(0.,1.,nEr),
+                                                        self._jr,
+                                                        kx=3,ky=3,s=0.)
+        # Check the units
+        self._check_consistent_units()
+        return None
+
+    def _setup_grid(self,numcores,**kwargs):
+        """
+        NAME:
+           _setup_grid
+        PURPOSE:
+           compute the grids of jz and jr
+        INPUT:
+           numcores= number of cpus to use to parallellize
+           +scipy.integrate.quad keywords
+        OUTPUT:
+           (none; sets attributes)
+        HISTORY:
+           2012-07-27 - Written as part of __init__ - Bovy (IAS@MPIA)
+           2026-10-17 - Split off from __init__
+        """
+        nR, nEz, nEr, nLz= self._nR, self._nEz, self._nEr, self._nLz
         #Build grid for Ez, first calculate Ez(zmax;R) function
         self._Rs= numpy.linspace(self._Rmin,self._Rmax,nR)
         self._EzZmaxs= _evaluatePotentials(self._pot,self._Rs,
                                            self._zmax*numpy.ones(nR))\
                                            -_evaluatePotentials(self._pot,self._Rs,numpy.zeros(nR))
-        self._EzZmaxsInterp= interpolate.InterpolatedUnivariateSpline(self._Rs,numpy.log(self._EzZmaxs),k=3)
         y= numpy.linspace(0.,1.,nEz)
         jz= numpy.zeros((nR,nEz))
         jzEzzmax= numpy.zeros(nR)
@@ -114,34 +184,18 @@ class actionAngleAdiabaticGrid(actionAngle):
                         if jj == nEz-1: 
                             jzEzzmax[ii]= jz[ii,jj]
         for ii in range(nR): jz[ii,:]/= jzEzzmax[ii]
-        #First interpolate Ez=Ezmax
-        self._jzEzmaxInterp= interpolate.InterpolatedUnivariateSpline(self._Rs,numpy.log(jzEzzmax+10.**-5.),k=3)
         self._jz= jz
-        self._jzInterp= interpolate.RectBivariateSpline(self._Rs,
-                                                        y,
-                                                        jz,
-                                                        kx=3,ky=3,s=0.)
+        self._jzEzzmax= jzEzzmax
         #JR grid
-        self._Lzmin= 0.01
         self._Lzs= numpy.linspace(self._Lzmin,
                                   self._Rmax\
                                       *galpy.potential.vcirc(self._pot,
                                                              self._Rmax),
                                   nLz)
-        self._Lzmax= self._Lzs[-1]
         #Calculate ER(vr=0,R=RL)
-        self._RL= numpy.array([galpy.potential.rl(self._pot,l) for l in self._Lzs])
-        self._RLInterp= interpolate.InterpolatedUnivariateSpline(self._Lzs,
-                                                                 self._RL,k=3)
+        self._RL= galpy.potential.rl(self._pot,self._Lzs)
         self._ERRL= _evaluatePotentials(self._pot,self._RL,numpy.zeros(nLz)) +self._Lzs**2./2./self._RL**2.
-        self._ERRLmax= numpy.amax(self._ERRL)+1.
-        self._ERRLInterp= interpolate.InterpolatedUnivariateSpline(self._Lzs,
-                                                                   numpy.log(-(self._ERRL-self._ERRLmax)),k=3)
-        self._Ramax= 99.
         self._ERRa= _evaluatePotentials(self._pot,self._Ramax,0.) +self._Lzs**2./2./self._Ramax**2.
-        self._ERRamax= numpy.amax(self._ERRa)+1.
-        self._ERRaInterp= interpolate.InterpolatedUnivariateSpline(self._Lzs,
-                                                                   numpy.log(-(self._ERRa-self._ERRamax)),k=3)
         y= numpy.linspace(0.,1.,nEr)
         jr= numpy.zeros((nLz,nEr))
         jrERRa= numpy.zeros(nLz)
@@ -186,16 +240,55 @@ class actionAngleAdiabaticGrid(actionAngle):
                         if jj == 0: 
                             jrERRa[ii]= jr[ii,jj]
         for ii in range(nLz): jr[ii,:]/= jrERRa[ii]
-        #First interpolate Ez=Ezmax
         self._jr= jr
-        self._jrERRaInterp= interpolate.InterpolatedUnivariateSpline(self._Lzs,
-                                                                     numpy.log(jrERRa+10.**-5.),k=3)
-        self._jrInterp= interpolate.RectBivariateSpline(self._Lzs,
-                                                        y,
-                                                        jr,
-                                                        kx=3,ky=3,s=0.)
-        # Check the units
-        self._check_consistent_units()
+        self._jrERRa= jrERRa
+        return None
+
+    def _fingerprint(self):
+        """Fingerprint of the potential and grid parameters, against which saved grids are checked"""
+        return _grid_fingerprint(self._pot,float(self._zmax),
+                                 float(self._gamma),float(self._Rmax),
+                                 self._nR,self._nEz,self._nEr,self._nLz,
+                                 float(self._Rmin),float(self._Lzmin),
+                                 float(self._Ramax),bool(self._c),
+                                 self._gridkwargs)
+
+    def save(self,savefilename):
+        """
+        NAME:
+           save
+        PURPOSE:
+           save the grids to a binary file, such that they can be restored with actionAngleAdiabaticGrid(savefilename=) rather than recomputed
+        INPUT:
+           savefilename - name of the file
+        OUTPUT:
+           (none)
+        HISTORY:
+           2026-10-17 - Written
+        """
+        _save_grid_tables(savefilename,'actionAngleAdiabaticGrid',
+                          self._fingerprint(),
+                          {'Rs':self._Rs,'EzZmaxs':self._EzZmaxs,
+                           'jz':self._jz,'jzEzzmax':self._jzEzzmax,
+                           'Lzs':self._Lzs,'RL':self._RL,
+                           'ERRL':self._ERRL,'ERRa':self._ERRa,
+                           'jr':self._jr,'jrERRa':self._jrERRa})
+        return None
+
+    def _load_grid(self,savefilename):
+        """Restore the grids saved with save, memory-mapped read-only"""
+        tables= _load_grid_tables(savefilename,'actionAngleAdiabaticGrid',
+                                  self._fingerprint())
+        self._Rs= tables['Rs']
+        self._EzZmaxs= tables['EzZmaxs']
+        self._jz= tables['jz']
+        self._jzEzzmax= tables['jzEzzmax']
+        self._Lzs= tables['Lzs']
+        self._RL= tables['RL']
+        self._ERRL= tables['ERRL']
+        self._ERRa= tables['ERRa']
+        self._jr= tables['jr']
+        self._jrERRa= tables['jrERRa']
         return None
 
     def _evaluate(self,*args,**kwargs):
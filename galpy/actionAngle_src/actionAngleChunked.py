@@ -0,0 +1,166 @@
+###############################################################################
+#   actionAngle: a Python module to calculate  actions, angles, and frequencies
+#
+#      function: computeActionsChunked
+#
+#             evaluate any actionAngle instance on a large catalog,
+#             reading the phase-space coordinates from (memory-mapped) files
+#             in chunks and writing the output chunk by chunk
+#
+###############################################################################
+import sys
+import time
+import numpy
+from galpy.util import multi
+_FITS_LOADED= True
+try:
+    from astropy.io import fits
+except ImportError:
+    _FITS_LOADED= False
+_NOUT= {'__call__':3,'actionsFreqs':6,'actionsFreqsAngles':9}
+_DEFAULT_COLUMNS= ['R','vR','vT','z','vz','phi']
+def computeActionsChunked(aA,input,output,method='__call__',columns=None,
+                          chunksize=100000,numcores=None,
+                          print_progress=False,**kwargs):
+    """
+    NAME:
+
+       computeActionsChunked
+
+    PURPOSE:
+
+       evaluate an actionAngle instance for a catalog that is too large to hold in memory, reading the phase-space coordinates and writing the output one chunk of objects at a time, with chunks run concurrently on multiple cores
+
+    INPUT:
+
+       aA - actionAngle instance
+
+       input - phase-space coordinates (R,vR,vT,z,vz[,phi]) of N objects (phi is required for actionsFreqsAngles and is passed to the actionAngle method whenever it is given), either:
+
+          a) filename of a .npy file with an array of shape (N,5) or (N,6), which is memory-mapped
+
+          b) filename of a FITS file (.fits or .fit) with a binary table, which is memory-mapped (requires astropy)
+
+          c) list of (memory-mapped) arrays or .npy filenames, one for each coordinate
+
+       output - filename of the .npy file to write the output to, as an array of shape (N,nout), or function output(indx,out) that is called with the slice of objects and the tuple of outputs for each chunk
+
+       method= ('__call__') actionAngle method to evaluate: '__call__' (nout=3: jr,lz,jz), 'actionsFreqs' (nout=6: jr,lz,jz,Omegar,Omegaphi,Omegaz), or 'actionsFreqsAngles' (nout=9: jr,lz,jz,Omegar,Omegaphi,Omegaz,angler,anglephi,anglez)
+
+       columns= (None) names of the columns in the FITS table to use for (R,vR,vT,z,vz[,phi]) (default: ['R','vR','vT','z','vz'] and 'phi' if the table has it)
+
+       chunksize= (100000) number of objects in each chunk
+
+       numcores= (None) if set to an integer larger than one, evaluate this many chunks concurrently in separate processes
+
+       print_progress= (False) if True, print the number of objects done and the throughput after each set of chunks
+
+       Other keywords are passed to the actionAngle method
+
+    OUTPUT:
+
+       memory-mapped array of shape (N,nout) when output is a filename, None otherwise
+
+    HISTORY:
+
+       2026-10-17 - Written
+
+    """
+    if not method in _NOUT:
+        raise ValueError("method= for computeActionsChunked must be one of '__call__', 'actionsFreqs', or 'actionsFreqsAngles'")
+    if chunksize < 1:
+        raise ValueError('chunksize for computeActionsChunked must be at least 1')
+    nout= _NOUT[method]
+    func= getattr(aA,method)
+    ncol= 6 if method == 'actionsFreqsAngles' else 5
+    cols, hdulist= _open_columns(input,ncol,columns)
+    try:
+        return _compute_chunks(func,cols,output,nout,chunksize,numcores,
+                               print_progress,kwargs)
+    finally:
+        if not hdulist is None: hdulist.close()
+
+def _compute_chunks(func,cols,output,nout,chunksize,numcores,print_progress,
+                    kwargs):
+    """Evaluate func on the chunks of the columns and write the output, for computeActionsChunked"""
+    ndata= len(cols[0])
+    def _chunk_output(start):
+        # Output is padded to chunksize, such that all chunks have the same
+        # shape when they are gathered by parallel_map
+        indx= slice(start,min(start+chunksize,ndata))
+        out= func(*[numpy.array(col[indx],dtype=numpy.float64)
+                    for col in cols],**kwargs)
+        padded= numpy.empty((chunksize,nout))
+        padded[:indx.stop-indx.start]= \
+            numpy.array([numpy.asarray(o,dtype=numpy.float64)
+                         *numpy.ones(indx.stop-indx.start)
+                         for o in out]).T
+        return padded
+    if callable(output):
+        result= None
+    else:
+        result= numpy.lib.format.open_memmap(output,mode='w+',
+                                             dtype=numpy.float64,
+                                             shape=(ndata,nout))
+    if numcores is None or numcores < 1: numcores= 1
+    starts= numpy.arange(0,ndata,chunksize)
+    ndone= 0
+    start_time= time.time()
+    # Evaluate numcores chunks at a time, such that at most numcores
+    # chunks of output are held in memory
+    for ii in range(0,len(starts),numcores):
+        these_starts= starts[ii:ii+numcores]
+        if numcores == 1 or len(these_starts) == 1:
+            outs= [_chunk_output(start) for start in these_starts]
+        else:
+            outs= list(multi.parallel_map(_chunk_output,these_starts,
+                                          numcores=numcores))
+        for start, out in zip(these_starts,outs):
+            indx= slice(start,min(start+chunksize,ndata))
+            out= out[:indx.stop-indx.start]
+            if result is None:
+                output(indx,tuple(out.T))
+            else:
+                result[indx]= out
+            ndone+= len(out)
+        if print_progress:
+            elapsed= time.time()-start_time
+            sys.stdout.write('\r'+"Object %i out of %i done (%.0f objects/s)" \
+                                 % (ndone,ndata,ndone/max(elapsed,1e-10)))
+            sys.stdout.flush()
+    if print_progress: sys.stdout.write('\n')
+    if not result is None:
+        result.flush()
+    return result
+
+def _open_columns(input,ncol,columns):
+    """Return a list of (memory-mapped) arrays for the phase-space coordinates in input, which need to include at least ncol coordinates and include phi if it is given, and the FITS HDUList that the arrays belong to (None for other input), which the caller needs to close"""
+    if isinstance(input,str) and input.endswith('.npy'):
+        data= numpy.load(input,mmap_mode='r')
+        if data.ndim != 2 or data.shape[1] < ncol:
+            raise ValueError("Array in %s must have shape (N,%i) for computeActionsChunked" % (input,ncol))
+        return ([data[:,ii] for ii in range(min(data.shape[1],6))],None)
+    elif isinstance(input,str) and (input.endswith('.fits')
+                                    or input.endswith('.fit')):
+        if not _FITS_LOADED: #pragma: no cover
+            raise ImportError("astropy is required to read FITS files in computeActionsChunked")
+        hdulist= fits.open(input,memmap=True)
+        try:
+            data= [hdu.data for hdu in hdulist
+                   if isinstance(hdu,fits.BinTableHDU)][0]
+            if columns is None:
+                columns= [name for name in _DEFAULT_COLUMNS
+                          if name in data.columns.names or name != 'phi']
+            if len(columns) < ncol:
+                raise ValueError("FITS table in %s must have %i columns for computeActionsChunked" % (input,ncol))
+            return ([data[name] for name in columns[:6]],hdulist)
+        except:
+            hdulist.close()
+            raise
+    elif isinstance(input,str):
+        raise ValueError("input file %s for computeActionsChunked must be a .npy or FITS file" % input)
+    else:
+        if len(input) < ncol:
+            raise ValueError("input for computeActionsChunked must contain %i coordinates" % ncol)
+        return ([numpy.load(col,mmap_mode='r') if isinstance(col,str) else col
+                 for col in input[:6]],None)
@@ -324,26 +324,20 @@ class actionAngleIsochroneApprox(actionAngle):
                 mask[:2*maxn-3:2]= False
             gridR= gridR[mask]
             gridZ= gridZ[mask]
-            tangleR= nu.tile(angleRT.T,(nn,1,1)).T
-            tgridR= nu.tile(gridR,(no,nt,1))
-            tangleZ= nu.tile(angleZT.T,(nn,1,1)).T
-            tgridZ= nu.tile(gridZ,(no,nt,1))
             if _isNonAxi(self._pot):
                 gridphi= gridphi[mask]
-                tgridphi= nu.tile(gridphi,(no,nt,1))
-                tanglephi= nu.tile(anglephiT.T,(nn,1,1)).T
-                sinnR= nu.sin(tgridR*tangleR+tgridphi*tanglephi+tgridZ*tangleZ)
+                sinnR= nu.sin(gridR*angleRT[:,:,nu.newaxis]
+                              +gridphi*anglephiT[:,:,nu.newaxis]
+                              +gridZ*angleZT[:,:,nu.newaxis])
             else:
-                sinnR= nu.sin(tgridR*tangleR+tgridZ*tangleZ)
+                sinnR= nu.sin(gridR*angleRT[:,:,nu.newaxis]
+                              +gridZ*angleZT[:,:,nu.newaxis])
             A[:,:,2:]= sinnR
-            #Matrix magic
-            atainv= nu.empty((no,2+nn,2+nn))
-            AT= nu.transpose(A,axes=(0,2,1))
-            for ii in range(no):
-                atainv[ii,:,:,]= linalg.inv(nu.dot(AT[ii,:,:],A[ii,:,:]))
-            ATAR= nu.sum(AT*nu.transpose(nu.tile(angleRT,(2+nn,1,1)),axes=(1,0,2)),axis=2)
-            ATAT= nu.sum(AT*nu.transpose(nu.tile(anglephiT,(2+nn,1,1)),axes=(1,0,2)),axis=2)
-            ATAZ= nu.sum(AT*nu.transpose(nu.tile(angleZT,(2+nn,1,1)),axes=(1,0,2)),axis=2)
+            #Matrix magic, for all objects at once
+            atainv= linalg.inv(nu.einsum('ijk,ijl->ikl',A,A))
+            ATAR= nu.einsum('ijk,ij->ik',A,angleRT)
+            ATAT= nu.einsum('ijk,ij->ik',A,anglephiT)
+            ATAZ= nu.einsum('ijk,ij->ik',A,angleZT)
             angleR= nu.sum(atainv[:,0,:]*ATAR,axis=1)
             OmegaR= nu.sum(atainv[:,1,:]*ATAR,axis=1)
             anglephi= nu.sum(atainv[:,0,:]*ATAT,axis=1)
@@ -576,8 +570,7 @@ class actionAngleIsochroneApprox(actionAngle):
 
     def _parse_args(self,freqsAngles=True,_firstFlip=False,*args):
         """Helper function to parse the arguments to the __call__ and actionsFreqsAngles functions"""
-        from galpy.orbit import Orbit
-        RasOrbit= False
+        from galpy.orbit import Orbit, Orbits
         integrated= True #whether the orbit was already integrated when given
         if len(args) == 5 or len(args) == 3: #pragma: no cover
             raise IOError("Must specify phi for actionAngleIsochroneApprox")
@@ -586,21 +579,27 @@ class actionAngleIsochroneApprox(actionAngle):
                 R,vR,vT, z, vz, phi= args
             else:
                 R,vR,vT, phi= args
-                z, vz= 0., 0.
-            if isinstance(R,float):
-                os= [Orbit([R,vR,vT,z,vz,phi])]
-                RasOrbit= True
-                integrated= False
-            elif len(R.shape) == 1: #not integrated yet
-                os= [Orbit([R[ii],vR[ii],vT[ii],z[ii],vz[ii],phi[ii]]) for ii in range(R.shape[0])]
-                RasOrbit= True
-                integrated= False
+                z, vz= 0.*R, 0.*R
+            if isinstance(R,float) or len(R.shape) == 1: #not integrated yet
+                # Integrate all orbits at once, directly into (no,ntJ,6)
+                os= Orbits(nu.atleast_2d(nu.array([R,vR,vT,z,vz,phi],
+                                                  dtype='float').T))
+                if freqsAngles:
+                    # Integrate backward and forward from t=0 in a single
+                    # call, such that the requested point is not at the edge
+                    ts= nu.concatenate((-self._tsJ[:0:-1],self._tsJ))
+                    t0index= len(self._tsJ)-1
+                else:
+                    ts= self._tsJ
+                    t0index= None
+                os.integrate(ts,self._pot,method=self._integrate_method,
+                             dt=self._integrate_dt,t0index=t0index)
+                orbits= os.getOrbit()
+                return (orbits[:,:,0],orbits[:,:,1],orbits[:,:,2],
+                        orbits[:,:,3],orbits[:,:,4],orbits[:,:,5])
         if isinstance(args[0],Orbit) \
-                or (isinstance(args[0],list) and isinstance(args[0][0],Orbit)) \
-                or RasOrbit:
-            if RasOrbit:
-                pass
-            elif not isinstance(args[0],list):
+                or (isinstance(args[0],list) and isinstance(args[0][0],Orbit)):
+            if not isinstance(args[0],list):
                 os= [args[0]]
                 if len(os[0]._orb.vxvv) == 3 or len(os[0]._orb.vxvv) == 5: #pragma: no cover
                     raise IOError("Must specify phi for actionAngleIsochroneApprox")
@@ -10,13 +10,17 @@
 #
 ###############################################################################
 import copy
+import warnings
 import math as m
 import numpy as nu
 from scipy import integrate
+from galpy.util import galpyWarning
 from galpy.potential import epifreq, omegac
-from galpy.potential_src.Potential import _evaluatePotentials
+from galpy.potential_src.Potential import _evaluatePotentials, _check_c
 from galpy.actionAngle_src.actionAngle import *
 from galpy.actionAngle_src.actionAngleAxi import actionAngleAxi, potentialAxi
+import galpy.actionAngle_src.actionAngleSpherical_c as actionAngleSpherical_c
+from galpy.actionAngle_src.actionAngleSpherical_c import _ext_loaded as ext_loaded
 class actionAngleSpherical(actionAngle):
     """Action-angle formalism for spherical potentials"""
     def __init__(self,*args,**kwargs):
@@ -33,6 +37,10 @@ class actionAngleSpherical(actionAngle):
 
            pot= a Spherical potential
 
+           c= (False) if True, use C to calculate the actions, frequencies, and angles for all objects at once
+
+           order= (10) order of the Gauss-Legendre integration used by the C code
+
            ro= distance from vantage point to GC (kpc; can be Quantity)
 
            vo= circular velocity at ro (km/s; can be Quantity)
@@ -45,6 +53,8 @@ class actionAngleSpherical(actionAngle):
 
            2013-12-28 - Written - Bovy (IAS)
 
+           2026-10-17 - Added C implementation
+
         """
         actionAngle.__init__(self,
                              ro=kwargs.get('ro',None),vo=kwargs.get('vo',None))
@@ -56,14 +66,13 @@ class actionAngleSpherical(actionAngle):
             self._2dpot= [p.toPlanar() for p in self._pot]
         else:
             self._2dpot= self._pot.toPlanar()
-        #The following for if we ever implement this code in C
-        self._c= False
-        ext_loaded= False
-        if ext_loaded and (('c' in kwargs and kwargs['c'])
-                           or not 'c' in kwargs):
-            self._c= True #pragma: no cover
+        if ext_loaded and 'c' in kwargs and kwargs['c']:
+            self._c= _check_c(self._pot)
+            if not self._c:
+                warnings.warn("C module not used because potential does not have a C implementation",galpyWarning) #pragma: no cover
         else:
             self._c= False
+        self._order= kwargs.get('order',10)
         # Check the units
         self._check_consistent_units()
         return None
@@ -104,8 +113,15 @@ class actionAngleSpherical(actionAngle):
             vT= nu.array([vT])
             z= nu.array([z])
             vz= nu.array([vz])
-        if self._c: #pragma: no cover
-            pass
+        if self._c:
+            Lz= R*vT
+            L= nu.sqrt((z*vT)**2.+(z*vR-R*vz)**2.+Lz**2.)
+            jr, err= actionAngleSpherical_c.actionAngleSpherical_c(\
+                self._pot,R,vR,vT,z,vz,order=self._order)
+            if err == 0:
+                return (jr,Lz,L-nu.fabs(Lz))
+            else: #pragma: no cover
+                raise RuntimeError("C-code for calculation actions failed; try with c=False")
         else:
             Lz= R*vT
             Lx= -z*vT
@@ -168,8 +184,17 @@ class actionAngleSpherical(actionAngle):
             vT= nu.array([vT])
             z= nu.array([z])
             vz= nu.array([vz])
-        if self._c: #pragma: no cover
-            pass
+        if self._c:
+            Lz= R*vT
+            L= nu.sqrt((z*vT)**2.+(z*vR-R*vz)**2.+Lz**2.)
+            jr, Or, Op, err= actionAngleSpherical_c.actionAngleFreqSpherical_c(\
+                self._pot,R,vR,vT,z,vz,order=self._order)
+            if err == 0:
+                Oz= copy.copy(Op)
+                Op[vT < 0.]*= -1.
+                return (jr,Lz,L-nu.fabs(Lz),Or,Op,Oz)
+            else: #pragma: no cover
+                raise RuntimeError("C-code for calculation actions failed; try with c=False")
         else:
             Lz= R*vT
             Lx= -z*vT
@@ -247,8 +272,37 @@ class actionAngleSpherical(actionAngle):
             z= nu.array([z])
             vz= nu.array([vz])
             phi= nu.array([phi])
-        if self._c: #pragma: no cover
-            pass
+        if self._c:
+            Lz= R*vT
+            L= nu.sqrt((z*vT)**2.+(z*vR-R*vz)**2.+Lz**2.)
+            jr, Or, Op, ar, az, err= \
+                actionAngleSpherical_c.actionAngleFreqAngleSpherical_c(\
+                self._pot,R,vR,vT,z,vz,order=self._order)
+            if err != 0: #pragma: no cover
+                raise RuntimeError("C-code for calculation actions failed; try with c=False")
+            r= nu.sqrt(R**2.+z**2.)
+            axivz= (z*vR-R*vz)/r
+            #Calculate the longitude of the ascending node
+            asc= self._calc_long_asc(z,R,axivz,phi,Lz,L)
+            #Add the angle from the ascending node to the angle in the plane
+            sinpsi= z/r/nu.sin(nu.arccos(Lz/L))
+            pindx= (sinpsi > 1.)*(sinpsi < (1.+10.**-7.))
+            sinpsi[pindx]= 1.
+            pindx= (sinpsi < -1.)*(sinpsi > (-1.-10.**-7.))
+            sinpsi[pindx]= -1.
+            psi= nu.arcsin(sinpsi)
+            vzindx= axivz > 0.
+            psi[vzindx]= nu.pi-psi[vzindx]
+            az+= psi
+            Oz= copy.copy(Op)
+            Op[vT < 0.]*= -1.
+            ap= copy.copy(asc)
+            ap[vT < 0.]-= az[vT < 0.]
+            ap[vT >= 0.]+= az[vT >= 0.]
+            ar= ar % (2.*nu.pi)
+            ap= ap % (2.*nu.pi)
+            az= az % (2.*nu.pi)
+            return (jr,Lz,L-nu.fabs(Lz),Or,Op,Oz,ar,ap,az)
         else:
             Lz= R*vT
             Lx= -z*vT
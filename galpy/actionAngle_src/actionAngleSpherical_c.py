@@ -0,0 +1,294 @@
+import os
+import sys
+import sysconfig
+import warnings
+import ctypes
+import ctypes.util
+import numpy
+from numpy.ctypeslib import ndpointer
+from galpy.util import galpyWarning
+from galpy.orbit_src.integrateFullOrbit import _parse_pot
+#Find and load the library
+_lib= None
+outerr= None
+PY3= sys.version > '3'
+if PY3: #pragma: no cover
+    _ext_suffix= sysconfig.get_config_var('EXT_SUFFIX')
+else:
+    _ext_suffix= '.so'
+for path in sys.path:
+    try:
+        _lib = ctypes.CDLL(os.path.join(path,'galpy_actionAngle_c%s' % _ext_suffix))
+    except OSError as e:
+        if os.path.exists(os.path.join(path,'galpy_actionAngle_c%s' % _ext_suffix)): #pragma: no cover
+            outerr= e
+        _lib = None
+    else:
+        break
+if _lib is None: #pragma: no cover
+    if not outerr is None:
+        warnings.warn("actionAngleSpherical_c extension module not loaded, because of error '%s' " % outerr,
+                      galpyWarning)
+    else:
+        warnings.warn("actionAngleSpherical_c extension module not loaded, because galpy_actionAngle_c%s image was not found" % _ext_suffix,
+                      galpyWarning)
+    _ext_loaded= False
+else:
+    _ext_loaded= True
+
+def actionAngleSpherical_c(pot,R,vR,vT,z,vz,order=10):
+    """
+    NAME:
+       actionAngleSpherical_c
+    PURPOSE:
+       Use C to calculate the radial action in a spherical potential
+    INPUT:
+       pot - Potential or list of such instances
+       R, vR, vT, z, vz - coordinates (arrays)
+       order= (10) order of the Gauss-Legendre integration
+    OUTPUT:
+       (jr,err)
+       jr : array, shape (len(R))
+       err - non-zero if error occured (-1: the root finder for the peri- and apocenters did not converge; -2: an integral is not finite)
+    HISTORY:
+       2026-10-17 - Written
+    """
+    #Parse the potential
+    npot, pot_type, pot_args= _parse_pot(pot,potforactions=True)
+
+    #Set up result arrays
+    jr= numpy.empty(len(R))
+    err= ctypes.c_int(0)
+
+    #Set up the C code
+    ndarrayFlags= ('C_CONTIGUOUS','WRITEABLE')
+    actionAngleSpherical_actionsFunc= _lib.actionAngleSpherical_actions
+    actionAngleSpherical_actionsFunc.argtypes= [ctypes.c_int,
+                               ndpointer(dtype=numpy.float64,flags=ndarrayFlags),
+                               ndpointer(dtype=numpy.float64,flags=ndarrayFlags),
+                               ndpointer(dtype=numpy.float64,flags=ndarrayFlags),
+                               ndpointer(dtype=numpy.float64,flags=ndarrayFlags),
+                               ndpointer(dtype=numpy.float64,flags=ndarrayFlags),
+                               ctypes.c_int,
+                               ndpointer(dtype=numpy.int32,flags=ndarrayFlags),
+                               ndpointer(dtype=numpy.float64,flags=ndarrayFlags),
+                               ctypes.c_int,
+                               ndpointer(dtype=numpy.float64,flags=ndarrayFlags),
+                               ctypes.POINTER(ctypes.c_int)]
+
+    #Array requirements, first store old order
+    f_cont= [R.flags['F_CONTIGUOUS'],
+             vR.flags['F_CONTIGUOUS'],
+             vT.flags['F_CONTIGUOUS'],
+             z.flags['F_CONTIGUOUS'],
+             vz.flags['F_CONTIGUOUS']]
+    R= numpy.require(R,dtype=numpy.float64,requirements=['C','W'])
+    vR= numpy.require(vR,dtype=numpy.float64,requirements=['C','W'])
+    vT= numpy.require(vT,dtype=numpy.float64,requirements=['C','W'])
+    z= numpy.require(z,dtype=numpy.float64,requirements=['C','W'])
+    vz= numpy.require(vz,dtype=numpy.float64,requirements=['C','W'])
+    jr= numpy.require(jr,dtype=numpy.float64,requirements=['C','W'])
+
+    #Run the C code
+    actionAngleSpherical_actionsFunc(len(R),
+                                     R,
+                                     vR,
+                                     vT,
+                                     z,
+                                     vz,
+                                     ctypes.c_int(npot),
+                                     pot_type,
+                                     pot_args,
+                                     ctypes.c_int(order),
+                                     jr,
+                                     ctypes.byref(err))
+
+    #Reset input arrays
+    if f_cont[0]: R= numpy.asfortranarray(R)
+    if f_cont[1]: vR= numpy.asfortranarray(vR)
+    if f_cont[2]: vT= numpy.asfortranarray(vT)
+    if f_cont[3]: z= numpy.asfortranarray(z)
+    if f_cont[4]: vz= numpy.asfortranarray(vz)
+
+    return (jr,err.value)
+
+def actionAngleFreqSpherical_c(pot,R,vR,vT,z,vz,order=10):
+    """
+    NAME:
+       actionAngleFreqSpherical_c
+    PURPOSE:
+       Use C to calculate the radial action and the frequencies in a
+       spherical potential
+    INPUT:
+       pot - Potential or list of such instances
+       R, vR, vT, z, vz - coordinates (arrays)
+       order= (10) order of the Gauss-Legendre integration
+    OUTPUT:
+       (jr,Omegar,Omegaphi,err)
+       jr,Omegar,Omegaphi : array, shape (len(R))
+       Omegaphi is the frequency in the orbital plane, always positive
+       err - non-zero if error occured (-1: the root finder for the peri- and apocenters did not converge; -2: an integral is not finite)
+    HISTORY:
+       2026-10-17 - Written
+    """
+    #Parse the potential
+    npot, pot_type, pot_args= _parse_pot(pot,potforactions=True)
+
+    #Set up result arrays
+    jr= numpy.empty(len(R))
+    Omegar= numpy.empty(len(R))
+    Omegaphi= numpy.empty(len(R))
+    err= ctypes.c_int(0)
+
+    #Set up the C code
+    ndarrayFlags= ('C_CONTIGUOUS','WRITEABLE')
+    actionAngleSpherical_actionsFunc= _lib.actionAngleSpherical_actionsFreqs
+    actionAngleSpherical_actionsFunc.argtypes= [ctypes.c_int,
+                               ndpointer(dtype=numpy.float64,flags=ndarrayFlags),
+                               ndpointer(dtype=numpy.float64,flags=ndarrayFlags),
+                               ndpointer(dtype=numpy.float64,flags=ndarrayFlags),
+                               ndpointer(dtype=numpy.float64,flags=ndarrayFlags),
+                               ndpointer(dtype=numpy.float64,flags=ndarrayFlags),
+                               ctypes.c_int,
+                               ndpointer(dtype=numpy.int32,flags=ndarrayFlags),
+                               ndpointer(dtype=numpy.float64,flags=ndarrayFlags),
+                               ctypes.c_int,
+                               ndpointer(dtype=numpy.float64,flags=ndarrayFlags),
+                               ndpointer(dtype=numpy.float64,flags=ndarrayFlags),
+                               ndpointer(dtype=numpy.float64,flags=ndarrayFlags),
+                               ctypes.POINTER(ctypes.c_int)]
+
+    #Array requirements, first store old order
+    f_cont= [R.flags['F_CONTIGUOUS'],
+             vR.flags['F_CONTIGUOUS'],
+             vT.flags['F_CONTIGUOUS'],
+             z.flags['F_CONTIGUOUS'],
+             vz.flags['F_CONTIGUOUS']]
+    R= numpy.require(R,dtype=numpy.float64,requirements=['C','W'])
+    vR= numpy.require(vR,dtype=numpy.float64,requirements=['C','W'])
+    vT= numpy.require(vT,dtype=numpy.float64,requirements=['C','W'])
+    z= numpy.require(z,dtype=numpy.float64,requirements=['C','W'])
+    vz= numpy.require(vz,dtype=numpy.float64,requirements=['C','W'])
+    jr= numpy.require(jr,dtype=numpy.float64,requirements=['C','W'])
+    Omegar= numpy.require(Omegar,dtype=numpy.float64,requirements=['C','W'])
+    Omegaphi= numpy.require(Omegaphi,dtype=numpy.float64,requirements=['C','W'])
+
+    #Run the C code
+    actionAngleSpherical_actionsFunc(len(R),
+                                     R,
+                                     vR,
+                                     vT,
+                                     z,
+                                     vz,
+                                     ctypes.c_int(npot),
+                                     pot_type,
+                                     pot_args,
+                                     ctypes.c_int(order),
+                                     jr,
+                                     Omegar,
+                                     Omegaphi,
+                                     ctypes.byref(err))
+
+    #Reset input arrays
+    if f_cont[0]: R= numpy.asfortranarray(R)
+    if f_cont[1]: vR= numpy.asfortranarray(vR)
+    if f_cont[2]: vT= numpy.asfortranarray(vT)
+    if f_cont[3]: z= numpy.asfortranarray(z)
+    if f_cont[4]: vz= numpy.asfortranarray(vz)
+
+    return (jr,Omegar,Omegaphi,err.value)
+
+def actionAngleFreqAngleSpherical_c(pot,R,vR,vT,z,vz,order=10):
+    """
+    NAME:
+       actionAngleFreqAngleSpherical_c
+    PURPOSE:
+       Use C to calculate the radial action, the frequencies, and the
+       angles in a spherical potential
+    INPUT:
+       pot - Potential or list of such instances
+       R, vR, vT, z, vz - coordinates (arrays)
+       order= (10) order of the Gauss-Legendre integration
+    OUTPUT:
+       (jr,Omegar,Omegaphi,Angler,Anglez,err)
+       jr,Omegar,Omegaphi,Angler,Anglez : array, shape (len(R))
+       Omegaphi is the frequency in the orbital plane, always positive;
+       Anglez still needs the angle from the ascending node to be added
+       err - non-zero if error occured (-1: the root finder for the peri- and apocenters did not converge; -2: an integral is not finite)
+    HISTORY:
+       2026-10-17 - Written
+    """
+    #Parse the potential
+    npot, pot_type, pot_args= _parse_pot(pot,potforactions=True)
+
+    #Set up result arrays
+    jr= numpy.empty(len(R))
+    Omegar= numpy.empty(len(R))
+    Omegaphi= numpy.empty(len(R))
+    Angler= numpy.empty(len(R))
+    Anglez= numpy.empty(len(R))
+    err= ctypes.c_int(0)
+
+    #Set up the C code
+    ndarrayFlags= ('C_CONTIGUOUS','WRITEABLE')
+    actionAngleSpherical_actionsFunc= _lib.actionAngleSpherical_actionsFreqsAngles
+    actionAngleSpherical_actionsFunc.argtypes= [ctypes.c_int,
+                               ndpointer(dtype=numpy.float64,flags=ndarrayFlags),
+                               ndpointer(dtype=numpy.float64,flags=ndarrayFlags),
+                               ndpointer(dtype=numpy.float64,flags=ndarrayFlags),
+                               ndpointer(dtype=numpy.float64,flags=ndarrayFlags),
+                               ndpointer(dtype=numpy.float64,flags=ndarrayFlags),
+                               ctypes.c_int,
+                               ndpointer(dtype=numpy.int32,flags=ndarrayFlags),
+                               ndpointer(dtype=numpy.float64,flags=ndarrayFlags),
+                               ctypes.c_int,
+                               ndpointer(dtype=numpy.float64,flags=ndarrayFlags),
+                               ndpointer(dtype=numpy.float64,flags=ndarrayFlags),
+                               ndpointer(dtype=numpy.float64,flags=ndarrayFlags),
+                               ndpointer(dtype=numpy.float64,flags=ndarrayFlags),
+                               ndpointer(dtype=numpy.float64,flags=ndarrayFlags),
+                               ctypes.POINTER(ctypes.c_int)]
+
+    #Array requirements, first store old order
+    f_cont= [R.flags['F_CONTIGUOUS'],
+             vR.flags['F_CONTIGUOUS'],
+             vT.flags['F_CONTIGUOUS'],
+             z.flags['F_CONTIGUOUS'],
+             vz.flags['F_CONTIGUOUS']]
+    R= numpy.require(R,dtype=numpy.float64,requirements=['C','W'])
+    vR= numpy.require(vR,dtype=numpy.float64,requirements=['C','W'])
+    vT= numpy.require(vT,dtype=numpy.float64,requirements=['C','W'])
+    z= numpy.require(z,dtype=numpy.float64,requirements=['C','W'])
+    vz= numpy.require(vz,dtype=numpy.float64,requirements=['C','W'])
+    jr= numpy.require(jr,dtype=numpy.float64,requirements=['C','W'])
+    Omegar= numpy.require(Omegar,dtype=numpy.float64,requirements=['C','W'])
+    Omegaphi= numpy.require(Omegaphi,dtype=numpy.float64,requirements=['C','W'])
+    Angler= numpy.require(Angler,dtype=numpy.float64,requirements=['C','W'])
+    Anglez= numpy.require(Anglez,dtype=numpy.float64,requirements=['C','W'])
+
+    #Run the C code
+    actionAngleSpherical_actionsFunc(len(R),
+                                     R,
+                                     vR,
+                                     vT,
+                                     z,
+                                     vz,
+                                     ctypes.c_int(npot),
+                                     pot_type,
+                                     pot_args,
+                                     ctypes.c_int(order),
+                                     jr,
+                                     Omegar,
+                                     Omegaphi,
+                                     Angler,
+                                     Anglez,
+                                     ctypes.byref(err))
+
+    #Reset input arrays
+    if f_cont[0]: R= numpy.asfortranarray(R)
+    if f_cont[1]: vR= numpy.asfortranarray(vR)
+    if f_cont[2]: vT= numpy.asfortranarray(vT)
+    if f_cont[3]: z= numpy.asfortranarray(z)
+    if f_cont[4]: vz= numpy.asfortranarray(vz)
+
+    return (jr,Omegar,Omegaphi,Angler,Anglez,err.value)
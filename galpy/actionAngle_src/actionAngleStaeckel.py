@@ -42,7 +42,9 @@ class actionAngleStaeckel(actionAngle):
         INPUT:
            pot= potential or list of potentials (3D)
 
-           delta= focus (can be Quantity)
+           delta= focus (can be Quantity); can be an array with shape (N) to use a different focus for each of N objects
+
+           adaptive_delta= (False) if True, estimate delta for each object from the second derivatives of the potential at its position using eqn. (9) in Sanders (2012) (delta= is then not needed)
 
            useu0 - use u0 to calculate dV (NOT recommended)
 
@@ -69,7 +71,8 @@ class actionAngleStaeckel(actionAngle):
         if self._pot == MWPotential:
             warnings.warn("Use of MWPotential as a Milky-Way-like potential is deprecated; galpy.potential.MWPotential2014, a potential fit to a large variety of dynamical constraints (see Bovy 2015), is the preferred Milky-Way-like potential in galpy",
                           galpyWarning)
-        if not 'delta' in kwargs: #pragma: no cover
+        self._adaptive_delta= kwargs.get('adaptive_delta',False)
+        if not 'delta' in kwargs and not self._adaptive_delta: #pragma: no cover
             raise IOError("Must specify delta= for actionAngleStaeckel")
         if ext_loaded and (('c' in kwargs and kwargs['c'])
                            or not 'c' in kwargs):           
@@ -79,12 +82,34 @@ class actionAngleStaeckel(actionAngle):
         else:
             self._c= False
         self._useu0= kwargs.get('useu0',False)
-        self._delta= kwargs['delta']
+        self._delta= kwargs.get('delta',None)
         if _APY_LOADED and isinstance(self._delta,units.Quantity):
             self._delta= self._delta.to(units.kpc).value/self._ro
         # Check the units
         self._check_consistent_units()
         return None
+
+    def _c_delta(self,R,z):
+        """Return the delta to pass to the C code: None lets the C code estimate it for each object, unless u0 needs to be computed first"""
+        if not self._adaptive_delta:
+            return self._delta
+        elif self._useu0:
+            return actionAngleStaeckel_c.actionAngleStaeckel_estimateDelta_c(\
+                self._pot,R,z)[0]
+        else:
+            return None
+
+    def _python_delta(self,R,z):
+        """Return delta for each object at (R,z) for the Python code, estimated in the same way as in the C code if adaptive_delta"""
+        if not self._adaptive_delta:
+            return self._delta*nu.ones(len(R))
+        # The estimate is even in z and 0/0 in the plane
+        zz= nu.maximum(nu.fabs(z),10.**-3.*nu.sqrt(R**2.+z**2.))
+        delta= nu.array([estimateDeltaStaeckel(self._pot,R[ii],zz[ii],
+                                               use_physical=False)
+                         for ii in range(len(R))])
+        delta[True^(delta > 10.**-6.)]= 10.**-6.
+        return delta
     
     def _evaluate(self,*args,**kwargs):
         """
@@ -125,6 +150,7 @@ class actionAngleStaeckel(actionAngle):
                 z= nu.array([z])
                 vz= nu.array([vz])
             Lz= R*vT
+            delta= self._c_delta(R,z)
             if self._useu0:
                 #First calculate u0
                 if 'u0' in kwargs:
@@ -134,12 +160,12 @@ class actionAngleStaeckel(actionAngle):
                                  +vR[ii]**2./2.+vz[ii]**2./2.+vT[ii]**2./2. for ii in range(len(R))])
                     u0= actionAngleStaeckel_c.actionAngleStaeckel_calcu0(E,Lz,
                                                                          self._pot,
-                                                                         self._delta)[0]
+                                                                         delta)[0]
                 kwargs.pop('u0',None)
             else:
                 u0= None
             jr, jz, err= actionAngleStaeckel_c.actionAngleStaeckel_c(\
-                self._pot,self._delta,R,vR,vT,z,vz,u0=u0)
+                self._pot,delta,R,vR,vT,z,vz,u0=u0)
             if err == 0:
                 return (jr,Lz,jz)
             else: #pragma: no cover
@@ -153,6 +179,7 @@ class actionAngleStaeckel(actionAngle):
                 ojr= nu.zeros((len(args[0])))
                 olz= nu.zeros((len(args[0])))
                 ojz= nu.zeros((len(args[0])))
+                delta= self._python_delta(args[0],args[3])
                 for ii in range(len(args[0])):
                     if len(args) == 5:
                         targs= (args[0][ii],args[1][ii],args[2][ii],
@@ -160,15 +187,22 @@ class actionAngleStaeckel(actionAngle):
                     elif len(args) == 6:
                         targs= (args[0][ii],args[1][ii],args[2][ii],
                                 args[3][ii],args[4][ii],args[5][ii])
-                    tjr,tlz,tjz= self(*targs,**copy.copy(kwargs))
-                    ojr[ii]= tjr
-                    ojz[ii]= tjz
-                    olz[ii]= tlz
+                    aASingle= actionAngleStaeckelSingle(*targs,pot=self._pot,
+                                                         delta=delta[ii])
+                    ojr[ii]= aASingle.JR(**copy.copy(kwargs))
+                    ojz[ii]= aASingle.Jz(**copy.copy(kwargs))
+                    olz[ii]= aASingle._R*aASingle._vT
                 return (ojr,olz,ojz)
             else:
                 #Set up the actionAngleStaeckelSingle object
+                if self._adaptive_delta:
+                    self._parse_eval_args(*args)
+                    delta= self._python_delta(nu.array([self._eval_R]),
+                                              nu.array([self._eval_z]))[0]
+                else:
+                    delta= self._delta
                 aASingle= actionAngleStaeckelSingle(*args,pot=self._pot,
-                                                     delta=self._delta)
+                                                     delta=delta)
                 return (aASingle.JR(**copy.copy(kwargs)),
                         aASingle._R*aASingle._vT,
                         aASingle.Jz(**copy.copy(kwargs)))
@@ -211,6 +245,7 @@ class actionAngleStaeckel(actionAngle):
                 z= nu.array([z])
                 vz= nu.array([vz])
             Lz= R*vT
+            delta= self._c_delta(R,z)
             if self._useu0:
                 #First calculate u0
                 if 'u0' in kwargs:
@@ -220,12 +255,12 @@ class actionAngleStaeckel(actionAngle):
                                  +vR[ii]**2./2.+vz[ii]**2./2.+vT[ii]**2./2. for ii in range(len(R))])
                     u0= actionAngleStaeckel_c.actionAngleStaeckel_calcu0(E,Lz,
                                                                          self._pot,
-                                                                         self._delta)[0]
+                                                                         delta)[0]
                 kwargs.pop('u0',None)
             else:
                 u0= None
             jr, jz, Omegar, Omegaphi, Omegaz, err= actionAngleStaeckel_c.actionAngleFreqStaeckel_c(\
-                self._pot,self._delta,R,vR,vT,z,vz,u0=u0)
+                self._pot,delta,R,vR,vT,z,vz,u0=u0)
             # Adjustements for close-to-circular orbits
             indx= nu.isnan(Omegar)*(jr < 10.**-3.)+nu.isnan(Omegaz)*(jz < 10.**-3.) #Close-to-circular and close-to-the-plane orbits
             if nu.sum(indx) > 0:
@@ -282,6 +317,7 @@ class actionAngleStaeckel(actionAngle):
                 vz= nu.array([vz])
                 phi= nu.array([phi])
             Lz= R*vT
+            delta= self._c_delta(R,z)
             if self._useu0:
                 #First calculate u0
                 if 'u0' in kwargs:
@@ -291,12 +327,12 @@ class actionAngleStaeckel(actionAngle):
                                  +vR[ii]**2./2.+vz[ii]**2./2.+vT[ii]**2./2. for ii in range(len(R))])
                     u0= actionAngleStaeckel_c.actionAngleStaeckel_calcu0(E,Lz,
                                                                          self._pot,
-                                                                         self._delta)[0]
+                                                                         delta)[0]
                 kwargs.pop('u0',None)
             else:
                 u0= None
             jr, jz, Omegar, Omegaphi, Omegaz, angler, anglephi,anglez, err= actionAngleStaeckel_c.actionAngleFreqAngleStaeckel_c(\
-                self._pot,self._delta,R,vR,vT,z,vz,phi,u0=u0)
+                self._pot,delta,R,vR,vT,z,vz,phi,u0=u0)
             # Adjustements for close-to-circular orbits
             indx= nu.isnan(Omegar)*(jr < 10.**-3.)+nu.isnan(Omegaz)*(jz < 10.**-3.) #Close-to-circular and close-to-the-plane orbits
             if nu.sum(indx) > 0:
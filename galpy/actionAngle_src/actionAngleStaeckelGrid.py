@@ -8,17 +8,21 @@
 #
 #      methods:
 #             __call__: returns (jr,lz,jz)
+#             save: save the grids to a file
 #
 ###############################################################################
+import os
+import warnings
 import numpy
 from scipy import interpolate, optimize, ndimage
 import galpy.actionAngle_src.actionAngleStaeckel as actionAngleStaeckel
-from galpy.actionAngle_src.actionAngle import actionAngle
+from galpy.actionAngle_src.actionAngle import actionAngle, \
+    _grid_fingerprint, _save_grid_tables, _load_grid_tables
 import galpy.actionAngle_src.actionAngleStaeckel_c as actionAngleStaeckel_c
 from galpy.actionAngle_src.actionAngleStaeckel_c import _ext_loaded as ext_loaded
 import galpy.potential
 from galpy.potential_src.Potential import _evaluatePotentials
-from galpy.util import multi, bovy_coords
+from galpy.util import galpyWarning, multi, bovy_coords
 _PRINTOUTSIDEGRID= False
 _APY_LOADED= True
 try:
@@ -28,7 +32,7 @@ except ImportError:
 class actionAngleStaeckelGrid(actionAngle):
     """Action-angle formalism for axisymmetric potentials using Binney (2012)'s Staeckel approximation, grid-based interpolation"""
     def __init__(self,pot=None,delta=None,Rmax=5.,
-                 nE=25,npsi=25,nLz=30,numcores=1,
+                 nE=25,npsi=25,nLz=30,numcores=1,savefilename=None,
                  **kwargs):
         """
         NAME:
@@ -46,6 +50,8 @@ class actionAngleStaeckelGrid(actionAngle):
 
            numcores= number of cpus to use to parallellize
 
+           savefilename= (None) if set, restore the grids from this file if it exists (memory-mapped read-only, such that processes share them; the file needs to have been built for the same potential and grid parameters) and otherwise compute the grids and save them to this file
+
            ro= distance from vantage point to GC (kpc; can be Quantity)
 
            vo= circular velocity at ro (km/s; can be Quantity)
@@ -58,6 +64,8 @@ class actionAngleStaeckelGrid(actionAngle):
 
             2012-11-29 - Written - Bovy (IAS)
 
+            2026-10-17 - Added savefilename
+
         """
         actionAngle.__init__(self,
                              ro=kwargs.get('ro',None),vo=kwargs.get('vo',None))
@@ -77,35 +85,73 @@ class actionAngleStaeckelGrid(actionAngle):
         self._Rmin= 0.01
         #Set up the actionAngleStaeckel object that we will use to interpolate
         self._aA= actionAngleStaeckel.actionAngleStaeckel(pot=self._pot,delta=self._delta,c=self._c)
-        #Build grid
         self._Lzmin= 0.01
+        self._nLz= nLz
+        self._nE= nE
+        self._npsi= npsi
+        self._Ramax= 200./8.
+        #Build grid, or restore it from savefilename
+        if not savefilename is None and self._fingerprint() is None:
+            warnings.warn("Not restoring or saving the grids of %s using %s, because some parameters of the potential or of the grid cannot be fingerprinted, such that saved grids could belong to a different potential" % (self.__class__.__name__,savefilename),galpyWarning)
+            savefilename= None
+        if not savefilename is None and os.path.exists(savefilename):
+            self._load_grid(savefilename)
+        else:
+            self._setup_grid(numcores)
+            if not savefilename is None:
+                self.save(savefilename)
+        self._Lzmax= self._Lzs[-1]
+        self._RLInterp= interpolate.InterpolatedUnivariateSpline(self._Lzs,
+                                                                 self._RL,k=3)
+        self._ERLmax= numpy.amax(self._ERL)+1.
+        self._ERLInterp= interpolate.InterpolatedUnivariateSpline(self._Lzs,
+                                                                  numpy.log(-(self._ERL-self._ERLmax)),k=3)
+        self._ERamax= numpy.amax(self._ERa)+1.
+        self._ERaInterp= interpolate.InterpolatedUnivariateSpline(self._Lzs,
+                                                                  numpy.log(-(self._ERa-self._ERamax)),k=3)
+        #First interpolate the maxima
+        self._jrLzInterp= interpolate.InterpolatedUnivariateSpline(self._Lzs,
+                                                                   numpy.log(self._jrLzE+10.**-5.),k=3)
+        self._jzLzInterp= interpolate.InterpolatedUnivariateSpline(self._Lzs,
+                                                                   numpy.log(self._jzLzE+10.**-5.),k=3)
+        #Interpolate u0
+        self._logu0Interp= interpolate.RectBivariateSpline(self._Lzs,
+                                                           numpy.linspace(0.,1.,nE),
+                                                           numpy.log(self._u0),
+                                                           kx=3,ky=3,s=0.)
+        # Check the units
+        self._check_consistent_units()
+        return None
+
+    def _setup_grid(self,numcores):
+        """
+        NAME:
+           _setup_grid
+        PURPOSE:
+           compute the grids of u0, jr, and jz
+        INPUT:
+           numcores= number of cpus to use to parallellize
+        OUTPUT:
+           (none; sets attributes)
+        HISTORY:
+           2012-11-29 - Written as part of __init__ - Bovy (IAS)
+           2026-10-17 - Split off from __init__
+        """
+        nLz, nE, npsi= self._nLz, self._nE, self._npsi
         self._Lzs= numpy.linspace(self._Lzmin,
                                   self._Rmax\
                                       *galpy.potential.vcirc(self._pot,
                                                              self._Rmax),
                                   nLz)
-        self._Lzmax= self._Lzs[-1]
-        self._nLz= nLz
         #Calculate E_c(R=RL), energy of circular orbit
-        self._RL= numpy.array([galpy.potential.rl(self._pot,l) for l in self._Lzs])
-        self._RLInterp= interpolate.InterpolatedUnivariateSpline(self._Lzs,
-                                                                 self._RL,k=3)
+        self._RL= galpy.potential.rl(self._pot,self._Lzs)
         self._ERL= _evaluatePotentials(self._pot,self._RL,
                                        numpy.zeros(self._nLz))\
                                        +self._Lzs**2./2./self._RL**2.
-        self._ERLmax= numpy.amax(self._ERL)+1.
-        self._ERLInterp= interpolate.InterpolatedUnivariateSpline(self._Lzs,
-                                                                  numpy.log(-(self._ERL-self._ERLmax)),k=3)
-        self._Ramax= 200./8.
         self._ERa= _evaluatePotentials(self._pot,self._Ramax,0.) +self._Lzs**2./2./self._Ramax**2.
         #self._EEsc= numpy.array([self._ERL[ii]+galpy.potential.vesc(self._pot,self._RL[ii])**2./4. for ii in range(nLz)])
-        self._ERamax= numpy.amax(self._ERa)+1.
-        self._ERaInterp= interpolate.InterpolatedUnivariateSpline(self._Lzs,
-                                                                  numpy.log(-(self._ERa-self._ERamax)),k=3)
         y= numpy.linspace(0.,1.,nE)
-        self._nE= nE
         psis= numpy.linspace(0.,1.,npsi)*numpy.pi/2.
-        self._npsi= npsi
         jr= numpy.zeros((nLz,nE,npsi))
         jz= numpy.zeros((nLz,nE,npsi))
         u0= numpy.zeros((nLz,nE))
@@ -181,26 +227,64 @@ class actionAngleStaeckelGrid(actionAngle):
         #Deal w/ NaN
         jr[numpy.isnan(jr)]= 0.
         jz[numpy.isnan(jz)]= 0.
-        #First interpolate the maxima
         self._jr= jr
         self._jz= jz
         self._u0= u0
         self._jrLzE= jrLzE
         self._jzLzE= jzLzE
-        self._jrLzInterp= interpolate.InterpolatedUnivariateSpline(self._Lzs,
-                                                                   numpy.log(jrLzE+10.**-5.),k=3)
-        self._jzLzInterp= interpolate.InterpolatedUnivariateSpline(self._Lzs,
-                                                                   numpy.log(jzLzE+10.**-5.),k=3)
-        #Interpolate u0
-        self._logu0Interp= interpolate.RectBivariateSpline(self._Lzs,
-                                                           y,
-                                                           numpy.log(u0),
-                                                           kx=3,ky=3,s=0.)
         #spline filter jr and jz, such that they can be used with ndimage.map_coordinates
         self._jrFiltered= ndimage.spline_filter(numpy.log(self._jr+10.**-10.),order=3)
         self._jzFiltered= ndimage.spline_filter(numpy.log(self._jz+10.**-10.),order=3)
-        # Check the units
-        self._check_consistent_units()
+        return None
+
+    def _fingerprint(self):
+        """Fingerprint of the potential and grid parameters, against which saved grids are checked"""
+        return _grid_fingerprint(self._pot,float(self._delta),
+                                 float(self._Rmax),
+                                 self._nE,self._npsi,self._nLz,
+                                 float(self._Rmin),float(self._Lzmin),
+                                 float(self._Ramax),bool(self._c))
+
+    def save(self,savefilename):
+        """
+        NAME:
+           save
+        PURPOSE:
+           save the grids to a binary file, such that they can be restored with actionAngleStaeckelGrid(savefilename=) rather than recomputed
+        INPUT:
+           savefilename - name of the file
+        OUTPUT:
+           (none)
+        HISTORY:
+           2026-10-17 - Written
+        """
+        _save_grid_tables(savefilename,'actionAngleStaeckelGrid',
+                          self._fingerprint(),
+                          {'Lzs':self._Lzs,'RL':self._RL,
+                           'ERL':self._ERL,'ERa':self._ERa,
+                           'u0':self._u0,'thisv':self.thisv,
+                           'jr':self._jr,'jz':self._jz,
+                           'jrLzE':self._jrLzE,'jzLzE':self._jzLzE,
+                           'jrFiltered':self._jrFiltered,
+                           'jzFiltered':self._jzFiltered})
+        return None
+
+    def _load_grid(self,savefilename):
+        """Restore the grids saved with save, memory-mapped read-only"""
+        tables= _load_grid_tables(savefilename,'actionAngleStaeckelGrid',
+                                  self._fingerprint())
+        self._Lzs= tables['Lzs']
+        self._RL= tables['RL']
+        self._ERL= tables['ERL']
+        self._ERa= tables['ERa']
+        self._u0= tables['u0']
+        self.thisv= tables['thisv']
+        self._jr= tables['jr']
+        self._jz= tables['jz']
+        self._jrLzE= tables['jrLzE']
+        self._jzLzE= tables['jzLzE']
+        self._jrFiltered= tables['jrFiltered']
+        self._jzFiltered= tables['jzFiltered']
         return None
 
     def _evaluate(self,*args,**kwargs):
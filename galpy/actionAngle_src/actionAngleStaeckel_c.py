@@ -45,7 +45,9 @@ def actionAngleStaeckel_c(pot,delta,R,vR,vT,z,vz,u0=None):
        Use C to calculate actions using the Staeckel approximation
     INPUT:
        pot - Potential or list of such instances
-       delta - focal length of prolate spheroidal coordinates
+       delta - focal length of prolate spheroidal coordinates; float or
+               array with shape (len(R)), or None to estimate it for each
+               object (in which case u0 is ignored)
        R, vR, vT, z, vz - coordinates (arrays)
     OUTPUT:
        (jr,jz,err)
@@ -54,8 +56,7 @@ def actionAngleStaeckel_c(pot,delta,R,vR,vT,z,vz,u0=None):
     HISTORY:
        2012-12-01 - Written - Bovy (IAS)
     """
-    if u0 is None:
-        u0, dummy= bovy_coords.Rz_to_uv(R,z,delta=delta)
+    delta, u0, estimate_delta= _prepare_delta_u0(delta,R,z,u0)
     #Parse the potential
     npot, pot_type, pot_args= _parse_pot(pot,potforactions=True)
 
@@ -77,7 +78,8 @@ def actionAngleStaeckel_c(pot,delta,R,vR,vT,z,vz,u0=None):
                                ctypes.c_int,
                                ndpointer(dtype=numpy.int32,flags=ndarrayFlags),
                                ndpointer(dtype=numpy.float64,flags=ndarrayFlags),
-                               ctypes.c_double,
+                               ndpointer(dtype=numpy.float64,flags=ndarrayFlags),
+                               ctypes.c_int,
                                ndpointer(dtype=numpy.float64,flags=ndarrayFlags),
                                ndpointer(dtype=numpy.float64,flags=ndarrayFlags),
                                ctypes.POINTER(ctypes.c_int)]
@@ -95,6 +97,7 @@ def actionAngleStaeckel_c(pot,delta,R,vR,vT,z,vz,u0=None):
     z= numpy.require(z,dtype=numpy.float64,requirements=['C','W'])
     vz= numpy.require(vz,dtype=numpy.float64,requirements=['C','W'])
     u0= numpy.require(u0,dtype=numpy.float64,requirements=['C','W'])
+    delta= numpy.require(delta,dtype=numpy.float64,requirements=['C','W'])
     jr= numpy.require(jr,dtype=numpy.float64,requirements=['C','W'])
     jz= numpy.require(jz,dtype=numpy.float64,requirements=['C','W'])
 
@@ -109,7 +112,8 @@ def actionAngleStaeckel_c(pot,delta,R,vR,vT,z,vz,u0=None):
                                     ctypes.c_int(npot),
                                     pot_type,
                                     pot_args,
-                                    ctypes.c_double(delta),
+                                    delta,
+                                    ctypes.c_int(estimate_delta),
                                     jr,
                                     jz,
                                     ctypes.byref(err))
@@ -133,7 +137,8 @@ def actionAngleStaeckel_calcu0(E,Lz,pot,delta):
     INPUT:
        E, Lz - energy and angular momentum
        pot - Potential or list of such instances
-       delta - focal length of prolate spheroidal coordinates
+       delta - focal length of prolate spheroidal coordinates; float or
+               array with shape (len(E))
     OUTPUT:
        (u0,err)
        u0 : array, shape (len(E))
@@ -146,6 +151,7 @@ def actionAngleStaeckel_calcu0(E,Lz,pot,delta):
 
     #Set up result arrays
     u0= numpy.empty(len(E))
+    delta= delta*numpy.ones(len(E))
     err= ctypes.c_int(0)
 
     #Set up the C code
@@ -157,7 +163,7 @@ def actionAngleStaeckel_calcu0(E,Lz,pot,delta):
                                ctypes.c_int,
                                ndpointer(dtype=numpy.int32,flags=ndarrayFlags),
                                ndpointer(dtype=numpy.float64,flags=ndarrayFlags),
-                               ctypes.c_double,
+                               ndpointer(dtype=numpy.float64,flags=ndarrayFlags),
                                ndpointer(dtype=numpy.float64,flags=ndarrayFlags),
                                ctypes.POINTER(ctypes.c_int)]
 
@@ -167,6 +173,7 @@ def actionAngleStaeckel_calcu0(E,Lz,pot,delta):
     E= numpy.require(E,dtype=numpy.float64,requirements=['C','W'])
     Lz= numpy.require(Lz,dtype=numpy.float64,requirements=['C','W'])
     u0= numpy.require(u0,dtype=numpy.float64,requirements=['C','W'])
+    delta= numpy.require(delta,dtype=numpy.float64,requirements=['C','W'])
 
     #Run the C code
     actionAngleStaeckel_actionsFunc(len(E),
@@ -175,7 +182,7 @@ def actionAngleStaeckel_calcu0(E,Lz,pot,delta):
                                     ctypes.c_int(npot),
                                     pot_type,
                                     pot_args,
-                                    ctypes.c_double(delta),
+                                    delta,
                                     u0,
                                     ctypes.byref(err))
 
@@ -194,7 +201,9 @@ def actionAngleFreqStaeckel_c(pot,delta,R,vR,vT,z,vz,u0=None):
        using the Staeckel approximation
     INPUT:
        pot - Potential or list of such instances
-       delta - focal length of prolate spheroidal coordinates
+       delta - focal length of prolate spheroidal coordinates; float or
+               array with shape (len(R)), or None to estimate it for each
+               object (in which case u0 is ignored)
        R, vR, vT, z, vz - coordinates (arrays)
     OUTPUT:
        (jr,jz,Omegar,Omegaphi,Omegaz,err)
@@ -203,8 +212,7 @@ def actionAngleFreqStaeckel_c(pot,delta,R,vR,vT,z,vz,u0=None):
     HISTORY:
        2013-08-23 - Written - Bovy (IAS)
     """
-    if u0 is None:
-        u0, dummy= bovy_coords.Rz_to_uv(R,z,delta=delta)
+    delta, u0, estimate_delta= _prepare_delta_u0(delta,R,z,u0)
     #Parse the potential
     npot, pot_type, pot_args= _parse_pot(pot,potforactions=True)
 
@@ -229,7 +237,8 @@ def actionAngleFreqStaeckel_c(pot,delta,R,vR,vT,z,vz,u0=None):
                                ctypes.c_int,
                                ndpointer(dtype=numpy.int32,flags=ndarrayFlags),
                                ndpointer(dtype=numpy.float64,flags=ndarrayFlags),
-                               ctypes.c_double,
+                               ndpointer(dtype=numpy.float64,flags=ndarrayFlags),
+                               ctypes.c_int,
                                ndpointer(dtype=numpy.float64,flags=ndarrayFlags),
                                ndpointer(dtype=numpy.float64,flags=ndarrayFlags),
                                ndpointer(dtype=numpy.float64,flags=ndarrayFlags),
@@ -250,6 +259,7 @@ def actionAngleFreqStaeckel_c(pot,delta,R,vR,vT,z,vz,u0=None):
     z= numpy.require(z,dtype=numpy.float64,requirements=['C','W'])
     vz= numpy.require(vz,dtype=numpy.float64,requirements=['C','W'])
     u0= numpy.require(u0,dtype=numpy.float64,requirements=['C','W'])
+    delta= numpy.require(delta,dtype=numpy.float64,requirements=['C','W'])
     jr= numpy.require(jr,dtype=numpy.float64,requirements=['C','W'])
     jz= numpy.require(jz,dtype=numpy.float64,requirements=['C','W'])
     Omegar= numpy.require(Omegar,dtype=numpy.float64,requirements=['C','W'])
@@ -268,7 +278,8 @@ def actionAngleFreqStaeckel_c(pot,delta,R,vR,vT,z,vz,u0=None):
                                     ctypes.c_int(npot),
                                     pot_type,
                                     pot_args,
-                                    ctypes.c_double(delta),
+                                    delta,
+                                    ctypes.c_int(estimate_delta),
                                     jr,
                                     jz,
                                     Omegar,
@@ -295,7 +306,9 @@ def actionAngleFreqAngleStaeckel_c(pot,delta,R,vR,vT,z,vz,phi,u0=None):
        using the Staeckel approximation
     INPUT:
        pot - Potential or list of such instances
-       delta - focal length of prolate spheroidal coordinates
+       delta - focal length of prolate spheroidal coordinates; float or
+               array with shape (len(R)), or None to estimate it for each
+               object (in which case u0 is ignored)
        R, vR, vT, z, vz, phi - coordinates (arrays)
     OUTPUT:
        (jr,jz,Omegar,Omegaphi,Omegaz,Angler,Anglephi,Anglez,err)
@@ -304,8 +317,7 @@ def actionAngleFreqAngleStaeckel_c(pot,delta,R,vR,vT,z,vz,phi,u0=None):
     HISTORY:
        2013-08-27 - Written - Bovy (IAS)
     """
-    if u0 is None:
-        u0, dummy= bovy_coords.Rz_to_uv(R,z,delta=delta)
+    delta, u0, estimate_delta= _prepare_delta_u0(delta,R,z,u0)
     #Parse the potential
     npot, pot_type, pot_args= _parse_pot(pot,potforactions=True)
 
@@ -333,7 +345,8 @@ def actionAngleFreqAngleStaeckel_c(pot,delta,R,vR,vT,z,vz,phi,u0=None):
                                ctypes.c_int,
                                ndpointer(dtype=numpy.int32,flags=ndarrayFlags),
                                ndpointer(dtype=numpy.float64,flags=ndarrayFlags),
-                               ctypes.c_double,
+                               ndpointer(dtype=numpy.float64,flags=ndarrayFlags),
+                               ctypes.c_int,
                                ndpointer(dtype=numpy.float64,flags=ndarrayFlags),
                                ndpointer(dtype=numpy.float64,flags=ndarrayFlags),
                                ndpointer(dtype=numpy.float64,flags=ndarrayFlags),
@@ -357,6 +370,7 @@ def actionAngleFreqAngleStaeckel_c(pot,delta,R,vR,vT,z,vz,phi,u0=None):
     z= numpy.require(z,dtype=numpy.float64,requirements=['C','W'])
     vz= numpy.require(vz,dtype=numpy.float64,requirements=['C','W'])
     u0= numpy.require(u0,dtype=numpy.float64,requirements=['C','W'])
+    delta= numpy.require(delta,dtype=numpy.float64,requirements=['C','W'])
     jr= numpy.require(jr,dtype=numpy.float64,requirements=['C','W'])
     jz= numpy.require(jz,dtype=numpy.float64,requirements=['C','W'])
     Omegar= numpy.require(Omegar,dtype=numpy.float64,requirements=['C','W'])
@@ -379,7 +393,8 @@ def actionAngleFreqAngleStaeckel_c(pot,delta,R,vR,vT,z,vz,phi,u0=None):
                                     ctypes.c_int(npot),
                                     pot_type,
                                     pot_args,
-                                    ctypes.c_double(delta),
+                                    delta,
+                                    ctypes.c_int(estimate_delta),
                                     jr,
                                     jz,
                                     Omegar,
@@ -405,3 +420,70 @@ def actionAngleFreqAngleStaeckel_c(pot,delta,R,vR,vT,z,vz,phi,u0=None):
     return (jr,jz,Omegar,Omegaphi,Omegaz,Angler,
             Anglephi,Anglez,err.value)
 
+def actionAngleStaeckel_estimateDelta_c(pot,R,z):
+    """
+    NAME:
+       actionAngleStaeckel_estimateDelta_c
+    PURPOSE:
+       Use C to estimate the focal length delta of the Staeckel
+       approximation for each object, using eqn. (9) in Sanders (2012)
+    INPUT:
+       pot - Potential or list of such instances
+       R, z - coordinates (arrays)
+    OUTPUT:
+       (delta,err)
+       delta : array, shape (len(R))
+       err - non-zero if error occured
+    HISTORY:
+       2026-10-17 - Written
+    """
+    #Parse the potential
+    npot, pot_type, pot_args= _parse_pot(pot,potforactions=True)
+
+    #Set up result arrays
+    delta= numpy.empty(len(R))
+    err= ctypes.c_int(0)
+
+    #Set up the C code
+    ndarrayFlags= ('C_CONTIGUOUS','WRITEABLE')
+    actionAngleStaeckel_deltaFunc= _lib.actionAngleStaeckel_estimateDelta
+    actionAngleStaeckel_deltaFunc.argtypes= [ctypes.c_int,
+                               ndpointer(dtype=numpy.float64,flags=ndarrayFlags),
+                               ndpointer(dtype=numpy.float64,flags=ndarrayFlags),
+                               ctypes.c_int,
+                               ndpointer(dtype=numpy.int32,flags=ndarrayFlags),
+                               ndpointer(dtype=numpy.float64,flags=ndarrayFlags),
+                               ndpointer(dtype=numpy.float64,flags=ndarrayFlags),
+                               ctypes.POINTER(ctypes.c_int)]
+
+    #Array requirements, first store old order
+    f_cont= [R.flags['F_CONTIGUOUS'],
+             z.flags['F_CONTIGUOUS']]
+    R= numpy.require(R,dtype=numpy.float64,requirements=['C','W'])
+    z= numpy.require(z,dtype=numpy.float64,requirements=['C','W'])
+    delta= numpy.require(delta,dtype=numpy.float64,requirements=['C','W'])
+
+    #Run the C code
+    actionAngleStaeckel_deltaFunc(len(R),
+                                  R,
+                                  z,
+                                  ctypes.c_int(npot),
+                                  pot_type,
+                                  pot_args,
+                                  delta,
+                                  ctypes.byref(err))
+
+    #Reset input arrays
+    if f_cont[0]: R= numpy.asfortranarray(R)
+    if f_cont[1]: z= numpy.asfortranarray(z)
+
+    return (delta,err.value)
+
+def _prepare_delta_u0(delta,R,z,u0):
+    """Broadcast delta to the shape of R and compute u0 if necessary; when delta is None, both are filled in by the C code"""
+    if delta is None:
+        return (numpy.empty(len(R)),numpy.empty(len(R)),1)
+    delta= delta*numpy.ones(len(R))
+    if u0 is None:
+        u0, dummy= bovy_coords.Rz_to_uv(R,z,delta=delta)
+    return (delta,u0,0)
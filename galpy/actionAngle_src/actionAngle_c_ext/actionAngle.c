@@ -55,7 +55,9 @@ void parse_actionAngleArgs(int npot,
       potentialArgs->Rforce= &DoubleExponentialDiskPotentialRforce;
       potentialArgs->zforce= &DoubleExponentialDiskPotentialzforce;
       //Look at pot_args to figure out the number of arguments
-      potentialArgs->nargs= (int) (8 + 2 * *(pot_args+5) + 4 * ( *(pot_args+4) + 1));
+      potentialArgs->nargs= (int) (11 + 2 * *(pot_args+5) + 4 * ( *(pot_args+4) + 1 )
+				   + 2 * *(pot_args + 9 + 2 * (int) *(pot_args+5) + 4 * ( (int) *(pot_args+4) + 1 ))
+				   + 2 * *(pot_args + 10 + 2 * (int) *(pot_args+5) + 4 * ( (int) *(pot_args+4) + 1 )));
       break;
     case 12: //FlattenedPowerPotential, 4 arguments
       potentialArgs->potentialEval= &FlattenedPowerPotentialEval;
@@ -187,6 +189,25 @@ void parse_actionAngleArgs(int npot,
       potentialArgs->zforce= &DiskSCFPotentialzforce;
       potentialArgs->nargs= (int) *(pot_args) + 3;
       break;      
+    case 28: //interp3DPotential, 18 arguments + array of spline coefficients
+      potentialArgs->potentialEval= &interp3DPotentialEval;
+      potentialArgs->Rforce= &interp3DPotentialRforce;
+      potentialArgs->zforce= &interp3DPotentialzforce;
+      potentialArgs->nargs= (int) (18 + *(pot_args+4) * *(pot_args+5)
+				   * *(pot_args+6));
+      break;
+    case 29: //FerrersPotential, 22 arguments + 2 x Gauss-Legendre order
+      potentialArgs->potentialEval= &FerrersPotentialEval;
+      potentialArgs->Rforce= &FerrersPotentialRforce;
+      potentialArgs->zforce= &FerrersPotentialzforce;
+      potentialArgs->nargs= (int) (22 + 2 * *(pot_args+8));
+      break;
+    case 30: //MovingObjectPotential, 9 + 13 x number of intervals arguments
+      potentialArgs->potentialEval= &MovingObjectPotentialEval;
+      potentialArgs->Rforce= &MovingObjectPotentialRforce;
+      potentialArgs->zforce= &MovingObjectPotentialzforce;
+      potentialArgs->nargs= (int) (9 + 13 * *(pot_args+2));
+      break;
 //////////////////////////////// WRAPPERS /////////////////////////////////////
     case -1: //DehnenSmoothWrapperPotential
       potentialArgs->potentialEval= &DehnenSmoothWrapperPotentialEval;
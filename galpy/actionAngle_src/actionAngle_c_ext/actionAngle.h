@@ -17,11 +17,13 @@ extern "C" {
 #ifndef __has_attribute      // Compatibility with non-clang compilers. 
 #define __has_attribute(x) 0  
 #endif
+#ifndef UNUSED
 #if defined(__GNUC__) || __has_attribute(unused)
 #  define UNUSED __attribute__((unused))
 #else
 #  define UNUSED /*NOTHING*/
 #endif
+#endif
 /*
   Structure declarations
 */
@@ -46,7 +46,7 @@ void calcJRAdiabatic(int,double *,double *,double *,double *,double *,
 void calcJzAdiabatic(int,double *,double *,double *,double *,int,
 		     struct potentialArg *,int);
 void calcRapRperi(int,double *,double *,double *,double *,double *,
-		  int,struct potentialArg *);
+		  int,struct potentialArg *,int *);
 void calcZmax(int,double *,double *,double *,double *,int,
 	      struct potentialArg *);
 double JRAdiabaticIntegrandSquared(double,void *);
@@ -55,7 +55,9 @@ double JzAdiabaticIntegrandSquared(double,void *);
 double JzAdiabaticIntegrand(double,void *);
 double evaluateVerticalPotentials(double, double,int, struct potentialArg *);
 /*
-  Actual functions, inlines first
+  Actual functions, inlines first; actionAngleArgs holds one copy of the
+  potentials per thread, because some potentials cache intermediate results
+  in their arguments
 */
 inline void calcEREzL(int ndata,
 		      double *R,
@@ -68,16 +70,21 @@ inline void calcEREzL(int ndata,
 		      double *Lz,
 		      int nargs,
 		      struct potentialArg * actionAngleArgs){
-  int ii;
+  int ii, tid;
   UNUSED int chunk= CHUNKSIZE;
-#pragma omp parallel for schedule(static,chunk) private(ii)
+#pragma omp parallel for schedule(static,chunk) private(ii,tid)
   for (ii=0; ii < ndata; ii++){
+#ifdef _OPENMP
+    tid= omp_get_thread_num();
+#else
+    tid = 0;
+#endif
     *(ER+ii)= evaluatePotentials(*(R+ii),0.,
-				 nargs,actionAngleArgs)
+				 nargs,actionAngleArgs+tid*nargs)
       + 0.5 * *(vR+ii) * *(vR+ii)
       + 0.5 * *(vT+ii) * *(vT+ii);
     *(Ez+ii)= evaluateVerticalPotentials(*(R+ii),*(z+ii),
-					 nargs,actionAngleArgs)     
+					 nargs,actionAngleArgs+tid*nargs)     
       + 0.5 * *(vz+ii) * *(vz+ii);
     *(Lz+ii)= *(R+ii) * *(vT+ii);
   }
@@ -98,10 +105,18 @@ void actionAngleAdiabatic_actions(int ndata,
 				  double *jr,
 				  double *jz,
 				  int * err){
-  int ii;
-  //Set up the potentials
-  struct potentialArg * actionAngleArgs= (struct potentialArg *) malloc ( npot * sizeof (struct potentialArg) );
-  parse_actionAngleArgs(npot,actionAngleArgs,pot_type,pot_args,false);
+  int ii, tid, nthreads;
+#ifdef _OPENMP
+  nthreads = omp_get_max_threads();
+#else
+  nthreads = 1;
+#endif
+  *err= 0;
+  //Set up the potentials, one copy per thread
+  struct potentialArg * actionAngleArgs= (struct potentialArg *) malloc ( nthreads * npot * sizeof (struct potentialArg) );
+  for (tid=0; tid < nthreads; tid++)
+    parse_actionAngleArgs(npot,actionAngleArgs+tid*npot,pot_type,pot_args,
+			  false);
   //ER, Ez, Lz
   double *ER= (double *) malloc ( ndata * sizeof(double) );
   double *Ez= (double *) malloc ( ndata * sizeof(double) );
@@ -121,9 +136,10 @@ void actionAngleAdiabatic_actions(int ndata,
     *(ER+ii)+= 0.5 * *(Lz+ii) * *(Lz+ii) / *(R+ii) / *(R+ii) 
       - 0.5 * *(vT+ii) * *(vT+ii);
   }
-  calcRapRperi(ndata,rperi,rap,R,ER,Lz,npot,actionAngleArgs);
+  calcRapRperi(ndata,rperi,rap,R,ER,Lz,npot,actionAngleArgs,err);
   calcJRAdiabatic(ndata,jr,rperi,rap,ER,Lz,npot,actionAngleArgs,10);
-  free_potentialArgs(npot,actionAngleArgs);
+  for (tid=0; tid < nthreads; tid++)
+    free_potentialArgs(npot,actionAngleArgs+tid*npot);
   free(actionAngleArgs);
   free(ER);
   free(Ez);
@@ -151,7 +167,7 @@ void calcJRAdiabatic(int ndata,
   struct JRAdiabaticArg * params= (struct JRAdiabaticArg *) malloc ( nthreads * sizeof (struct JRAdiabaticArg) );
   for (tid=0; tid < nthreads; tid++){
     (params+tid)->nargs= nargs;
-    (params+tid)->actionAngleArgs= actionAngleArgs;
+    (params+tid)->actionAngleArgs= actionAngleArgs+tid*nargs;
   }
   //Setup integrator
   gsl_integration_glfixed_table * T= gsl_integration_glfixed_table_alloc (order);
@@ -204,7 +220,7 @@ void calcJzAdiabatic(int ndata,
   struct JzAdiabaticArg * params= (struct JzAdiabaticArg *) malloc ( nthreads * sizeof (struct JzAdiabaticArg) );
   for (tid=0; tid < nthreads; tid++){
     (params+tid)->nargs= nargs;
-    (params+tid)->actionAngleArgs= actionAngleArgs;
+    (params+tid)->actionAngleArgs= actionAngleArgs+tid*nargs;
   }
   //Setup integrator
   gsl_integration_glfixed_table * T= gsl_integration_glfixed_table_alloc (order);
@@ -246,7 +262,9 @@ void calcRapRperi(int ndata,
 		  double * ER,
 		  double * Lz,
 		  int nargs,
-		  struct potentialArg * actionAngleArgs){
+		  struct potentialArg * actionAngleArgs,
+		  int * err){
+  // *err is set to -1 when the root finder does not converge
   int ii, tid, nthreads;
 #ifdef _OPENMP
   nthreads = omp_get_max_threads();
@@ -265,14 +283,14 @@ void calcRapRperi(int ndata,
   T = gsl_root_fsolver_brent;
   for (tid=0; tid < nthreads; tid++){
     (params+tid)->nargs= nargs;
-    (params+tid)->actionAngleArgs= actionAngleArgs;
+    (params+tid)->actionAngleArgs= actionAngleArgs+tid*nargs;
     (s+tid)->s= gsl_root_fsolver_alloc (T);
   }
   UNUSED int chunk= CHUNKSIZE;
   gsl_set_error_handler_off();
 #pragma omp parallel for schedule(static,chunk)				\
   private(tid,ii,iter,status,R_lo,R_hi,meps,peps)			\
-  shared(rperi,rap,JRRoot,params,s,R,ER,Lz,max_iter)
+  shared(rperi,rap,JRRoot,params,s,R,ER,Lz,max_iter,err)
   for (ii=0; ii < ndata; ii++){
 #ifdef _OPENMP
     tid= omp_get_thread_num();
@@ -325,6 +343,10 @@ void calcRapRperi(int ndata,
 	  continue;
 	}
 	// LCOV_EXCL_STOP
+	if ( status != GSL_SUCCESS ) {
+#pragma omp atomic write
+	  *err= -1;
+	}
 	*(rperi+ii) = gsl_root_fsolver_root ((s+tid)->s);
       }
       else if ( peps > 0. && meps < 0. ){//umin
@@ -361,6 +383,10 @@ void calcRapRperi(int ndata,
 	  continue;
 	}
 	// LCOV_EXCL_STOP
+	if ( status != GSL_SUCCESS ) {
+#pragma omp atomic write
+	  *err= -1;
+	}
 	*(rap+ii) = gsl_root_fsolver_root ((s+tid)->s);
       }
     }
@@ -396,6 +422,10 @@ void calcRapRperi(int ndata,
 	  continue;
 	}
 	// LCOV_EXCL_STOP
+	if ( status != GSL_SUCCESS ) {
+#pragma omp atomic write
+	  *err= -1;
+	}
 	*(rperi+ii) = gsl_root_fsolver_root ((s+tid)->s);
       }
       //Find starting points for maximum
@@ -432,6 +462,10 @@ void calcRapRperi(int ndata,
 	continue;
       }
       // LCOV_EXCL_STOP
+      if ( status != GSL_SUCCESS ) {
+#pragma omp atomic write
+	*err= -1;
+      }
       *(rap+ii) = gsl_root_fsolver_root ((s+tid)->s);
     }
   }
@@ -466,7 +500,7 @@ void calcZmax(int ndata,
   T = gsl_root_fsolver_brent;
   for (tid=0; tid < nthreads; tid++){
     (params+tid)->nargs= nargs;
-    (params+tid)->actionAngleArgs= actionAngleArgs;
+    (params+tid)->actionAngleArgs= actionAngleArgs+tid*nargs;
     (s+tid)->s= gsl_root_fsolver_alloc (T);
   }
   UNUSED int chunk= CHUNKSIZE;
@@ -0,0 +1,412 @@
+/*
+  C code for actions, frequencies, and angles in spherical potentials
+*/
+#include <stdio.h>
+#include <stdlib.h>
+#include <stdbool.h>
+#include <math.h>
+#include <gsl/gsl_math.h>
+#include <gsl/gsl_errno.h>
+#include <gsl/gsl_roots.h>
+#include <gsl/gsl_integration.h>
+#ifdef _OPENMP
+#include <omp.h>
+#endif
+#define CHUNKSIZE 10
+//Potentials
+#include <galpy_potentials.h>
+#include <actionAngle.h>
+#ifndef M_PI
+#define M_PI 3.14159265358979323846
+#endif
+/*
+  Structure Declarations
+*/
+struct JRSphericalArg{
+  double E;
+  double L22;
+  double rturn; // rperi or rap, the turning point the integral starts at
+  int nargs;
+  struct potentialArg * actionAngleArgs;
+};
+/*
+  Function Declarations
+*/
+void actionAngleSpherical_actions(int,double *,double *,double *,double *,
+				  double *,int,int *,double *,int,double *,
+				  int *);
+void actionAngleSpherical_actionsFreqs(int,double *,double *,double *,
+				       double *,double *,int,int *,double *,
+				       int,double *,double *,double *,int *);
+void actionAngleSpherical_actionsFreqsAngles(int,double *,double *,double *,
+					     double *,double *,int,int *,
+					     double *,int,double *,double *,
+					     double *,double *,double *,int *);
+void calcActionsFreqsAnglesSpherical(int,double *,double *,double *,double *,
+				     double *,double *,double *,double *,
+				     double *,double *,double *,int,
+				     struct potentialArg *,int,int *);
+// Peri- and apocenters in the effective potential, from actionAngleAdiabatic.c
+void calcRapRperi(int,double *,double *,double *,double *,double *,
+		  int,struct potentialArg *,int *);
+double JRSphericalIntegrandSmall(double,void *);
+double JRSphericalIntegrandLarge(double,void *);
+double TrSphericalIntegrandSmall(double,void *);
+double TrSphericalIntegrandLarge(double,void *);
+double ISphericalIntegrandSmall(double,void *);
+double ISphericalIntegrandLarge(double,void *);
+/*
+  Actual functions, inlines first; actionAngleArgs holds one copy of the
+  potentials per thread, because some potentials cache intermediate results
+  in their arguments
+*/
+inline void calcErL(int ndata,
+		    double *R,
+		    double *vR,
+		    double *vT,
+		    double *z,
+		    double *vz,
+		    double *E,
+		    double *r,
+		    double *vr,
+		    double *L,
+		    int nargs,
+		    struct potentialArg * actionAngleArgs){
+  int ii, tid;
+  double Lx, Ly, Lz;
+  UNUSED int chunk= CHUNKSIZE;
+#pragma omp parallel for schedule(static,chunk) private(ii,tid,Lx,Ly,Lz)
+  for (ii=0; ii < ndata; ii++){
+#ifdef _OPENMP
+    tid= omp_get_thread_num();
+#else
+    tid = 0;
+#endif
+    *(E+ii)= evaluatePotentials(*(R+ii),*(z+ii),
+				nargs,actionAngleArgs+tid*nargs)
+      + 0.5 * *(vR+ii) * *(vR+ii)
+      + 0.5 * *(vT+ii) * *(vT+ii)
+      + 0.5 * *(vz+ii) * *(vz+ii);
+    Lz= *(R+ii) * *(vT+ii);
+    Lx= - *(z+ii) * *(vT+ii);
+    Ly= *(z+ii) * *(vR+ii) - *(R+ii) * *(vz+ii);
+    *(L+ii)= sqrt ( Lx * Lx + Ly * Ly + Lz * Lz );
+    *(r+ii)= sqrt ( *(R+ii) * *(R+ii) + *(z+ii) * *(z+ii) );
+    *(vr+ii)= ( *(R+ii) * *(vR+ii) + *(z+ii) * *(vz+ii) ) / *(r+ii);
+  }
+}
+inline double integrateSpherical(gsl_function * F,double tmax,
+				 gsl_integration_glfixed_table * T){
+  // Integrals with a zero-length range are zero (the integrands are 0/0
+  // at t=0 for circular orbits)
+  if ( tmax <= 0. ) return 0.;
+  return gsl_integration_glfixed (F,0.,tmax,T);
+}
+/*
+  MAIN FUNCTIONS
+ */
+void actionAngleSpherical_actions(int ndata,
+				  double *R,
+				  double *vR,
+				  double *vT,
+				  double *z,
+				  double *vz,
+				  int npot,
+				  int * pot_type,
+				  double * pot_args,
+				  int order,
+				  double *jr,
+				  int * err){
+  actionAngleSpherical_actionsFreqsAngles(ndata,R,vR,vT,z,vz,
+					  npot,pot_type,pot_args,order,
+					  jr,NULL,NULL,NULL,NULL,err);
+}
+void actionAngleSpherical_actionsFreqs(int ndata,
+				       double *R,
+				       double *vR,
+				       double *vT,
+				       double *z,
+				       double *vz,
+				       int npot,
+				       int * pot_type,
+				       double * pot_args,
+				       int order,
+				       double *jr,
+				       double *Omegar,
+				       double *Omegaphi,
+				       int * err){
+  actionAngleSpherical_actionsFreqsAngles(ndata,R,vR,vT,z,vz,
+					  npot,pot_type,pot_args,order,
+					  jr,Omegar,Omegaphi,NULL,NULL,err);
+}
+void actionAngleSpherical_actionsFreqsAngles(int ndata,
+					     double *R,
+					     double *vR,
+					     double *vT,
+					     double *z,
+					     double *vz,
+					     int npot,
+					     int * pot_type,
+					     double * pot_args,
+					     int order,
+					     double *jr,
+					     double *Omegar,
+					     double *Omegaphi,
+					     double *Angler,
+					     double *Anglez,
+					     int * err){
+  int tid, nthreads;
+#ifdef _OPENMP
+  nthreads = omp_get_max_threads();
+#else
+  nthreads = 1;
+#endif
+  *err= 0;
+  //Set up the potentials, one copy per thread
+  struct potentialArg * actionAngleArgs= (struct potentialArg *) malloc ( nthreads * npot * sizeof (struct potentialArg) );
+  for (tid=0; tid < nthreads; tid++)
+    parse_actionAngleArgs(npot,actionAngleArgs+tid*npot,pot_type,pot_args,
+			  false);
+  //E, r, vr, L
+  double *E= (double *) malloc ( ndata * sizeof(double) );
+  double *r= (double *) malloc ( ndata * sizeof(double) );
+  double *vr= (double *) malloc ( ndata * sizeof(double) );
+  double *L= (double *) malloc ( ndata * sizeof(double) );
+  calcErL(ndata,R,vR,vT,z,vz,E,r,vr,L,npot,actionAngleArgs);
+  //Calculate peri and apocenters
+  double *rperi= (double *) malloc ( ndata * sizeof(double) );
+  double *rap= (double *) malloc ( ndata * sizeof(double) );
+  calcRapRperi(ndata,rperi,rap,r,E,L,npot,actionAngleArgs,err);
+  calcActionsFreqsAnglesSpherical(ndata,jr,Omegar,Omegaphi,Angler,Anglez,
+				  rperi,rap,E,L,r,vr,npot,actionAngleArgs,order,
+				  err);
+  for (tid=0; tid < nthreads; tid++)
+    free_potentialArgs(npot,actionAngleArgs+tid*npot);
+  free(actionAngleArgs);
+  free(E);
+  free(r);
+  free(vr);
+  free(L);
+  free(rperi);
+  free(rap);
+}
+void calcActionsFreqsAnglesSpherical(int ndata,
+				     double * jr,
+				     double * Omegar,
+				     double * Omegaphi,
+				     double * Angler,
+				     double * Anglez,
+				     double * rperi,
+				     double * rap,
+				     double * E,
+				     double * L,
+				     double * r,
+				     double * vr,
+				     int nargs,
+				     struct potentialArg * actionAngleArgs,
+				     int order,
+				     int * err){
+  // Omegar, Omegaphi, Angler, and Anglez are only computed when not NULL;
+  // Omegaphi is the (positive) frequency of the motion in the orbital
+  // plane and Anglez is the angle in the orbital plane without the
+  // position angle psi from the ascending node, which is added in Python;
+  // *err is set to -2 when an integral does not evaluate to a finite value
+  int ii, tid, nthreads;
+#ifdef _OPENMP
+  nthreads = omp_get_max_threads();
+#else
+  nthreads = 1;
+#endif
+  double Rmean, tmean1, tmean2, Tr, I, Or, Op, FR, dFRdr, h;
+  double wr, wz, dpsi;
+  bool freqs= Omegar != NULL;
+  bool angles= Angler != NULL;
+  gsl_function * JRInt= (gsl_function *) malloc ( nthreads * sizeof(gsl_function) );
+  struct JRSphericalArg * params= (struct JRSphericalArg *) malloc ( nthreads * sizeof (struct JRSphericalArg) );
+  for (tid=0; tid < nthreads; tid++){
+    (params+tid)->nargs= nargs;
+    (params+tid)->actionAngleArgs= actionAngleArgs+tid*nargs;
+    (JRInt+tid)->params = params+tid;
+  }
+  //Setup integrator
+  gsl_integration_glfixed_table * T= gsl_integration_glfixed_table_alloc (order);
+  UNUSED int chunk= CHUNKSIZE;
+#pragma omp parallel for schedule(dynamic,chunk)			\
+  private(tid,ii,Rmean,tmean1,tmean2,Tr,I,Or,Op,FR,dFRdr,h,		\
+	  wr,wz,dpsi)					\
+  shared(jr,Omegar,Omegaphi,Angler,Anglez,rperi,rap,E,L,r,vr,	\
+	 JRInt,params,T,freqs,angles,err)
+  for (ii=0; ii < ndata; ii++){
+#ifdef _OPENMP
+    tid= omp_get_thread_num();
+#else
+    tid = 0;
+#endif
+    if ( *(rperi+ii) == -9999.99 || *(rap+ii) == -9999.99 ){
+      *(jr+ii)= 9999.99;
+      if ( freqs ) {
+	*(Omegar+ii)= NAN;
+	*(Omegaphi+ii)= NAN;
+      }
+      if ( angles ) {
+	*(Angler+ii)= NAN;
+	*(Anglez+ii)= NAN;
+      }
+      continue;
+    }
+    (params+tid)->E= *(E+ii);
+    (params+tid)->L22= 0.5 * *(L+ii) * *(L+ii);
+    // Split the integrals at the geometric mean of the turning points and
+    // substitute r = rperi + t^2 and r = rap - t^2 on either side, which
+    // removes the inverse-square-root singularities at the turning points
+    Rmean= sqrt( *(rperi+ii) * *(rap+ii) );
+    tmean1= sqrt( Rmean - *(rperi+ii) );
+    tmean2= sqrt( *(rap+ii) - Rmean );
+    (params+tid)->rturn= *(rperi+ii);
+    (JRInt+tid)->function = &JRSphericalIntegrandSmall;
+    *(jr+ii)= integrateSpherical(JRInt+tid,tmean1,T);
+    (params+tid)->rturn= *(rap+ii);
+    (JRInt+tid)->function = &JRSphericalIntegrandLarge;
+    *(jr+ii)+= integrateSpherical(JRInt+tid,tmean2,T);
+    *(jr+ii)/= M_PI;
+    if ( !isfinite(*(jr+ii)) ) {
+#pragma omp atomic write
+      *err= -2;
+    }
+    if ( !freqs ) continue;
+    if ( *(jr+ii) < 0.000000001 ){//circular
+      // epicycle and circular frequency at r
+      h= 0.0001 * *(r+ii);
+      FR= calcRforce(*(r+ii),0.,0.,0.,nargs,actionAngleArgs+tid*nargs);
+      dFRdr= ( calcRforce(*(r+ii)+h,0.,0.,0.,nargs,actionAngleArgs+tid*nargs)
+	       - calcRforce(*(r+ii)-h,0.,0.,0.,nargs,
+			    actionAngleArgs+tid*nargs) )
+	/ 2. / h;
+      Or= sqrt( - dFRdr - 3. * FR / *(r+ii) );
+      Op= sqrt( - FR / *(r+ii) );
+    }
+    else {
+      //Radial period
+      (params+tid)->rturn= *(rperi+ii);
+      (JRInt+tid)->function = &TrSphericalIntegrandSmall;
+      Tr= integrateSpherical(JRInt+tid,tmean1,T);
+      (JRInt+tid)->function = &ISphericalIntegrandSmall;
+      I= integrateSpherical(JRInt+tid,tmean1,T);
+      (params+tid)->rturn= *(rap+ii);
+      (JRInt+tid)->function = &TrSphericalIntegrandLarge;
+      Tr+= integrateSpherical(JRInt+tid,tmean2,T);
+      (JRInt+tid)->function = &ISphericalIntegrandLarge;
+      I+= integrateSpherical(JRInt+tid,tmean2,T);
+      Or= M_PI / Tr;
+      Op= I * *(L+ii) * Or / M_PI;
+    }
+    *(Omegar+ii)= Or;
+    *(Omegaphi+ii)= Op;
+    if ( !isfinite(Or) || !isfinite(Op) ) {
+#pragma omp atomic write
+      *err= -2;
+    }
+    if ( !angles ) continue;
+    //Angles, first the radial angle and the radial part of the angle in the orbital plane
+    dpsi= Op / Or * 2. * M_PI;
+    if ( *(r+ii) < Rmean ) {
+      (params+tid)->rturn= *(rperi+ii);
+      if ( *(r+ii) > *(rperi+ii) ) {
+	(JRInt+tid)->function = &TrSphericalIntegrandSmall;
+	wr= Or * integrateSpherical(JRInt+tid,sqrt(*(r+ii)-*(rperi+ii)),T);
+	(JRInt+tid)->function = &ISphericalIntegrandSmall;
+	wz= *(L+ii) * integrateSpherical(JRInt+tid,
+					 sqrt(*(r+ii)-*(rperi+ii)),T);
+      }
+      else {
+	wr= 0.;
+	wz= 0.;
+      }
+      if ( *(vr+ii) < 0. ) {
+	wr= 2. * M_PI - wr;
+	wz= dpsi - wz;
+      }
+    }
+    else {
+      (params+tid)->rturn= *(rap+ii);
+      if ( *(r+ii) < *(rap+ii) ) {
+	(JRInt+tid)->function = &TrSphericalIntegrandLarge;
+	wr= Or * integrateSpherical(JRInt+tid,sqrt(*(rap+ii)-*(r+ii)),T);
+	(JRInt+tid)->function = &ISphericalIntegrandLarge;
+	wz= *(L+ii) * integrateSpherical(JRInt+tid,
+					 sqrt(*(rap+ii)-*(r+ii)),T);
+      }
+      else {
+	wr= 0.;
+	wz= 0.;
+      }
+      if ( *(vr+ii) < 0. ) {
+	wr= M_PI + wr;
+	wz= 0.5 * dpsi + wz;
+      }
+      else {
+	wr= M_PI - wr;
+	wz= 0.5 * dpsi - wz;
+      }
+    }
+    *(Angler+ii)= wr;
+    *(Anglez+ii)= - wz + Op / Or * wr;
+    if ( !isfinite(wr) || !isfinite(wz) ) {
+#pragma omp atomic write
+      *err= -2;
+    }
+  }
+  free(JRInt);
+  free(params);
+  gsl_integration_glfixed_table_free ( T );
+}
+double JRSphericalIntegrandSmall(double t,
+				 void * p){
+  struct JRSphericalArg * params= (struct JRSphericalArg *) p;
+  double rad= params->rturn + t * t;
+  double rad2= 2. * ( params->E
+		      - evaluatePotentials(rad,0.,params->nargs,
+					   params->actionAngleArgs) )
+    - 2. * params->L22 / rad / rad;
+  return ( rad2 > 0. ) ? 2. * t * sqrt( rad2 ): 0.;
+}
+double JRSphericalIntegrandLarge(double t,
+				 void * p){
+  struct JRSphericalArg * params= (struct JRSphericalArg *) p;
+  double rad= params->rturn - t * t;
+  double rad2= 2. * ( params->E
+		      - evaluatePotentials(rad,0.,params->nargs,
+					   params->actionAngleArgs) )
+    - 2. * params->L22 / rad / rad;
+  return ( rad2 > 0. ) ? 2. * t * sqrt( rad2 ): 0.;
+}
+double TrSphericalIntegrandSmall(double t,
+				 void * p){
+  struct JRSphericalArg * params= (struct JRSphericalArg *) p;
+  double rad= params->rturn + t * t;
+  return 2. * t / sqrt( 2. * ( params->E
+			       - evaluatePotentials(rad,0.,params->nargs,
+						    params->actionAngleArgs) )
+			- 2. * params->L22 / rad / rad );
+}
+double TrSphericalIntegrandLarge(double t,
+				 void * p){
+  struct JRSphericalArg * params= (struct JRSphericalArg *) p;
+  double rad= params->rturn - t * t;
+  return 2. * t / sqrt( 2. * ( params->E
+			       - evaluatePotentials(rad,0.,params->nargs,
+						    params->actionAngleArgs) )
+			- 2. * params->L22 / rad / rad );
+}
+double ISphericalIntegrandSmall(double t,
+				void * p){
+  struct JRSphericalArg * params= (struct JRSphericalArg *) p;
+  double rad= params->rturn + t * t;
+  return TrSphericalIntegrandSmall(t,p) / rad / rad;
+}
+double ISphericalIntegrandLarge(double t,
+				void * p){
+  struct JRSphericalArg * params= (struct JRSphericalArg *) p;
+  double rad= params->rturn - t * t;
+  return TrSphericalIntegrandLarge(t,p) / rad / rad;
+}
@@ -86,25 +86,29 @@ struct u0EqArg{
 /*
   Function Declarations
 */
-void calcu0(int,double *,double *,int,int *,double *,double,double *,int *);
+void calcu0(int,double *,double *,int,int *,double *,double *,double *,int *);
+void actionAngleStaeckel_estimateDelta(int,double *,double *,int,int *,
+				       double *,double *,int *);
 void actionAngleStaeckel_actions(int,double *,double *,double *,double *,
-				 double *,double *,int,int *,double *,double,
-				 double *,double *,int *);
+				 double *,double *,int,int *,double *,double *,
+				 int,double *,double *,int *);
 void actionAngleStaeckel_actionsFreqsAngles(int,double *,double *,double *,
 					    double *,double *,double *,
 					    int,int *,double *,
-					    double,double *,double *,double *,
+					    double *,int,double *,double *,
 					    double *,double *,double *,
-					    double *,double *,int *);
+					    double *,double *,double *,int *);
 void actionAngleStaeckel_actionsFreqs(int,double *,double *,double *,double *,
 				      double *,double *,int,int *,double *,
-				      double,double *,double *,double *,
-				      double *,double *,int *);
+				      double *,int,double *,double *,
+				      double *,double *,double *,int *);
+void calcDeltaStaeckel(int,double *,double *,double *,int,
+		       struct potentialArg *);
 void calcAnglesStaeckel(int,double *,double *,double *,double *,double *,
 			double *,double *,double *,double *,double *,double *,
 			double *,double *,double *,double *,double *,double *,
 			double *,double *,double *,double *,double *,double *,
-			double *,double,double *,double *,double *,double *,
+			double *,double *,double *,double *,double *,double *,
 			double *,double *,double *,double *,double *,int,
 			struct potentialArg *,int);
 void calcFreqsFromDerivsStaeckel(int,double *,double *,double *,
@@ -113,23 +117,23 @@ void calcFreqsFromDerivsStaeckel(int,double *,double *,double *,
 void calcdI3dJFromDerivsStaeckel(int,double *,double *,double *,double *,
 				 double *,double *,double *,double *);
 void calcJRStaeckel(int,double *,double *,double *,double *,double *,double *,
-		    double,double *,double *,double *,double *,double *,int,
+		    double *,double *,double *,double *,double *,double *,int,
 		    struct potentialArg *,int);
-void calcJzStaeckel(int,double *,double *,double *,double *,double *,double,
+void calcJzStaeckel(int,double *,double *,double *,double *,double *,double *,
 		    double *,double *,double *,double *,int,
 		    struct potentialArg *,int);
 void calcdJRStaeckel(int,double *,double *,double *,double *,double *,
 		    double *,double *,double *,
-		    double,double *,double *,double *,double *,double *,int,
+		    double *,double *,double *,double *,double *,double *,int,
 		    struct potentialArg *,int);
 void calcdJzStaeckel(int,double *,double *,double *,double *,double *,
-		     double *,double *,double,double *,double *,double *,
+		     double *,double *,double *,double *,double *,double *,
 		     double *,int,
 		     struct potentialArg *,int);
 void calcUminUmax(int,double *,double *,double *,double *,double *,double *,
-		  double *,double,double *,double *,double *,double *,double *,
+		  double *,double *,double *,double *,double *,double *,double *,
 		  int,struct potentialArg *);
-void calcVmin(int,double *,double *,double *,double *,double *,double *,double,
+void calcVmin(int,double *,double *,double *,double *,double *,double *,double *,
 	      double *,double *,double *,double *,int,struct potentialArg *);
 double JRStaeckelIntegrandSquared(double,void *);
 double JRStaeckelIntegrand(double,void *);
@@ -168,14 +172,14 @@ inline void Rz_to_uv_vec(int ndata,
 			 double *z,
 			 double *u,
 			 double *v,
-			 double delta){
+			 double *delta){
   int ii;
   double d12, d22, coshu, cosv;
   for (ii=0; ii < ndata; ii++) {
-    d12= (*(z+ii)+delta)*(*(z+ii)+delta)+(*(R+ii))*(*(R+ii));
-    d22= (*(z+ii)-delta)*(*(z+ii)-delta)+(*(R+ii))*(*(R+ii));
-    coshu= 0.5/delta*(sqrt(d12)+sqrt(d22));
-    cosv=  0.5/delta*(sqrt(d12)-sqrt(d22));
+    d12= (*(z+ii)+*(delta+ii))*(*(z+ii)+*(delta+ii))+(*(R+ii))*(*(R+ii));
+    d22= (*(z+ii)-*(delta+ii))*(*(z+ii)-*(delta+ii))+(*(R+ii))*(*(R+ii));
+    coshu= 0.5/ *(delta+ii)*(sqrt(d12)+sqrt(d22));
+    cosv=  0.5/ *(delta+ii)*(sqrt(d12)-sqrt(d22));
     *u++= acosh(coshu);
     *v++= acos(cosv);
   }
@@ -211,7 +215,7 @@ void calcu0(int ndata,
 	    int npot,
 	    int * pot_type,
 	    double * pot_args,
-	    double delta,
+	    double * delta,
 	    double *u0,
 	    int * err){
   int ii;
@@ -221,7 +225,6 @@ void calcu0(int ndata,
   //setup the function to be minimized
   gsl_function u0Eq;
   struct u0EqArg * params= (struct u0EqArg *) malloc ( sizeof (struct u0EqArg) );
-  params->delta= delta;
   params->nargs= npot;
   params->actionAngleArgs= actionAngleArgs;
   //Setup solver
@@ -236,7 +239,8 @@ void calcu0(int ndata,
   for (ii=0; ii < ndata; ii++){
     //Setup function
     params->E= *(E+ii);
-    params->Lz22delta= 0.5 * *(Lz+ii) * *(Lz+ii) / delta / delta;
+    params->Lz22delta= 0.5 * *(Lz+ii) * *(Lz+ii) / *(delta+ii) / *(delta+ii);
+    params->delta= *(delta+ii);
     u0Eq.params = params;
     //Find starting points for minimum
     u_guess= 1.;
@@ -271,6 +275,59 @@ void calcu0(int ndata,
   free(actionAngleArgs);
   *err= status;
 }
+void actionAngleStaeckel_estimateDelta(int ndata,
+				       double *R,
+				       double *z,
+				       int npot,
+				       int * pot_type,
+				       double * pot_args,
+				       double *delta,
+				       int * err){
+  //Set up the potentials
+  struct potentialArg * actionAngleArgs= (struct potentialArg *) malloc ( npot * sizeof (struct potentialArg) );
+  parse_actionAngleArgs(npot,actionAngleArgs,pot_type,pot_args,false);
+  calcDeltaStaeckel(ndata,delta,R,z,npot,actionAngleArgs);
+  free_potentialArgs(npot,actionAngleArgs);
+  free(actionAngleArgs);
+  *err= 0;
+}
+void calcDeltaStaeckel(int ndata,
+		       double * delta,
+		       double * R,
+		       double * z,
+		       int nargs,
+		       struct potentialArg * actionAngleArgs){
+  // Estimate delta using eqn. (9) in Sanders (2012), with the second
+  // derivatives of the potential from finite differences of the forces
+  int ii;
+  double h, zz, FR, Fz, R2deriv, z2deriv, Rzderiv, delta2;
+  UNUSED int chunk= CHUNKSIZE;
+#pragma omp parallel for schedule(static,chunk)				\
+  private(ii,h,zz,FR,Fz,R2deriv,z2deriv,Rzderiv,delta2)
+  for (ii=0; ii < ndata; ii++){
+    h= 0.0001 * sqrt( *(R+ii) * *(R+ii) + *(z+ii) * *(z+ii) );
+    // The estimate is even in z and 0/0 in the plane, so evaluate it
+    // slightly above the plane there
+    zz= fabs( *(z+ii) );
+    if ( zz < 10. * h ) zz= 10. * h;
+    FR= calcRforce(*(R+ii),zz,0.,0.,nargs,actionAngleArgs);
+    Fz= calczforce(*(R+ii),zz,0.,0.,nargs,actionAngleArgs);
+    R2deriv= - ( calcRforce(*(R+ii)+h,zz,0.,0.,nargs,actionAngleArgs)
+		 - calcRforce(*(R+ii)-h,zz,0.,0.,nargs,actionAngleArgs) )
+      / 2. / h;
+    z2deriv= - ( calczforce(*(R+ii),zz+h,0.,0.,nargs,actionAngleArgs)
+		 - calczforce(*(R+ii),zz-h,0.,0.,nargs,actionAngleArgs) )
+      / 2. / h;
+    Rzderiv= - ( calcRforce(*(R+ii),zz+h,0.,0.,nargs,actionAngleArgs)
+		 - calcRforce(*(R+ii),zz-h,0.,0.,nargs,actionAngleArgs) )
+      / 2. / h;
+    delta2= zz * zz - *(R+ii) * *(R+ii) //eqn. (9) has a sign error
+      + ( 3. * *(R+ii) * Fz - 3. * zz * FR
+	  + *(R+ii) * zz * ( R2deriv - z2deriv ) ) / Rzderiv;
+    // Close-to-spherical potentials have delta2 ~ 0, use a small delta
+    *(delta+ii)= ( delta2 > 0.000000000001 ) ? sqrt(delta2) : 0.000001;
+  }
+}
 void actionAngleStaeckel_actions(int ndata,
 				 double *R,
 				 double *vR,
@@ -281,7 +338,8 @@ void actionAngleStaeckel_actions(int ndata,
 				 int npot,
 				 int * pot_type,
 				 double * pot_args,
-				 double delta,
+				 double * delta,
+				 int estimate_delta,
 				 double *jr,
 				 double *jz,
 				 int * err){
@@ -289,6 +347,9 @@ void actionAngleStaeckel_actions(int ndata,
   //Set up the potentials
   struct potentialArg * actionAngleArgs= (struct potentialArg *) malloc ( npot * sizeof (struct potentialArg) );
   parse_actionAngleArgs(npot,actionAngleArgs,pot_type,pot_args,false);
+  //Estimate the focal length for each object if requested
+  if ( estimate_delta )
+    calcDeltaStaeckel(ndata,delta,R,z,npot,actionAngleArgs);
   //E,Lz
   double *E= (double *) malloc ( ndata * sizeof(double) );
   double *Lz= (double *) malloc ( ndata * sizeof(double) );
@@ -297,6 +358,8 @@ void actionAngleStaeckel_actions(int ndata,
   double *ux= (double *) malloc ( ndata * sizeof(double) );
   double *vx= (double *) malloc ( ndata * sizeof(double) );
   Rz_to_uv_vec(ndata,R,z,ux,vx,delta);
+  if ( estimate_delta ) // u0 is only known now
+    for (ii=0; ii < ndata; ii++) *(u0+ii)= *(ux+ii);
   double *coshux= (double *) malloc ( ndata * sizeof(double) );
   double *sinhux= (double *) malloc ( ndata * sizeof(double) );
   double *sinvx= (double *) malloc ( ndata * sizeof(double) );
@@ -318,31 +381,31 @@ void actionAngleStaeckel_actions(int ndata,
     *(sinhux+ii)= sinh(*(ux+ii));
     *(cosvx+ii)= cos(*(vx+ii));
     *(sinvx+ii)= sin(*(vx+ii));
-    *(pux+ii)= delta * (*(vR+ii) * *(coshux+ii) * *(sinvx+ii) 
+    *(pux+ii)= *(delta+ii) * (*(vR+ii) * *(coshux+ii) * *(sinvx+ii) 
 			+ *(vz+ii) * *(sinhux+ii) * *(cosvx+ii));
-    *(pvx+ii)= delta * (*(vR+ii) * *(sinhux+ii) * *(cosvx+ii) 
+    *(pvx+ii)= *(delta+ii) * (*(vR+ii) * *(sinhux+ii) * *(cosvx+ii) 
 			- *(vz+ii) * *(coshux+ii) * *(sinvx+ii));
     *(sinh2u0+ii)= sinh(*(u0+ii)) * sinh(*(u0+ii));
     *(cosh2u0+ii)= cosh(*(u0+ii)) * cosh(*(u0+ii));
     *(v0+ii)= 0.5 * M_PI; //*(vx+ii);
     *(sin2v0+ii)= sin(*(v0+ii)) * sin(*(v0+ii));
-    *(potu0v0+ii)= evaluatePotentialsUV(*(u0+ii),*(v0+ii),delta,
+    *(potu0v0+ii)= evaluatePotentialsUV(*(u0+ii),*(v0+ii),*(delta+ii),
 					npot,actionAngleArgs);
     *(I3U+ii)= *(E+ii) * *(sinhux+ii) * *(sinhux+ii)
-      - 0.5 * *(pux+ii) * *(pux+ii) / delta / delta
-      - 0.5 * *(Lz+ii) * *(Lz+ii) / delta / delta / *(sinhux+ii) / *(sinhux+ii) 
+      - 0.5 * *(pux+ii) * *(pux+ii) / *(delta+ii) / *(delta+ii)
+      - 0.5 * *(Lz+ii) * *(Lz+ii) / *(delta+ii) / *(delta+ii) / *(sinhux+ii) / *(sinhux+ii) 
       - ( *(sinhux+ii) * *(sinhux+ii) + *(sin2v0+ii))
-      *evaluatePotentialsUV(*(ux+ii),*(v0+ii),delta,
+      *evaluatePotentialsUV(*(ux+ii),*(v0+ii),*(delta+ii),
 			    npot,actionAngleArgs)
       + ( *(sinh2u0+ii) + *(sin2v0+ii) )* *(potu0v0+ii);
-    *(potupi2+ii)= evaluatePotentialsUV(*(u0+ii),0.5 * M_PI,delta,
+    *(potupi2+ii)= evaluatePotentialsUV(*(u0+ii),0.5 * M_PI,*(delta+ii),
 					npot,actionAngleArgs);
     *(I3V+ii)= - *(E+ii) * *(sinvx+ii) * *(sinvx+ii)
-      + 0.5 * *(pvx+ii) * *(pvx+ii) / delta / delta
-      + 0.5 * *(Lz+ii) * *(Lz+ii) / delta / delta / *(sinvx+ii) / *(sinvx+ii)
+      + 0.5 * *(pvx+ii) * *(pvx+ii) / *(delta+ii) / *(delta+ii)
+      + 0.5 * *(Lz+ii) * *(Lz+ii) / *(delta+ii) / *(delta+ii) / *(sinvx+ii) / *(sinvx+ii)
       - *(cosh2u0+ii) * *(potupi2+ii)
       + ( *(sinh2u0+ii) + *(sinvx+ii) * *(sinvx+ii))
-      * evaluatePotentialsUV(*(u0+ii),*(vx+ii),delta,
+      * evaluatePotentialsUV(*(u0+ii),*(vx+ii),*(delta+ii),
 			     npot,actionAngleArgs);
   }
   //Calculate 'peri' and 'apo'centers
@@ -390,7 +453,7 @@ void calcJRStaeckel(int ndata,
 		    double * E,
 		    double * Lz,
 		    double * I3U,
-		    double delta,
+		    double * delta,
 		    double * u0,
 		    double * sinh2u0,
 		    double * v0,
@@ -408,7 +471,6 @@ void calcJRStaeckel(int ndata,
   gsl_function * JRInt= (gsl_function *) malloc ( nthreads * sizeof(gsl_function) );
   struct JRStaeckelArg * params= (struct JRStaeckelArg *) malloc ( nthreads * sizeof (struct JRStaeckelArg) );
   for (tid=0; tid < nthreads; tid++){
-    (params+tid)->delta= delta;
     (params+tid)->nargs= nargs;
     (params+tid)->actionAngleArgs= actionAngleArgs;
   }
@@ -434,7 +496,8 @@ void calcJRStaeckel(int ndata,
     }
     //Setup function
     (params+tid)->E= *(E+ii);
-    (params+tid)->Lz22delta= 0.5 * *(Lz+ii) * *(Lz+ii) / delta / delta;
+    (params+tid)->Lz22delta= 0.5 * *(Lz+ii) * *(Lz+ii) / *(delta+ii) / *(delta+ii);
+    (params+tid)->delta= *(delta+ii);
     (params+tid)->I3U= *(I3U+ii);
     (params+tid)->u0= *(u0+ii);
     (params+tid)->sinh2u0= *(sinh2u0+ii);
@@ -445,7 +508,7 @@ void calcJRStaeckel(int ndata,
     (JRInt+tid)->params = params+tid;
     //Integrate
     *(jr+ii)= gsl_integration_glfixed (JRInt+tid,*(umin+ii),*(umax+ii),T)
-      * sqrt(2.) * delta / M_PI;
+      * sqrt(2.) * *(delta+ii) / M_PI;
   }
   free(JRInt);
   free(params);
@@ -457,7 +520,7 @@ void calcJzStaeckel(int ndata,
 		    double * E,
 		    double * Lz,
 		    double * I3V,
-		    double delta,
+		    double * delta,
 		    double * u0,
 		    double * cosh2u0,
 		    double * sinh2u0,
@@ -474,7 +537,6 @@ void calcJzStaeckel(int ndata,
   gsl_function * JzInt= (gsl_function *) malloc ( nthreads * sizeof(gsl_function) );
   struct JzStaeckelArg * params= (struct JzStaeckelArg *) malloc ( nthreads * sizeof (struct JzStaeckelArg) );
   for (tid=0; tid < nthreads; tid++){
-    (params+tid)->delta= delta;
     (params+tid)->nargs= nargs;
     (params+tid)->actionAngleArgs= actionAngleArgs;
   }
@@ -500,7 +562,8 @@ void calcJzStaeckel(int ndata,
     }
     //Setup function
     (params+tid)->E= *(E+ii);
-    (params+tid)->Lz22delta= 0.5 * *(Lz+ii) * *(Lz+ii) / delta / delta;
+    (params+tid)->Lz22delta= 0.5 * *(Lz+ii) * *(Lz+ii) / *(delta+ii) / *(delta+ii);
+    (params+tid)->delta= *(delta+ii);
     (params+tid)->I3V= *(I3V+ii);
     (params+tid)->u0= *(u0+ii);
     (params+tid)->cosh2u0= *(cosh2u0+ii);
@@ -510,7 +573,7 @@ void calcJzStaeckel(int ndata,
     (JzInt+tid)->params = params+tid;
     //Integrate
     *(jz+ii)= gsl_integration_glfixed (JzInt+tid,*(vmin+ii),M_PI/2.,T)
-      * 2 * sqrt(2.) * delta / M_PI;
+      * 2 * sqrt(2.) * *(delta+ii) / M_PI;
   }
   free(JzInt);
   free(params);
@@ -526,7 +589,8 @@ void actionAngleStaeckel_actionsFreqs(int ndata,
 				      int npot,
 				      int * pot_type,
 				      double * pot_args,
-				      double delta,
+				      double * delta,
+				      int estimate_delta,
 				      double *jr,
 				      double *jz,
 				      double *Omegar,
@@ -537,6 +601,9 @@ void actionAngleStaeckel_actionsFreqs(int ndata,
   //Set up the potentials
   struct potentialArg * actionAngleArgs= (struct potentialArg *) malloc ( npot * sizeof (struct potentialArg) );
   parse_actionAngleArgs(npot,actionAngleArgs,pot_type,pot_args,false);
+  //Estimate the focal length for each object if requested
+  if ( estimate_delta )
+    calcDeltaStaeckel(ndata,delta,R,z,npot,actionAngleArgs);
   //E,Lz
   double *E= (double *) malloc ( ndata * sizeof(double) );
   double *Lz= (double *) malloc ( ndata * sizeof(double) );
@@ -545,6 +612,8 @@ void actionAngleStaeckel_actionsFreqs(int ndata,
   double *ux= (double *) malloc ( ndata * sizeof(double) );
   double *vx= (double *) malloc ( ndata * sizeof(double) );
   Rz_to_uv_vec(ndata,R,z,ux,vx,delta);
+  if ( estimate_delta ) // u0 is only known now
+    for (ii=0; ii < ndata; ii++) *(u0+ii)= *(ux+ii);
   double *coshux= (double *) malloc ( ndata * sizeof(double) );
   double *sinhux= (double *) malloc ( ndata * sizeof(double) );
   double *sinvx= (double *) malloc ( ndata * sizeof(double) );
@@ -566,31 +635,31 @@ void actionAngleStaeckel_actionsFreqs(int ndata,
     *(sinhux+ii)= sinh(*(ux+ii));
     *(cosvx+ii)= cos(*(vx+ii));
     *(sinvx+ii)= sin(*(vx+ii));
-    *(pux+ii)= delta * (*(vR+ii) * *(coshux+ii) * *(sinvx+ii) 
+    *(pux+ii)= *(delta+ii) * (*(vR+ii) * *(coshux+ii) * *(sinvx+ii) 
 			+ *(vz+ii) * *(sinhux+ii) * *(cosvx+ii));
-    *(pvx+ii)= delta * (*(vR+ii) * *(sinhux+ii) * *(cosvx+ii) 
+    *(pvx+ii)= *(delta+ii) * (*(vR+ii) * *(sinhux+ii) * *(cosvx+ii) 
 			- *(vz+ii) * *(coshux+ii) * *(sinvx+ii));
     *(sinh2u0+ii)= sinh(*(u0+ii)) * sinh(*(u0+ii));
     *(cosh2u0+ii)= cosh(*(u0+ii)) * cosh(*(u0+ii));
     *(v0+ii)= 0.5 * M_PI; //*(vx+ii);
     *(sin2v0+ii)= sin(*(v0+ii)) * sin(*(v0+ii));
-    *(potu0v0+ii)= evaluatePotentialsUV(*(u0+ii),*(v0+ii),delta,
+    *(potu0v0+ii)= evaluatePotentialsUV(*(u0+ii),*(v0+ii),*(delta+ii),
 					npot,actionAngleArgs);
     *(I3U+ii)= *(E+ii) * *(sinhux+ii) * *(sinhux+ii)
-      - 0.5 * *(pux+ii) * *(pux+ii) / delta / delta
-      - 0.5 * *(Lz+ii) * *(Lz+ii) / delta / delta / *(sinhux+ii) / *(sinhux+ii) 
+      - 0.5 * *(pux+ii) * *(pux+ii) / *(delta+ii) / *(delta+ii)
+      - 0.5 * *(Lz+ii) * *(Lz+ii) / *(delta+ii) / *(delta+ii) / *(sinhux+ii) / *(sinhux+ii) 
       - ( *(sinhux+ii) * *(sinhux+ii) + *(sin2v0+ii))
-      *evaluatePotentialsUV(*(ux+ii),*(v0+ii),delta,
+      *evaluatePotentialsUV(*(ux+ii),*(v0+ii),*(delta+ii),
 			    npot,actionAngleArgs)
       + ( *(sinh2u0+ii) + *(sin2v0+ii) )* *(potu0v0+ii);
-    *(potupi2+ii)= evaluatePotentialsUV(*(u0+ii),0.5 * M_PI,delta,
+    *(potupi2+ii)= evaluatePotentialsUV(*(u0+ii),0.5 * M_PI,*(delta+ii),
 					npot,actionAngleArgs);
     *(I3V+ii)= - *(E+ii) * *(sinvx+ii) * *(sinvx+ii)
-      + 0.5 * *(pvx+ii) * *(pvx+ii) / delta / delta
-      + 0.5 * *(Lz+ii) * *(Lz+ii) / delta / delta / *(sinvx+ii) / *(sinvx+ii)
+      + 0.5 * *(pvx+ii) * *(pvx+ii) / *(delta+ii) / *(delta+ii)
+      + 0.5 * *(Lz+ii) * *(Lz+ii) / *(delta+ii) / *(delta+ii) / *(sinvx+ii) / *(sinvx+ii)
       - *(cosh2u0+ii) * *(potupi2+ii)
       + ( *(sinh2u0+ii) + *(sinvx+ii) * *(sinvx+ii))
-      * evaluatePotentialsUV(*(u0+ii),*(vx+ii),delta,
+      * evaluatePotentialsUV(*(u0+ii),*(vx+ii),*(delta+ii),
 			     npot,actionAngleArgs);
   }
   //Calculate 'peri' and 'apo'centers
@@ -665,7 +734,8 @@ void actionAngleStaeckel_actionsFreqsAngles(int ndata,
 					    int npot,
 					    int * pot_type,
 					    double * pot_args,
-					    double delta,
+					    double * delta,
+					    int estimate_delta,
 					    double *jr,
 					    double *jz,
 					    double *Omegar,
@@ -679,6 +749,9 @@ void actionAngleStaeckel_actionsFreqsAngles(int ndata,
   //Set up the potentials
   struct potentialArg * actionAngleArgs= (struct potentialArg *) malloc ( npot * sizeof (struct potentialArg) );
   parse_actionAngleArgs(npot,actionAngleArgs,pot_type,pot_args,false);
+  //Estimate the focal length for each object if requested
+  if ( estimate_delta )
+    calcDeltaStaeckel(ndata,delta,R,z,npot,actionAngleArgs);
   //E,Lz
   double *E= (double *) malloc ( ndata * sizeof(double) );
   double *Lz= (double *) malloc ( ndata * sizeof(double) );
@@ -687,6 +760,8 @@ void actionAngleStaeckel_actionsFreqsAngles(int ndata,
   double *ux= (double *) malloc ( ndata * sizeof(double) );
   double *vx= (double *) malloc ( ndata * sizeof(double) );
   Rz_to_uv_vec(ndata,R,z,ux,vx,delta);
+  if ( estimate_delta ) // u0 is only known now
+    for (ii=0; ii < ndata; ii++) *(u0+ii)= *(ux+ii);
   double *coshux= (double *) malloc ( ndata * sizeof(double) );
   double *sinhux= (double *) malloc ( ndata * sizeof(double) );
   double *sinvx= (double *) malloc ( ndata * sizeof(double) );
@@ -708,31 +783,31 @@ void actionAngleStaeckel_actionsFreqsAngles(int ndata,
     *(sinhux+ii)= sinh(*(ux+ii));
     *(cosvx+ii)= cos(*(vx+ii));
     *(sinvx+ii)= sin(*(vx+ii));
-    *(pux+ii)= delta * (*(vR+ii) * *(coshux+ii) * *(sinvx+ii) 
+    *(pux+ii)= *(delta+ii) * (*(vR+ii) * *(coshux+ii) * *(sinvx+ii) 
 			+ *(vz+ii) * *(sinhux+ii) * *(cosvx+ii));
-    *(pvx+ii)= delta * (*(vR+ii) * *(sinhux+ii) * *(cosvx+ii) 
+    *(pvx+ii)= *(delta+ii) * (*(vR+ii) * *(sinhux+ii) * *(cosvx+ii) 
 			- *(vz+ii) * *(coshux+ii) * *(sinvx+ii));
     *(sinh2u0+ii)= sinh(*(u0+ii)) * sinh(*(u0+ii));
     *(cosh2u0+ii)= cosh(*(u0+ii)) * cosh(*(u0+ii));
     *(v0+ii)= 0.5 * M_PI; //*(vx+ii);
     *(sin2v0+ii)= sin(*(v0+ii)) * sin(*(v0+ii));
-    *(potu0v0+ii)= evaluatePotentialsUV(*(u0+ii),*(v0+ii),delta,
+    *(potu0v0+ii)= evaluatePotentialsUV(*(u0+ii),*(v0+ii),*(delta+ii),
 					npot,actionAngleArgs);
     *(I3U+ii)= *(E+ii) * *(sinhux+ii) * *(sinhux+ii)
-      - 0.5 * *(pux+ii) * *(pux+ii) / delta / delta
-      - 0.5 * *(Lz+ii) * *(Lz+ii) / delta / delta / *(sinhux+ii) / *(sinhux+ii) 
+      - 0.5 * *(pux+ii) * *(pux+ii) / *(delta+ii) / *(delta+ii)
+      - 0.5 * *(Lz+ii) * *(Lz+ii) / *(delta+ii) / *(delta+ii) / *(sinhux+ii) / *(sinhux+ii) 
       - ( *(sinhux+ii) * *(sinhux+ii) + *(sin2v0+ii))
-      *evaluatePotentialsUV(*(ux+ii),*(v0+ii),delta,
+      *evaluatePotentialsUV(*(ux+ii),*(v0+ii),*(delta+ii),
 			    npot,actionAngleArgs)
       + ( *(sinh2u0+ii) + *(sin2v0+ii) )* *(potu0v0+ii);
-    *(potupi2+ii)= evaluatePotentialsUV(*(u0+ii),0.5 * M_PI,delta,
+    *(potupi2+ii)= evaluatePotentialsUV(*(u0+ii),0.5 * M_PI,*(delta+ii),
 					npot,actionAngleArgs);
     *(I3V+ii)= - *(E+ii) * *(sinvx+ii) * *(sinvx+ii)
-      + 0.5 * *(pvx+ii) * *(pvx+ii) / delta / delta
-      + 0.5 * *(Lz+ii) * *(Lz+ii) / delta / delta / *(sinvx+ii) / *(sinvx+ii)
+      + 0.5 * *(pvx+ii) * *(pvx+ii) / *(delta+ii) / *(delta+ii)
+      + 0.5 * *(Lz+ii) * *(Lz+ii) / *(delta+ii) / *(delta+ii) / *(sinvx+ii) / *(sinvx+ii)
       - *(cosh2u0+ii) * *(potupi2+ii)
       + ( *(sinh2u0+ii) + *(sinvx+ii) * *(sinvx+ii))
-      * evaluatePotentialsUV(*(u0+ii),*(vx+ii),delta,
+      * evaluatePotentialsUV(*(u0+ii),*(vx+ii),*(delta+ii),
 			     npot,actionAngleArgs);
   }
   //Calculate 'peri' and 'apo'centers
@@ -873,7 +948,7 @@ void calcdJRStaeckel(int ndata,
 		     double * E,
 		     double * Lz,
 		     double * I3U,
-		     double delta,
+		     double * delta,
 		     double * u0,
 		     double * sinh2u0,
 		     double * v0,
@@ -892,7 +967,6 @@ void calcdJRStaeckel(int ndata,
   gsl_function * dJRInt= (gsl_function *) malloc ( nthreads * sizeof(gsl_function) );
   struct dJRStaeckelArg * params= (struct dJRStaeckelArg *) malloc ( nthreads * sizeof (struct dJRStaeckelArg) );
   for (tid=0; tid < nthreads; tid++){
-    (params+tid)->delta= delta;
     (params+tid)->nargs= nargs;
     (params+tid)->actionAngleArgs= actionAngleArgs;
   }
@@ -922,7 +996,8 @@ void calcdJRStaeckel(int ndata,
     }
     //Setup function
     (params+tid)->E= *(E+ii);
-    (params+tid)->Lz22delta= 0.5 * *(Lz+ii) * *(Lz+ii) / delta / delta;
+    (params+tid)->Lz22delta= 0.5 * *(Lz+ii) * *(Lz+ii) / *(delta+ii) / *(delta+ii);
+    (params+tid)->delta= *(delta+ii);
     (params+tid)->I3U= *(I3U+ii);
     (params+tid)->u0= *(u0+ii);
     (params+tid)->sinh2u0= *(sinh2u0+ii);
@@ -938,19 +1013,19 @@ void calcdJRStaeckel(int ndata,
     *(djrdE+ii)= gsl_integration_glfixed (dJRInt+tid,0.,mid,T);
     (dJRInt+tid)->function = &dJRdEHighStaeckelIntegrand;
     *(djrdE+ii)+= gsl_integration_glfixed (dJRInt+tid,0.,mid,T);
-    *(djrdE+ii)*= delta / M_PI / sqrt(2.);
+    *(djrdE+ii)*= *(delta+ii) / M_PI / sqrt(2.);
     //then calculate djrdLz
     (dJRInt+tid)->function = &dJRdLzLowStaeckelIntegrand;
     *(djrdLz+ii)= gsl_integration_glfixed (dJRInt+tid,0.,mid,T);
     (dJRInt+tid)->function = &dJRdLzHighStaeckelIntegrand;
     *(djrdLz+ii)+= gsl_integration_glfixed (dJRInt+tid,0.,mid,T);
-    *(djrdLz+ii)*= - *(Lz+ii) / M_PI / sqrt(2.) / delta;
+    *(djrdLz+ii)*= - *(Lz+ii) / M_PI / sqrt(2.) / *(delta+ii);
     //then calculate djrdI3
     (dJRInt+tid)->function = &dJRdI3LowStaeckelIntegrand;
     *(djrdI3+ii)= gsl_integration_glfixed (dJRInt+tid,0.,mid,T);
     (dJRInt+tid)->function = &dJRdI3HighStaeckelIntegrand;
     *(djrdI3+ii)+= gsl_integration_glfixed (dJRInt+tid,0.,mid,T);
-    *(djrdI3+ii)*= -delta / M_PI / sqrt(2.);
+    *(djrdI3+ii)*= -*(delta+ii) / M_PI / sqrt(2.);
   }
   free(dJRInt);
   free(params);
@@ -964,7 +1039,7 @@ void calcdJzStaeckel(int ndata,
 		     double * E,
 		     double * Lz,
 		     double * I3V,
-		     double delta,
+		     double * delta,
 		     double * u0,
 		     double * cosh2u0,
 		     double * sinh2u0,
@@ -982,7 +1057,6 @@ void calcdJzStaeckel(int ndata,
   gsl_function * dJzInt= (gsl_function *) malloc ( nthreads * sizeof(gsl_function) );
   struct dJzStaeckelArg * params= (struct dJzStaeckelArg *) malloc ( nthreads * sizeof (struct dJzStaeckelArg) );
   for (tid=0; tid < nthreads; tid++){
-    (params+tid)->delta= delta;
     (params+tid)->nargs= nargs;
     (params+tid)->actionAngleArgs= actionAngleArgs;
   }
@@ -1012,7 +1086,8 @@ void calcdJzStaeckel(int ndata,
     }
     //Setup function
     (params+tid)->E= *(E+ii);
-    (params+tid)->Lz22delta= 0.5 * *(Lz+ii) * *(Lz+ii) / delta / delta;
+    (params+tid)->Lz22delta= 0.5 * *(Lz+ii) * *(Lz+ii) / *(delta+ii) / *(delta+ii);
+    (params+tid)->delta= *(delta+ii);
     (params+tid)->I3V= *(I3V+ii);
     (params+tid)->u0= *(u0+ii);
     (params+tid)->cosh2u0= *(cosh2u0+ii);
@@ -1028,21 +1103,21 @@ void calcdJzStaeckel(int ndata,
     *(djzdE+ii)= gsl_integration_glfixed (dJzInt+tid,0.,mid,T);
     (dJzInt+tid)->function = &dJzdEHighStaeckelIntegrand;
     *(djzdE+ii)+= gsl_integration_glfixed (dJzInt+tid,0.,mid,T);
-    *(djzdE+ii)*= sqrt(2.) * delta / M_PI;
+    *(djzdE+ii)*= sqrt(2.) * *(delta+ii) / M_PI;
     //Then calculate dJzdLz
     (dJzInt+tid)->function = &dJzdLzLowStaeckelIntegrand;
     //Integrate
     *(djzdLz+ii)= gsl_integration_glfixed (dJzInt+tid,0.,mid,T);
     (dJzInt+tid)->function = &dJzdLzHighStaeckelIntegrand;
     *(djzdLz+ii)+= gsl_integration_glfixed (dJzInt+tid,0.,mid,T);
-    *(djzdLz+ii)*= - *(Lz+ii) * sqrt(2.) / M_PI / delta;
+    *(djzdLz+ii)*= - *(Lz+ii) * sqrt(2.) / M_PI / *(delta+ii);
     //Then calculate dJzdI3
     (dJzInt+tid)->function = &dJzdI3LowStaeckelIntegrand;
     //Integrate
     *(djzdI3+ii)= gsl_integration_glfixed (dJzInt+tid,0.,mid,T);
     (dJzInt+tid)->function = &dJzdI3HighStaeckelIntegrand;
     *(djzdI3+ii)+= gsl_integration_glfixed (dJzInt+tid,0.,mid,T);
-    *(djzdI3+ii)*= sqrt(2.) * delta / M_PI;
+    *(djzdI3+ii)*= sqrt(2.) * *(delta+ii) / M_PI;
   }
   free(dJzInt);
   free(params);
@@ -1073,7 +1148,7 @@ void calcAnglesStaeckel(int ndata,
 			double * E,
 			double * Lz,
 			double * I3U,
-			double delta,
+			double * delta,
 			double * u0,
 			double * sinh2u0,
 			double * v0,
@@ -1099,10 +1174,8 @@ void calcAnglesStaeckel(int ndata,
   struct dJRStaeckelArg * paramsu= (struct dJRStaeckelArg *) malloc ( nthreads * sizeof (struct dJRStaeckelArg) );
   struct dJzStaeckelArg * paramsv= (struct dJzStaeckelArg *) malloc ( nthreads * sizeof (struct dJzStaeckelArg) );
   for (tid=0; tid < nthreads; tid++){
-    (paramsu+tid)->delta= delta;
     (paramsu+tid)->nargs= nargs;
     (paramsu+tid)->actionAngleArgs= actionAngleArgs;
-    (paramsv+tid)->delta= delta;
     (paramsv+tid)->nargs= nargs;
     (paramsv+tid)->actionAngleArgs= actionAngleArgs;
   }
@@ -1132,7 +1205,8 @@ void calcAnglesStaeckel(int ndata,
     }
     //Setup u function
     (paramsu+tid)->E= *(E+ii);
-    (paramsu+tid)->Lz22delta= 0.5 * *(Lz+ii) * *(Lz+ii) / delta / delta;
+    (paramsu+tid)->Lz22delta= 0.5 * *(Lz+ii) * *(Lz+ii) / *(delta+ii) / *(delta+ii);
+    (paramsu+tid)->delta= *(delta+ii);
     (paramsu+tid)->I3U= *(I3U+ii);
     (paramsu+tid)->u0= *(u0+ii);
     (paramsu+tid)->sinh2u0= *(sinh2u0+ii);
@@ -1151,9 +1225,9 @@ void calcAnglesStaeckel(int ndata,
 	(AngleuInt+tid)->function = &dJRdI3HighStaeckelIntegrand;
 	I3r1= -gsl_integration_glfixed (AngleuInt+tid,0.,mid,T);
 	(AngleuInt+tid)->function = &dJRdLzHighStaeckelIntegrand;
-	*(Anglephi+ii)= M_PI * *(dJRdLz+ii) + *(Lz+ii) * gsl_integration_glfixed (AngleuInt+tid,0.,mid,T) / delta / sqrt(2.);
-	Or1*= delta / sqrt(2.);
-	I3r1*= delta / sqrt(2.);
+	*(Anglephi+ii)= M_PI * *(dJRdLz+ii) + *(Lz+ii) * gsl_integration_glfixed (AngleuInt+tid,0.,mid,T) / *(delta+ii) / sqrt(2.);
+	Or1*= *(delta+ii) / sqrt(2.);
+	I3r1*= *(delta+ii) / sqrt(2.);
 	Or1= M_PI * *(dJRdE+ii) - Or1;
 	I3r1= M_PI * *(dJRdI3+ii) - I3r1;
       }
@@ -1164,9 +1238,9 @@ void calcAnglesStaeckel(int ndata,
 	(AngleuInt+tid)->function = &dJRdI3LowStaeckelIntegrand;
 	I3r1= -gsl_integration_glfixed (AngleuInt+tid,0.,mid,T);
 	(AngleuInt+tid)->function = &dJRdLzLowStaeckelIntegrand;
-	*(Anglephi+ii)= - *(Lz+ii) * gsl_integration_glfixed (AngleuInt+tid,0.,mid,T) / delta / sqrt(2.);
-	Or1*= delta / sqrt(2.);
-	I3r1*= delta / sqrt(2.);
+	*(Anglephi+ii)= - *(Lz+ii) * gsl_integration_glfixed (AngleuInt+tid,0.,mid,T) / *(delta+ii) / sqrt(2.);
+	Or1*= *(delta+ii) / sqrt(2.);
+	I3r1*= *(delta+ii) / sqrt(2.);
       }
     } 
     else {
@@ -1174,32 +1248,33 @@ void calcAnglesStaeckel(int ndata,
 	mid= sqrt( ( *(umax+ii) - *(ux+ii) ) );
 	(AngleuInt+tid)->function = &dJRdEHighStaeckelIntegrand;
 	Or1= gsl_integration_glfixed (AngleuInt+tid,0.,mid,T);
-	Or1*= delta / sqrt(2.);
+	Or1*= *(delta+ii) / sqrt(2.);
 	Or1= M_PI * *(dJRdE+ii) + Or1;
 	(AngleuInt+tid)->function = &dJRdI3HighStaeckelIntegrand;
 	I3r1= -gsl_integration_glfixed (AngleuInt+tid,0.,mid,T);
-	I3r1*= delta / sqrt(2.);
+	I3r1*= *(delta+ii) / sqrt(2.);
 	I3r1= M_PI * *(dJRdI3+ii) + I3r1;
 	(AngleuInt+tid)->function = &dJRdLzHighStaeckelIntegrand;
-	*(Anglephi+ii)= M_PI * *(dJRdLz+ii) - *(Lz+ii) * gsl_integration_glfixed (AngleuInt+tid,0.,mid,T) / delta / sqrt(2.);
+	*(Anglephi+ii)= M_PI * *(dJRdLz+ii) - *(Lz+ii) * gsl_integration_glfixed (AngleuInt+tid,0.,mid,T) / *(delta+ii) / sqrt(2.);
       }
       else {
 	mid= sqrt( ( *(ux+ii) - *(umin+ii) ) );
 	(AngleuInt+tid)->function = &dJRdELowStaeckelIntegrand;
 	Or1= gsl_integration_glfixed (AngleuInt+tid,0.,mid,T);
-	Or1*= delta / sqrt(2.);
+	Or1*= *(delta+ii) / sqrt(2.);
 	Or1= 2. * M_PI * *(dJRdE+ii) - Or1;
 	(AngleuInt+tid)->function = &dJRdI3LowStaeckelIntegrand;
 	I3r1= -gsl_integration_glfixed (AngleuInt+tid,0.,mid,T);
-	I3r1*= delta / sqrt(2.);
+	I3r1*= *(delta+ii) / sqrt(2.);
 	I3r1= 2. * M_PI * *(dJRdI3+ii) - I3r1;
 	(AngleuInt+tid)->function = &dJRdLzLowStaeckelIntegrand;
-	*(Anglephi+ii)= 2. * M_PI * *(dJRdLz+ii) + *(Lz+ii) * gsl_integration_glfixed (AngleuInt+tid,0.,mid,T) / delta / sqrt(2.);
+	*(Anglephi+ii)= 2. * M_PI * *(dJRdLz+ii) + *(Lz+ii) * gsl_integration_glfixed (AngleuInt+tid,0.,mid,T) / *(delta+ii) / sqrt(2.);
       }
     }
     //Setup v function
     (paramsv+tid)->E= *(E+ii);
-    (paramsv+tid)->Lz22delta= 0.5 * *(Lz+ii) * *(Lz+ii) / delta / delta;
+    (paramsv+tid)->Lz22delta= 0.5 * *(Lz+ii) * *(Lz+ii) / *(delta+ii) / *(delta+ii);
+    (paramsv+tid)->delta= *(delta+ii);
     (paramsv+tid)->I3V= *(I3V+ii);
     (paramsv+tid)->u0= *(u0+ii);
     (paramsv+tid)->cosh2u0= *(cosh2u0+ii);
@@ -1213,13 +1288,13 @@ void calcAnglesStaeckel(int ndata,
 	mid = ( *(vx+ii) > 0.5 * M_PI ) ? sqrt( (M_PI - *(vx+ii) - *(vmin+ii))): sqrt( *(vx+ii) - *(vmin+ii));
 	(AnglevInt+tid)->function = &dJzdELowStaeckelIntegrand;
 	Or2= gsl_integration_glfixed (AnglevInt+tid,0.,mid,T);
-	Or2*= delta / sqrt(2.);
+	Or2*= *(delta+ii) / sqrt(2.);
 	(AnglevInt+tid)->function = &dJzdI3LowStaeckelIntegrand;
 	I3r2= gsl_integration_glfixed (AnglevInt+tid,0.,mid,T);
-	I3r2*= delta / sqrt(2.);
+	I3r2*= *(delta+ii) / sqrt(2.);
 	(AnglevInt+tid)->function = &dJzdLzLowStaeckelIntegrand;
 	phitmp= gsl_integration_glfixed (AnglevInt+tid,0.,mid,T);
-	phitmp*= - *(Lz+ii) / delta / sqrt(2.);
+	phitmp*= - *(Lz+ii) / *(delta+ii) / sqrt(2.);
 	if ( *(vx+ii) > 0.5 * M_PI ) {
 	  Or2= M_PI * *(dJzdE+ii) - Or2;
 	  I3r2= M_PI * *(dJzdI3+ii) - I3r2;
@@ -1230,13 +1305,13 @@ void calcAnglesStaeckel(int ndata,
 	mid= sqrt( fabs ( 0.5 * M_PI - *(vx+ii) ) );
 	(AnglevInt+tid)->function = &dJzdEHighStaeckelIntegrand;
 	Or2= gsl_integration_glfixed (AnglevInt+tid,0.,mid,T);
-	Or2*= delta / sqrt(2.);
+	Or2*= *(delta+ii) / sqrt(2.);
 	(AnglevInt+tid)->function = &dJzdI3HighStaeckelIntegrand;
 	I3r2= gsl_integration_glfixed (AnglevInt+tid,0.,mid,T);
-	I3r2*= delta / sqrt(2.);
+	I3r2*= *(delta+ii) / sqrt(2.);
 	(AnglevInt+tid)->function = &dJzdLzHighStaeckelIntegrand;
 	phitmp= gsl_integration_glfixed (AnglevInt+tid,0.,mid,T);
-	phitmp*= - *(Lz+ii) / delta / sqrt(2.);
+	phitmp*= - *(Lz+ii) / *(delta+ii) / sqrt(2.);
 	if ( *(vx+ii) > 0.5 * M_PI ) {
 	  Or2= 0.5 * M_PI * *(dJzdE+ii) + Or2;
 	  I3r2= 0.5 * M_PI * *(dJzdI3+ii) + I3r2;
@@ -1254,13 +1329,13 @@ void calcAnglesStaeckel(int ndata,
 	mid = ( *(vx+ii) > 0.5 * M_PI ) ? sqrt( (M_PI - *(vx+ii) - *(vmin+ii))): sqrt( *(vx+ii) - *(vmin+ii));
 	(AnglevInt+tid)->function = &dJzdELowStaeckelIntegrand;
 	Or2= gsl_integration_glfixed (AnglevInt+tid,0.,mid,T);
-	Or2*= delta / sqrt(2.);
+	Or2*= *(delta+ii) / sqrt(2.);
 	(AnglevInt+tid)->function = &dJzdI3LowStaeckelIntegrand;
 	I3r2= gsl_integration_glfixed (AnglevInt+tid,0.,mid,T);
-	I3r2*= delta / sqrt(2.);
+	I3r2*= *(delta+ii) / sqrt(2.);
 	(AnglevInt+tid)->function = &dJzdLzLowStaeckelIntegrand;
 	phitmp= gsl_integration_glfixed (AnglevInt+tid,0.,mid,T);
-	phitmp*= - *(Lz+ii) / delta / sqrt(2.);
+	phitmp*= - *(Lz+ii) / *(delta+ii) / sqrt(2.);
 	if ( *(vx+ii) < 0.5 * M_PI ) {
 	  Or2= 2. * M_PI * *(dJzdE+ii) - Or2;
 	  I3r2= 2. * M_PI * *(dJzdI3+ii) - I3r2;
@@ -1276,13 +1351,13 @@ void calcAnglesStaeckel(int ndata,
 	mid= sqrt( fabs ( 0.5 * M_PI - *(vx+ii) ) );
 	(AnglevInt+tid)->function = &dJzdEHighStaeckelIntegrand;
 	Or2= gsl_integration_glfixed (AnglevInt+tid,0.,mid,T);
-	Or2*= delta / sqrt(2.);
+	Or2*= *(delta+ii) / sqrt(2.);
 	(AnglevInt+tid)->function = &dJzdI3HighStaeckelIntegrand;
 	I3r2= gsl_integration_glfixed (AnglevInt+tid,0.,mid,T);
-	I3r2*= delta / sqrt(2.);
+	I3r2*= *(delta+ii) / sqrt(2.);
 	(AnglevInt+tid)->function = &dJzdLzHighStaeckelIntegrand;
 	phitmp= gsl_integration_glfixed (AnglevInt+tid,0.,mid,T);
-	phitmp*= - *(Lz+ii) / delta / sqrt(2.);
+	phitmp*= - *(Lz+ii) / *(delta+ii) / sqrt(2.);
 	if ( *(vx+ii) < 0.5 * M_PI ) {
 	  Or2= 1.5 * M_PI * *(dJzdE+ii) + Or2;
 	  I3r2= 1.5 * M_PI * *(dJzdI3+ii) + I3r2;
@@ -1329,7 +1404,7 @@ void calcUminUmax(int ndata,
 		  double * E,
 		  double * Lz,
 		  double * I3U,
-		  double delta,
+		  double * delta,
 		  double * u0,
 		  double * sinh2u0,
 		  double * v0,
@@ -1354,7 +1429,6 @@ void calcUminUmax(int ndata,
   double u_lo, u_hi;
   T = gsl_root_fsolver_brent;
   for (tid=0; tid < nthreads; tid++){
-    (params+tid)->delta= delta;
     (params+tid)->nargs= nargs;
     (params+tid)->actionAngleArgs= actionAngleArgs;
     (s+tid)->s= gsl_root_fsolver_alloc (T);
@@ -1372,7 +1446,8 @@ void calcUminUmax(int ndata,
 #endif
     //Setup function
     (params+tid)->E= *(E+ii);
-    (params+tid)->Lz22delta= 0.5 * *(Lz+ii) * *(Lz+ii) / delta / delta;
+    (params+tid)->Lz22delta= 0.5 * *(Lz+ii) * *(Lz+ii) / *(delta+ii) / *(delta+ii);
+    (params+tid)->delta= *(delta+ii);
     (params+tid)->I3U= *(I3U+ii);
     (params+tid)->u0= *(u0+ii);
     (params+tid)->sinh2u0= *(sinh2u0+ii);
@@ -1428,7 +1503,7 @@ void calcUminUmax(int ndata,
 	*(umin+ii)= *(ux+ii);
 	u_lo= *(ux+ii) + 0.000001;
 	u_hi= 1.1 * (*(ux+ii) + 0.000001);
-	while ( GSL_FN_EVAL(JRRoot+tid,u_hi) >= 0. && u_hi < asinh(37.5/delta)) {
+	while ( GSL_FN_EVAL(JRRoot+tid,u_hi) >= 0. && u_hi < asinh(37.5 / *(delta+ii))) {
 	  u_lo= u_hi; //this makes sure that brent evaluates using previous
 	  u_hi*= 1.1;
 	}
@@ -1498,7 +1573,7 @@ void calcUminUmax(int ndata,
       //Find starting points for maximum
       u_lo= *(ux+ii);
       u_hi= 1.1 * *(ux+ii);
-      while ( GSL_FN_EVAL(JRRoot+tid,u_hi) > 0. && u_hi < asinh(37.5/delta)) {
+      while ( GSL_FN_EVAL(JRRoot+tid,u_hi) > 0. && u_hi < asinh(37.5 / *(delta+ii))) {
 	u_lo= u_hi; //this makes sure that brent evaluates using previous
 	u_hi*= 1.1;
       }
@@ -1546,7 +1621,7 @@ void calcVmin(int ndata,
 	      double * E,
 	      double * Lz,
 	      double * I3V,
-	      double delta,
+	      double * delta,
 	      double * u0,
 	      double * cosh2u0,
 	      double * sinh2u0,
@@ -1569,7 +1644,6 @@ void calcVmin(int ndata,
   double v_lo, v_hi;
   T = gsl_root_fsolver_brent;
   for (tid=0; tid < nthreads; tid++){
-    (params+tid)->delta= delta;
     (params+tid)->nargs= nargs;
     (params+tid)->actionAngleArgs= actionAngleArgs;
     (s+tid)->s= gsl_root_fsolver_alloc (T);
@@ -1587,7 +1661,8 @@ void calcVmin(int ndata,
 #endif
     //Setup function
     (params+tid)->E= *(E+ii);
-    (params+tid)->Lz22delta= 0.5 * *(Lz+ii) * *(Lz+ii) / delta / delta;
+    (params+tid)->Lz22delta= 0.5 * *(Lz+ii) * *(Lz+ii) / *(delta+ii) / *(delta+ii);
+    (params+tid)->delta= *(delta+ii);
     (params+tid)->I3V= *(I3V+ii);
     (params+tid)->u0= *(u0+ii);
     (params+tid)->cosh2u0= *(cosh2u0+ii);
@@ -124,7 +124,7 @@ class quasiisothermaldf(df):
             self._precomputergLzmax= self._precomputergrmax\
                 *potential.vcirc(self._pot,self._precomputergrmax)
             self._precomputergLzgrid= numpy.linspace(self._precomputergLzmin,self._precomputergLzmax,self._precomputergnLz)
-            self._rls= numpy.array([potential.rl(self._pot,l) for l in self._precomputergLzgrid])
+            self._rls= potential.rl(self._pot,self._precomputergLzgrid)
             #Spline interpolate
             self._rgInterp= interpolate.InterpolatedUnivariateSpline(self._precomputergLzgrid,self._rls,k=3)
         else:
@@ -2275,11 +2275,11 @@ class quasiisothermaldf(df):
            Not sure what to do about negative lz...
         """
         if isinstance(lz,numpy.ndarray):
-            indx= (lz > self._precomputergLzmax)*(lz < self._precomputergLzmin)
+            indx= (lz > self._precomputergLzmax)+(lz < self._precomputergLzmin)
             indxc= True^indx
             out= numpy.empty(lz.shape)
             out[indxc]= self._rgInterp(lz[indxc])
-            out[indx]= numpy.array([potential.rl(self._pot,lz[indx][ii]) for ii in range(numpy.sum(indx))])
+            out[indx]= potential.rl(self._pot,lz[indx])
             return out
         else:
             if lz > self._precomputergLzmax or lz < self._precomputergLzmin:
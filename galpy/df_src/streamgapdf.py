@@ -1472,10 +1472,10 @@ def impulse_deltav_general_fullplummerintegration(v,x,b,w,x0,v0,galpot,GM,rs,
     tmax = tmaxfac*rs/numpy.sqrt(numpy.sum((w-v0)**2))
     times = numpy.linspace(0.,tmax,N)
     dtimes = numpy.linspace(-tmax,tmax,2*N)
-    o = Orbit(vxvv=[R,-vR,-vp,z,-vz,phi])
-    o.integrate(times,galpot,method=integrate_method)
-    oplum = o(times[-1]).flip()
-    oplum.integrate(dtimes,galpot,method=integrate_method)
+    # Integrate backward and forward from the point of closest approach at t=0
+    oplum = Orbit(vxvv=[R,vR,vp,z,vz,phi])
+    oplum.integrate(numpy.concatenate((-times[:0:-1],times)),galpot,
+                    method=integrate_method,t0index=N-1)
     plumpot = MovingObjectPotential(orbit=oplum, GM=GM, softening_model='plummer', softening_length=rs)
 
     # Now integrate each particle backwards in galaxy potential, forwards in combined potential and backwards again in galaxy and take diff
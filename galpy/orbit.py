@@ -1,4 +1,5 @@
 from galpy.orbit_src import Orbit
+from galpy.orbit_src import Orbits
 
 #
 # Functions
@@ -10,4 +11,5 @@ from galpy.orbit_src import Orbit
 # Classes
 #
 Orbit= Orbit.Orbit
+Orbits= Orbits.Orbits
 
@@ -14,10 +14,14 @@ import galpy.util.bovy_plot as plot
 import galpy.util.bovy_symplecticode as symplecticode
 import galpy.util.bovy_coords as coords
 #try:
-from galpy.orbit_src.integrateFullOrbit import integrateFullOrbit_c, _ext_loaded
+from galpy.orbit_src.integrateFullOrbit import integrateFullOrbit_c, \
+    integrateFullOrbit_dense_c, integrateFullOrbit_chunks_c, \
+    integrateFullOrbit_dxdv_c, integrateFullOrbit_lyapunov_c, _ext_loaded
 ext_loaded= _ext_loaded
 from galpy.util.bovy_conversion import physical_conversion
-from galpy.orbit_src.OrbitTop import OrbitTop
+from galpy.orbit_src.OrbitTop import OrbitTop, _rect_to_cyl, _cyl_to_rect, \
+    _cyl_to_rect_dxdv, _rect_to_cyl_dxdv, _integrate_twosided
+from galpy.orbit_src.integratePlanarOrbit import _parse_t0index
 _ORBFITNORMRADEC= 360.
 _ORBFITNORMDIST= 10.
 _ORBFITNORMPMRADEC= 4.
@@ -62,7 +66,8 @@ class FullOrbit(OrbitTop):
                           ro=ro,zo=zo,vo=vo,solarmotion=solarmotion)
         return None
 
-    def integrate(self,t,pot,method='symplec4_c',dt=None):
+    def integrate(self,t,pot,method='symplec4_c',dt=None,dense=False,
+                  events=None,output=None,chunksize=10000,t0index=None):
         """
         NAME:
            integrate
@@ -78,17 +83,94 @@ class FullOrbit(OrbitTop):
                    'rk6_c' for a 6-th order Runge-Kutta integrator in C
                    'dopr54_c' for a Dormand-Prince integrator in C (generally the fastest)
            dt= (None) if set, force the integrator to use this basic stepsize; must be an integer divisor of output stepsize
+           dense= (False) if True, store the dense output of the Runge-Kutta integrators and use it to evaluate the orbit in between the output times
+           events= (None) list of events to detect during the integration with the C integrators (get them using getEvents())
+           output= (None) if set, filename of a .npy file that the orbit is streamed to in chunks of chunksize output times by the C integrators; the orbit is then memory-mapped from this file
+           chunksize= (10000) number of output times in each chunk when using output=
+           t0index= (None) if set, the index of t=0 in the interior of the monotonic times t; the orbit is then integrated backward and forward from the initial condition at t=0
         OUTPUT:
            (none) (get the actual orbit using getOrbit()
         HISTORY:
            2010-08-01 - Written - Bovy (NYU)
+           2026-10-17 - Added dense keyword
+           2026-10-17 - Added events keyword
+           2026-10-17 - Added output and chunksize keywords
         """
         #Reset things that may have been defined by a previous integration
         if hasattr(self,'_orbInterp'): delattr(self,'_orbInterp')
+        if hasattr(self,'_dense'): delattr(self,'_dense')
+        if hasattr(self,'_events'): delattr(self,'_events')
         if hasattr(self,'rs'): delattr(self,'rs')
         self.t= nu.array(t)
         self._pot= pot
-        self.orbit= _integrateFullOrbit(self.vxvv,pot,t,method,dt)
+        if dense or not events is None:
+            self.orbit, thisdense, thisevents=\
+                _integrateFullOrbit(self.vxvv,pot,t,method,dt,
+                                    dense=dense,events=events)
+            if not thisdense is None: self._dense= thisdense
+            elif dense:
+                warnings.warn("Dense output was requested, but is only available for the C integrators and potentials implemented in C; the orbit will be interpolated in between the output times instead",galpyWarning)
+            if not thisevents is None:
+                self._events= thisevents
+                self._event_specs= list(events)
+        elif not output is None:
+            self.orbit= _integrateFullOrbit(self.vxvv,pot,t,method,dt,
+                                            output=output,chunksize=chunksize)
+        else:
+            self.orbit= _integrateFullOrbit(self.vxvv,pot,t,method,dt,
+                                            t0index=t0index)
+
+    def integrate_dxdv(self,dxdv,t,pot,method='dopr54_c',
+                       rectIn=False,rectOut=False):
+        """
+        NAME:
+           integrate_dxdv
+        PURPOSE:
+           integrate the orbit and a small area of phase space
+        INPUT:
+           dxdv - [dR,dvR,dvT,dz,dvz,dphi]
+           t - list of times at which to output (0 has to be in this!)
+           pot - potential instance or list of instances
+           method= 'rk4_c' for a 4th-order Runge-Kutta integrator in C
+                   'rk6_c' for a 6-th order Runge-Kutta integrator in C
+                   'dopr54_c' for a Dormand-Prince integrator in C (generally the fastest)
+           rectIn= (False) if True, input dxdv is in rectangular coordinates
+           rectOut= (False) if True, output dxdv (that in orbit_dxdv) is in rectangular coordinates
+        OUTPUT:
+           (none) (get the actual orbit using getOrbit_dxdv()
+        HISTORY:
+           2026-10-17 - Written
+        """
+        if hasattr(self,'_orbInterp'): delattr(self,'_orbInterp')
+        if hasattr(self,'_dense'): delattr(self,'_dense')
+        if hasattr(self,'_events'): delattr(self,'_events')
+        if hasattr(self,'rs'): delattr(self,'rs')
+        self.t= nu.array(t)
+        self._pot_dxdv= pot
+        self._pot= pot
+        self.orbit_dxdv, msg= _integrateFullOrbit_dxdv(self.vxvv,dxdv,pot,t,
+                                                       method,rectIn,rectOut)
+        self.orbit= self.orbit_dxdv[:,:6]
+        return msg
+
+    def lyapunov(self,t,pot,method='dopr54_c',dxdv=None,rectIn=False):
+        """
+        NAME:
+           lyapunov
+        PURPOSE:
+           estimate the maximal Lyapunov exponent of the orbit
+        INPUT:
+           t - list of times at which to renormalize the deviation vector and estimate the exponent (0 has to be in this!)
+           pot - potential instance or list of instances
+           method= 'rk4_c', 'rk6_c', or 'dopr54_c'
+           dxdv= (None) initial deviation vector [dR,dvR,dvT,dz,dvz,dphi] (default: equal components in rectangular coordinates)
+           rectIn= (False) if True, input dxdv is in rectangular coordinates
+        OUTPUT:
+           finite-time estimate of the maximal Lyapunov exponent at each t
+        HISTORY:
+           2026-10-17 - Written
+        """
+        return _lyapunovFullOrbit(self.vxvv,dxdv,pot,t,method,rectIn)[0]
 
     @physical_conversion('energy')
     def Jacobi(self,*args,**kwargs):
@@ -295,11 +377,8 @@ class FullOrbit(OrbitTop):
             self._setupaA(pot=pot,type='adiabatic')
             (rperi,rap)= self._aA.calcRapRperi(self)
             return (rap-rperi)/(rap+rperi)
-        if not hasattr(self,'orbit'):
-            raise AttributeError("Integrate the orbit first")
-        if not hasattr(self,'rs'):
-            self.rs= nu.sqrt(self.orbit[:,0]**2.+self.orbit[:,3]**2.)
-        return (nu.amax(self.rs)-nu.amin(self.rs))/(nu.amax(self.rs)+nu.amin(self.rs))
+        rperi, rap= self._rperirap()
+        return (rap-rperi)/(rap+rperi)
 
     @physical_conversion('position')
     def rap(self,analytic=False,pot=None,**kwargs):
@@ -320,11 +399,7 @@ class FullOrbit(OrbitTop):
             self._setupaA(pot=pot,type='adiabatic')
             (rperi,rap)= self._aA.calcRapRperi(self)
             return rap
-        if not hasattr(self,'orbit'):
-            raise AttributeError("Integrate the orbit first")
-        if not hasattr(self,'rs'):
-            self.rs= nu.sqrt(self.orbit[:,0]**2.+self.orbit[:,3]**2.)
-        return nu.amax(self.rs)
+        return self._rperirap()[1]
 
     @physical_conversion('position')
     def rperi(self,analytic=False,pot=None,**kwargs):
@@ -345,11 +420,22 @@ class FullOrbit(OrbitTop):
             self._setupaA(pot=pot,type='adiabatic')
             (rperi,rap)= self._aA.calcRapRperi(self)
             return rperi
+        return self._rperirap()[0]
+
+    def _rperirap(self):
+        """Pericenter and apocenter radius from the integrated orbit, including the pericenters and apocenters detected during the integration"""
         if not hasattr(self,'orbit'):
             raise AttributeError("Integrate the orbit first")
         if not hasattr(self,'rs'):
             self.rs= nu.sqrt(self.orbit[:,0]**2.+self.orbit[:,3]**2.)
-        return nu.amin(self.rs)
+        rperi, rap= nu.amin(self.rs), nu.amax(self.rs)
+        evs= self._eventsOfType('pericenter')
+        if not evs is None and len(evs) > 0:
+            rperi= min(rperi,nu.amin(nu.sqrt(evs[:,0]**2.+evs[:,3]**2.)))
+        evs= self._eventsOfType('apocenter')
+        if not evs is None and len(evs) > 0:
+            rap= max(rap,nu.amax(nu.sqrt(evs[:,0]**2.+evs[:,3]**2.)))
+        return (rperi,rap)
 
     @physical_conversion('position')
     def zmax(self,analytic=False,pot=None,**kwargs):
@@ -373,7 +459,11 @@ class FullOrbit(OrbitTop):
             return zmax
         if not hasattr(self,'orbit'):
             raise AttributeError("Integrate the orbit first")
-        return nu.amax(nu.fabs(self.orbit[:,3]))
+        zmax= nu.amax(nu.fabs(self.orbit[:,3]))
+        evs= self._eventsOfType('zmax')
+        if not evs is None and len(evs) > 0:
+            zmax= max(zmax,nu.amax(nu.fabs(evs[:,3])))
+        return zmax
 
     def fit(self,vxvv,vxvv_err=None,pot=None,radec=False,lb=False,
             customsky=False,lb_to_customsky=None,pmllpmbb_to_customsky=None,
@@ -542,7 +632,8 @@ class FullOrbit(OrbitTop):
             plot.bovy_plot(self.orbit[:,4],nu.array(self.EzJz)/self.EzJz[0],
                            *args,**kwargs)
 
-def _integrateFullOrbit(vxvv,pot,t,method,dt):
+def _integrateFullOrbit(vxvv,pot,t,method,dt,dense=False,events=None,
+                        output=None,chunksize=10000,t0index=None):
     """
     NAME:
        _integrateFullOrbit
@@ -555,11 +646,23 @@ def _integrateFullOrbit(vxvv,pot,t,method,dt):
        t - list of times at which to output (0 has to be in this!)
        method - 'odeint' or 'leapfrog'
        dt - if set, force the integrator to use this basic stepsize; must be an integer divisor of output stepsize
+       dense= (False) if True, also return the dense output in rectangular coordinates of the C integrators (None if the orbit was not integrated with C)
+       events= (None) if set, also return the events detected by the C integrators as a list of (t,[:,6] array of [R,vR,vT,z,vz,phi]) (None if the orbit was not integrated with C)
+       output= (None) if set, filename of a .npy file to which the C integrators stream the orbit in chunks of chunksize output times
+       chunksize= (10000) number of output times in each chunk when using output=
+       t0index= (None) if set, the index of t=0 in the interior of the monotonic times t, from which the orbit is integrated backward and forward
     OUTPUT:
-       [:,5] array of [R,vR,vT,z,vz,phi] at each t
+       [:,5] array of [R,vR,vT,z,vz,phi] at each t[, dense output, events] (memory-mapped from the output file when output is set)
     HISTORY:
        2010-08-01 - Written - Bovy (NYU)
+       2026-10-17 - Added dense keyword
+       2026-10-17 - Added events keyword
+       2026-10-17 - Added output and chunksize keywords
     """
+    dense_out, events_out= None, None
+    ti0= _parse_t0index(t,t0index)
+    if ti0 > 0 and (dense or not events is None or not output is None):
+        raise ValueError("Integrating backward and forward from t[t0index]=0 cannot be combined with dense output, events, or streaming the orbit to a file")
     #First check that the potential has C
     if '_c' in method:
         if not _check_c(pot):
@@ -568,6 +671,29 @@ def _integrateFullOrbit(vxvv,pot,t,method,dt):
             else:
                 method= 'odeint'
             warnings.warn("Cannot use C integration because some of the potentials are not implemented in C (using %s instead)" % (method), galpyWarning)
+    if ti0 > 0 and not (ext_loaded and '_c' in method.lower()):
+        # The C integrators do this in a single call
+        return _integrate_twosided(lambda tt: _integrateFullOrbit(vxvv,pot,tt,
+                                                                  method,dt),
+                                   t,ti0)
+    if not output is None:
+        if not ext_loaded or not '_c' in method:
+            raise ValueError("Streaming the orbit to a file is only supported for the C integrators")
+        this_vxvv= nu.array([vxvv[0]*nu.cos(vxvv[5]),
+                             vxvv[0]*nu.sin(vxvv[5]),
+                             vxvv[3],
+                             vxvv[1]*nu.cos(vxvv[5])-vxvv[2]*nu.sin(vxvv[5]),
+                             vxvv[2]*nu.cos(vxvv[5])+vxvv[1]*nu.sin(vxvv[5]),
+                             vxvv[4]])
+        out= nu.lib.format.open_memmap(output,mode='w+',dtype=nu.float64,
+                                       shape=(len(t),6))
+        for indx, tmp_out, msg in \
+                integrateFullOrbit_chunks_c(pot,this_vxvv,t,method,dt=dt,
+                                            chunksize=chunksize):
+            out[indx]= _rect_to_cyl(tmp_out)
+        out.flush()
+        del out
+        return nu.load(output,mmap_mode='r+')
     if method.lower() == 'leapfrog':
         #go to the rectangular frame
         this_vxvv= nu.array([vxvv[0]*nu.cos(vxvv[5]),
@@ -594,7 +720,9 @@ def _integrateFullOrbit(vxvv,pot,t,method,dt):
     elif ext_loaded and \
             (method.lower() == 'leapfrog_c' or method.lower() == 'rk4_c' \
             or method.lower() == 'rk6_c' or method.lower() == 'symplec4_c' \
-            or method.lower() == 'symplec6_c' or method.lower() == 'dopr54_c'):
+            or method.lower() == 'symplec6_c' or method.lower() == 'dopr54_c' \
+            or method.lower() == 'symplec4_block_c' \
+            or method.lower() == 'symplec6_block_c'):
         warnings.warn("Using C implementation to integrate orbits",
                       galpyWarning)
         #go to the rectangular frame
@@ -605,8 +733,16 @@ def _integrateFullOrbit(vxvv,pot,t,method,dt):
                              vxvv[2]*nu.cos(vxvv[5])+vxvv[1]*nu.sin(vxvv[5]),
                              vxvv[4]])
         #integrate
-        tmp_out, msg= integrateFullOrbit_c(pot,this_vxvv,
-                                           t,method,dt=dt)
+        if dense or not events is None:
+            tmp_out, dense_out, events_out, msg=\
+                integrateFullOrbit_dense_c(pot,this_vxvv,t,method,dt=dt,
+                                           dense=dense,events=events)
+            if not events_out is None:
+                events_out= [(evt,_rect_to_cyl(evy)) 
+                             for evt,evy in events_out]
+        else:
+            tmp_out, msg= integrateFullOrbit_c(pot,this_vxvv,
+                                               t,method,dt=dt,t0index=ti0)
         #go back to the cylindrical frame
         R= nu.sqrt(tmp_out[:,0]**2.+tmp_out[:,1]**2.)
         phi= nu.arccos(tmp_out[:,0]/R)
@@ -636,8 +772,94 @@ def _integrateFullOrbit(vxvv,pot,t,method,dt):
     neg_radii= (out[:,0] < 0.)
     out[neg_radii,0]= -out[neg_radii,0]
     out[neg_radii,5]+= m.pi
+    if dense or not events is None:
+        if events_out is None and not events is None:
+            warnings.warn("Events are only detected by the C integrators; no events were detected",galpyWarning)
+        return (out,dense_out,events_out)
     return out
 
+def _integrateFullOrbit_dxdv(vxvv,dxdv,pot,t,method,rectIn,rectOut,
+                             numcores=None):
+    """
+    NAME:
+       _integrateFullOrbit_dxdv
+    PURPOSE:
+       integrate an orbit and area of phase space in a Phi(R,z,phi) potential
+    INPUT:
+       vxvv - array with the initial conditions stacked like
+              [R,vR,vT,z,vz,phi]; vR outward!; can be [N,6] for N orbits
+       dxdv - difference to integrate [dR,dvR,dvT,dz,dvz,dphi]; [N,6] for [N,6] vxvv
+       pot - Potential instance
+       t - list of times at which to output (0 has to be in this!)
+       method - 'rk4_c', 'rk6_c', or 'dopr54_c'
+       rectIn= (False) if True, input dxdv is in rectangular coordinates
+       rectOut= (False) if True, output dxdv (that in orbit_dxdv) is in rectangular coordinates
+       numcores= (None) number of OpenMP threads to use for multiple orbits
+    OUTPUT:
+       [:,12] (or [N,:,12]) array of [R,vR,vT,z,vz,phi,dR,dvR,dvT,dz,dvz,dphi] at each t
+       error message from integrator
+    HISTORY:
+       2026-10-17 - Written
+    """
+    if not method.lower() in ['rk4_c','rk6_c','dopr54_c']:
+        raise NotImplementedError("Integrating phase-space volumes of three-dimensional orbits is only supported for the 'rk4_c', 'rk6_c', and 'dopr54_c' methods")
+    if not ext_loaded or not _check_c(pot):
+        raise NotImplementedError("Integrating phase-space volumes of three-dimensional orbits requires all potentials to be implemented in C")
+    warnings.warn("Using C implementation to integrate orbits",galpyWarning)
+    vxvv= nu.array(vxvv,dtype='float')
+    dxdv= nu.array(dxdv,dtype='float')
+    #go to the rectangular frame
+    this_vxvv= _cyl_to_rect(vxvv)
+    if not rectIn:
+        this_dxdv= _cyl_to_rect_dxdv(vxvv,dxdv)
+    else:
+        this_dxdv= dxdv
+    #integrate
+    tmp_out, msg= integrateFullOrbit_dxdv_c(pot,this_vxvv,this_dxdv,t,method,
+                                            numcores=numcores)
+    #go back to the cylindrical frame
+    out= _rect_to_cyl_dxdv(tmp_out)
+    if rectOut:
+        out[...,6:]= tmp_out[...,6:]
+    return (out,msg)
+
+def _lyapunovFullOrbit(vxvv,dxdv,pot,t,method,rectIn,numcores=None):
+    """
+    NAME:
+       _lyapunovFullOrbit
+    PURPOSE:
+       estimate the maximal Lyapunov exponent of an orbit in a Phi(R,z,phi) potential
+    INPUT:
+       vxvv - array with the initial conditions stacked like
+              [R,vR,vT,z,vz,phi]; vR outward!; can be [N,6] for N orbits
+       dxdv - initial deviation vector [dR,dvR,dvT,dz,dvz,dphi] ([N,6] for [N,6] vxvv); if None, equal components in rectangular coordinates
+       pot - Potential instance
+       t - list of times at which to renormalize the deviation vector (0 has to be in this!)
+       method - 'rk4_c', 'rk6_c', or 'dopr54_c'
+       rectIn= (False) if True, input dxdv is in rectangular coordinates
+       numcores= (None) number of OpenMP threads to use for multiple orbits
+    OUTPUT:
+       [nt] (or [N,nt]) array of the finite-time Lyapunov exponent at each t
+       error message from integrator
+    HISTORY:
+       2026-10-17 - Written
+    """
+    if not method.lower() in ['rk4_c','rk6_c','dopr54_c']:
+        raise NotImplementedError("Lyapunov exponents are only computed with the 'rk4_c', 'rk6_c', and 'dopr54_c' methods")
+    if not ext_loaded or not _check_c(pot):
+        raise NotImplementedError("Lyapunov exponents of three-dimensional orbits require all potentials to be implemented in C")
+    vxvv= nu.array(vxvv,dtype='float')
+    #go to the rectangular frame
+    this_vxvv= _cyl_to_rect(vxvv)
+    if dxdv is None:
+        this_dxdv= nu.ones(vxvv.shape)
+    elif not rectIn:
+        this_dxdv= _cyl_to_rect_dxdv(vxvv,nu.array(dxdv,dtype='float'))
+    else:
+        this_dxdv= nu.array(dxdv,dtype='float')
+    return integrateFullOrbit_lyapunov_c(pot,this_vxvv,this_dxdv,t,method,
+                                         numcores=numcores)
+
 def _FullEOM(y,t,pot):
     """
     NAME:
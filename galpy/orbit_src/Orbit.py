@@ -16,6 +16,9 @@ from galpy.orbit_src.RZOrbit import RZOrbit
 from galpy.orbit_src.planarOrbit import planarOrbit, planarROrbit, \
     planarOrbitTop
 from galpy.orbit_src.linearOrbit import linearOrbit
+from galpy.orbit_src.integratePlanarOrbit import _parse_t0index
+from galpy.potential_src.MovingObjectPotential import \
+    _check_movingobject_times
 _K=4.74047
 if _APY_LOADED:
     vxvv_units= [units.kpc,units.km/units.s,units.km/units.s,
@@ -365,7 +368,8 @@ class Orbit(object):
             self._vo= vo
         self._orb.turn_physical_on(ro=ro,vo=vo)
 
-    def integrate(self,t,pot,method='symplec4_c',dt=None):
+    def integrate(self,t,pot,method='symplec4_c',dt=None,dense=False,
+                  events=None,output=None,chunksize=10000,t0index=None):
         """
         NAME:
 
@@ -386,12 +390,29 @@ class Orbit(object):
                    'leapfrog_c' for a simple leapfrog implementation in C
                    'symplec4_c' for a 4th order symplectic integrator in C
                    'symplec6_c' for a 6th order symplectic integrator in C
+                   'symplec4_block_c', 'symplec6_block_c' for the 4th and 6th order symplectic integrators in C with block timesteps that adapt to the local dynamical time (dt then sets the largest step)
                    'rk4_c' for a 4th-order Runge-Kutta integrator in C
                    'rk6_c' for a 6-th order Runge-Kutta integrator in C
                    'dopr54_c' for a Dormand-Prince integrator in C (generally the fastest)
 
            dt= (None) if set, force the integrator to use this basic stepsize; must be an integer divisor of output stepsize (only works for the C integrators that use a fixed stepsize) (can be Quantity)
 
+           dense= (False) if True, store the dense output (the interpolating polynomial of each integration step) of the 'rk4_c', 'rk6_c', or 'dopr54_c' integrators and use it to evaluate the orbit at times in between the output times, rather than interpolating the output with splines; only for 2D and 3D orbits with phi
+
+           events= (None) list of events to detect during the integration with the C integrators; the time and phase-space position of each event are found by root-finding within the integration step in which it happens (get them using getEvents()); each event is one of
+
+              'pericenter', 'apocenter': pericenter and apocenter passages (rperi, rap, and e then use these)
+
+              'zcross', 'zmax': z=0 crossings and vertical turning points (vz=0; zmax then uses these) [3D only]
+
+              (c,offset[,direction]): a surface of section c.w = offset, where w=[x,y,z,vx,vy,vz] (3D) or [x,y,vx,vy] (2D) is the rectangular phase-space position; direction= +1 (-1) to only detect crossings where c.w increases (decreases), default: 0 (both)
+
+           output= (None) if set, filename of a .npy file that the orbit is streamed to by the C integrators in chunks of chunksize output times, such that the full orbit never has to be held in memory; the orbit is then memory-mapped from this file and all methods read lazily from it (reverse and flip(inplace=True) modify the file); only for 3D orbits with phi
+
+           chunksize= (10000) number of output times integrated in each chunk when using output=
+
+           t0index= (None) if set, the index of t=0 in the interior of the monotonic times t (e.g., t= numpy.linspace(-10.,10.,1001) with t0index=500); the initial condition is then taken to be at t=0 and the orbit is integrated backward and forward from it in a single call (cannot be combined with dense, events, or output); by default, the initial condition is at t[0]
+
         OUTPUT:
 
            (none) (get the actual orbit using getOrbit()
@@ -402,6 +423,12 @@ class Orbit(object):
 
            2015-06-28 - Added dt keyword - Bovy (IAS)
 
+           2026-10-17 - Added dense keyword
+
+           2026-10-17 - Added events keyword
+
+           2026-10-17 - Added output and chunksize keywords
+
         """
         _check_potential_dim(self,pot)
         _check_consistent_units(self,pot)
@@ -419,7 +446,28 @@ class Orbit(object):
                           galpyWarning)
         if not _check_integrate_dt(t,dt):
             raise ValueError('dt input (integrator stepsize) for Orbit.integrate must be an integer divisor of the output stepsize')
-        self._orb.integrate(t,pot,method=method,dt=dt)
+        _check_movingobject_times(pot,t)
+        t0index= _parse_t0index(t,t0index)
+        if t0index > 0 and (dense or not events is None or not output is None):
+            raise ValueError("Integrating backward and forward from t[t0index]=0 cannot be combined with dense output, events, or streaming the orbit to a file")
+        if dense or not events is None:
+            if not len(self._orb.vxvv) in [4,6]:
+                raise NotImplementedError('Dense output and events are only available for 2D and 3D orbits that include the azimuth')
+            if dense and not method.lower() in ['rk4_c','rk6_c','dopr54_c']:
+                raise ValueError("Dense output is only available for the 'rk4_c', 'rk6_c', and 'dopr54_c' integrators")
+            if not events is None and not '_c' in method.lower():
+                raise ValueError("Events are only detected by the C integrators")
+            if not output is None:
+                raise ValueError("Streaming the orbit to a file cannot be combined with dense output or events")
+            self._orb.integrate(t,pot,method=method,dt=dt,dense=dense,
+                                events=events)
+        elif not output is None:
+            if not len(self._orb.vxvv) == 6:
+                raise NotImplementedError('Streaming the orbit to a file is only available for 3D orbits that include the azimuth')
+            self._orb.integrate(t,pot,method=method,dt=dt,output=output,
+                                chunksize=chunksize)
+        else:
+            self._orb.integrate(t,pot,method=method,dt=dt,t0index=t0index)
 
     def integrate_dxdv(self,dxdv,t,pot,method='dopr54_c',
                        rectIn=False,rectOut=False):
@@ -434,13 +482,13 @@ class Orbit(object):
 
         INPUT:
 
-           dxdv - [dR,dvR,dvT,dphi]
+           dxdv - [dR,dvR,dvT,dphi] for planar orbits or [dR,dvR,dvT,dz,dvz,dphi] for three-dimensional orbits
 
            t - list of times at which to output (0 has to be in this!) (can be Quantity)
 
            pot - potential instance or list of instances
 
-           method= 'odeint' for scipy's odeint
+           method= 'odeint' for scipy's odeint (planar orbits only)
 
                    'rk4_c' for a 4th-order Runge-Kutta integrator in C
 
@@ -465,6 +513,8 @@ class Orbit(object):
 
            2014-06-29 - Added rectIn and rectOut - Bovy (IAS)
 
+           2026-10-17 - Added three-dimensional orbits
+
         """
         _check_potential_dim(self,pot)
         _check_consistent_units(self,pot)
@@ -473,9 +523,59 @@ class Orbit(object):
             self._orb._integrate_t_asQuantity= True
             t= t.to(units.Gyr).value\
                 /bovy_conversion.time_in_Gyr(self._vo,self._ro)
+        _check_movingobject_times(pot,t)
         self._orb.integrate_dxdv(dxdv,t,pot,method=method,
                                  rectIn=rectIn,rectOut=rectOut)
 
+    @physical_conversion('frequency')
+    def lyapunov(self,t,pot,method='dopr54_c',dxdv=None,rectIn=False,
+                 **kwargs):
+        """
+        NAME:
+
+           lyapunov
+
+        PURPOSE:
+
+           estimate the maximal Lyapunov exponent of the orbit by integrating the variational equations for a deviation vector that is renormalized at each time in t
+
+        INPUT:
+
+           t - list of times at which to renormalize the deviation vector and estimate the exponent (0 has to be in this!) (can be Quantity)
+
+           pot - potential instance or list of instances
+
+           method= 'rk4_c', 'rk6_c', or 'dopr54_c' (default)
+
+           dxdv= (None) initial deviation vector [dR,dvR,dvT,dphi] or [dR,dvR,dvT,dz,dvz,dphi] (default: equal components in rectangular coordinates)
+
+           rectIn= (False) if True, input dxdv is in rectangular coordinates
+
+           ro= (Object-wide default) physical scale for distances to use to convert
+
+           vo= (Object-wide default) physical scale for velocities to use to convert
+
+           use_physical= use to override Object-wide default for using a physical scale for output
+
+        OUTPUT:
+
+           finite-time estimate of the maximal Lyapunov exponent log(|dxdv(t)|/|dxdv(0)|)/t at each time in t (this does not store the orbit)
+
+        HISTORY:
+
+           2026-10-17 - Written
+
+        """
+        if not len(self._orb.vxvv) in [4,6]:
+            raise AttributeError("lyapunov is only implemented for planar orbits with azimuth and for three-dimensional orbits")
+        _check_potential_dim(self,pot)
+        _check_consistent_units(self,pot)
+        if _APY_LOADED and isinstance(t,units.Quantity):
+            t= t.to(units.Gyr).value\
+                /bovy_conversion.time_in_Gyr(self._vo,self._ro)
+        _check_movingobject_times(pot,t)
+        return self._orb.lyapunov(t,pot,method=method,dxdv=dxdv,rectIn=rectIn)
+
     def reverse(self):
         """
         NAME:
@@ -498,6 +598,8 @@ class Orbit(object):
            2011-04-13 - Written - Bovy (NYU)
         """
         if hasattr(self,'_orbInterp'): delattr(self,'_orbInterp')
+        if hasattr(self._orb,'_dense'): delattr(self._orb,'_dense')
+        if hasattr(self._orb,'_events'): delattr(self._orb,'_events')
         if hasattr(self,'rs'): delattr(self,'rs')
         sortindx = list(range(len(self._orb.t)))
         sortindx.sort(key=lambda x: self._orb.t[x],reverse=True)
@@ -597,6 +699,32 @@ class Orbit(object):
         """
         return self._orb.getOrbit()
 
+    def getEvents(self):
+        """
+
+        NAME:
+
+           getEvents
+
+        PURPOSE:
+
+           return the events detected during a previous integration with events=
+
+        INPUT:
+
+           (none)
+
+        OUTPUT:
+
+           list with for each requested event a tuple (t,vxvv) with the times t[nevent] and phase-space positions vxvv[nevent,nd] of the events (in internal units)
+
+        HISTORY:
+
+           2026-10-17 - Written
+
+        """
+        return self._orb.getEvents()
+
     def getOrbit_dxdv(self):
         """
 
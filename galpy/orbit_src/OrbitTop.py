@@ -113,7 +113,7 @@ class OrbitTop(object):
             self._vo= vo
         return None
 
-    def integrate(self,t,pot,method='symplec4_c',dt=None):
+    def integrate(self,t,pot,method='symplec4_c',dt=None,t0index=None):
         """
         NAME:
            integrate
@@ -122,6 +122,7 @@ class OrbitTop(object):
         INPUT:
            t - list of times at which to output (0 has to be in this!)
            pot - Potential instance or list of instances
+           t0index= (None) if set, the index of t=0 in the interior of the monotonic times t, from which the orbit is integrated backward and forward
         OUTPUT:
            (none) (get the actual orbit using self.getOrbit()
         HISTORY:
@@ -144,6 +145,31 @@ class OrbitTop(object):
         """
         return self.orbit
 
+    def getEvents(self):
+        """
+        NAME:
+           getEvents
+        PURPOSE:
+           return the events detected during a previous integration
+        INPUT:
+           (none)
+        OUTPUT:
+           list with for each requested event a tuple (t,vxvv) with the times [nevent] and phase-space positions [nevent,nd] of the events
+        HISTORY:
+           2026-10-17 - Written
+        """
+        if not hasattr(self,'_events'):
+            raise AttributeError("Integrate the orbit with events= first")
+        return self._events
+
+    def _eventsOfType(self,evtype):
+        """Return the phase-space positions of all events of type evtype ('pericenter', ...) detected during the integration (None if there are none)"""
+        if not hasattr(self,'_events'): return None
+        out= [ev[1] for spec, ev in zip(self._event_specs,self._events)
+              if isinstance(spec,str) and spec.lower() == evtype]
+        if len(out) == 0: return None
+        return nu.concatenate(out,axis=0)
+
     def getOrbit_dxdv(self):
         """
         NAME:
@@ -157,7 +183,7 @@ class OrbitTop(object):
         HISTORY:
            2010-07-10 - Written - Bovy (NYU)
         """
-        return self.orbit_dxdv[:,4:]
+        return self.orbit_dxdv[:,self.orbit_dxdv.shape[1]//2:]
 
     @physical_conversion('time')
     def time(self,*args,**kwargs):
@@ -1295,6 +1321,13 @@ class OrbitTop(object):
             else: 
                 nt= len(t)
             dim= len(self.vxvv)
+            if hasattr(self,'_dense'):
+                out= _evaluate_dense(self._dense,nu.array(t,dtype='float'),
+                                     dim)
+                if nt == 1:
+                    return out.reshape(dim)
+                else:
+                    return out
             try:
                 self._setupOrbitInterp()
             except:
@@ -2095,6 +2128,101 @@ class OrbitTop(object):
         return None
 
 
+def _evaluate_dense(dense,t,dim):
+    """Evaluate the dense output of the Runge-Kutta integrators at times t, dense is [nsteps,2+5*dim] with [t0,dt,r1,...,r5] for each step, returns [R,vR,vT,(z,vz),phi] x nt"""
+    t0= dense[:,0]
+    if dense[0,1] < 0.: # backward integration
+        indx= nu.searchsorted(-t0,-t,side='right')-1
+    else:
+        indx= nu.searchsorted(t0,t,side='right')-1
+    indx[indx < 0]= 0
+    theta= (t-t0[indx])/dense[indx,1]
+    if nu.any(theta < -10.**-10.) or nu.any(theta > 1.+10.**-10.):
+        raise ValueError("One or more requested time is not within the integrated range")
+    r= dense[indx,2:].reshape((len(t),5,dim))
+    theta= theta[:,None]
+    rect= r[:,0]+theta*(r[:,1]+(1.-theta)*(r[:,2]+theta*(r[:,3]\
+                                                          +(1.-theta)*r[:,4])))
+    return _rect_to_cyl(rect).T
+
+def _rect_to_cyl(rect):
+    """Convert [:,[x,y,(z),vx,vy,(vz)]] to [:,[R,vR,vT,(z,vz),phi]]"""
+    dim= rect.shape[1]
+    x, y= rect[:,0], rect[:,1]
+    vx, vy= rect[:,dim//2], rect[:,dim//2+1]
+    R= nu.sqrt(x**2.+y**2.)
+    phi= nu.arctan2(y,x) % (2.*nu.pi)
+    out= nu.empty_like(rect)
+    out[:,0]= R
+    out[:,1]= vx*nu.cos(phi)+vy*nu.sin(phi)
+    out[:,2]= vy*nu.cos(phi)-vx*nu.sin(phi)
+    if dim == 6:
+        out[:,3]= rect[:,2]
+        out[:,4]= rect[:,5]
+    out[:,-1]= phi
+    return out
+
+def _integrate_twosided(integrator,t,ti0):
+    """Integrate an orbit backward from t[ti0] to t[0] and forward from t[ti0] to t[-1] using integrator(t), which returns the [nt,ndim] orbit or a tuple (orbit,msg), and stitch both parts into a single array"""
+    t= nu.asarray(t)
+    back= integrator(t[ti0::-1])
+    fwd= integrator(t[ti0:])
+    if isinstance(fwd,tuple):
+        return (nu.concatenate((back[0][:0:-1],fwd[0])),
+                back[1] if back[1] else fwd[1])
+    return nu.concatenate((back[:0:-1],fwd))
+
+def _cyl_to_rect(vxvv):
+    """Convert [...,[R,vR,vT,(z,vz),phi]] to [...,[x,y,(z),vx,vy,(vz)]]"""
+    dim= vxvv.shape[-1]
+    R, vR, vT, phi= vxvv[...,0], vxvv[...,1], vxvv[...,2], vxvv[...,-1]
+    cp, sp= nu.cos(phi), nu.sin(phi)
+    out= nu.empty(vxvv.shape)
+    out[...,0]= R*cp
+    out[...,1]= R*sp
+    out[...,dim//2]= vR*cp-vT*sp
+    out[...,dim//2+1]= vT*cp+vR*sp
+    if dim == 6:
+        out[...,2]= vxvv[...,3]
+        out[...,5]= vxvv[...,4]
+    return out
+
+def _cyl_to_rect_dxdv(vxvv,dxdv):
+    """Convert the deviation vectors dxdv [...,[dR,dvR,dvT,(dz,dvz),dphi]] of the phase-space positions vxvv [...,[R,vR,vT,(z,vz),phi]] to [...,[dx,dy,(dz),dvx,dvy,(dvz)]]"""
+    dim= vxvv.shape[-1]
+    R, vR, vT, phi= vxvv[...,0], vxvv[...,1], vxvv[...,2], vxvv[...,-1]
+    dR, dvR, dvT, dphi= dxdv[...,0], dxdv[...,1], dxdv[...,2], dxdv[...,-1]
+    cp, sp= nu.cos(phi), nu.sin(phi)
+    out= nu.empty(nu.shape(dxdv))
+    out[...,0]= cp*dR-R*sp*dphi
+    out[...,1]= sp*dR+R*cp*dphi
+    out[...,dim//2]= -(vR*sp+vT*cp)*dphi+cp*dvR-sp*dvT
+    out[...,dim//2+1]= (vR*cp-vT*sp)*dphi+sp*dvR+cp*dvT
+    if dim == 6:
+        out[...,2]= dxdv[...,3]
+        out[...,5]= dxdv[...,4]
+    return out
+
+def _rect_to_cyl_dxdv(rect):
+    """Convert [...,[x,y,(z),vx,vy,(vz),dx,dy,(dz),dvx,dvy,(dvz)]] to [...,[R,vR,vT,(z,vz),phi,dR,dvR,dvT,(dz,dvz),dphi]]"""
+    dim= rect.shape[-1]//2
+    out= nu.empty(rect.shape)
+    out[...,:dim]= _rect_to_cyl(rect[...,:dim].reshape((-1,dim)))\
+        .reshape(rect.shape[:-1]+(dim,))
+    R, vR, vT, phi= out[...,0], out[...,1], out[...,2], out[...,dim-1]
+    cp, sp= nu.cos(phi), nu.sin(phi)
+    dx, dy= rect[...,dim], rect[...,dim+1]
+    dvx, dvy= rect[...,dim+dim//2], rect[...,dim+dim//2+1]
+    dphi= (cp*dy-sp*dx)/R
+    out[...,dim]= cp*dx+sp*dy
+    out[...,dim+1]= cp*dvx+sp*dvy+vT*dphi
+    out[...,dim+2]= cp*dvy-sp*dvx-vR*dphi
+    out[...,-1]= dphi
+    if dim == 6:
+        out[...,dim+3]= rect[...,dim+2]
+        out[...,dim+4]= rect[...,dim+5]
+    return out
+
 class _fakeInterp(object): 
     """Fake class to simulate interpolation when orbit was not integrated"""
     def __init__(self,x):
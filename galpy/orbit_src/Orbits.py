@@ -0,0 +1,3188 @@
+import warnings
+import numpy as nu
+from scipy import interpolate
+_APY_LOADED= True
+try:
+    from astropy import units, coordinates
+except ImportError:
+    _APY_LOADED= False
+from galpy import actionAngle
+import galpy.util.bovy_coords as coords
+from galpy.util.bovy_conversion import physical_conversion
+from galpy.util import galpyWarning
+from galpy.util import bovy_conversion
+from galpy.util import config
+from galpy.potential_src.Potential import _evaluatePotentials, _check_c
+from galpy.potential_src.planarPotential import toPlanarPotential, \
+    _evaluateplanarPotentials
+from galpy.orbit_src.Orbit import Orbit, _check_integrate_dt, \
+    _check_potential_dim, _check_consistent_units, _K
+from galpy.orbit_src.FullOrbit import _integrateFullOrbit, \
+    _integrateFullOrbit_dxdv, _lyapunovFullOrbit
+from galpy.orbit_src.planarOrbit import _integrateOrbit, _integrateOrbit_dxdv, \
+    _lyapunovOrbit
+from galpy.orbit_src.integrateFullOrbit import integrateFullOrbit_c, \
+    integrateFullOrbit_chunks_c, _ext_loaded
+from galpy.orbit_src.integratePlanarOrbit import integratePlanarOrbit_c, \
+    _parse_t0index
+from galpy.orbit_src.OrbitTop import _check_roSet, _check_voSet
+from galpy.potential_src.MovingObjectPotential import \
+    _check_movingobject_times
+ext_loaded= _ext_loaded
+_C_METHODS= ['leapfrog_c','rk4_c','rk6_c','symplec4_c','symplec6_c',
+             'dopr54_c','symplec4_block_c','symplec6_block_c']
+class Orbits(object):
+    """Class representing multiple orbits, stored in contiguous arrays"""
+    def __init__(self,vxvv=None,uvw=False,lb=False,
+                 radec=False,vo=None,ro=None,zo=0.025,
+                 solarmotion='hogg'):
+        """
+        NAME:
+
+           __init__
+
+        PURPOSE:
+
+           Initialize an Orbits instance, which holds N orbits whose initial conditions and integrated orbits are stored in single arrays
+
+        INPUT:
+
+           vxvv - initial conditions; either
+
+              1) [N,6] or [N,4] array of Galactocentric cylindrical coordinates [R,vR,vT(,z,vz),phi] in natural units
+
+              2) [N,6] array of [ra,dec,d,mu_ra, mu_dec,vlos] in [deg,deg,kpc,mas/yr,mas/yr,km/s] (all J2000.0; mu_ra = mu_ra * cos dec)
+
+              3) [N,6] array of [ra,dec,d,U,V,W] in [deg,deg,kpc,km/s,km/s,kms]
+
+              4) [N,6] array of (l,b,d,mu_l, mu_b, vlos) in [deg,deg,kpc,mas/yr,mas/yr,km/s) (all J2000.0; mu_l = mu_l * cos b)
+
+              5) [N,6] array of [l,b,d,U,V,W] in [deg,deg,kpc,km/s,km/s,kms]
+
+              6) list of Orbit instances
+
+           4) and 5) also work when leaving out b and mu_b/W
+
+        OPTIONAL INPUTS:
+
+           radec= if True, input is 2) (or 3) above
+
+           uvw= if True, velocities are UVW
+
+           lb= if True, input is 4) or 5) above
+
+           ro= distance from vantage point to GC (kpc; can be Quantity)
+
+           vo= circular velocity at ro (km/s; can be Quantity)
+
+           zo= offset toward the NGP of the Sun wrt the plane (kpc; can be Quantity)
+
+           solarmotion= 'hogg' or 'dehnen', or 'schoenrich', or value in
+           [-U,V,W]; can be Quantity
+
+        OUTPUT:
+
+           instance
+
+        HISTORY:
+
+           2026-10-17 - Written
+
+        """
+        if _APY_LOADED and isinstance(ro,units.Quantity):
+            ro= ro.to(units.kpc).value
+        if _APY_LOADED and isinstance(zo,units.Quantity):
+            zo= zo.to(units.kpc).value
+        if _APY_LOADED and isinstance(vo,units.Quantity):
+            vo= vo.to(units.km/units.s).value
+        if isinstance(vxvv,list) and len(vxvv) > 0 \
+                and isinstance(vxvv[0],Orbit):
+            # Take the physical scales from the first Orbit, if set
+            if ro is None and vxvv[0]._roSet: ro= vxvv[0]._ro
+            if vo is None and vxvv[0]._voSet: vo= vxvv[0]._vo
+            zo= vxvv[0]._orb._zo
+            solarmotion= vxvv[0]._orb._solarmotion
+            vxvv= [o._orb.vxvv for o in vxvv]
+        vxvv= nu.array(vxvv,dtype='float',ndmin=2)
+        if radec or lb:
+            if ro is None:
+                ro= config.__config__.getfloat('normalization','ro')
+            if vo is None:
+                vo= config.__config__.getfloat('normalization','vo')
+        if isinstance(solarmotion,str) and solarmotion.lower() == 'hogg':
+            vsolar= nu.array([-10.1,4.0,6.7])
+        elif isinstance(solarmotion,str) and solarmotion.lower() == 'dehnen':
+            vsolar= nu.array([-10.,5.25,7.17])
+        elif isinstance(solarmotion,str) \
+                and solarmotion.lower() == 'schoenrich':
+            vsolar= nu.array([-11.1,12.24,7.25])
+        elif _APY_LOADED and isinstance(solarmotion,units.Quantity):
+            vsolar= solarmotion.to(units.km/units.s).value
+        else:
+            vsolar= nu.array(solarmotion)
+        if radec or lb:
+            vxvv= _parse_obs_vxvv(vxvv,radec,lb,uvw,ro,vo,zo,vsolar)
+        if vxvv.shape[1] != 4 and vxvv.shape[1] != 6:
+            raise ValueError("Orbits only supports planar ([R,vR,vT,phi]) and full three-dimensional ([R,vR,vT,z,vz,phi]) initial conditions")
+        self.vxvv= vxvv
+        self._zo= zo
+        self._solarmotion= vsolar
+        if vo is None:
+            self._vo= config.__config__.getfloat('normalization','vo')
+            self._voSet= False
+        else:
+            self._vo= vo
+            self._voSet= True
+        if ro is None:
+            self._ro= config.__config__.getfloat('normalization','ro')
+            self._roSet= False
+        else:
+            self._ro= ro
+            self._roSet= True
+        return None
+
+    def __len__(self):
+        return self.vxvv.shape[0]
+
+    def __getitem__(self,key):
+        """
+        NAME:
+
+           __getitem__
+
+        PURPOSE:
+
+           get a subset of the orbits
+
+        INPUT:
+
+           key - index, slice, or index array
+
+        OUTPUT:
+
+           Orbit instance for an integer index, Orbits instance otherwise; integrated orbits are carried over
+
+        HISTORY:
+
+           2026-10-17 - Written
+
+        """
+        orbSetupKwargs= self._orbSetupKwargs()
+        if isinstance(key,(int,nu.integer)):
+            out= Orbit(vxvv=list(self.vxvv[key]),**orbSetupKwargs)
+            if hasattr(self,'t'):
+                out._orb.t= self.t.copy()
+                out._orb._pot= self._pot
+                out._orb.orbit= self.orbit[key].copy()
+            return out
+        out= Orbits(vxvv=self.vxvv[key],**orbSetupKwargs)
+        if hasattr(self,'t'):
+            out.t= self.t.copy()
+            out._pot= self._pot
+            out.orbit= self.orbit[key]
+        return out
+
+    def _orbSetupKwargs(self):
+        """Keywords to set up new Orbit(s) instances with the same physical scales and solar position and motion"""
+        orbSetupKwargs= {'ro':None,
+                         'vo':None,
+                         'zo':self._zo,
+                         'solarmotion':self._solarmotion}
+        if self._roSet:
+            orbSetupKwargs['ro']= self._ro
+        if self._voSet:
+            orbSetupKwargs['vo']= self._vo
+        return orbSetupKwargs
+
+    def dim(self):
+        """
+        NAME:
+
+           dim
+
+        PURPOSE:
+
+           return the dimension of the problem
+
+        INPUT:
+
+           (none)
+
+        OUTPUT:
+
+           dimension
+
+        HISTORY:
+
+           2026-10-17 - Written
+
+        """
+        if self.vxvv.shape[1] == 4:
+            return 2
+        else:
+            return 3
+
+    def turn_physical_off(self):
+        """
+        NAME:
+
+           turn_physical_off
+
+        PURPOSE:
+
+           turn off automatic returning of outputs in physical units
+
+        INPUT:
+
+           (none)
+
+        OUTPUT:
+
+           (none)
+
+        HISTORY:
+
+           2026-10-17 - Written
+
+        """
+        self._roSet= False
+        self._voSet= False
+        return None
+
+    def turn_physical_on(self,ro=None,vo=None):
+        """
+        NAME:
+
+           turn_physical_on
+
+        PURPOSE:
+
+           turn on automatic returning of outputs in physical units
+
+        INPUT:
+
+           ro= reference distance (kpc; can be Quantity)
+
+           vo= reference velocity (km/s; can be Quantity)
+
+        OUTPUT:
+
+           (none)
+
+        HISTORY:
+
+           2026-10-17 - Written
+
+        """
+        self._roSet= True
+        self._voSet= True
+        if not ro is None:
+            if _APY_LOADED and isinstance(ro,units.Quantity):
+                ro= ro.to(units.kpc).value
+            self._ro= ro
+        if not vo is None:
+            if _APY_LOADED and isinstance(vo,units.Quantity):
+                vo= vo.to(units.km/units.s).value
+            self._vo= vo
+        return None
+
+    def integrate(self,t,pot,method='symplec4_c',dt=None,numcores=None,
+                  output=None,chunksize=10000,t0index=None,events=None):
+        """
+        NAME:
+
+           integrate
+
+        PURPOSE:
+
+           integrate all orbits; when using the C integrators, all orbits are integrated in a single call to the C library
+
+        INPUT:
+
+           t - list of times at which to output (0 has to be in this!) (can be Quantity)
+
+           pot - potential instance or list of instances
+
+           method= 'odeint' for scipy's odeint
+                   'leapfrog' for a simple leapfrog implementation
+                   'leapfrog_c' for a simple leapfrog implementation in C
+                   'symplec4_c' for a 4th order symplectic integrator in C
+                   'symplec6_c' for a 6th order symplectic integrator in C
+                   'symplec4_block_c', 'symplec6_block_c' for the 4th and 6th order symplectic integrators in C with block timesteps that adapt to the local dynamical time (dt then sets the largest step)
+                   'rk4_c' for a 4th-order Runge-Kutta integrator in C
+                   'rk6_c' for a 6-th order Runge-Kutta integrator in C
+                   'dopr54_c' for a Dormand-Prince integrator in C (generally the fastest)
+
+           dt= (None) if set, force the integrator to use this basic stepsize; must be an integer divisor of output stepsize (only works for the C integrators that use a fixed stepsize) (can be Quantity)
+
+           numcores= (None) number of OpenMP threads to use for the C integrators (default: OpenMP's default)
+
+           output= (None) if set, filename of a .npy file that the orbits are streamed to in chunks of chunksize output times by the C integrators, such that the full [N,nt,6] array never has to fit in memory; the orbits are then memory-mapped from this file [three-dimensional orbits only]
+
+           chunksize= (10000) number of output times in each chunk when using output=
+
+           t0index= (None) if set, the index of t=0 in the interior of the monotonic times t (e.g., t= numpy.linspace(-10.,10.,1001) with t0index=500); the initial conditions are then taken to be at t=0 and the orbits are integrated backward and forward from them in a single call (cannot be combined with output); by default, the initial conditions are at t[0]
+
+           events= (None) list of events to detect along each orbit with the C integrators, as for Orbit.integrate (get them using getEvents()); the orbits are then integrated one by one (cannot be combined with output or t0index)
+
+        OUTPUT:
+
+           (none) (get the actual orbits using getOrbit())
+
+        HISTORY:
+
+           2026-10-17 - Written
+
+        """
+        _check_potential_dim(self,pot)
+        _check_consistent_units(self,pot)
+        # Parse t
+        if _APY_LOADED and isinstance(t,units.Quantity):
+            self._integrate_t_asQuantity= True
+            t= t.to(units.Gyr).value\
+                /bovy_conversion.time_in_Gyr(self._vo,self._ro)
+        else:
+            self._integrate_t_asQuantity= False
+        if _APY_LOADED and not dt is None and isinstance(dt,units.Quantity):
+            dt= dt.to(units.Gyr).value\
+                /bovy_conversion.time_in_Gyr(self._vo,self._ro)
+        if not _check_integrate_dt(t,dt):
+            raise ValueError('dt input (integrator stepsize) for Orbits.integrate must be an integer divisor of the output stepsize')
+        _check_movingobject_times(pot,t)
+        t0index= _parse_t0index(t,t0index)
+        if t0index > 0 and not output is None:
+            raise ValueError("Integrating backward and forward from t[t0index]=0 cannot be combined with streaming the orbits to a file")
+        if not events is None and (t0index > 0 or not output is None):
+            raise ValueError("Detecting events cannot be combined with integrating backward and forward from t[t0index]=0 or with streaming the orbits to a file")
+        #Reset things that may have been defined by a previous integration
+        if hasattr(self,'_orbInterp'): delattr(self,'_orbInterp')
+        if hasattr(self,'_events'): delattr(self,'_events')
+        self.t= nu.array(t,dtype='float')
+        if not events is None:
+            if self.dim() == 2: self._pot= toPlanarPotential(pot)
+            else: self._pot= pot
+            self.orbit, thisevents= _integrateOrbitsEvents(self.vxvv,self._pot,
+                                                           self.t,method,dt,
+                                                           events)
+            if not thisevents is None:
+                self._events= thisevents
+                self._event_specs= list(events)
+        elif self.dim() == 2:
+            if not output is None:
+                raise NotImplementedError('Streaming orbits to a file is only supported for three-dimensional orbits')
+            self._pot= toPlanarPotential(pot)
+            self.orbit= _integrateOrbits(self.vxvv,self._pot,self.t,
+                                         method,dt,numcores,t0index=t0index)
+        else:
+            self._pot= pot
+            self.orbit= _integrateFullOrbits(self.vxvv,self._pot,self.t,
+                                             method,dt,numcores,
+                                             output=output,
+                                             chunksize=chunksize,
+                                             t0index=t0index)
+        return None
+
+    def getOrbit(self):
+        """
+        NAME:
+
+           getOrbit
+
+        PURPOSE:
+
+           return previously calculated orbits
+
+        INPUT:
+
+           (none)
+
+        OUTPUT:
+
+           array orbit[N,nt,ndim]
+
+        HISTORY:
+
+           2026-10-17 - Written
+
+        """
+        return self.orbit
+
+    def getEvents(self):
+        """
+        NAME:
+
+           getEvents
+
+        PURPOSE:
+
+           return the events detected during a previous integration with events=
+
+        INPUT:
+
+           (none)
+
+        OUTPUT:
+
+           list with for each orbit the list of events returned by Orbit.getEvents, that is, for each requested event a tuple (t,vxvv) with the times [nevent] and phase-space positions [nevent,ndim] of the events
+
+        HISTORY:
+
+           2026-10-17 - Written
+
+        """
+        if not hasattr(self,'_events'):
+            raise AttributeError("Integrate the orbits with events= first")
+        return self._events
+
+    def _eventsOfType(self,evtype):
+        """Return for each orbit the phase-space positions of all events of type evtype ('pericenter', ...) detected during the integration (None if there are none)"""
+        if not hasattr(self,'_events'): return None
+        out= []
+        for events in self._events:
+            thisout= [ev[1] for spec, ev in zip(self._event_specs,events)
+                      if isinstance(spec,str) and spec.lower() == evtype]
+            if len(thisout) == 0: out.append(None)
+            else: out.append(nu.concatenate(thisout,axis=0))
+        return out
+
+    def integrate_dxdv(self,dxdv,t,pot,method='dopr54_c',numcores=None,
+                       rectIn=False,rectOut=False):
+        """
+        NAME:
+
+           integrate_dxdv
+
+        PURPOSE:
+
+           integrate all orbits and a small area of phase space around each of them in a single call to the C library
+
+        INPUT:
+
+           dxdv - [N,4] array of [dR,dvR,dvT,dphi] for planar orbits or [N,6] array of [dR,dvR,dvT,dz,dvz,dphi] for three-dimensional orbits
+
+           t - list of times at which to output (0 has to be in this!) (can be Quantity)
+
+           pot - potential instance or list of instances
+
+           method= 'rk4_c' for a 4th-order Runge-Kutta integrator in C
+
+                   'rk6_c' for a 6-th order Runge-Kutta integrator in C
+
+                   'dopr54_c' for a Dormand-Prince integrator in C (generally the fastest)
+
+           numcores= (None) number of OpenMP threads to use (default: OpenMP's default)
+
+           rectIn= (False) if True, input dxdv is in rectangular coordinates
+
+           rectOut= (False) if True, output dxdv (that in orbit_dxdv) is in rectangular coordinates
+
+        OUTPUT:
+
+           (none) (get the actual orbits using getOrbit_dxdv(), the orbits that are integrated alongside with dxdv are stored as usual, any previous regular orbit integration will be erased!)
+
+        HISTORY:
+
+           2026-10-17 - Written
+
+        """
+        _check_potential_dim(self,pot)
+        _check_consistent_units(self,pot)
+        # Parse t
+        if _APY_LOADED and isinstance(t,units.Quantity):
+            self._integrate_t_asQuantity= True
+            t= t.to(units.Gyr).value\
+                /bovy_conversion.time_in_Gyr(self._vo,self._ro)
+        else:
+            self._integrate_t_asQuantity= False
+        _check_movingobject_times(pot,t)
+        if hasattr(self,'_orbInterp'): delattr(self,'_orbInterp')
+        if hasattr(self,'_events'): delattr(self,'_events')
+        self.t= nu.array(t,dtype='float')
+        if self.dim() == 2:
+            self._pot= toPlanarPotential(pot)
+            self.orbit_dxdv, msg= _integrateOrbit_dxdv(self.vxvv,dxdv,
+                                                       self._pot,self.t,
+                                                       method,rectIn,rectOut,
+                                                       numcores=numcores)
+        else:
+            self._pot= pot
+            self.orbit_dxdv, msg= _integrateFullOrbit_dxdv(self.vxvv,dxdv,
+                                                           self._pot,self.t,
+                                                           method,rectIn,
+                                                           rectOut,
+                                                           numcores=numcores)
+        self.orbit= self.orbit_dxdv[...,:self.vxvv.shape[1]]
+        return None
+
+    def getOrbit_dxdv(self):
+        """
+        NAME:
+
+           getOrbit_dxdv
+
+        PURPOSE:
+
+           return previously calculated deviation vectors
+
+        INPUT:
+
+           (none)
+
+        OUTPUT:
+
+           array orbit_dxdv[N,nt,ndim]
+
+        HISTORY:
+
+           2026-10-17 - Written
+
+        """
+        return self.orbit_dxdv[...,self.vxvv.shape[1]:]
+
+    @physical_conversion('frequency')
+    def lyapunov(self,t,pot,method='dopr54_c',dxdv=None,numcores=None,
+                 rectIn=False,**kwargs):
+        """
+        NAME:
+
+           lyapunov
+
+        PURPOSE:
+
+           estimate the maximal Lyapunov exponent of all orbits in a single call to the C library by integrating the variational equations for deviation vectors that are renormalized at each time in t
+
+        INPUT:
+
+           t - list of times at which to renormalize the deviation vectors and estimate the exponents (0 has to be in this!) (can be Quantity)
+
+           pot - potential instance or list of instances
+
+           method= 'rk4_c', 'rk6_c', or 'dopr54_c' (default)
+
+           dxdv= (None) [N,4] or [N,6] array of initial deviation vectors (default: equal components in rectangular coordinates)
+
+           numcores= (None) number of OpenMP threads to use (default: OpenMP's default)
+
+           rectIn= (False) if True, input dxdv is in rectangular coordinates
+
+           ro= (Object-wide default) physical scale for distances to use to convert
+
+           vo= (Object-wide default) physical scale for velocities to use to convert
+
+           use_physical= use to override Object-wide default for using a physical scale for output
+
+        OUTPUT:
+
+           [N,nt] array of the finite-time estimate of the maximal Lyapunov exponent at each time in t (this does not store the orbits)
+
+        HISTORY:
+
+           2026-10-17 - Written
+
+        """
+        _check_potential_dim(self,pot)
+        _check_consistent_units(self,pot)
+        if _APY_LOADED and isinstance(t,units.Quantity):
+            t= t.to(units.Gyr).value\
+                /bovy_conversion.time_in_Gyr(self._vo,self._ro)
+        t= nu.array(t,dtype='float')
+        _check_movingobject_times(pot,t)
+        if self.dim() == 2:
+            return _lyapunovOrbit(self.vxvv,dxdv,toPlanarPotential(pot),t,
+                                  method,rectIn,numcores=numcores)[0]
+        else:
+            return _lyapunovFullOrbit(self.vxvv,dxdv,pot,t,method,rectIn,
+                                      numcores=numcores)[0]
+
+    def reverse(self):
+        """
+        NAME:
+
+           reverse
+
+        PURPOSE:
+
+           reverse already integrated orbits (that is, make them go from end to beginning in t=0 to tend)
+
+        INPUT:
+
+           (none)
+
+        OUTPUT:
+
+           (none)
+
+        HISTORY:
+
+           2026-10-17 - Written
+
+        """
+        if hasattr(self,'_orbInterp'): delattr(self,'_orbInterp')
+        if hasattr(self,'_events'): delattr(self,'_events')
+        sortindx= nu.argsort(-self.t,kind='mergesort')
+        self.orbit[:]= self.orbit[:,sortindx]
+        return None
+
+    def flip(self,inplace=False):
+        """
+        NAME:
+
+           flip
+
+        PURPOSE:
+
+           'flip' the initial conditions of all orbits such that the velocities are minus the original velocities; useful for quick backward integration; returns a new Orbits instance
+
+        INPUT:
+
+           inplace= (False) if True, flip the orbits in-place, that is, without returning a new instance and also flip the velocities of the integrated orbits (if they exist)
+
+        OUTPUT:
+
+           Orbits instance that has the velocities of the current orbits flipped (inplace=False) or just flips all velocities of current instance (inplace=True)
+
+        HISTORY:
+
+           2026-10-17 - Written
+
+        """
+        if self.dim() == 2: vindx= [1,2]
+        else: vindx= [1,2,4]
+        if inplace:
+            self.vxvv[:,vindx]= -self.vxvv[:,vindx]
+            if hasattr(self,'orbit'):
+                self.orbit[:,:,vindx]= -self.orbit[:,:,vindx]
+            if hasattr(self,'_orbInterp'): delattr(self,'_orbInterp')
+            return None
+        vxvv= self.vxvv.copy()
+        vxvv[:,vindx]= -vxvv[:,vindx]
+        return Orbits(vxvv=vxvv,**self._orbSetupKwargs())
+
+    def toPlanar(self):
+        """
+        NAME:
+
+           toPlanar
+
+        PURPOSE:
+
+           convert three-dimensional orbits into planar orbits
+
+        INPUT:
+
+           (none)
+
+        OUTPUT:
+
+           planar Orbits instance
+
+        HISTORY:
+
+           2026-10-17 - Written
+
+        """
+        if self.dim() == 2:
+            raise AttributeError("planar Orbits do not have the toPlanar attribute")
+        return Orbits(vxvv=self.vxvv[:,[0,1,2,5]],**self._orbSetupKwargs())
+
+    def __call__(self,*args,**kwargs):
+        """
+        NAME:
+
+          __call__
+
+        PURPOSE:
+
+           return the phase-space coordinates of all orbits at time t
+
+        INPUT:
+
+           t - (optional) desired time or array of times (can be Quantity); if not given, return the initial conditions
+
+        OUTPUT:
+
+           array [N,ndim] for no or a single time, [N,nt,ndim] for an array of times
+
+        HISTORY:
+
+           2026-10-17 - Written
+
+        """
+        thiso= self._call(*args,**kwargs)
+        if len(thiso.shape) == 2: return thiso.T
+        else: return nu.transpose(thiso,axes=(1,2,0))
+
+    def _call(self,*args,**kwargs):
+        """Return the orbits at time(s) t as an [ndim,N(,nt)] array"""
+        if len(args) == 0:
+            return self.vxvv.T
+        t= args[0]
+        # Parse t
+        if _APY_LOADED and isinstance(t,units.Quantity):
+            t= t.to(units.Gyr).value\
+                /bovy_conversion.time_in_Gyr(self._vo,self._ro)
+        onet= (len(nu.shape(t)) == 0)
+        t= nu.atleast_1d(nu.array(t,dtype='float'))
+        if not hasattr(self,'t'): #Orbits have not been integrated
+            if nu.any(t != 0.):
+                raise ValueError("Integrate instance before evaluating it at non-zero time")
+            out= nu.tile(self.vxvv.T[:,:,None],(1,1,len(t)))
+        else:
+            # Times that are part of the integration grid are returned as is
+            sindx= nu.argsort(self.t)
+            tindx= nu.clip(nu.searchsorted(self.t[sindx],t),0,len(self.t)-1)
+            indx= sindx[tindx]
+            if nu.all(self.t[indx] == t):
+                out= nu.transpose(self.orbit[:,indx],axes=(2,0,1))
+            else:
+                if nu.any((t < self.t[sindx[0]])+(t > self.t[sindx[-1]])):
+                    raise ValueError("One or more requested time is not within the integrated range")
+                self._setupOrbitInterp()
+                tmp_out= self._orbInterp(t)
+                #Unpack interpolated x and y to R and phi
+                x= tmp_out[:,:,0].copy()
+                y= tmp_out[:,:,-1].copy()
+                tmp_out[:,:,0]= nu.sqrt(x**2.+y**2.)
+                tmp_out[:,:,-1]= nu.arctan2(y,x) % (2.*nu.pi)
+                out= nu.transpose(tmp_out,axes=(2,0,1))
+        if onet: return out[:,:,0]
+        else: return out
+
+    def _setupOrbitInterp(self):
+        if not hasattr(self,"_orbInterp"):
+            sindx= nu.argsort(self.t)
+            # Interpolate x and y rather than R and phi to avoid issues w/
+            # phase wrapping
+            tmp_orbit= self.orbit[:,sindx].copy()
+            tmp_orbit[:,:,0]= self.orbit[:,sindx,0]\
+                *nu.cos(self.orbit[:,sindx,-1])
+            tmp_orbit[:,:,-1]= self.orbit[:,sindx,0]\
+                *nu.sin(self.orbit[:,sindx,-1])
+            self._orbInterp= interpolate.CubicSpline(self.t[sindx],tmp_orbit,
+                                                     axis=1,extrapolate=False)
+        return None
+
+    @physical_conversion('time')
+    def time(self,*args,**kwargs):
+        """
+        NAME:
+
+           time
+
+        PURPOSE:
+
+           return the times at which the orbits are sampled
+
+        INPUT:
+
+           t - (default: integration times) time at which to get the time (for consistency reasons); default is to return the list of times at which the orbits are sampled
+
+           ro= (Object-wide default) physical scale for distances to use to convert (can be Quantity)
+
+           vo= (Object-wide default) physical scale for velocities to use to convert (can be Quantity)
+
+           use_physical= use to override Object-wide default for using a physical scale for output
+
+        OUTPUT:
+
+           t(t)
+
+        HISTORY:
+
+           2026-10-17 - Written
+
+        """
+        if len(args) == 0:
+            try:
+                return self.t
+            except AttributeError:
+                return 0.
+        else: return args[0]
+
+    @physical_conversion('position')
+    def R(self,*args,**kwargs):
+        """
+        NAME:
+
+           R
+
+        PURPOSE:
+
+           return cylindrical radius at time t
+
+        INPUT:
+
+           t - (optional) time at which to get the radius (can be Quantity)
+
+           ro= (Object-wide default) physical scale for distances to use to convert (can be Quantity)
+
+           use_physical= use to override Object-wide default for using a physical scale for output
+
+        OUTPUT:
+
+           R(t) [N] or [N,nt]
+
+        HISTORY:
+
+           2026-10-17 - Written
+
+        """
+        return self._call(*args,**kwargs)[0]
+
+    @physical_conversion('position')
+    def r(self,*args,**kwargs):
+        """
+        NAME:
+
+           r
+
+        PURPOSE:
+
+           return spherical radius at time t
+
+        INPUT:
+
+           t - (optional) time at which to get the radius (can be Quantity)
+
+           ro= (Object-wide default) physical scale for distances to use to convert (can be Quantity)
+
+           use_physical= use to override Object-wide default for using a physical scale for output
+
+        OUTPUT:
+
+           r(t) [N] or [N,nt]
+
+        HISTORY:
+
+           2026-10-17 - Written
+
+        """
+        thiso= self._call(*args,**kwargs)
+        if self.dim() == 2: return thiso[0]
+        else: return nu.sqrt(thiso[0]**2.+thiso[3]**2.)
+
+    @physical_conversion('velocity')
+    def vR(self,*args,**kwargs):
+        """
+        NAME:
+
+           vR
+
+        PURPOSE:
+
+           return radial velocity at time t
+
+        INPUT:
+
+           t - (optional) time at which to get the radial velocity (can be Quantity)
+
+           vo= (Object-wide default) physical scale for velocities to use to convert (can be Quantity)
+
+           use_physical= use to override Object-wide default for using a physical scale for output
+
+        OUTPUT:
+
+           vR(t) [N] or [N,nt]
+
+        HISTORY:
+
+           2026-10-17 - Written
+
+        """
+        return self._call(*args,**kwargs)[1]
+
+    @physical_conversion('velocity')
+    def vT(self,*args,**kwargs):
+        """
+        NAME:
+
+           vT
+
+        PURPOSE:
+
+           return tangential velocity at time t
+
+        INPUT:
+
+           t - (optional) time at which to get the tangential velocity (can be Quantity)
+
+           vo= (Object-wide default) physical scale for velocities to use to convert (can be Quantity)
+
+           use_physical= use to override Object-wide default for using a physical scale for output
+
+        OUTPUT:
+
+           vT(t) [N] or [N,nt]
+
+        HISTORY:
+
+           2026-10-17 - Written
+
+        """
+        return self._call(*args,**kwargs)[2]
+
+    @physical_conversion('position')
+    def z(self,*args,**kwargs):
+        """
+        NAME:
+
+           z
+
+        PURPOSE:
+
+           return vertical height
+
+        INPUT:
+
+           t - (optional) time at which to get the vertical height (can be Quantity)
+
+           ro= (Object-wide default) physical scale for distances to use to convert (can be Quantity)
+
+           use_physical= use to override Object-wide default for using a physical scale for output
+
+        OUTPUT:
+
+           z(t) [N] or [N,nt]
+
+        HISTORY:
+
+           2026-10-17 - Written
+
+        """
+        if self.dim() < 3:
+            raise AttributeError("planar orbits do not have z()")
+        return self._call(*args,**kwargs)[3]
+
+    @physical_conversion('velocity')
+    def vz(self,*args,**kwargs):
+        """
+        NAME:
+
+           vz
+
+        PURPOSE:
+
+           return vertical velocity
+
+        INPUT:
+
+           t - (optional) time at which to get the vertical velocity (can be Quantity)
+
+           vo= (Object-wide default) physical scale for velocities to use to convert (can be Quantity)
+
+           use_physical= use to override Object-wide default for using a physical scale for output
+
+        OUTPUT:
+
+           vz(t) [N] or [N,nt]
+
+        HISTORY:
+
+           2026-10-17 - Written
+
+        """
+        if self.dim() < 3:
+            raise AttributeError("planar orbits do not have vz()")
+        return self._call(*args,**kwargs)[4]
+
+    @physical_conversion('angle')
+    def phi(self,*args,**kwargs):
+        """
+        NAME:
+
+           phi
+
+        PURPOSE:
+
+           return azimuth
+
+        INPUT:
+
+           t - (optional) time at which to get the azimuth (can be Quantity)
+
+        OUTPUT:
+
+           phi(t) [N] or [N,nt]
+
+        HISTORY:
+
+           2026-10-17 - Written
+
+        """
+        return self._call(*args,**kwargs)[-1]
+
+    @physical_conversion('velocity')
+    def vphi(self,*args,**kwargs):
+        """
+        NAME:
+
+           vphi
+
+        PURPOSE:
+
+           return angular velocity
+
+        INPUT:
+
+           t - (optional) time at which to get the angular velocity (can be Quantity)
+
+           vo= (Object-wide default) physical scale for velocities to use to convert (can be Quantity)
+
+           use_physical= use to override Object-wide default for using a physical scale for output
+
+        OUTPUT:
+
+           vphi(t) [N] or [N,nt]
+
+        HISTORY:
+
+           2026-10-17 - Written
+
+        """
+        thiso= self._call(*args,**kwargs)
+        return thiso[2]/thiso[0]
+
+    @physical_conversion('position')
+    def x(self,*args,**kwargs):
+        """
+        NAME:
+
+           x
+
+        PURPOSE:
+
+           return x
+
+        INPUT:
+
+           t - (optional) time at which to get x (can be Quantity)
+
+           ro= (Object-wide default) physical scale for distances to use to convert (can be Quantity)
+
+           use_physical= use to override Object-wide default for using a physical scale for output
+
+        OUTPUT:
+
+           x(t) [N] or [N,nt]
+
+        HISTORY:
+
+           2026-10-17 - Written
+
+        """
+        thiso= self._call(*args,**kwargs)
+        return thiso[0]*nu.cos(thiso[-1])
+
+    @physical_conversion('position')
+    def y(self,*args,**kwargs):
+        """
+        NAME:
+
+           y
+
+        PURPOSE:
+
+           return y
+
+        INPUT:
+
+           t - (optional) time at which to get y (can be Quantity)
+
+           ro= (Object-wide default) physical scale for distances to use to convert (can be Quantity)
+
+           use_physical= use to override Object-wide default for using a physical scale for output
+
+        OUTPUT:
+
+           y(t) [N] or [N,nt]
+
+        HISTORY:
+
+           2026-10-17 - Written
+
+        """
+        thiso= self._call(*args,**kwargs)
+        return thiso[0]*nu.sin(thiso[-1])
+
+    @physical_conversion('velocity')
+    def vx(self,*args,**kwargs):
+        """
+        NAME:
+
+           vx
+
+        PURPOSE:
+
+           return x velocity at time t
+
+        INPUT:
+
+           t - (optional) time at which to get the velocity (can be Quantity)
+
+           vo= (Object-wide default) physical scale for velocities to use to convert (can be Quantity)
+
+           use_physical= use to override Object-wide default for using a physical scale for output
+
+        OUTPUT:
+
+           vx(t) [N] or [N,nt]
+
+        HISTORY:
+
+           2026-10-17 - Written
+
+        """
+        thiso= self._call(*args,**kwargs)
+        return thiso[1]*nu.cos(thiso[-1])-thiso[2]*nu.sin(thiso[-1])
+
+    @physical_conversion('velocity')
+    def vy(self,*args,**kwargs):
+        """
+        NAME:
+
+           vy
+
+        PURPOSE:
+
+           return y velocity at time t
+
+        INPUT:
+
+           t - (optional) time at which to get the velocity (can be Quantity)
+
+           vo= (Object-wide default) physical scale for velocities to use to convert (can be Quantity)
+
+           use_physical= use to override Object-wide default for using a physical scale for output
+
+        OUTPUT:
+
+           vy(t) [N] or [N,nt]
+
+        HISTORY:
+
+           2026-10-17 - Written
+
+        """
+        thiso= self._call(*args,**kwargs)
+        return thiso[2]*nu.cos(thiso[-1])+thiso[1]*nu.sin(thiso[-1])
+
+    @physical_conversion('energy')
+    def E(self,*args,**kwargs):
+        """
+        NAME:
+
+           E
+
+        PURPOSE:
+
+           calculate the energy
+
+        INPUT:
+
+           t - (optional) time at which to get the energy (can be Quantity)
+
+           pot= Potential instance or list of such instances
+
+           vo= (Object-wide default) physical scale for velocities to use to convert (can be Quantity)
+
+           use_physical= use to override Object-wide default for using a physical scale for output
+
+        OUTPUT:
+
+           energy [N] or [N,nt]
+
+        HISTORY:
+
+           2026-10-17 - Written
+
+        """
+        pot= self._parse_pot_kwarg(kwargs)
+        thiso= self._call(*args,**kwargs)
+        if self.dim() == 2:
+            return self._evaluatePotentials(pot,thiso[0],None,thiso[-1],
+                                            *args)\
+                +thiso[1]**2./2.+thiso[2]**2./2.
+        else:
+            return self._evaluatePotentials(pot,thiso[0],thiso[3],thiso[-1],
+                                            *args)\
+                +thiso[1]**2./2.+thiso[2]**2./2.+thiso[4]**2./2.
+
+    @physical_conversion('energy')
+    def ER(self,*args,**kwargs):
+        """
+        NAME:
+
+           ER
+
+        PURPOSE:
+
+           calculate the radial energy
+
+        INPUT:
+
+           t - (optional) time at which to get the radial energy (can be Quantity)
+
+           pot= Potential instance or list of such instances
+
+           vo= (Object-wide default) physical scale for velocities to use to convert (can be Quantity)
+
+           use_physical= use to override Object-wide default for using a physical scale for output
+
+        OUTPUT:
+
+           radial energy [N] or [N,nt]
+
+        HISTORY:
+
+           2026-10-17 - Written
+
+        """
+        if self.dim() < 3:
+            raise AttributeError("ER is only defined for three-dimensional orbits")
+        pot= self._parse_pot_kwarg(kwargs)
+        thiso= self._call(*args,**kwargs)
+        return self._evaluatePotentials(pot,thiso[0],0.*thiso[3],thiso[-1],
+                                        *args)\
+            +thiso[1]**2./2.+thiso[2]**2./2.
+
+    @physical_conversion('energy')
+    def Ez(self,*args,**kwargs):
+        """
+        NAME:
+
+           Ez
+
+        PURPOSE:
+
+           calculate the vertical energy
+
+        INPUT:
+
+           t - (optional) time at which to get the vertical energy (can be Quantity)
+
+           pot= Potential instance or list of such instances
+
+           vo= (Object-wide default) physical scale for velocities to use to convert (can be Quantity)
+
+           use_physical= use to override Object-wide default for using a physical scale for output
+
+        OUTPUT:
+
+           vertical energy [N] or [N,nt]
+
+        HISTORY:
+
+           2026-10-17 - Written
+
+        """
+        if self.dim() < 3:
+            raise AttributeError("Ez is only defined for three-dimensional orbits")
+        pot= self._parse_pot_kwarg(kwargs)
+        thiso= self._call(*args,**kwargs)
+        return self._evaluatePotentials(pot,thiso[0],thiso[3],thiso[-1],
+                                        *args)\
+            -self._evaluatePotentials(pot,thiso[0],0.*thiso[3],thiso[-1],
+                                      *args)\
+            +thiso[4]**2./2.
+
+    @physical_conversion('action')
+    def L(self,*args,**kwargs):
+        """
+        NAME:
+
+           L
+
+        PURPOSE:
+
+           calculate the angular momentum at time t
+
+        INPUT:
+
+           t - (optional) time at which to get the angular momentum (can be Quantity)
+
+           ro= (Object-wide default) physical scale for distances to use to convert (can be Quantity)
+
+           vo= (Object-wide default) physical scale for velocities to use to convert (can be Quantity)
+
+           use_physical= use to override Object-wide default for using a physical scale for output
+
+        OUTPUT:
+
+           angular momentum: [N] or [N,nt] for planar orbits, [N,3] or [N,nt,3] for three-dimensional orbits
+
+        HISTORY:
+
+           2026-10-17 - Written
+
+        """
+        thiso= self._call(*args,**kwargs)
+        if self.dim() == 2:
+            return thiso[0]*thiso[2]
+        x= thiso[0]*nu.cos(thiso[-1])
+        y= thiso[0]*nu.sin(thiso[-1])
+        vx= thiso[1]*nu.cos(thiso[-1])-thiso[2]*nu.sin(thiso[-1])
+        vy= thiso[2]*nu.cos(thiso[-1])+thiso[1]*nu.sin(thiso[-1])
+        return nu.stack((y*thiso[4]-thiso[3]*vy,
+                         thiso[3]*vx-x*thiso[4],
+                         x*vy-y*vx),axis=-1)
+
+    @physical_conversion('energy')
+    def Jacobi(self,*args,**kwargs):
+        """
+        NAME:
+
+           Jacobi
+
+        PURPOSE:
+
+           calculate the Jacobi integral E - Omega L
+
+        INPUT:
+
+           t - (optional) time at which to get the Jacobi integral (can be Quantity)
+
+           OmegaP= pattern speed (can be Quantity); for three-dimensional orbits, can also be a vector [Omega_x,Omega_y,Omega_z] (default: the pattern speed of the potential, or 1)
+
+           pot= Potential instance or list of such instances
+
+           vo= (Object-wide default) physical scale for velocities to use to convert (can be Quantity)
+
+           use_physical= use to override Object-wide default for using a physical scale for output
+
+        OUTPUT:
+
+           Jacobi integral [N] or [N,nt]
+
+        HISTORY:
+
+           2026-10-17 - Written
+
+        """
+        OmegaP= kwargs.pop('OmegaP',None)
+        if OmegaP is None:
+            OmegaP= 1.
+            pot= kwargs.get('pot',None)
+            if pot is None:
+                try:
+                    pot= self._pot
+                except AttributeError:
+                    raise AttributeError("Integrate orbits or specify pot=")
+            if not isinstance(pot,list): pot= [pot]
+            for p in pot:
+                if hasattr(p,'OmegaP'):
+                    OmegaP= p.OmegaP()
+                    break
+        elif _APY_LOADED and isinstance(OmegaP,units.Quantity):
+            OmegaP= OmegaP.to(units.km/units.s/units.kpc).value\
+                /bovy_conversion.freq_in_kmskpc(self._vo,self._ro)
+        #Make sure you are not using physical coordinates
+        kwargs['use_physical']= False
+        thisE= self.E(*args,**kwargs)
+        thisL= self.L(*args,**kwargs)
+        if self.dim() == 2:
+            return thisE-OmegaP*thisL
+        elif nu.ndim(OmegaP) == 0:
+            return thisE-OmegaP*thisL[...,2]
+        else:
+            return thisE-nu.sum(nu.array(OmegaP)*thisL,axis=-1)
+
+    def e(self,analytic=False,pot=None):
+        """
+        NAME:
+
+           e
+
+        PURPOSE:
+
+           calculate the eccentricity of all orbits, either from the integrated orbits (including any pericenters and apocenters detected with events=) or analytically
+
+        INPUT:
+
+           analytic - compute this analytically
+
+           pot - potential to use for analytical calculation
+
+        OUTPUT:
+
+           eccentricity [N]
+
+        HISTORY:
+
+           2026-10-17 - Written
+
+        """
+        if analytic:
+            rperi, rap= self._rperirap_analytic(pot=pot)
+        else:
+            rperi, rap= self._rperirap()
+        return (rap-rperi)/(rap+rperi)
+
+    @physical_conversion('position')
+    def rap(self,analytic=False,pot=None,**kwargs):
+        """
+        NAME:
+
+           rap
+
+        PURPOSE:
+
+           return the apocenter radius of all orbits, either from the integrated orbits (including any apocenters detected with events=) or analytically
+
+        INPUT:
+
+           analytic - compute this analytically
+
+           pot - potential to use for analytical calculation
+
+           ro= (Object-wide default) physical scale for distances to use to convert (can be Quantity)
+
+           use_physical= use to override Object-wide default for using a physical scale for output
+
+        OUTPUT:
+
+           R_ap [N]
+
+        HISTORY:
+
+           2026-10-17 - Written
+
+        """
+        if analytic:
+            return self._rperirap_analytic(pot=pot)[1]
+        return self._rperirap()[1]
+
+    @physical_conversion('position')
+    def rperi(self,analytic=False,pot=None,**kwargs):
+        """
+        NAME:
+
+           rperi
+
+        PURPOSE:
+
+           return the pericenter radius of all orbits, either from the integrated orbits (including any pericenters detected with events=) or analytically
+
+        INPUT:
+
+           analytic - compute this analytically
+
+           pot - potential to use for analytical calculation
+
+           ro= (Object-wide default) physical scale for distances to use to convert (can be Quantity)
+
+           use_physical= use to override Object-wide default for using a physical scale for output
+
+        OUTPUT:
+
+           R_peri [N]
+
+        HISTORY:
+
+           2026-10-17 - Written
+
+        """
+        if analytic:
+            return self._rperirap_analytic(pot=pot)[0]
+        return self._rperirap()[0]
+
+    @physical_conversion('position')
+    def zmax(self,analytic=False,pot=None,**kwargs):
+        """
+        NAME:
+
+           zmax
+
+        PURPOSE:
+
+           return the maximum vertical height of all orbits, either from the integrated orbits (including any vertical turning points detected with events=) or analytically
+
+        INPUT:
+
+           analytic - compute this analytically
+
+           pot - potential to use for analytical calculation
+
+           ro= (Object-wide default) physical scale for distances to use to convert (can be Quantity)
+
+           use_physical= use to override Object-wide default for using a physical scale for output
+
+        OUTPUT:
+
+           Z_max [N]
+
+        HISTORY:
+
+           2026-10-17 - Written
+
+        """
+        if self.dim() < 3:
+            raise AttributeError("zmax is only defined for three-dimensional orbits")
+        if analytic:
+            self._setupaA(pot=pot,type='adiabatic')
+            vxvv= self._aAvxvv()
+            return nu.array([self._aA.calczmax(*[v[ii] for v in vxvv[:5]])
+                             for ii in range(len(self))])
+        if not hasattr(self,'orbit'):
+            raise AttributeError("Integrate the orbits first")
+        zmax= nu.amax(nu.fabs(self.orbit[:,:,3]),axis=1)
+        evs= self._eventsOfType('zmax')
+        if not evs is None:
+            for ii, ev in enumerate(evs):
+                if ev is None or len(ev) == 0: continue
+                zmax[ii]= max(zmax[ii],nu.amax(nu.fabs(ev[:,3])))
+        return zmax
+
+    def _rperirap(self):
+        """Pericenter and apocenter radii [N] from the integrated orbits, including the pericenters and apocenters detected during the integration"""
+        if not hasattr(self,'orbit'):
+            raise AttributeError("Integrate the orbits first")
+        if self.dim() == 2:
+            rs= self.orbit[:,:,0]
+        else:
+            rs= nu.sqrt(self.orbit[:,:,0]**2.+self.orbit[:,:,3]**2.)
+        rperi, rap= nu.amin(rs,axis=1), nu.amax(rs,axis=1)
+        if self.dim() == 2:
+            evrs= lambda ev: ev[:,0]
+        else:
+            evrs= lambda ev: nu.sqrt(ev[:,0]**2.+ev[:,3]**2.)
+        evs= self._eventsOfType('pericenter')
+        if not evs is None:
+            for ii, ev in enumerate(evs):
+                if ev is None or len(ev) == 0: continue
+                rperi[ii]= min(rperi[ii],nu.amin(evrs(ev)))
+        evs= self._eventsOfType('apocenter')
+        if not evs is None:
+            for ii, ev in enumerate(evs):
+                if ev is None or len(ev) == 0: continue
+                rap[ii]= max(rap[ii],nu.amax(evrs(ev)))
+        return (rperi,rap)
+
+    def _rperirap_analytic(self,pot=None):
+        """Pericenter and apocenter radii [N] calculated analytically with actionAngleAdiabatic (which finds the roots one orbit at a time)"""
+        self._setupaA(pot=pot,type='adiabatic')
+        vxvv= self._aAvxvv()
+        out= nu.array([self._aA.calcRapRperi(*[v[ii] for v in vxvv[:5]])
+                       for ii in range(len(self))])
+        return (out[:,0],out[:,1])
+
+    def _parse_pot_kwarg(self,kwargs):
+        """Get the potential from the kwargs or from the integration"""
+        pot= kwargs.pop('pot',None)
+        if pot is None:
+            try:
+                pot= self._pot
+            except AttributeError:
+                raise AttributeError("Integrate orbits or specify pot=")
+        elif self.dim() == 2:
+            pot= toPlanarPotential(pot)
+        return pot
+
+    def _evaluatePotentials(self,pot,R,z,phi,*args):
+        """Evaluate the potential, looping over times and vectorized over orbits"""
+        if len(args) > 0:
+            t= args[0]
+            if _APY_LOADED and isinstance(t,units.Quantity):
+                t= t.to(units.Gyr).value\
+                    /bovy_conversion.time_in_Gyr(self._vo,self._ro)
+        else:
+            t= 0.
+        if len(R.shape) == 1:
+            if self.dim() == 2:
+                return _evaluateplanarPotentials(pot,R,phi=phi,t=t)
+            else:
+                return _evaluatePotentials(pot,R,z,phi=phi,t=t)
+        out= nu.empty_like(R)
+        for ii in range(R.shape[1]):
+            if self.dim() == 2:
+                out[:,ii]= _evaluateplanarPotentials(pot,R[:,ii],
+                                                    phi=phi[:,ii],t=t[ii])
+            else:
+                out[:,ii]= _evaluatePotentials(pot,R[:,ii],z[:,ii],
+                                               phi=phi[:,ii],t=t[ii])
+        return out
+
+    @physical_conversion('angle_deg')
+    def ra(self,*args,**kwargs):
+        """
+        NAME:
+
+           ra
+
+        PURPOSE:
+
+           return the right ascension
+
+        INPUT:
+
+           t - (optional) time at which to get ra (can be Quantity)
+
+           obs=[X,Y,Z] - (optional) position of observer (in kpc; entries can be Quantity) (default=[8.0,0.,0.])
+           Y is ignored and always assumed to be zero
+
+           ro= (Object-wide default) physical scale for distances to use to convert (can be Quantity)
+
+        OUTPUT:
+
+           ra(t) in deg [N] or [N,nt]
+
+        HISTORY:
+
+           2026-10-17 - Written
+
+        """
+        _check_roSet(self,kwargs,'ra')
+        l,b,d= self._lbd(*args,**kwargs)
+        return coords.lb_to_radec(l.flatten(),b.flatten(),
+                                  degree=True)[:,0].reshape(l.shape)
+
+    @physical_conversion('angle_deg')
+    def dec(self,*args,**kwargs):
+        """
+        NAME:
+
+           dec
+
+        PURPOSE:
+
+           return the declination
+
+        INPUT:
+
+           t - (optional) time at which to get dec (can be Quantity)
+
+           obs=[X,Y,Z] - (optional) position of observer (in kpc; entries can be Quantity) (default=[8.0,0.,0.])
+           Y is ignored and always assumed to be zero
+
+           ro= (Object-wide default) physical scale for distances to use to convert (can be Quantity)
+
+        OUTPUT:
+
+           dec(t) in deg [N] or [N,nt]
+
+        HISTORY:
+
+           2026-10-17 - Written
+
+        """
+        _check_roSet(self,kwargs,'dec')
+        l,b,d= self._lbd(*args,**kwargs)
+        return coords.lb_to_radec(l.flatten(),b.flatten(),
+                                  degree=True)[:,1].reshape(l.shape)
+
+    @physical_conversion('angle_deg')
+    def ll(self,*args,**kwargs):
+        """
+        NAME:
+
+           ll
+
+        PURPOSE:
+
+           return Galactic longitude
+
+        INPUT:
+
+           t - (optional) time at which to get ll (can be Quantity)
+
+           obs=[X,Y,Z] - (optional) position of observer (in kpc; entries can be Quantity) (default=[8.0,0.,0.])
+           Y is ignored and always assumed to be zero
+
+           ro= (Object-wide default) physical scale for distances to use to convert (can be Quantity)
+
+        OUTPUT:
+
+           l(t) in deg [N] or [N,nt]
+
+        HISTORY:
+
+           2026-10-17 - Written
+
+        """
+        _check_roSet(self,kwargs,'ll')
+        return self._lbd(*args,**kwargs)[0]
+
+    @physical_conversion('angle_deg')
+    def bb(self,*args,**kwargs):
+        """
+        NAME:
+
+           bb
+
+        PURPOSE:
+
+           return Galactic latitude
+
+        INPUT:
+
+           t - (optional) time at which to get bb (can be Quantity)
+
+           obs=[X,Y,Z] - (optional) position of observer (in kpc; entries can be Quantity) (default=[8.0,0.,0.])
+           Y is ignored and always assumed to be zero
+
+           ro= (Object-wide default) physical scale for distances to use to convert (can be Quantity)
+
+        OUTPUT:
+
+           b(t) in deg [N] or [N,nt]
+
+        HISTORY:
+
+           2026-10-17 - Written
+
+        """
+        _check_roSet(self,kwargs,'bb')
+        return self._lbd(*args,**kwargs)[1]
+
+    @physical_conversion('position_kpc')
+    def dist(self,*args,**kwargs):
+        """
+        NAME:
+
+           dist
+
+        PURPOSE:
+
+           return distance from the observer in kpc
+
+        INPUT:
+
+           t - (optional) time at which to get dist (can be Quantity)
+
+           obs=[X,Y,Z] - (optional) position of observer (in kpc; entries can be Quantity) (default=[8.0,0.,0.])
+           Y is ignored and always assumed to be zero
+
+           ro= (Object-wide default) physical scale for distances to use to convert (can be Quantity)
+
+        OUTPUT:
+
+           dist(t) in kpc [N] or [N,nt]
+
+        HISTORY:
+
+           2026-10-17 - Written
+
+        """
+        _check_roSet(self,kwargs,'dist')
+        return self._lbd(*args,**kwargs)[2]
+
+    @physical_conversion('proper-motion_masyr')
+    def pmra(self,*args,**kwargs):
+        """
+        NAME:
+
+           pmra
+
+        PURPOSE:
+
+           return proper motion in right ascension (in mas/yr)
+
+        INPUT:
+
+           t - (optional) time at which to get pmra (can be Quantity)
+
+           obs=[X,Y,Z,vx,vy,vz] - (optional) position and velocity of observer
+                         in the Galactocentric frame
+                         (in kpc and km/s) (default=[8.0,0.,0.,0.,220.,0.]; entries can be Quantities)
+                         Y is ignored and always assumed to be zero
+
+           ro= (Object-wide default) physical scale for distances to use to convert (can be Quantity)
+
+           vo= (Object-wide default) physical scale for velocities to use to convert (can be Quantity)
+
+        OUTPUT:
+
+           pm_ra(t) in mas/yr [N] or [N,nt]
+
+        HISTORY:
+
+           2026-10-17 - Written
+
+        """
+        _check_roSet(self,kwargs,'pmra')
+        _check_voSet(self,kwargs,'pmra')
+        return self._pmrapmdec(*args,**kwargs)[0]
+
+    @physical_conversion('proper-motion_masyr')
+    def pmdec(self,*args,**kwargs):
+        """
+        NAME:
+
+           pmdec
+
+        PURPOSE:
+
+           return proper motion in declination (in mas/yr)
+
+        INPUT:
+
+           t - (optional) time at which to get pmdec (can be Quantity)
+
+           obs=[X,Y,Z,vx,vy,vz] - (optional) position and velocity of observer
+                         in the Galactocentric frame
+                         (in kpc and km/s) (default=[8.0,0.,0.,0.,220.,0.]; entries can be Quantities)
+                         Y is ignored and always assumed to be zero
+
+           ro= (Object-wide default) physical scale for distances to use to convert (can be Quantity)
+
+           vo= (Object-wide default) physical scale for velocities to use to convert (can be Quantity)
+
+        OUTPUT:
+
+           pm_dec(t) in mas/yr [N] or [N,nt]
+
+        HISTORY:
+
+           2026-10-17 - Written
+
+        """
+        _check_roSet(self,kwargs,'pmdec')
+        _check_voSet(self,kwargs,'pmdec')
+        return self._pmrapmdec(*args,**kwargs)[1]
+
+    @physical_conversion('proper-motion_masyr')
+    def pmll(self,*args,**kwargs):
+        """
+        NAME:
+
+           pmll
+
+        PURPOSE:
+
+           return proper motion in Galactic longitude (in mas/yr)
+
+        INPUT:
+
+           t - (optional) time at which to get pmll (can be Quantity)
+
+           obs=[X,Y,Z,vx,vy,vz] - (optional) position and velocity of observer
+                         in the Galactocentric frame
+                         (in kpc and km/s) (default=[8.0,0.,0.,0.,220.,0.]; entries can be Quantities)
+                         Y is ignored and always assumed to be zero
+
+           ro= (Object-wide default) physical scale for distances to use to convert (can be Quantity)
+
+           vo= (Object-wide default) physical scale for velocities to use to convert (can be Quantity)
+
+        OUTPUT:
+
+           pm_l(t) in mas/yr [N] or [N,nt]
+
+        HISTORY:
+
+           2026-10-17 - Written
+
+        """
+        _check_roSet(self,kwargs,'pmll')
+        _check_voSet(self,kwargs,'pmll')
+        return self._lbdvrpmllpmbb(*args,**kwargs)[4]
+
+    @physical_conversion('proper-motion_masyr')
+    def pmbb(self,*args,**kwargs):
+        """
+        NAME:
+
+           pmbb
+
+        PURPOSE:
+
+           return proper motion in Galactic latitude (in mas/yr)
+
+        INPUT:
+
+           t - (optional) time at which to get pmbb (can be Quantity)
+
+           obs=[X,Y,Z,vx,vy,vz] - (optional) position and velocity of observer
+                         in the Galactocentric frame
+                         (in kpc and km/s) (default=[8.0,0.,0.,0.,220.,0.]; entries can be Quantities)
+                         Y is ignored and always assumed to be zero
+
+           ro= (Object-wide default) physical scale for distances to use to convert (can be Quantity)
+
+           vo= (Object-wide default) physical scale for velocities to use to convert (can be Quantity)
+
+        OUTPUT:
+
+           pm_b(t) in mas/yr [N] or [N,nt]
+
+        HISTORY:
+
+           2026-10-17 - Written
+
+        """
+        _check_roSet(self,kwargs,'pmbb')
+        _check_voSet(self,kwargs,'pmbb')
+        return self._lbdvrpmllpmbb(*args,**kwargs)[5]
+
+    @physical_conversion('velocity_kms')
+    def vlos(self,*args,**kwargs):
+        """
+        NAME:
+
+           vlos
+
+        PURPOSE:
+
+           return the line-of-sight velocity (in km/s)
+
+        INPUT:
+
+           t - (optional) time at which to get vlos (can be Quantity)
+
+           obs=[X,Y,Z,vx,vy,vz] - (optional) position and velocity of observer
+                         in the Galactocentric frame
+                         (in kpc and km/s) (default=[8.0,0.,0.,0.,220.,0.]; entries can be Quantities)
+                         Y is ignored and always assumed to be zero
+
+           ro= (Object-wide default) physical scale for distances to use to convert (can be Quantity)
+
+           vo= (Object-wide default) physical scale for velocities to use to convert (can be Quantity)
+
+        OUTPUT:
+
+           vlos(t) in km/s [N] or [N,nt]
+
+        HISTORY:
+
+           2026-10-17 - Written
+
+        """
+        _check_roSet(self,kwargs,'vlos')
+        _check_voSet(self,kwargs,'vlos')
+        return self._lbdvrpmllpmbb(*args,**kwargs)[3]
+
+    @physical_conversion('velocity_kms')
+    def vra(self,*args,**kwargs):
+        """
+        NAME:
+
+           vra
+
+        PURPOSE:
+
+           return velocity in right ascension (km/s)
+
+        INPUT:
+
+           t - (optional) time at which to get vra (can be Quantity)
+
+           obs=[X,Y,Z,vx,vy,vz] - (optional) position and velocity of observer
+                         in the Galactocentric frame
+                         (in kpc and km/s) (default=[8.0,0.,0.,0.,220.,0.]; entries can be Quantities)
+                         Y is ignored and always assumed to be zero
+
+           ro= (Object-wide default) physical scale for distances to use to convert (can be Quantity)
+
+           vo= (Object-wide default) physical scale for velocities to use to convert (can be Quantity)
+
+        OUTPUT:
+
+           v_ra(t) in km/s [N] or [N,nt]
+
+        HISTORY:
+
+           2026-10-17 - Written
+
+        """
+        _check_roSet(self,kwargs,'vra')
+        _check_voSet(self,kwargs,'vra')
+        return self._vradec(*args,**kwargs)[0]
+
+    @physical_conversion('velocity_kms')
+    def vdec(self,*args,**kwargs):
+        """
+        NAME:
+
+           vdec
+
+        PURPOSE:
+
+           return velocity in declination (km/s)
+
+        INPUT:
+
+           t - (optional) time at which to get vdec (can be Quantity)
+
+           obs=[X,Y,Z,vx,vy,vz] - (optional) position and velocity of observer
+                         in the Galactocentric frame
+                         (in kpc and km/s) (default=[8.0,0.,0.,0.,220.,0.]; entries can be Quantities)
+                         Y is ignored and always assumed to be zero
+
+           ro= (Object-wide default) physical scale for distances to use to convert (can be Quantity)
+
+           vo= (Object-wide default) physical scale for velocities to use to convert (can be Quantity)
+
+        OUTPUT:
+
+           v_dec(t) in km/s [N] or [N,nt]
+
+        HISTORY:
+
+           2026-10-17 - Written
+
+        """
+        _check_roSet(self,kwargs,'vdec')
+        _check_voSet(self,kwargs,'vdec')
+        return self._vradec(*args,**kwargs)[1]
+
+    @physical_conversion('velocity_kms')
+    def vll(self,*args,**kwargs):
+        """
+        NAME:
+
+           vll
+
+        PURPOSE:
+
+           return velocity in Galactic longitude (km/s)
+
+        INPUT:
+
+           t - (optional) time at which to get vll (can be Quantity)
+
+           obs=[X,Y,Z,vx,vy,vz] - (optional) position and velocity of observer
+                         in the Galactocentric frame
+                         (in kpc and km/s) (default=[8.0,0.,0.,0.,220.,0.]; entries can be Quantities)
+                         Y is ignored and always assumed to be zero
+
+           ro= (Object-wide default) physical scale for distances to use to convert (can be Quantity)
+
+           vo= (Object-wide default) physical scale for velocities to use to convert (can be Quantity)
+
+        OUTPUT:
+
+           v_l(t) in km/s [N] or [N,nt]
+
+        HISTORY:
+
+           2026-10-17 - Written
+
+        """
+        _check_roSet(self,kwargs,'vll')
+        _check_voSet(self,kwargs,'vll')
+        lbdvrpmllpmbb= self._lbdvrpmllpmbb(*args,**kwargs)
+        return lbdvrpmllpmbb[2]*_K*lbdvrpmllpmbb[4]
+
+    @physical_conversion('velocity_kms')
+    def vbb(self,*args,**kwargs):
+        """
+        NAME:
+
+           vbb
+
+        PURPOSE:
+
+           return velocity in Galactic latitude (km/s)
+
+        INPUT:
+
+           t - (optional) time at which to get vbb (can be Quantity)
+
+           obs=[X,Y,Z,vx,vy,vz] - (optional) position and velocity of observer
+                         in the Galactocentric frame
+                         (in kpc and km/s) (default=[8.0,0.,0.,0.,220.,0.]; entries can be Quantities)
+                         Y is ignored and always assumed to be zero
+
+           ro= (Object-wide default) physical scale for distances to use to convert (can be Quantity)
+
+           vo= (Object-wide default) physical scale for velocities to use to convert (can be Quantity)
+
+        OUTPUT:
+
+           v_b(t) in km/s [N] or [N,nt]
+
+        HISTORY:
+
+           2026-10-17 - Written
+
+        """
+        _check_roSet(self,kwargs,'vbb')
+        _check_voSet(self,kwargs,'vbb')
+        lbdvrpmllpmbb= self._lbdvrpmllpmbb(*args,**kwargs)
+        return lbdvrpmllpmbb[2]*_K*lbdvrpmllpmbb[5]
+
+    @physical_conversion('position_kpc')
+    def helioX(self,*args,**kwargs):
+        """
+        NAME:
+
+           helioX
+
+        PURPOSE:
+
+           return Heliocentric Galactic rectangular x-coordinate (aka "X")
+
+        INPUT:
+
+           t - (optional) time at which to get X (can be Quantity)
+
+           obs=[X,Y,Z] - (optional) position of observer (in kpc; entries can be Quantity) (default=[8.0,0.,0.])
+           Y is ignored and always assumed to be zero
+
+           ro= (Object-wide default) physical scale for distances to use to convert (can be Quantity)
+
+        OUTPUT:
+
+           helioX(t) in kpc [N] or [N,nt]
+
+        HISTORY:
+
+           2026-10-17 - Written
+
+        """
+        _check_roSet(self,kwargs,'helioX')
+        return self._helioXYZ(*args,**kwargs)[0]
+
+    @physical_conversion('position_kpc')
+    def helioY(self,*args,**kwargs):
+        """
+        NAME:
+
+           helioY
+
+        PURPOSE:
+
+           return Heliocentric Galactic rectangular y-coordinate (aka "Y")
+
+        INPUT:
+
+           t - (optional) time at which to get Y (can be Quantity)
+
+           obs=[X,Y,Z] - (optional) position of observer (in kpc; entries can be Quantity) (default=[8.0,0.,0.])
+           Y is ignored and always assumed to be zero
+
+           ro= (Object-wide default) physical scale for distances to use to convert (can be Quantity)
+
+        OUTPUT:
+
+           helioY(t) in kpc [N] or [N,nt]
+
+        HISTORY:
+
+           2026-10-17 - Written
+
+        """
+        _check_roSet(self,kwargs,'helioY')
+        return self._helioXYZ(*args,**kwargs)[1]
+
+    @physical_conversion('position_kpc')
+    def helioZ(self,*args,**kwargs):
+        """
+        NAME:
+
+           helioZ
+
+        PURPOSE:
+
+           return Heliocentric Galactic rectangular z-coordinate (aka "Z")
+
+        INPUT:
+
+           t - (optional) time at which to get Z (can be Quantity)
+
+           obs=[X,Y,Z] - (optional) position of observer (in kpc; entries can be Quantity) (default=[8.0,0.,0.])
+           Y is ignored and always assumed to be zero
+
+           ro= (Object-wide default) physical scale for distances to use to convert (can be Quantity)
+
+        OUTPUT:
+
+           helioZ(t) in kpc [N] or [N,nt]
+
+        HISTORY:
+
+           2026-10-17 - Written
+
+        """
+        _check_roSet(self,kwargs,'helioZ')
+        return self._helioXYZ(*args,**kwargs)[2]
+
+    @physical_conversion('velocity_kms')
+    def U(self,*args,**kwargs):
+        """
+        NAME:
+
+           U
+
+        PURPOSE:
+
+           return Heliocentric Galactic rectangular x-velocity (aka "U")
+
+        INPUT:
+
+           t - (optional) time at which to get U (can be Quantity)
+
+           obs=[X,Y,Z,vx,vy,vz] - (optional) position and velocity of observer
+                         in the Galactocentric frame
+                         (in kpc and km/s) (default=[8.0,0.,0.,0.,220.,0.]; entries can be Quantities)
+                         Y is ignored and always assumed to be zero
+
+           ro= (Object-wide default) physical scale for distances to use to convert (can be Quantity)
+
+           vo= (Object-wide default) physical scale for velocities to use to convert (can be Quantity)
+
+        OUTPUT:
+
+           U(t) in km/s [N] or [N,nt]
+
+        HISTORY:
+
+           2026-10-17 - Written
+
+        """
+        _check_roSet(self,kwargs,'U')
+        _check_voSet(self,kwargs,'U')
+        return self._XYZvxvyvz(*args,**kwargs)[3]
+
+    @physical_conversion('velocity_kms')
+    def V(self,*args,**kwargs):
+        """
+        NAME:
+
+           V
+
+        PURPOSE:
+
+           return Heliocentric Galactic rectangular y-velocity (aka "V")
+
+        INPUT:
+
+           t - (optional) time at which to get V (can be Quantity)
+
+           obs=[X,Y,Z,vx,vy,vz] - (optional) position and velocity of observer
+                         in the Galactocentric frame
+                         (in kpc and km/s) (default=[8.0,0.,0.,0.,220.,0.]; entries can be Quantities)
+                         Y is ignored and always assumed to be zero
+
+           ro= (Object-wide default) physical scale for distances to use to convert (can be Quantity)
+
+           vo= (Object-wide default) physical scale for velocities to use to convert (can be Quantity)
+
+        OUTPUT:
+
+           V(t) in km/s [N] or [N,nt]
+
+        HISTORY:
+
+           2026-10-17 - Written
+
+        """
+        _check_roSet(self,kwargs,'V')
+        _check_voSet(self,kwargs,'V')
+        return self._XYZvxvyvz(*args,**kwargs)[4]
+
+    @physical_conversion('velocity_kms')
+    def W(self,*args,**kwargs):
+        """
+        NAME:
+
+           W
+
+        PURPOSE:
+
+           return Heliocentric Galactic rectangular z-velocity (aka "W")
+
+        INPUT:
+
+           t - (optional) time at which to get W (can be Quantity)
+
+           obs=[X,Y,Z,vx,vy,vz] - (optional) position and velocity of observer
+                         in the Galactocentric frame
+                         (in kpc and km/s) (default=[8.0,0.,0.,0.,220.,0.]; entries can be Quantities)
+                         Y is ignored and always assumed to be zero
+
+           ro= (Object-wide default) physical scale for distances to use to convert (can be Quantity)
+
+           vo= (Object-wide default) physical scale for velocities to use to convert (can be Quantity)
+
+        OUTPUT:
+
+           W(t) in km/s [N] or [N,nt]
+
+        HISTORY:
+
+           2026-10-17 - Written
+
+        """
+        _check_roSet(self,kwargs,'W')
+        _check_voSet(self,kwargs,'W')
+        return self._XYZvxvyvz(*args,**kwargs)[5]
+
+    def SkyCoord(self,*args,**kwargs):
+        """
+        NAME:
+
+           SkyCoord
+
+        PURPOSE:
+
+           return the positions of all orbits as an astropy SkyCoord
+
+        INPUT:
+
+           t - (optional) time at which to get the positions (can be Quantity)
+
+           obs=[X,Y,Z] - (optional) position of observer (in kpc; entries can be Quantity) (default=Object-wide default)
+           Y is ignored and always assumed to be zero
+
+           ro= (Object-wide default) physical scale for distances to use to convert (can be Quantity)
+
+        OUTPUT:
+
+           SkyCoord(t) of shape [N] or [N,nt]
+
+        HISTORY:
+
+           2026-10-17 - Written
+
+        """
+        _check_roSet(self,kwargs,'SkyCoord')
+        l,b,d= self._lbd(*args,**kwargs)
+        radec= coords.lb_to_radec(l.flatten(),b.flatten(),degree=True)
+        return coordinates.SkyCoord(radec[:,0].reshape(l.shape)*units.degree,
+                                    radec[:,1].reshape(l.shape)*units.degree,
+                                    distance=d*units.kpc,
+                                    frame='fk5',equinox='J2000')
+
+    def _helioXYZ(self,*args,**kwargs):
+        """Calculate heliocentric rectangular coordinates"""
+        obs, ro, vo= self._parse_radec_kwargs(kwargs)
+        thiso= self._call(*args,**kwargs)
+        shape= thiso[0].shape
+        if self.dim() == 2: z= nu.zeros(shape)
+        else: z= thiso[3]
+        XYZ= coords.galcencyl_to_XYZ(thiso[0].flatten(),thiso[-1].flatten(),
+                                     z.flatten(),
+                                     Xsun=obs[0]/ro,Zsun=obs[2]/ro)
+        return (XYZ[:,0].reshape(shape)*ro,
+                XYZ[:,1].reshape(shape)*ro,
+                XYZ[:,2].reshape(shape)*ro)
+
+    def _XYZvxvyvz(self,*args,**kwargs):
+        """Calculate X,Y,Z,U,V,W"""
+        obs, ro, vo= self._parse_radec_kwargs(kwargs,vel=True)
+        thiso= self._call(*args,**kwargs)
+        shape= thiso[0].shape
+        if self.dim() == 2:
+            z= nu.zeros(shape)
+            vz= nu.zeros(shape)
+        else:
+            z= thiso[3]
+            vz= thiso[4]
+        XYZ= coords.galcencyl_to_XYZ(thiso[0].flatten(),thiso[-1].flatten(),
+                                     z.flatten(),
+                                     Xsun=obs[0]/ro,Zsun=obs[2]/ro)
+        vXYZ= coords.galcencyl_to_vxvyvz(thiso[1].flatten(),
+                                         thiso[2].flatten(),
+                                         vz.flatten(),thiso[-1].flatten(),
+                                         vsun=nu.array(obs[3:6])/vo,
+                                         Xsun=obs[0]/ro,Zsun=obs[2]/ro)
+        return (XYZ[:,0].reshape(shape)*ro,
+                XYZ[:,1].reshape(shape)*ro,
+                XYZ[:,2].reshape(shape)*ro,
+                vXYZ[:,0].reshape(shape)*vo,
+                vXYZ[:,1].reshape(shape)*vo,
+                vXYZ[:,2].reshape(shape)*vo)
+
+    def _lbd(self,*args,**kwargs):
+        """Calculate l,b, and d"""
+        obs, ro, vo= self._parse_radec_kwargs(kwargs,dontpop=True)
+        X,Y,Z= self._helioXYZ(*args,**kwargs)
+        bad_indx= (X == 0.)*(Y == 0.)*(Z == 0.)
+        if True in bad_indx:
+            X[bad_indx]+= ro/10000.
+        lbd= coords.XYZ_to_lbd(X.flatten(),Y.flatten(),Z.flatten(),
+                               degree=True)
+        return (lbd[:,0].reshape(X.shape),
+                lbd[:,1].reshape(X.shape),
+                lbd[:,2].reshape(X.shape))
+
+    def _lbdvrpmllpmbb(self,*args,**kwargs):
+        """Calculate l,b,d,vr,pmll,pmbb"""
+        obs, ro, vo= self._parse_radec_kwargs(kwargs,dontpop=True)
+        X,Y,Z,vX,vY,vZ= self._XYZvxvyvz(*args,**kwargs)
+        bad_indx= (X == 0.)*(Y == 0.)*(Z == 0.)
+        if True in bad_indx:
+            X[bad_indx]+= ro/10000.
+        out= coords.rectgal_to_sphergal(X.flatten(),Y.flatten(),Z.flatten(),
+                                        vX.flatten(),vY.flatten(),vZ.flatten(),
+                                        degree=True)
+        return tuple([out[:,ii].reshape(X.shape) for ii in range(6)])
+
+    def _pmrapmdec(self,*args,**kwargs):
+        """Calculate pmra and pmdec"""
+        lbdvrpmllpmbb= self._lbdvrpmllpmbb(*args,**kwargs)
+        shape= lbdvrpmllpmbb[0].shape
+        out= coords.pmllpmbb_to_pmrapmdec(lbdvrpmllpmbb[4].flatten(),
+                                          lbdvrpmllpmbb[5].flatten(),
+                                          lbdvrpmllpmbb[0].flatten(),
+                                          lbdvrpmllpmbb[1].flatten(),
+                                          degree=True)
+        return (out[:,0].reshape(shape),out[:,1].reshape(shape))
+
+    def _vradec(self,*args,**kwargs):
+        """Calculate vra and vdec"""
+        lbdvrpmllpmbb= self._lbdvrpmllpmbb(*args,**kwargs)
+        shape= lbdvrpmllpmbb[0].shape
+        out= coords.pmllpmbb_to_pmrapmdec(lbdvrpmllpmbb[4].flatten(),
+                                          lbdvrpmllpmbb[5].flatten(),
+                                          lbdvrpmllpmbb[0].flatten(),
+                                          lbdvrpmllpmbb[1].flatten(),
+                                          degree=True)
+        return (lbdvrpmllpmbb[2]*_K*out[:,0].reshape(shape),
+                lbdvrpmllpmbb[2]*_K*out[:,1].reshape(shape))
+
+    def _parse_radec_kwargs(self,kwargs,vel=False,dontpop=False):
+        if 'obs' in kwargs:
+            obs= kwargs['obs']
+            if not dontpop:
+                kwargs.pop('obs')
+            if not isinstance(obs,(list,nu.ndarray)):
+                raise NotImplementedError("Orbits only supports an observer given as a list or array of [X,Y,Z(,vx,vy,vz)]")
+            obs= list(obs)
+            if len(obs) == 2:
+                obs= [obs[0],obs[1],0.]
+            elif len(obs) == 4:
+                obs= [obs[0],obs[1],0.,obs[2],obs[3],0.]
+            for ii in range(len(obs)):
+                if _APY_LOADED and isinstance(obs[ii],units.Quantity):
+                    if ii < 3:
+                        obs[ii]= obs[ii].to(units.kpc).value
+                    else:
+                        obs[ii]= obs[ii].to(units.km/units.s).value
+        else:
+            if vel:
+                obs= [self._ro,0.,self._zo,
+                      self._solarmotion[0],self._solarmotion[1]+self._vo,
+                      self._solarmotion[2]]
+            else:
+                obs= [self._ro,0.,self._zo]
+        if 'ro' in kwargs:
+            ro= kwargs['ro']
+            if _APY_LOADED and isinstance(ro,units.Quantity):
+                ro= ro.to(units.kpc).value
+            if not dontpop:
+                kwargs.pop('ro')
+        else:
+            ro= self._ro
+        if 'vo' in kwargs:
+            vo= kwargs['vo']
+            if _APY_LOADED and isinstance(vo,units.Quantity):
+                vo= vo.to(units.km/units.s).value
+            if not dontpop:
+                kwargs.pop('vo')
+        else:
+            vo= self._vo
+        return (obs,ro,vo)
+
+    @physical_conversion('action')
+    def jr(self,pot=None,**kwargs):
+        """
+        NAME:
+
+           jr
+
+        PURPOSE:
+
+           calculate the radial action of all orbits
+
+        INPUT:
+
+           pot - potential
+
+           type= ('adiabatic') type of actionAngle module to use
+
+              1) 'adiabatic'
+
+              2) 'staeckel'
+
+              3) 'isochroneApprox'
+
+              4) 'spherical'
+
+           +actionAngle module setup kwargs
+
+           ro= (Object-wide default) physical scale for distances to use to convert (can be Quantity)
+
+           vo= (Object-wide default) physical scale for velocities to use to convert (can be Quantity)
+
+           use_physical= use to override Object-wide default for using a physical scale for output
+
+        OUTPUT:
+
+           jr [N]
+
+        HISTORY:
+
+           2026-10-17 - Written
+
+        """
+        return self._actions(pot=pot,**kwargs)[0]
+
+    @physical_conversion('action')
+    def jp(self,pot=None,**kwargs):
+        """
+        NAME:
+
+           jp
+
+        PURPOSE:
+
+           calculate the azimuthal action of all orbits
+
+        INPUT:
+
+           pot - potential
+
+           type= ('adiabatic') type of actionAngle module to use (see jr)
+
+           +actionAngle module setup kwargs
+
+           ro= (Object-wide default) physical scale for distances to use to convert (can be Quantity)
+
+           vo= (Object-wide default) physical scale for velocities to use to convert (can be Quantity)
+
+           use_physical= use to override Object-wide default for using a physical scale for output
+
+        OUTPUT:
+
+           jp [N]
+
+        HISTORY:
+
+           2026-10-17 - Written
+
+        """
+        return self._actions(pot=pot,**kwargs)[1]
+
+    @physical_conversion('action')
+    def jz(self,pot=None,**kwargs):
+        """
+        NAME:
+
+           jz
+
+        PURPOSE:
+
+           calculate the vertical action of all orbits
+
+        INPUT:
+
+           pot - potential
+
+           type= ('adiabatic') type of actionAngle module to use (see jr)
+
+           +actionAngle module setup kwargs
+
+           ro= (Object-wide default) physical scale for distances to use to convert (can be Quantity)
+
+           vo= (Object-wide default) physical scale for velocities to use to convert (can be Quantity)
+
+           use_physical= use to override Object-wide default for using a physical scale for output
+
+        OUTPUT:
+
+           jz [N]
+
+        HISTORY:
+
+           2026-10-17 - Written
+
+        """
+        return self._actions(pot=pot,**kwargs)[2]
+
+    @physical_conversion('angle')
+    def wr(self,pot=None,**kwargs):
+        """
+        NAME:
+
+           wr
+
+        PURPOSE:
+
+           calculate the radial angle of all orbits
+
+        INPUT:
+
+           pot - potential
+
+           type= ('adiabatic') type of actionAngle module to use (see jr)
+
+           +actionAngle module setup kwargs
+
+        OUTPUT:
+
+           wr [N]
+
+        HISTORY:
+
+           2026-10-17 - Written
+
+        """
+        return self._actionsFreqsAngles(pot=pot,**kwargs)[6]
+
+    @physical_conversion('angle')
+    def wp(self,pot=None,**kwargs):
+        """
+        NAME:
+
+           wp
+
+        PURPOSE:
+
+           calculate the azimuthal angle of all orbits
+
+        INPUT:
+
+           pot - potential
+
+           type= ('adiabatic') type of actionAngle module to use (see jr)
+
+           +actionAngle module setup kwargs
+
+        OUTPUT:
+
+           wp [N]
+
+        HISTORY:
+
+           2026-10-17 - Written
+
+        """
+        return self._actionsFreqsAngles(pot=pot,**kwargs)[7]
+
+    @physical_conversion('angle')
+    def wz(self,pot=None,**kwargs):
+        """
+        NAME:
+
+           wz
+
+        PURPOSE:
+
+           calculate the vertical angle of all orbits
+
+        INPUT:
+
+           pot - potential
+
+           type= ('adiabatic') type of actionAngle module to use (see jr)
+
+           +actionAngle module setup kwargs
+
+        OUTPUT:
+
+           wz [N]
+
+        HISTORY:
+
+           2026-10-17 - Written
+
+        """
+        return self._actionsFreqsAngles(pot=pot,**kwargs)[8]
+
+    @physical_conversion('frequency')
+    def Or(self,pot=None,**kwargs):
+        """
+        NAME:
+
+           Or
+
+        PURPOSE:
+
+           calculate the radial frequency of all orbits
+
+        INPUT:
+
+           pot - potential
+
+           type= ('adiabatic') type of actionAngle module to use (see jr)
+
+           +actionAngle module setup kwargs
+
+           ro= (Object-wide default) physical scale for distances to use to convert (can be Quantity)
+
+           vo= (Object-wide default) physical scale for velocities to use to convert (can be Quantity)
+
+           use_physical= use to override Object-wide default for using a physical scale for output
+
+        OUTPUT:
+
+           Or [N]
+
+        HISTORY:
+
+           2026-10-17 - Written
+
+        """
+        return self._actionsFreqs(pot=pot,**kwargs)[3]
+
+    @physical_conversion('frequency')
+    def Op(self,pot=None,**kwargs):
+        """
+        NAME:
+
+           Op
+
+        PURPOSE:
+
+           calculate the azimuthal frequency of all orbits
+
+        INPUT:
+
+           pot - potential
+
+           type= ('adiabatic') type of actionAngle module to use (see jr)
+
+           +actionAngle module setup kwargs
+
+           ro= (Object-wide default) physical scale for distances to use to convert (can be Quantity)
+
+           vo= (Object-wide default) physical scale for velocities to use to convert (can be Quantity)
+
+           use_physical= use to override Object-wide default for using a physical scale for output
+
+        OUTPUT:
+
+           Op [N]
+
+        HISTORY:
+
+           2026-10-17 - Written
+
+        """
+        return self._actionsFreqs(pot=pot,**kwargs)[4]
+
+    @physical_conversion('frequency')
+    def Oz(self,pot=None,**kwargs):
+        """
+        NAME:
+
+           Oz
+
+        PURPOSE:
+
+           calculate the vertical frequency of all orbits
+
+        INPUT:
+
+           pot - potential
+
+           type= ('adiabatic') type of actionAngle module to use (see jr)
+
+           +actionAngle module setup kwargs
+
+           ro= (Object-wide default) physical scale for distances to use to convert (can be Quantity)
+
+           vo= (Object-wide default) physical scale for velocities to use to convert (can be Quantity)
+
+           use_physical= use to override Object-wide default for using a physical scale for output
+
+        OUTPUT:
+
+           Oz [N]
+
+        HISTORY:
+
+           2026-10-17 - Written
+
+        """
+        return self._actionsFreqs(pot=pot,**kwargs)[5]
+
+    @physical_conversion('time')
+    def Tr(self,pot=None,**kwargs):
+        """
+        NAME:
+
+           Tr
+
+        PURPOSE:
+
+           calculate the radial period of all orbits
+
+        INPUT:
+
+           pot - potential
+
+           type= ('adiabatic') type of actionAngle module to use (see jr)
+
+           +actionAngle module setup kwargs
+
+           ro= (Object-wide default) physical scale for distances to use to convert (can be Quantity)
+
+           vo= (Object-wide default) physical scale for velocities to use to convert (can be Quantity)
+
+           use_physical= use to override Object-wide default for using a physical scale for output
+
+        OUTPUT:
+
+           Tr [N]
+
+        HISTORY:
+
+           2026-10-17 - Written
+
+        """
+        return 2.*nu.pi/self._actionsFreqs(pot=pot,**kwargs)[3]
+
+    @physical_conversion('time')
+    def Tp(self,pot=None,**kwargs):
+        """
+        NAME:
+
+           Tp
+
+        PURPOSE:
+
+           calculate the azimuthal period of all orbits
+
+        INPUT:
+
+           pot - potential
+
+           type= ('adiabatic') type of actionAngle module to use (see jr)
+
+           +actionAngle module setup kwargs
+
+           ro= (Object-wide default) physical scale for distances to use to convert (can be Quantity)
+
+           vo= (Object-wide default) physical scale for velocities to use to convert (can be Quantity)
+
+           use_physical= use to override Object-wide default for using a physical scale for output
+
+        OUTPUT:
+
+           Tp [N]
+
+        HISTORY:
+
+           2026-10-17 - Written
+
+        """
+        return 2.*nu.pi/self._actionsFreqs(pot=pot,**kwargs)[4]
+
+    def TrTp(self,pot=None,**kwargs):
+        """
+        NAME:
+
+           TrTp
+
+        PURPOSE:
+
+           the 'ratio' between the radial and azimuthal period Tr/Tphi*pi of all orbits
+
+        INPUT:
+
+           pot - potential
+
+           type= ('adiabatic') type of actionAngle module to use (see jr)
+
+           +actionAngle module setup kwargs
+
+        OUTPUT:
+
+           Tr/Tp*pi [N]
+
+        HISTORY:
+
+           2026-10-17 - Written
+
+        """
+        acfs= self._actionsFreqs(pot=pot,**kwargs)
+        return acfs[4]/acfs[3]*nu.pi
+
+    @physical_conversion('time')
+    def Tz(self,pot=None,**kwargs):
+        """
+        NAME:
+
+           Tz
+
+        PURPOSE:
+
+           calculate the vertical period of all orbits
+
+        INPUT:
+
+           pot - potential
+
+           type= ('adiabatic') type of actionAngle module to use (see jr)
+
+           +actionAngle module setup kwargs
+
+           ro= (Object-wide default) physical scale for distances to use to convert (can be Quantity)
+
+           vo= (Object-wide default) physical scale for velocities to use to convert (can be Quantity)
+
+           use_physical= use to override Object-wide default for using a physical scale for output
+
+        OUTPUT:
+
+           Tz [N]
+
+        HISTORY:
+
+           2026-10-17 - Written
+
+        """
+        return 2.*nu.pi/self._actionsFreqs(pot=pot,**kwargs)[5]
+
+    def _actions(self,pot=None,**kwargs):
+        self._setupaA(pot=pot,**kwargs)
+        return self._aA(*self._aAvxvv(),use_physical=False)
+
+    def _actionsFreqs(self,pot=None,**kwargs):
+        self._setupaA(pot=pot,**kwargs)
+        return self._aA.actionsFreqs(*self._aAvxvv(),use_physical=False)
+
+    def _actionsFreqsAngles(self,pot=None,**kwargs):
+        self._setupaA(pot=pot,**kwargs)
+        return self._aA.actionsFreqsAngles(*self._aAvxvv(),use_physical=False)
+
+    def _aAvxvv(self):
+        """Initial conditions as the (R,vR,vT,z,vz,phi) that the actionAngle modules take"""
+        if self.dim() == 2:
+            zeros= nu.zeros(len(self))
+            return (self.vxvv[:,0],self.vxvv[:,1],self.vxvv[:,2],
+                    zeros,zeros,self.vxvv[:,3])
+        else:
+            return (self.vxvv[:,0],self.vxvv[:,1],self.vxvv[:,2],
+                    self.vxvv[:,3],self.vxvv[:,4],self.vxvv[:,5])
+
+    def _setupaA(self,pot=None,type='adiabatic',**kwargs):
+        """Set up the actionAngle module for all orbits (re-using a previous one if pot and type did not change)"""
+        for key in ['ro','vo','use_physical','quantity']:
+            kwargs.pop(key,None)
+        if pot is None:
+            try:
+                pot= self._pot
+            except AttributeError:
+                raise AttributeError("Integrate orbits or specify pot=")
+        _check_consistent_units(self,pot)
+        if hasattr(self,'_aA') and pot is self._aAPot \
+                and type == self._aAType and kwargs == self._aAKwargs:
+            return None
+        if type.lower() == 'adiabatic':
+            self._aA= actionAngle.actionAngleAdiabatic(pot=pot,**kwargs)
+        elif type.lower() == 'staeckel':
+            self._aA= actionAngle.actionAngleStaeckel(pot=pot,**kwargs)
+        elif type.lower() == 'isochroneapprox':
+            from galpy.actionAngle_src.actionAngleIsochroneApprox import actionAngleIsochroneApprox
+            self._aA= actionAngleIsochroneApprox(pot=pot,**kwargs)
+        elif type.lower() == 'spherical':
+            self._aA= actionAngle.actionAngleSpherical(pot=pot,**kwargs)
+        else:
+            raise ValueError("type= for Orbits actionAngle methods must be one of 'adiabatic', 'staeckel', 'isochroneapprox', or 'spherical'")
+        self._aAPot= pot
+        self._aAType= type
+        self._aAKwargs= kwargs
+        return None
+
+def _parse_obs_vxvv(vxvv,radec,lb,uvw,ro,vo,zo,vsolar):
+    """Convert observed [N,6] (or [N,4] for lb) coordinates to Galactocentric cylindrical coordinates in natural units"""
+    if radec:
+        ra, dec= vxvv[:,0], vxvv[:,1]
+        lb_out= coords.radec_to_lb(ra,dec,degree=True)
+        l, b= lb_out[:,0], lb_out[:,1]
+    elif vxvv.shape[1] == 4:
+        l, b= vxvv[:,0], nu.zeros(vxvv.shape[0])
+    else:
+        l, b= vxvv[:,0], vxvv[:,1]
+    if uvw:
+        XYZ= coords.lbd_to_XYZ(l,b,vxvv[:,2],degree=True)
+        X,Y,Z= XYZ[:,0], XYZ[:,1], XYZ[:,2]
+        vx= vxvv[:,3]
+        vy= vxvv[:,4]
+        vz= vxvv[:,5]
+    else:
+        if radec:
+            pmllpmbb= coords.pmrapmdec_to_pmllpmbb(vxvv[:,3],vxvv[:,4],ra,dec,
+                                                   degree=True)
+            pmll, pmbb= pmllpmbb[:,0], pmllpmbb[:,1]
+            d, vlos= vxvv[:,2], vxvv[:,5]
+        elif vxvv.shape[1] == 4:
+            pmll, pmbb= vxvv[:,2], nu.zeros(vxvv.shape[0])
+            d, vlos= vxvv[:,1], vxvv[:,3]
+        else:
+            pmll, pmbb= vxvv[:,3], vxvv[:,4]
+            d, vlos= vxvv[:,2], vxvv[:,5]
+        XYZvxvyvz= coords.sphergal_to_rectgal(l,b,d,vlos,pmll,pmbb,
+                                              degree=True)
+        X,Y,Z= XYZvxvyvz[:,0], XYZvxvyvz[:,1], XYZvxvyvz[:,2]
+        vx,vy,vz= XYZvxvyvz[:,3], XYZvxvyvz[:,4], XYZvxvyvz[:,5]
+    X= X/ro
+    Y= Y/ro
+    Z= Z/ro
+    vx= vx/vo
+    vy= vy/vo
+    vz= vz/vo
+    vsun= nu.array([0.,1.,0.,])+vsolar/vo
+    Rphiz= coords.XYZ_to_galcencyl(X,Y,Z,Zsun=zo/ro)
+    R, phi, z= Rphiz[:,0], Rphiz[:,1], Rphiz[:,2]
+    vRvTvz= coords.vxvyvz_to_galcencyl(vx,vy,vz,R,phi,z,vsun=vsun,
+                                       Xsun=1.,Zsun=zo/ro,galcen=True)
+    vR, vT, vz= vRvTvz[:,0], vRvTvz[:,1], vRvTvz[:,2]
+    if lb and vxvv.shape[1] == 4:
+        return nu.array([R,vR,vT,phi]).T
+    else:
+        return nu.array([R,vR,vT,z,vz,phi]).T
+
+def _integrateFullOrbits(vxvv,pot,t,method,dt,numcores,output=None,
+                         chunksize=10000,t0index=None):
+    """
+    NAME:
+       _integrateFullOrbits
+    PURPOSE:
+       integrate N orbits in a Phi(R,z,phi) potential
+    INPUT:
+       vxvv - [N,6] array with the initial conditions stacked like
+              [R,vR,vT,z,vz,phi]; vR outward!
+       pot - Potential instance
+       t - list of times at which to output (0 has to be in this!)
+       method - 'odeint', 'leapfrog', or one of the C integrators
+       dt - if set, force the integrator to use this basic stepsize; must be an integer divisor of output stepsize
+       numcores - number of OpenMP threads to use for the C integrators
+       output= (None) if set, filename of a .npy file to which the C integrators stream the orbits in chunks of chunksize output times
+       chunksize= (10000) number of output times in each chunk when using output=
+       t0index= (None) if set, the index of t=0 in the interior of the monotonic times t, from which the orbits are integrated backward and forward
+    OUTPUT:
+       [N,nt,6] array of [R,vR,vT,z,vz,phi] at each t (memory-mapped from the output file when output is set)
+    HISTORY:
+       2026-10-17 - Written
+       2026-10-17 - Added output and chunksize keywords
+    """
+    if not (ext_loaded and method.lower() in _C_METHODS and _check_c(pot)):
+        if not output is None:
+            raise ValueError("Streaming orbits to a file is only supported for the C integrators and potentials implemented in C")
+        # Fall back onto integrating the orbits one by one
+        return nu.array([_integrateFullOrbit(vxvv[ii],pot,t,method,dt,
+                                             t0index=t0index)
+                         for ii in range(vxvv.shape[0])])
+    warnings.warn("Using C implementation to integrate orbits",galpyWarning)
+    #go to the rectangular frame
+    this_vxvv= nu.array([vxvv[:,0]*nu.cos(vxvv[:,5]),
+                         vxvv[:,0]*nu.sin(vxvv[:,5]),
+                         vxvv[:,3],
+                         vxvv[:,1]*nu.cos(vxvv[:,5])
+                         -vxvv[:,2]*nu.sin(vxvv[:,5]),
+                         vxvv[:,2]*nu.cos(vxvv[:,5])
+                         +vxvv[:,1]*nu.sin(vxvv[:,5]),
+                         vxvv[:,4]]).T
+    if not output is None:
+        out= nu.lib.format.open_memmap(output,mode='w+',dtype=nu.float64,
+                                       shape=(vxvv.shape[0],len(t),6))
+        err= nu.zeros(len(this_vxvv),dtype=nu.int32)
+        for indx, tmp_out, msg in \
+                integrateFullOrbit_chunks_c(pot,this_vxvv,t,method,dt=dt,
+                                            numcores=numcores,
+                                            chunksize=chunksize):
+            out[:,indx]= _rect_to_cyl_orbits(tmp_out)
+            err= nu.maximum(err,msg)
+        _warn_integration_errors(err)
+        out.flush()
+        del out
+        return nu.load(output,mmap_mode='r+')
+    #integrate
+    tmp_out, msg= integrateFullOrbit_c(pot,this_vxvv,t,method,dt=dt,
+                                       numcores=numcores,t0index=t0index)
+    _warn_integration_errors(msg)
+    #go back to the cylindrical frame
+    return _rect_to_cyl_orbits(tmp_out)
+
+def _integrateOrbitsEvents(vxvv,pot,t,method,dt,events):
+    """
+    NAME:
+       _integrateOrbitsEvents
+    PURPOSE:
+       integrate N orbits one by one with the C integrators that detect events along each orbit
+    INPUT:
+       vxvv - [N,4] or [N,6] array with the initial conditions
+       pot - Potential instance (planar for [N,4] initial conditions)
+       t - list of times at which to output (0 has to be in this!)
+       method - 'odeint', 'leapfrog', or one of the C integrators
+       dt - if set, force the integrator to use this basic stepsize; must be an integer divisor of output stepsize
+       events - list of events to detect (see Orbit.integrate)
+    OUTPUT:
+       ([N,nt,ndim] array of the orbits, list with the events of each orbit as returned by Orbit.getEvents or None if the orbits were not integrated with C)
+    HISTORY:
+       2026-10-17 - Written
+    """
+    out= nu.empty((vxvv.shape[0],len(t),vxvv.shape[1]))
+    events_out= []
+    for ii in range(vxvv.shape[0]):
+        if vxvv.shape[1] == 4:
+            out[ii], msg, dense, thisevents= \
+                _integrateOrbit(vxvv[ii],pot,t,method,dt,events=events)
+        else:
+            out[ii], dense, thisevents= \
+                _integrateFullOrbit(vxvv[ii],pot,t,method,dt,events=events)
+        events_out.append(thisevents)
+    if any([thisevents is None for thisevents in events_out]):
+        events_out= None
+    return (out,events_out)
+
+def _warn_integration_errors(err):
+    """Warn when the C integrators returned a non-zero error code for any of the orbits"""
+    bad= nu.atleast_1d(err) != 0
+    if nu.any(bad):
+        warnings.warn("C integration returned a non-zero error code for %i of %i orbits (indices %s); these orbits are likely inaccurate" % (nu.sum(bad),len(bad),str(nu.arange(len(bad))[bad])),galpyWarning)
+    return None
+
+def _rect_to_cyl_orbits(tmp_out):
+    """Convert [N,nt,[x,y,z,vx,vy,vz]] to [N,nt,[R,vR,vT,z,vz,phi]]"""
+    R= nu.sqrt(tmp_out[:,:,0]**2.+tmp_out[:,:,1]**2.)
+    phi= nu.arctan2(tmp_out[:,:,1],tmp_out[:,:,0]) % (2.*nu.pi)
+    out= nu.empty_like(tmp_out)
+    out[:,:,0]= R
+    out[:,:,1]= tmp_out[:,:,3]*nu.cos(phi)+tmp_out[:,:,4]*nu.sin(phi)
+    out[:,:,2]= tmp_out[:,:,4]*nu.cos(phi)-tmp_out[:,:,3]*nu.sin(phi)
+    out[:,:,3]= tmp_out[:,:,2]
+    out[:,:,4]= tmp_out[:,:,5]
+    out[:,:,5]= phi
+    return out
+
+def _integrateOrbits(vxvv,pot,t,method,dt,numcores,t0index=None):
+    """
+    NAME:
+       _integrateOrbits
+    PURPOSE:
+       integrate N orbits in a Phi(R,phi) potential in the (R,phi)-plane
+    INPUT:
+       vxvv - [N,4] array with the initial conditions stacked like
+              [R,vR,vT,phi]; vR outward!
+       pot - (planar) Potential instance
+       t - list of times at which to output (0 has to be in this!)
+       method - 'odeint', 'leapfrog', or one of the C integrators
+       dt - if set, force the integrator to use this basic stepsize; must be an integer divisor of output stepsize
+       numcores - number of OpenMP threads to use for the C integrators
+       t0index= (None) if set, the index of t=0 in the interior of the monotonic times t, from which the orbits are integrated backward and forward
+    OUTPUT:
+       [N,nt,4] array of [R,vR,vT,phi] at each t
+    HISTORY:
+       2026-10-17 - Written
+    """
+    if not (ext_loaded and method.lower() in _C_METHODS and _check_c(pot)):
+        # Fall back onto integrating the orbits one by one
+        return nu.array([_integrateOrbit(vxvv[ii],pot,t,method,dt,
+                                         t0index=t0index)[0]
+                         for ii in range(vxvv.shape[0])])
+    warnings.warn("Using C implementation to integrate orbits",galpyWarning)
+    #go to the rectangular frame
+    this_vxvv= nu.array([vxvv[:,0]*nu.cos(vxvv[:,3]),
+                         vxvv[:,0]*nu.sin(vxvv[:,3]),
+                         vxvv[:,1]*nu.cos(vxvv[:,3])
+                         -vxvv[:,2]*nu.sin(vxvv[:,3]),
+                         vxvv[:,2]*nu.cos(vxvv[:,3])
+                         +vxvv[:,1]*nu.sin(vxvv[:,3])]).T
+    #integrate
+    tmp_out, msg= integratePlanarOrbit_c(pot,this_vxvv,t,method,dt=dt,
+                                         numcores=numcores,t0index=t0index)
+    _warn_integration_errors(msg)
+    #go back to the cylindrical frame
+    R= nu.sqrt(tmp_out[:,:,0]**2.+tmp_out[:,:,1]**2.)
+    phi= nu.arctan2(tmp_out[:,:,1],tmp_out[:,:,0]) % (2.*nu.pi)
+    out= nu.empty_like(tmp_out)
+    out[:,:,0]= R
+    out[:,:,1]= tmp_out[:,:,2]*nu.cos(phi)+tmp_out[:,:,3]*nu.sin(phi)
+    out[:,:,2]= tmp_out[:,:,3]*nu.cos(phi)-tmp_out[:,:,2]*nu.sin(phi)
+    out[:,:,3]= phi
+    return out
@@ -9,7 +9,8 @@ import galpy.util.bovy_plot as plot
 import galpy.util.bovy_symplecticode as symplecticode
 from galpy.orbit_src.FullOrbit import _integrateFullOrbit
 from galpy.util.bovy_conversion import physical_conversion
-from galpy.orbit_src.OrbitTop import OrbitTop
+from galpy.orbit_src.OrbitTop import OrbitTop, _integrate_twosided
+from galpy.orbit_src.integratePlanarOrbit import _parse_t0index
 class RZOrbit(OrbitTop):
     """Class that holds and integrates orbits in axisymetric potentials 
     in the (R,z) plane"""
@@ -51,7 +52,7 @@ class RZOrbit(OrbitTop):
                           ro=ro,zo=zo,vo=vo,solarmotion=solarmotion)
         return None
 
-    def integrate(self,t,pot,method='symplec4_c',dt=None):
+    def integrate(self,t,pot,method='symplec4_c',dt=None,t0index=None):
         """
         NAME:
            integrate
@@ -67,6 +68,7 @@ class RZOrbit(OrbitTop):
                    'rk6_c' for a 6-th order Runge-Kutta integrator in C
                    'dopr54_c' for a Dormand-Prince integrator in C (generally the fastest)
            dt= (None) if set, force the integrator to use this basic stepsize; must be an integer divisor of output stepsize
+           t0index= (None) if set, the index of t=0 in the interior of the monotonic times t; the orbit is then integrated backward and forward from the initial condition at t=0
         OUTPUT:
            (none) (get the actual orbit using getOrbit()
         HISTORY:
@@ -76,7 +78,8 @@ class RZOrbit(OrbitTop):
         if hasattr(self,'rs'): delattr(self,'rs')
         self.t= nu.array(t)
         self._pot= pot
-        self.orbit= _integrateRZOrbit(self.vxvv,pot,t,method,dt)
+        self.orbit= _integrateRZOrbit(self.vxvv,pot,t,method,dt,
+                                      t0index=t0index)
 
     @physical_conversion('energy')
     def E(self,*args,**kwargs):
@@ -448,7 +451,7 @@ class RZOrbit(OrbitTop):
             plot.bovy_plot(self.orbit[:,4],nu.array(self.EzJz)/self.EzJz[0],
                            *args,**kwargs)
 
-def _integrateRZOrbit(vxvv,pot,t,method,dt):
+def _integrateRZOrbit(vxvv,pot,t,method,dt,t0index=None):
     """
     NAME:
        _integrateRZOrbit
@@ -461,6 +464,7 @@ def _integrateRZOrbit(vxvv,pot,t,method,dt):
        t - list of times at which to output (0 has to be in this!)
        method - 'odeint' or 'leapfrog'
        dt - if set, force the integrator to use this basic stepsize; must be an integer divisor of output stepsize
+       t0index= (None) if set, the index of t=0 in the interior of the monotonic times t, from which the orbit is integrated backward and forward
     OUTPUT:
        [:,5] array of [R,vR,vT,z,vz] at each t
     HISTORY:
@@ -477,13 +481,20 @@ def _integrateRZOrbit(vxvv,pot,t,method,dt):
     if method.lower() == 'leapfrog' \
             or method.lower() == 'leapfrog_c' or method.lower() == 'rk4_c' \
             or method.lower() == 'rk6_c' or method.lower() == 'symplec4_c' \
-            or method.lower() == 'symplec6_c' or method.lower() == 'dopr54_c':
+            or method.lower() == 'symplec6_c' or method.lower() == 'dopr54_c' \
+            or method.lower() == 'symplec4_block_c' \
+            or method.lower() == 'symplec6_block_c':
         #We hack this by upgrading to a FullOrbit
         this_vxvv= nu.zeros(len(vxvv)+1)
         this_vxvv[0:len(vxvv)]= vxvv
-        tmp_out= _integrateFullOrbit(this_vxvv,pot,t,method,dt)
+        tmp_out= _integrateFullOrbit(this_vxvv,pot,t,method,dt,
+                                     t0index=t0index)
         #tmp_out is (nt,6)
         out= tmp_out[:,0:5]
+    elif _parse_t0index(t,t0index) > 0:
+        out= _integrate_twosided(lambda tt: _integrateRZOrbit(vxvv,pot,tt,
+                                                              method,dt),
+                                 t,_parse_t0index(t,t0index))
     elif method.lower() == 'odeint':
         l= vxvv[0]*vxvv[2]
         l2= l**2.
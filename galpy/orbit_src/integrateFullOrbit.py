@@ -8,7 +8,8 @@ from numpy.ctypeslib import ndpointer
 import os
 from galpy import potential
 from galpy.util import galpyWarning
-from galpy.orbit_src.integratePlanarOrbit import _parse_integrator, _parse_tol
+from galpy.orbit_src.integratePlanarOrbit import _parse_integrator, _parse_tol,\
+    _parse_events, _parse_pot_cached, _combine_parsed_pots, _parse_t0index
 #Find and load the library
 _lib= None
 outerr= None
@@ -36,8 +37,88 @@ if _lib is None: #pragma: no cover
     _ext_loaded= False
 else:
     _ext_loaded= True
+    #Declare the argument types of the C integrators once
+    _ndarrayFlags= ('C_CONTIGUOUS','WRITEABLE')
+    _lib.integrateFullOrbit.argtypes=\
+        [ctypes.c_int,
+         ndpointer(dtype=nu.float64,flags=_ndarrayFlags),
+         ctypes.c_int,
+         ndpointer(dtype=nu.float64,flags=_ndarrayFlags),
+         ctypes.c_int,
+         ctypes.c_int,
+         ndpointer(dtype=nu.int32,flags=_ndarrayFlags),
+         ndpointer(dtype=nu.float64,flags=_ndarrayFlags),
+         ctypes.c_double,
+         ctypes.c_double,
+         ctypes.c_double,
+         ctypes.c_int,
+         ndpointer(dtype=nu.float64,flags=_ndarrayFlags),
+         ndpointer(dtype=nu.int32,flags=_ndarrayFlags),
+         ctypes.c_int]
+    _lib.integrateFullOrbit_dense.argtypes=\
+        [ndpointer(dtype=nu.float64,flags=_ndarrayFlags),
+         ctypes.c_int,
+         ndpointer(dtype=nu.float64,flags=_ndarrayFlags),
+         ctypes.c_int,
+         ndpointer(dtype=nu.int32,flags=_ndarrayFlags),
+         ndpointer(dtype=nu.float64,flags=_ndarrayFlags),
+         ctypes.c_double,
+         ctypes.c_double,
+         ctypes.c_double,
+         ctypes.c_int,
+         ndpointer(dtype=nu.float64,flags=_ndarrayFlags),
+         ndpointer(dtype=nu.float64,flags=_ndarrayFlags),
+         ctypes.POINTER(ctypes.c_int),
+         ctypes.c_int,
+         ndpointer(dtype=nu.int32,flags=_ndarrayFlags),
+         ndpointer(dtype=nu.float64,flags=_ndarrayFlags),
+         ctypes.c_int,
+         ndpointer(dtype=nu.float64,flags=_ndarrayFlags),
+         ctypes.POINTER(ctypes.c_int),
+         ctypes.POINTER(ctypes.c_int),
+         ctypes.c_int]
+    _lib.integrateFullOrbit_dxdv.argtypes=\
+        [ctypes.c_int,
+         ndpointer(dtype=nu.float64,flags=_ndarrayFlags),
+         ctypes.c_int,
+         ndpointer(dtype=nu.float64,flags=_ndarrayFlags),
+         ctypes.c_int,
+         ndpointer(dtype=nu.int32,flags=_ndarrayFlags),
+         ndpointer(dtype=nu.float64,flags=_ndarrayFlags),
+         ctypes.c_double,
+         ctypes.c_double,
+         ctypes.c_double,
+         ctypes.c_int,
+         ndpointer(dtype=nu.float64,flags=_ndarrayFlags),
+         ndpointer(dtype=nu.int32,flags=_ndarrayFlags),
+         ctypes.c_int]
+    _lib.integrateFullOrbit_lyapunov.argtypes=\
+        [ctypes.c_int,
+         ndpointer(dtype=nu.float64,flags=_ndarrayFlags),
+         ctypes.c_int,
+         ndpointer(dtype=nu.float64,flags=_ndarrayFlags),
+         ctypes.c_int,
+         ndpointer(dtype=nu.int32,flags=_ndarrayFlags),
+         ndpointer(dtype=nu.float64,flags=_ndarrayFlags),
+         ctypes.c_double,
+         ctypes.c_double,
+         ctypes.c_double,
+         ctypes.c_int,
+         ndpointer(dtype=nu.float64,flags=_ndarrayFlags),
+         ndpointer(dtype=nu.int32,flags=_ndarrayFlags),
+         ctypes.c_int]
 
 def _parse_pot(pot,potforactions=False,potfortorus=False):
+    """Parse the potential so it can be fed to C, re-using the arguments of each potential that were cached when it was last parsed with the same parameters"""
+    if not isinstance(pot,list):
+        pot= [pot]
+    parser= lambda x: _parse_pot_nocache(x,potforactions=potforactions,
+                                         potfortorus=potfortorus)
+    return _combine_parsed_pots([_parse_pot_cached(p,('full',potforactions,
+                                                      potfortorus),parser)
+                                 for p in pot])
+
+def _parse_pot_nocache(pot,potforactions=False,potfortorus=False):
     """Parse the potential so it can be fed to C"""
     #Figure out what's in pot
     if not isinstance(pot,list):
@@ -80,6 +161,11 @@ def _parse_pot(pot,potforactions=False,potfortorus=False):
             pot_args.extend([p._j1zeros[ii] for ii in range(p._nzeros+1)])
             pot_args.extend([p._dj1zeros[ii] for ii in range(p._nzeros+1)])
             pot_args.extend([p._kp._amp,p._kp.alpha])
+            pot_args.extend([p._de_rmin,len(p._de_nodes[0][0]),
+                             len(p._de_nodes[1][0])])
+            for ii in range(2):
+                pot_args.extend(p._de_nodes[ii][0])
+                pot_args.extend(p._de_nodes[ii][1])
         elif isinstance(p,potential.FlattenedPowerPotential):
             pot_type.append(12)
             pot_args.extend([p._amp,p.alpha,p.q2,p.core2])
@@ -190,6 +276,15 @@ def _parse_pot(pot,potforactions=False,potfortorus=False):
             pot_args.extend([len(p._Cs), p._amp, p._N, p._sin_alpha, p._tan_alpha, p._r_ref, p._phi_ref,
                              p._Rs, p._H, p._omega])
             pot_args.extend(p._Cs)
+        elif isinstance(p,potential.interp3DPotential):
+            pot_type.append(28)
+            pot_args.extend(_parse_interp3d_pot(p))
+        elif isinstance(p,potential.FerrersPotential):
+            pot_type.append(29)
+            pot_args.extend(_parse_ferrers_pot(p))
+        elif isinstance(p,potential.MovingObjectPotential):
+            pot_type.append(30)
+            pot_args.extend(_parse_movingobject_pot(p))
         ############################## WRAPPERS ###############################
         elif isinstance(p,potential.DehnenSmoothWrapperPotential):
             pot_type.append(-1)
@@ -204,6 +299,37 @@ def _parse_pot(pot,potforactions=False,potfortorus=False):
     pot_args= nu.array(pot_args,dtype=nu.float64,order='C')
     return (npot,pot_type,pot_args)
 
+def _parse_interp3d_pot(p):
+    # Stand-alone parser for interp3DPotential, bc re-used
+    pot_args= [p._amp,int(p._logR),int(p._zsym),p._omegab,
+               len(p._xgrid),len(p._zgrid),p._nphi,
+               p._xgrid[0],p._xgrid[1]-p._xgrid[0],
+               p._zgrid[0],p._zgrid[1]-p._zgrid[0]]
+    pot_args.extend([nu.nan for ii in range(7)]) # for caching
+    pot_args.extend(nu.asarray(p._potGrid_splinecoeffs).flatten(order='C'))
+    return pot_args
+
+def _parse_ferrers_pot(p,glorder=50):
+    # Stand-alone parser for FerrersPotential, bc re-used
+    pot_args= [p._amp,p._a2,p._b2*p._a2,p._c2*p._a2,p.n,
+               nu.pi*p._rhoc_M*p.a**3*p._b*p._c,p._omegab,p._pa,glorder]
+    pot_args.extend([nu.nan for ii in range(13)]) # for caching
+    glx, glw= nu.polynomial.legendre.leggauss(glorder)
+    pot_args.extend(0.5*glx+0.5)
+    pot_args.extend(0.5*glw)
+    return pot_args
+
+def _parse_movingobject_pot(p):
+    # Stand-alone parser for MovingObjectPotential, bc re-used
+    pot_args= [p._amp,p._softening._softening_length,len(p._tbreak)-1]
+    pot_args.extend([nu.nan for ii in range(4)]) # for caching
+    pot_args.append(0) # index of the last interval used
+    pot_args.extend(p._tbreak)
+    pot_args.extend(p._xcoeffs.flatten(order='C'))
+    pot_args.extend(p._ycoeffs.flatten(order='C'))
+    pot_args.extend(p._zcoeffs.flatten(order='C'))
+    return pot_args
+
 def _parse_scf_pot(p,extra_amp=1.):
     # Stand-alone parser for SCF, bc re-used
     isNonAxi= p.isNonAxi
@@ -215,7 +341,8 @@ def _parse_scf_pot(p,extra_amp=1.):
     pot_args.extend([-1.,0,0,0,0,0,0])    
     return (24,pot_args)
 
-def integrateFullOrbit_c(pot,yo,t,int_method,rtol=None,atol=None,dt=None):
+def integrateFullOrbit_c(pot,yo,t,int_method,rtol=None,atol=None,dt=None,
+                         numcores=None,t0index=None):
     """
     NAME:
        integrateFullOrbit_c
@@ -223,145 +350,402 @@ def integrateFullOrbit_c(pot,yo,t,int_method,rtol=None,atol=None,dt=None):
        C integrate an ode for a FullOrbit
     INPUT:
        pot - Potential or list of such instances
-       yo - initial condition [q,p]
+       yo - initial condition [q,p]; can be a [N,6] array of initial conditions for N orbits that are integrated in a single call with the same potential and times
        t - set of times at which one wants the result
        int_method= 'leapfrog_c', 'rk4_c', 'rk6_c', 'symplec4_c'
        rtol, atol
        dt= (None) force integrator to use this stepsize (default is to automatically determine one))
+       numcores= (None) number of OpenMP threads to spread multiple orbits over (default: OpenMP's default, usually the number of cores)
+       t0index= (None) if set, the index of t=0 in the interior of the monotonic times t; the initial condition is then at t=0 and the orbits are integrated both backward and forward from it in the same call
     OUTPUT:
        (y,err)
-       y : array, shape (len(y0), len(t))
+       y : array, shape (len(t),6) or (N,len(t),6) for [N,6] yo
+       Array containing the value of y for each desired time in t, \
+       with the initial value y0 in the first row (or in row t0index).
+       err: error message, if not zero: 1 means maximum step reduction happened for adaptive integrators; array of shape (N,) with the error of each orbit for [N,6] yo
+    HISTORY:
+       2011-11-13 - Written - Bovy (IAS)
+       2026-10-17 - Allow multiple initial conditions to be integrated at once
+       2026-10-17 - Integrate multiple orbits in parallel with OpenMP
+       2026-10-17 - Integrate backward and forward from t=0 in the interior of t
+    """
+    rtol, atol= _parse_tol(rtol,atol)
+    npot, pot_type, pot_args= _parse_pot(pot)
+    int_method_c= _parse_integrator(int_method)
+    if dt is None: 
+        dt= -9999.99
+    if numcores is None:
+        numcores= -1
+
+    #Array requirements
+    scalarOut= len(nu.shape(yo)) == 1
+    yo= nu.require(nu.atleast_2d(yo),dtype=nu.float64,requirements=['C','W'])
+    t= nu.require(t,dtype=nu.float64,requirements=['C','W'])
+    nobj= yo.shape[0]
+
+    #Set up result and error arrays
+    result= nu.empty((nobj,len(t),6))
+    err= nu.zeros(nobj,dtype=nu.int32)
+
+    #Run the C code
+    _lib.integrateFullOrbit(ctypes.c_int(nobj),
+                            yo,
+                            ctypes.c_int(len(t)),
+                            t,
+                            ctypes.c_int(_parse_t0index(t,t0index)),
+                            ctypes.c_int(npot),
+                            pot_type,
+                            pot_args,
+                            ctypes.c_double(dt),
+                            ctypes.c_double(rtol),ctypes.c_double(atol),
+                            ctypes.c_int(numcores),
+                            result,
+                            err,
+                            ctypes.c_int(int_method_c))
+    
+    if nu.any(err == -10): #pragma: no cover
+        raise KeyboardInterrupt("Orbit integration interrupted by CTRL-C (SIGINT)")
+
+    if scalarOut:
+        return (result[0],int(err[0]))
+    else:
+        return (result,err)
+
+def integrateFullOrbit_chunks_c(pot,yo,t,int_method,rtol=None,atol=None,
+                                dt=None,numcores=None,chunksize=10000):
+    """
+    NAME:
+       integrateFullOrbit_chunks_c
+    PURPOSE:
+       C integrate an ode for a FullOrbit in chunks of output times, yielding the solution chunk by chunk such that the full solution never has to be held in memory
+    INPUT:
+       pot - Potential or list of such instances
+       yo - initial condition [q,p]; can be a [N,6] array of initial conditions for N orbits
+       t - set of times at which one wants the result
+       int_method= 'leapfrog_c', 'rk4_c', 'rk6_c', 'symplec4_c'
+       rtol, atol
+       dt= (None) force integrator to use this stepsize (default is to automatically determine one))
+       numcores= (None) number of OpenMP threads to spread multiple orbits over
+       chunksize= (10000) number of output times in each chunk
+    OUTPUT:
+       generator of (indx,y,err) for consecutive chunks, with
+       indx : slice of t that this chunk corresponds to
+       y : array, shape (len(t[indx]),6) or (N,len(t[indx]),6) for [N,6] yo
+       err: error message of this chunk, like for integrateFullOrbit_c
+    HISTORY:
+       2026-10-17 - Written
+    """
+    if chunksize < 1:
+        raise ValueError('chunksize for integrateFullOrbit_chunks_c must be at least 1')
+    scalarOut= len(nu.shape(yo)) == 1
+    this_yo= nu.array(nu.atleast_2d(yo),dtype=nu.float64)
+    t= nu.asarray(t,dtype=nu.float64)
+    start= 0
+    while start < len(t):
+        end= min(start+chunksize,len(t))
+        # Each chunk is started at the last time of the previous one
+        if start == 0:
+            tchunk= t[:end]
+        else:
+            tchunk= t[start-1:end]
+        if len(tchunk) == 1:
+            result= this_yo[:,nu.newaxis,:]
+            err= nu.zeros(len(this_yo),dtype=nu.int32)
+        else:
+            result, err= integrateFullOrbit_c(pot,this_yo,tchunk,int_method,
+                                              rtol=rtol,atol=atol,dt=dt,
+                                              numcores=numcores)
+            this_yo= result[:,-1].copy()
+            if start > 0:
+                result= result[:,1:]
+        if scalarOut:
+            yield (slice(start,end),result[0],int(err[0]))
+        else:
+            yield (slice(start,end),result,err)
+        start= end
+
+def integrateFullOrbit_stream_c(pot,yo,t,int_method,output,rtol=None,
+                                atol=None,dt=None,numcores=None,
+                                chunksize=10000):
+    """
+    NAME:
+       integrateFullOrbit_stream_c
+    PURPOSE:
+       C integrate an ode for a FullOrbit, streaming the solution to a memory-mapped .npy file or to a function, one chunk of output times at a time
+    INPUT:
+       pot - Potential or list of such instances
+       yo - initial condition [q,p]; can be a [N,6] array of initial conditions for N orbits
+       t - set of times at which one wants the result
+       int_method= 'leapfrog_c', 'rk4_c', 'rk6_c', 'symplec4_c'
+       output - filename of the .npy file to write the solution to or function output(t,y) that is called with each chunk of times and solution (with the shape of y as in integrateFullOrbit_chunks_c)
+       rtol, atol
+       dt= (None) force integrator to use this stepsize (default is to automatically determine one))
+       numcores= (None) number of OpenMP threads to spread multiple orbits over
+       chunksize= (10000) number of output times in each chunk
+    OUTPUT:
+       (y,err)
+       y : memory-mapped array of shape (len(t),6) or (N,len(t),6) for [N,6] yo when output is a filename, None otherwise
+       err: error message, if not zero: 1 means maximum step reduction happened for adaptive integrators in any chunk
+    HISTORY:
+       2026-10-17 - Written
+    """
+    scalarOut= len(nu.shape(yo)) == 1
+    t= nu.asarray(t,dtype=nu.float64)
+    if callable(output):
+        result= None
+    else:
+        if scalarOut: shape= (len(t),6)
+        else: shape= (len(yo),len(t),6)
+        result= nu.lib.format.open_memmap(output,mode='w+',
+                                          dtype=nu.float64,shape=shape)
+    if scalarOut: err= 0
+    else: err= nu.zeros(len(yo),dtype=nu.int32)
+    for indx, y, cerr in integrateFullOrbit_chunks_c(pot,yo,t,int_method,
+                                                     rtol=rtol,atol=atol,
+                                                     dt=dt,numcores=numcores,
+                                                     chunksize=chunksize):
+        err= nu.maximum(err,cerr)
+        if result is None:
+            output(t[indx],y)
+        elif scalarOut:
+            result[indx]= y
+        else:
+            result[:,indx]= y
+    if not result is None:
+        result.flush()
+    if scalarOut: err= int(err)
+    return (result,err)
+
+def integrateFullOrbit_dense_c(pot,yo,t,int_method,rtol=None,atol=None,dt=None,
+                         dense=True,events=None):
+    """
+    NAME:
+       integrateFullOrbit_dense_c
+    PURPOSE:
+       C integrate an ode for a FullOrbit and return its dense output and/or the events that happen along the orbit
+    INPUT:
+       pot - Potential or list of such instances
+       yo - initial condition [q,p]
+       t - set of times at which one wants the result
+       int_method= 'leapfrog_c', 'rk4_c', 'rk6_c', 'symplec4_c', 'symplec6_c', 'dopr54_c', 'symplec4_block_c', 'symplec6_block_c'
+       rtol, atol
+       dt= (None) force integrator to use this stepsize (default is to automatically determine one))
+       dense= (True) if True, return the dense output
+       events= (None) list of events to detect (see _parse_events)
+    OUTPUT:
+       (y,dense,events,err)
+       y : array, shape (len(t),6)
        Array containing the value of y for each desired time in t, \
        with the initial value y0 in the first row.
+       dense : array, shape (nsteps,2+5*6) with for each integration step the start time, the stepsize, and the coefficients of the interpolating polynomial (see _evaluate_dense); None if dense=False
+       events : list with for each requested event a tuple (t,y) of the times [nevent] and phase-space positions [nevent,6] of the events; None if events=None
        err: error message, if not zero: 1 means maximum step reduction happened for adaptive integrators
     HISTORY:
-       2011-11-13 - Written - Bovy (IAS)
+       2026-10-17 - Written
+       2026-10-17 - Added events
     """
     rtol, atol= _parse_tol(rtol,atol)
     npot, pot_type, pot_args= _parse_pot(pot)
     int_method_c= _parse_integrator(int_method)
     if dt is None: 
         dt= -9999.99
+    if events is None:
+        nevtypes, ev_types, ev_args= 0, nu.zeros(1,dtype=nu.int32), nu.zeros(1)
+    else:
+        nevtypes, ev_types, ev_args= _parse_events(events,6)
+
+    #Array requirements
+    yo= nu.require(yo,dtype=nu.float64,requirements=['C','W'])
+    t= nu.require(t,dtype=nu.float64,requirements=['C','W'])
 
-    #Set up result array
+    #Set up result and error arrays
     result= nu.empty((len(t),6))
     err= ctypes.c_int(0)
+    nsteps= ctypes.c_int(0)
+    nevents= ctypes.c_int(0)
 
-    #Set up the C code
-    ndarrayFlags= ('C_CONTIGUOUS','WRITEABLE')
-    integrationFunc= _lib.integrateFullOrbit
-    integrationFunc.argtypes= [ndpointer(dtype=nu.float64,flags=ndarrayFlags),
-                               ctypes.c_int,                             
-                               ndpointer(dtype=nu.float64,flags=ndarrayFlags),
-                               ctypes.c_int,
-                               ndpointer(dtype=nu.int32,flags=ndarrayFlags),
-                               ndpointer(dtype=nu.float64,flags=ndarrayFlags),
-                               ctypes.c_double,
-                               ctypes.c_double,
-                               ctypes.c_double,
-                               ndpointer(dtype=nu.float64,flags=ndarrayFlags),
-                               ctypes.POINTER(ctypes.c_int),
-                               ctypes.c_int]
-
-    #Array requirements, first store old order
-    f_cont= [yo.flags['F_CONTIGUOUS'],
-             t.flags['F_CONTIGUOUS']]
-    yo= nu.require(yo,dtype=nu.float64,requirements=['C','W'])
+    #Run the C code; when the initial guess of the number of steps or events
+    #is too small, run again with the actual number
+    maxsteps= 10*len(t)*dense
+    maxevents= len(t)*(nevtypes > 0)
+    while True:
+        dense_out= nu.empty((max(maxsteps,1),2+5*6))
+        events_out= nu.empty((max(maxevents,1),2+6))
+        _lib.integrateFullOrbit_dense(yo,
+                                  ctypes.c_int(len(t)),
+                                  t,
+                                  ctypes.c_int(npot),
+                                  pot_type,
+                                  pot_args,
+                                  ctypes.c_double(dt),
+                                  ctypes.c_double(rtol),ctypes.c_double(atol),
+                                  ctypes.c_int(maxsteps),
+                                  result,
+                                  dense_out,
+                                  ctypes.byref(nsteps),
+                                  ctypes.c_int(nevtypes),
+                                  ev_types,
+                                  ev_args,
+                                  ctypes.c_int(maxevents),
+                                  events_out,
+                                  ctypes.byref(nevents),
+                                  ctypes.byref(err),
+                                  ctypes.c_int(int_method_c))
+        if int(err.value) == -10: #pragma: no cover
+            raise KeyboardInterrupt("Orbit integration interrupted by CTRL-C (SIGINT)")
+        if (not dense or nsteps.value <= maxsteps) \
+                and nevents.value <= maxevents: break
+        if dense: maxsteps= nsteps.value
+        maxevents= nevents.value
+
+    if dense:
+        dense_out= dense_out[:nsteps.value]
+    else:
+        dense_out= None
+    if not events is None:
+        events_out= events_out[:nevents.value]
+        events_out= [(events_out[events_out[:,0] == ii,1],
+                      events_out[events_out[:,0] == ii,2:])
+                     for ii in range(nevtypes)]
+    else:
+        events_out= None
+    return (result,dense_out,events_out,err.value)
+
+def integrateFullOrbit_dxdv_c(pot,yo,dyo,t,int_method,rtol=None,atol=None,
+                                dt=None,numcores=None):
+    """
+    NAME:
+       integrateFullOrbit_dxdv_c
+    PURPOSE:
+       C integrate an ode for a FullOrbit+phase space volume dxdv (the tidal tensor is computed by finite differences of the forces)
+    INPUT:
+       pot - Potential or list of such instances
+       yo - initial condition [q,p]; can be a [N,6] array of initial conditions for N orbits that are integrated in a single call
+       dyo - initial condition [dq,dp]; [N,6] array when yo is [N,6]
+       t - set of times at which one wants the result
+       int_method= 'rk4_c', 'rk6_c', 'dopr54_c'
+       rtol, atol
+       dt= (None) force integrator to use this stepsize (default is to automatically determine one))
+       numcores= (None) number of OpenMP threads to spread multiple orbits over (default: OpenMP's default, usually the number of cores)
+    OUTPUT:
+       (y,err)
+       y : array, shape (len(t),12) or (N,len(t),12) for [N,6] yo
+       Array containing the value of y for each desired time in t, \
+       with the initial value y0 in the first row.
+       err: error message if not zero, 1: maximum step reduction happened for adaptive integrators; array of shape (N,) for [N,6] yo
+    HISTORY:
+       2011-11-13 - Written - Bovy (IAS)
+       2026-10-17 - Allow multiple initial conditions to be integrated at once in parallel
+    """
+    rtol, atol= _parse_tol(rtol,atol)
+    npot, pot_type, pot_args= _parse_pot(pot)
+    int_method_c= _parse_integrator(int_method)
+    if dt is None: 
+        dt= -9999.99
+    if numcores is None:
+        numcores= -1
+
+    #Array requirements
+    scalarOut= len(nu.shape(yo)) == 1
+    yo= nu.require(nu.hstack((nu.atleast_2d(yo),nu.atleast_2d(dyo))),
+                   dtype=nu.float64,requirements=['C','W'])
     t= nu.require(t,dtype=nu.float64,requirements=['C','W'])
-    result= nu.require(result,dtype=nu.float64,requirements=['C','W'])
+    nobj= yo.shape[0]
+
+    #Set up result and error arrays
+    result= nu.empty((nobj,len(t),12))
+    err= nu.zeros(nobj,dtype=nu.int32)
+
+    #Set up the C code
+    integrationFunc= _lib.integrateFullOrbit_dxdv
 
     #Run the C code
-    integrationFunc(yo,
+    integrationFunc(ctypes.c_int(nobj),
+                    yo,
                     ctypes.c_int(len(t)),
                     t,
                     ctypes.c_int(npot),
                     pot_type,
                     pot_args,
-                    ctypes.c_double(dt),
+                    ctypes.c_double(dt),                    
                     ctypes.c_double(rtol),ctypes.c_double(atol),
+                    ctypes.c_int(numcores),
                     result,
-                    ctypes.byref(err),
+                    err,
                     ctypes.c_int(int_method_c))
-    
-    if int(err.value) == -10: #pragma: no cover
-        raise KeyboardInterrupt("Orbit integration interrupted by CTRL-C (SIGINT)")
 
-    #Reset input arrays
-    if f_cont[0]: yo= nu.asfortranarray(yo)
-    if f_cont[1]: t= nu.asfortranarray(t)
+    if nu.any(err == -10): #pragma: no cover
+        raise KeyboardInterrupt("Orbit integration interrupted by CTRL-C (SIGINT)")
 
-    return (result,err.value)
+    if scalarOut:
+        return (result[0],int(err[0]))
+    else:
+        return (result,err)
 
-def integrateFullOrbit_dxdv_c(pot,yo,dyo,t,int_method,rtol=None,atol=None): #pragma: no cover because not included in v1, uncover when included
+def integrateFullOrbit_lyapunov_c(pot,yo,dyo,t,int_method,rtol=None,
+                                    atol=None,dt=None,numcores=None):
     """
     NAME:
-       integrateFullOrbit_dxdv_c
+       integrateFullOrbit_lyapunov_c
     PURPOSE:
-       C integrate an ode for a planarOrbit+phase space volume dxdv
+       C estimate the maximal Lyapunov exponent of orbits by integrating them together with a deviation vector that is renormalized at each time in t, without storing the orbits
     INPUT:
        pot - Potential or list of such instances
-       yo - initial condition [q,p]
-       dyo - initial condition [dq,dp]
-       t - set of times at which one wants the result
-       int_method= 'leapfrog_c', 'rk4_c', 'rk6_c', 'symplec4_c'
+       yo - initial condition [q,p]; can be a [N,6] array of initial conditions for N orbits that are integrated in a single call
+       dyo - initial deviation vector [dq,dp]; [N,6] array when yo is [N,6]
+       t - set of times at which to renormalize the deviation vector and estimate the Lyapunov exponent
+       int_method= 'rk4_c', 'rk6_c', 'dopr54_c'
        rtol, atol
+       dt= (None) force integrator to use this stepsize (default is to automatically determine one))
+       numcores= (None) number of OpenMP threads to spread multiple orbits over (default: OpenMP's default, usually the number of cores)
     OUTPUT:
-       (y,err)
-       y : array, shape (len(y0), len(t))
-       Array containing the value of y for each desired time in t, \
-       with the initial value y0 in the first row.
-       err: error message if not zero, 1: maximum step reduction happened for adaptive integrators
+       (lyap,err)
+       lyap : array, shape (len(t)) or (N,len(t)) for [N,6] yo with the finite-time estimate of the maximal Lyapunov exponent at each time in t
+       err: error message if not zero, 1: maximum step reduction happened for adaptive integrators; array of shape (N,) for [N,6] yo
     HISTORY:
-       2011-11-13 - Written - Bovy (IAS)
+       2026-10-17 - Written
     """
     rtol, atol= _parse_tol(rtol,atol)
     npot, pot_type, pot_args= _parse_pot(pot)
     int_method_c= _parse_integrator(int_method)
-    yo= nu.concatenate((yo,dyo))
+    if dt is None: 
+        dt= -9999.99
+    if numcores is None:
+        numcores= -1
 
-    #Set up result array
-    result= nu.empty((len(t),12))
-    err= ctypes.c_int(0)
+    #Array requirements
+    scalarOut= len(nu.shape(yo)) == 1
+    yo= nu.require(nu.hstack((nu.atleast_2d(yo),nu.atleast_2d(dyo))),
+                   dtype=nu.float64,requirements=['C','W'])
+    t= nu.require(t,dtype=nu.float64,requirements=['C','W'])
+    nobj= yo.shape[0]
+
+    #Set up result and error arrays
+    lyap= nu.empty((nobj,len(t)))
+    err= nu.zeros(nobj,dtype=nu.int32)
 
     #Set up the C code
-    ndarrayFlags= ('C_CONTIGUOUS','WRITEABLE')
-    integrationFunc= _lib.integrateFullOrbit_dxdv
-    integrationFunc.argtypes= [ndpointer(dtype=nu.float64,flags=ndarrayFlags),
-                               ctypes.c_int,                             
-                               ndpointer(dtype=nu.float64,flags=ndarrayFlags),
-                               ctypes.c_int,
-                               ndpointer(dtype=nu.int32,flags=ndarrayFlags),
-                               ndpointer(dtype=nu.float64,flags=ndarrayFlags),
-                               ctypes.c_double,
-                               ctypes.c_double,
-                               ndpointer(dtype=nu.float64,flags=ndarrayFlags),
-                               ctypes.POINTER(ctypes.c_int),
-                               ctypes.c_int]
-
-    #Array requirements, first store old order
-    f_cont= [yo.flags['F_CONTIGUOUS'],
-             t.flags['F_CONTIGUOUS']]
-    yo= nu.require(yo,dtype=nu.float64,requirements=['C','W'])
-    t= nu.require(t,dtype=nu.float64,requirements=['C','W'])
-    result= nu.require(result,dtype=nu.float64,requirements=['C','W'])
+    integrationFunc= _lib.integrateFullOrbit_lyapunov
 
     #Run the C code
-    integrationFunc(yo,
+    integrationFunc(ctypes.c_int(nobj),
+                    yo,
                     ctypes.c_int(len(t)),
                     t,
                     ctypes.c_int(npot),
                     pot_type,
                     pot_args,
+                    ctypes.c_double(dt),                    
                     ctypes.c_double(rtol),ctypes.c_double(atol),
-                    result,
-                    ctypes.byref(err),
+                    ctypes.c_int(numcores),
+                    lyap,
+                    err,
                     ctypes.c_int(int_method_c))
 
-    if int(err.value) == -10: #pragma: no cover
+    if nu.any(err == -10): #pragma: no cover
         raise KeyboardInterrupt("Orbit integration interrupted by CTRL-C (SIGINT)")
 
-    #Reset input arrays
-    if f_cont[0]: yo= nu.asfortranarray(yo)
-    if f_cont[1]: t= nu.asfortranarray(t)
-
-    return (result,err.value)
+    if scalarOut:
+        return (lyap[0],int(err[0]))
+    else:
+        return (lyap,err)
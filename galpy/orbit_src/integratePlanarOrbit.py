@@ -6,6 +6,9 @@ import ctypes
 import ctypes.util
 from numpy.ctypeslib import ndpointer
 import os
+import numbers
+import zlib
+import weakref
 from galpy import potential, potential_src
 from galpy.util import galpyWarning
 #Find and load the library
@@ -35,10 +38,160 @@ if _lib is None: #pragma: no cover
     _ext_loaded= False
 else:
     _ext_loaded= True
+    #Declare the argument types of the C integrators once
+    _ndarrayFlags= ('C_CONTIGUOUS','WRITEABLE')
+    _lib.integratePlanarOrbit.argtypes=\
+        [ctypes.c_int,
+         ndpointer(dtype=nu.float64,flags=_ndarrayFlags),
+         ctypes.c_int,
+         ndpointer(dtype=nu.float64,flags=_ndarrayFlags),
+         ctypes.c_int,
+         ctypes.c_int,
+         ndpointer(dtype=nu.int32,flags=_ndarrayFlags),
+         ndpointer(dtype=nu.float64,flags=_ndarrayFlags),
+         ctypes.c_double,
+         ctypes.c_double,
+         ctypes.c_double,
+         ctypes.c_int,
+         ndpointer(dtype=nu.float64,flags=_ndarrayFlags),
+         ndpointer(dtype=nu.int32,flags=_ndarrayFlags),
+         ctypes.c_int]
+    _lib.integratePlanarOrbit_dense.argtypes=\
+        [ndpointer(dtype=nu.float64,flags=_ndarrayFlags),
+         ctypes.c_int,
+         ndpointer(dtype=nu.float64,flags=_ndarrayFlags),
+         ctypes.c_int,
+         ndpointer(dtype=nu.int32,flags=_ndarrayFlags),
+         ndpointer(dtype=nu.float64,flags=_ndarrayFlags),
+         ctypes.c_double,
+         ctypes.c_double,
+         ctypes.c_double,
+         ctypes.c_int,
+         ndpointer(dtype=nu.float64,flags=_ndarrayFlags),
+         ndpointer(dtype=nu.float64,flags=_ndarrayFlags),
+         ctypes.POINTER(ctypes.c_int),
+         ctypes.c_int,
+         ndpointer(dtype=nu.int32,flags=_ndarrayFlags),
+         ndpointer(dtype=nu.float64,flags=_ndarrayFlags),
+         ctypes.c_int,
+         ndpointer(dtype=nu.float64,flags=_ndarrayFlags),
+         ctypes.POINTER(ctypes.c_int),
+         ctypes.POINTER(ctypes.c_int),
+         ctypes.c_int]
+    _lib.integratePlanarOrbit_dxdv.argtypes=\
+        [ctypes.c_int,
+         ndpointer(dtype=nu.float64,flags=_ndarrayFlags),
+         ctypes.c_int,
+         ndpointer(dtype=nu.float64,flags=_ndarrayFlags),
+         ctypes.c_int,
+         ndpointer(dtype=nu.int32,flags=_ndarrayFlags),
+         ndpointer(dtype=nu.float64,flags=_ndarrayFlags),
+         ctypes.c_double,
+         ctypes.c_double,
+         ctypes.c_double,
+         ctypes.c_int,
+         ndpointer(dtype=nu.float64,flags=_ndarrayFlags),
+         ndpointer(dtype=nu.int32,flags=_ndarrayFlags),
+         ctypes.c_int]
+    _lib.integratePlanarOrbit_lyapunov.argtypes=\
+        [ctypes.c_int,
+         ndpointer(dtype=nu.float64,flags=_ndarrayFlags),
+         ctypes.c_int,
+         ndpointer(dtype=nu.float64,flags=_ndarrayFlags),
+         ctypes.c_int,
+         ndpointer(dtype=nu.int32,flags=_ndarrayFlags),
+         ndpointer(dtype=nu.float64,flags=_ndarrayFlags),
+         ctypes.c_double,
+         ctypes.c_double,
+         ctypes.c_double,
+         ctypes.c_int,
+         ndpointer(dtype=nu.float64,flags=_ndarrayFlags),
+         ndpointer(dtype=nu.int32,flags=_ndarrayFlags),
+         ctypes.c_int]
+
+# Cache of the C arguments of each potential, such that repeated
+# integrations in the same potential only marshal the arguments once
+_parsed_pot_cache= weakref.WeakKeyDictionary()
+
+# Returned by _pot_fingerprint(unknown=_UNFINGERPRINTABLE) for attributes that
+# it cannot summarize
+_UNFINGERPRINTABLE= object()
+
+def _pot_fingerprint(obj,checksum=zlib.crc32,unknown=None):
+    """Summarize the parameters of a potential (or of one of its attributes) such that any change in them changes the fingerprint; arrays are summarized with checksum, evaluation caches are ignored, and objects that cannot be summarized are replaced by unknown"""
+    if isinstance(obj,(bool,numbers.Number,str)) or obj is None:
+        return obj
+    elif isinstance(obj,nu.ndarray):
+        return (obj.shape,obj.dtype.str,
+                checksum(nu.ascontiguousarray(obj)))
+    elif isinstance(obj,(list,tuple)):
+        return tuple([_pot_fingerprint(x,checksum=checksum,unknown=unknown)
+                      for x in obj])
+    elif isinstance(obj,dict):
+        return tuple([(k,_pot_fingerprint(obj[k],checksum=checksum,
+                                          unknown=unknown))
+                      for k in sorted(obj)])
+    elif isinstance(obj,(potential.Potential,
+                         potential_src.planarPotential.planarPotential)):
+        return (type(obj).__name__,
+                tuple([(k,_pot_fingerprint(v,checksum=checksum,
+                                           unknown=unknown))
+                       for k,v in sorted(obj.__dict__.items())
+                       if not 'cache' in k and not 'hash' in k]))
+    else: # e.g., Python-side interpolation objects, not passed to C
+        return unknown
+
+def _fingerprint_complete(fingerprint):
+    """Check that no part of a fingerprint computed with _pot_fingerprint(unknown=_UNFINGERPRINTABLE) had to be left out, such that the fingerprint identifies the potential"""
+    if fingerprint is _UNFINGERPRINTABLE:
+        return False
+    elif isinstance(fingerprint,tuple):
+        return all([_fingerprint_complete(x) for x in fingerprint])
+    else:
+        return True
+
+def _parse_pot_cached(p,key,parser):
+    """Return (npot,pot_type,pot_args) for a single potential p from the cache when its parameters have not changed since it was last parsed with parser, otherwise parse it and cache the result"""
+    # planar potentials are re-created from the same 3D potential, so
+    # cache on the underlying 3D potential
+    owner= getattr(p,'_Pot',p)
+    # Potentials without array parameters are parsed faster than
+    # their cache is checked
+    if not any([isinstance(v,nu.ndarray) for v in owner.__dict__.values()]):
+        return parser([p])
+    key= (type(p).__name__,)+key
+    fingerprint= _pot_fingerprint(p)
+    try:
+        cache= _parsed_pot_cache.setdefault(owner,{})
+    except TypeError: #pragma: no cover
+        return parser([p])
+    if key in cache and cache[key][0] == fingerprint:
+        return cache[key][1]
+    out= parser([p])
+    cache[key]= (fingerprint,out)
+    return out
+
+def _combine_parsed_pots(parsed):
+    """Combine the (npot,pot_type,pot_args) of individual potentials"""
+    npot= sum([x[0] for x in parsed])
+    pot_type= nu.ascontiguousarray(nu.concatenate([x[1] for x in parsed]),
+                                   dtype=nu.int32)
+    pot_args= nu.ascontiguousarray(nu.concatenate([x[2] for x in parsed]),
+                                   dtype=nu.float64)
+    return (npot,pot_type,pot_args)
 
 def _parse_pot(pot):
+    """Parse the potential so it can be fed to C, re-using the arguments of each potential that were cached when it was last parsed with the same parameters"""
+    if not isinstance(pot,list):
+        pot= [pot]
+    return _combine_parsed_pots([_parse_pot_cached(p,('planar',),
+                                                   _parse_pot_nocache)
+                                 for p in pot])
+
+def _parse_pot_nocache(pot):
     """Parse the potential so it can be fed to C"""
-    from galpy.orbit_src.integrateFullOrbit import _parse_scf_pot
+    from galpy.orbit_src.integrateFullOrbit import _parse_scf_pot, \
+        _parse_interp3d_pot, _parse_ferrers_pot, _parse_movingobject_pot
     #Figure out what's in pot
     if not isinstance(pot,list):
         pot= [pot]
@@ -119,6 +272,11 @@ def _parse_pot(pot):
             pot_args.extend([p._Pot._j1zeros[ii] for ii in range(p._Pot._nzeros+1)])
             pot_args.extend([p._Pot._dj1zeros[ii] for ii in range(p._Pot._nzeros+1)])
             pot_args.extend([p._Pot._kp._amp,p._Pot._kp.alpha])
+            pot_args.extend([p._Pot._de_rmin,len(p._Pot._de_nodes[0][0]),
+                             len(p._Pot._de_nodes[1][0])])
+            for ii in range(2):
+                pot_args.extend(p._Pot._de_nodes[ii][0])
+                pot_args.extend(p._Pot._de_nodes[ii][1])
         elif isinstance(p,potential_src.planarPotential.planarPotentialFromRZPotential) \
                 and isinstance(p._Pot,potential.FlattenedPowerPotential):
             pot_type.append(12)
@@ -232,6 +390,18 @@ def _parse_pot(pot):
             pot_args.extend([len(p._Pot._Cs), p._Pot._amp, p._Pot._N, p._Pot._sin_alpha,
                              p._Pot._tan_alpha, p._Pot._r_ref, p._Pot._phi_ref, p._Pot._Rs, p._Pot._H, p._Pot._omega])
             pot_args.extend(p._Pot._Cs)
+        elif isinstance(p,potential_src.planarPotential.planarPotentialFromFullPotential) \
+                and isinstance(p._Pot,potential.interp3DPotential):
+            pot_type.append(28)
+            pot_args.extend(_parse_interp3d_pot(p._Pot))
+        elif (isinstance(p,potential_src.planarPotential.planarPotentialFromFullPotential) or isinstance(p,potential_src.planarPotential.planarPotentialFromRZPotential)) \
+                and isinstance(p._Pot,potential.FerrersPotential):
+            pot_type.append(29)
+            pot_args.extend(_parse_ferrers_pot(p._Pot))
+        elif isinstance(p,potential_src.planarPotential.planarPotentialFromFullPotential) \
+                and isinstance(p._Pot,potential.MovingObjectPotential):
+            pot_type.append(30)
+            pot_args.extend(_parse_movingobject_pot(p._Pot))
         ############################## WRAPPERS ###############################
         elif (isinstance(p,potential_src.planarPotential.planarPotentialFromFullPotential) or isinstance(p,potential_src.planarPotential.planarPotentialFromRZPotential)) \
                 and isinstance(p._Pot,potential.DehnenSmoothWrapperPotential):
@@ -259,10 +429,59 @@ def _parse_integrator(int_method):
         int_method_c= 4
     elif int_method.lower() == 'dopr54_c':
         int_method_c= 5
+    elif int_method.lower() == 'symplec4_block_c':
+        int_method_c= 6
+    elif int_method.lower() == 'symplec6_block_c':
+        int_method_c= 7
     else:
         int_method_c= 0
     return int_method_c
             
+def _parse_events(events,dim):
+    """parse the events to detect to pass to C; each event is either 'pericenter', 'apocenter', 'zcross' (z=0 crossing), 'zmax' (vertical turning point, vz=0), or a surface of section (c,offset[,direction]) defined as c.y = offset for the rectangular phase-space position y=[x,y,(z),vx,vy,(vz)], where direction is +1 (only crossings where c.y increases), -1 (only decreasing), or 0 (both; default)"""
+    ev_types= []
+    ev_args= []
+    for ev in events:
+        args= nu.zeros(dim+2)
+        if isinstance(ev,str):
+            if ev.lower() == 'pericenter':
+                ev_types.append(0)
+            elif ev.lower() == 'apocenter':
+                ev_types.append(1)
+            elif ev.lower() == 'zcross' and dim == 6:
+                ev_types.append(2)
+            elif ev.lower() == 'zmax' and dim == 6:
+                ev_types.append(3)
+            else:
+                raise ValueError("Event %s not understood or not available for %iD orbits" % (ev,dim//2))
+        else:
+            if len(ev[0]) != dim:
+                raise ValueError("Surface of section coefficients need to have the same length as the phase-space position (%i)" % dim)
+            ev_types.append(4)
+            args[:dim]= ev[0]
+            args[dim]= ev[1]
+            if len(ev) > 2:
+                args[dim+1]= nu.sign(ev[2])
+        ev_args.extend(args)
+    ev_types= nu.array(ev_types,dtype=nu.int32,order='C')
+    ev_args= nu.array(ev_args,dtype=nu.float64,order='C')
+    return (len(ev_types),ev_types,ev_args)
+
+def _parse_t0index(t,t0index=None):
+    """Check that t0index is the index of t=0 in the interior of the monotonic times t, such that the orbit can be integrated both backward and forward from the initial condition at t=0, and return it as an int; 0 when t0index is None (initial condition at t[0])"""
+    if t0index is None or t0index == 0:
+        return 0
+    t= nu.asarray(t)
+    if int(t0index) != t0index or t0index < 0 or t0index >= len(t)-1:
+        raise ValueError("t0index= must be the index of a time in the interior of t")
+    t0index= int(t0index)
+    if t[t0index] != 0.:
+        raise ValueError("t[t0index] must be 0 to integrate backward and forward from the initial condition at t=0")
+    dt= nu.diff(t)
+    if not (nu.all(dt > 0.) or nu.all(dt < 0.)):
+        raise ValueError("t must be monotonic to integrate backward and forward from the initial condition at t[t0index]=0")
+    return t0index
+
 def _parse_tol(rtol,atol):
     """Parse the tolerance keywords"""
     #Process atol and rtol
@@ -277,7 +496,7 @@ def _parse_tol(rtol,atol):
     return (rtol,atol)
 
 def integratePlanarOrbit_c(pot,yo,t,int_method,rtol=None,atol=None,
-                           dt=None):
+                           dt=None,numcores=None,t0index=None):
     """
     NAME:
        integratePlanarOrbit_c
@@ -285,78 +504,164 @@ def integratePlanarOrbit_c(pot,yo,t,int_method,rtol=None,atol=None,
        C integrate an ode for a planarOrbit
     INPUT:
        pot - Potential or list of such instances
-       yo - initial condition [q,p]
+       yo - initial condition [q,p]; can be a [N,4] array of initial conditions for N orbits that are integrated in a single call with the same potential and times
        t - set of times at which one wants the result
        int_method= 'leapfrog_c', 'rk4_c', 'rk6_c', 'symplec4_c'
        rtol, atol
        dt= (None) force integrator to use this stepsize (default is to automatically determine one))
+       numcores= (None) number of OpenMP threads to spread multiple orbits over (default: OpenMP's default, usually the number of cores)
+       t0index= (None) if set, the index of t=0 in the interior of the monotonic times t; the initial condition is then at t=0 and the orbits are integrated both backward and forward from it in the same call
     OUTPUT:
        (y,err)
-       y : array, shape (len(y0), len(t))
+       y : array, shape (len(t),4) or (N,len(t),4) for [N,4] yo
        Array containing the value of y for each desired time in t, \
-       with the initial value y0 in the first row.
-       err: error message, if not zero: 1 means maximum step reduction happened for adaptive integrators
+       with the initial value y0 in the first row (or in row t0index).
+       err: error message, if not zero: 1 means maximum step reduction happened for adaptive integrators; array of shape (N,) with the error of each orbit for [N,4] yo
     HISTORY:
        2011-10-03 - Written - Bovy (IAS)
+       2026-10-17 - Integrate multiple orbits in parallel with OpenMP
+       2026-10-17 - Integrate backward and forward from t=0 in the interior of t
     """
     rtol, atol= _parse_tol(rtol,atol)
     npot, pot_type, pot_args= _parse_pot(pot)
     int_method_c= _parse_integrator(int_method)
     if dt is None: 
         dt= -9999.99
+    if numcores is None:
+        numcores= -1
 
-    #Set up result array
-    result= nu.empty((len(t),4))
-    err= ctypes.c_int(0)
-
-    #Set up the C code
-    ndarrayFlags= ('C_CONTIGUOUS','WRITEABLE')
-    integrationFunc= _lib.integratePlanarOrbit
-    integrationFunc.argtypes= [ndpointer(dtype=nu.float64,flags=ndarrayFlags),
-                               ctypes.c_int,                             
-                               ndpointer(dtype=nu.float64,flags=ndarrayFlags),
-                               ctypes.c_int,
-                               ndpointer(dtype=nu.int32,flags=ndarrayFlags),
-                               ndpointer(dtype=nu.float64,flags=ndarrayFlags),
-                               ctypes.c_double,
-                               ctypes.c_double,
-                               ctypes.c_double,
-                               ndpointer(dtype=nu.float64,flags=ndarrayFlags),
-                               ctypes.POINTER(ctypes.c_int),
-                               ctypes.c_int]
-
-    #Array requirements, first store old order
-    f_cont= [yo.flags['F_CONTIGUOUS'],
-             t.flags['F_CONTIGUOUS']]
-    yo= nu.require(yo,dtype=nu.float64,requirements=['C','W'])
+    #Array requirements
+    scalarOut= len(nu.shape(yo)) == 1
+    yo= nu.require(nu.atleast_2d(yo),dtype=nu.float64,requirements=['C','W'])
     t= nu.require(t,dtype=nu.float64,requirements=['C','W'])
-    result= nu.require(result,dtype=nu.float64,requirements=['C','W'])
+    nobj= yo.shape[0]
+
+    #Set up result and error arrays
+    result= nu.empty((nobj,len(t),4))
+    err= nu.zeros(nobj,dtype=nu.int32)
 
     #Run the C code
-    integrationFunc(yo,
-                    ctypes.c_int(len(t)),
-                    t,
-                    ctypes.c_int(npot),
-                    pot_type,
-                    pot_args,
-                    ctypes.c_double(dt),                    
-                    ctypes.c_double(rtol),ctypes.c_double(atol),
-                    result,
-                    ctypes.byref(err),
-                    ctypes.c_int(int_method_c))
+    _lib.integratePlanarOrbit(ctypes.c_int(nobj),
+                              yo,
+                              ctypes.c_int(len(t)),
+                              t,
+                              ctypes.c_int(_parse_t0index(t,t0index)),
+                              ctypes.c_int(npot),
+                              pot_type,
+                              pot_args,
+                              ctypes.c_double(dt),
+                              ctypes.c_double(rtol),ctypes.c_double(atol),
+                              ctypes.c_int(numcores),
+                              result,
+                              err,
+                              ctypes.c_int(int_method_c))
 
-    if err.value == -10: #pragma: no cover
+    if nu.any(err == -10): #pragma: no cover
         raise KeyboardInterrupt("Orbit integration interrupted by CTRL-C (SIGINT)")
 
-    #Reset input arrays
-    if f_cont[0]: yo= nu.asfortranarray(yo)
-    if f_cont[1]: t= nu.asfortranarray(t)
+    if scalarOut:
+        return (result[0],int(err[0]))
+    else:
+        return (result,err)
+
+
+def integratePlanarOrbit_dense_c(pot,yo,t,int_method,rtol=None,atol=None,dt=None,
+                         dense=True,events=None):
+    """
+    NAME:
+       integratePlanarOrbit_dense_c
+    PURPOSE:
+       C integrate an ode for a planarOrbit and return its dense output and/or the events that happen along the orbit
+    INPUT:
+       pot - Potential or list of such instances
+       yo - initial condition [q,p]
+       t - set of times at which one wants the result
+       int_method= 'leapfrog_c', 'rk4_c', 'rk6_c', 'symplec4_c', 'symplec6_c', 'dopr54_c', 'symplec4_block_c', 'symplec6_block_c'
+       rtol, atol
+       dt= (None) force integrator to use this stepsize (default is to automatically determine one))
+       dense= (True) if True, return the dense output
+       events= (None) list of events to detect (see _parse_events)
+    OUTPUT:
+       (y,dense,events,err)
+       y : array, shape (len(t),4)
+       Array containing the value of y for each desired time in t, \
+       with the initial value y0 in the first row.
+       dense : array, shape (nsteps,2+5*4) with for each integration step the start time, the stepsize, and the coefficients of the interpolating polynomial (see _evaluate_dense); None if dense=False
+       events : list with for each requested event a tuple (t,y) of the times [nevent] and phase-space positions [nevent,4] of the events; None if events=None
+       err: error message, if not zero: 1 means maximum step reduction happened for adaptive integrators
+    HISTORY:
+       2026-10-17 - Written
+       2026-10-17 - Added events
+    """
+    rtol, atol= _parse_tol(rtol,atol)
+    npot, pot_type, pot_args= _parse_pot(pot)
+    int_method_c= _parse_integrator(int_method)
+    if dt is None: 
+        dt= -9999.99
+    if events is None:
+        nevtypes, ev_types, ev_args= 0, nu.zeros(1,dtype=nu.int32), nu.zeros(1)
+    else:
+        nevtypes, ev_types, ev_args= _parse_events(events,4)
+
+    #Array requirements
+    yo= nu.require(yo,dtype=nu.float64,requirements=['C','W'])
+    t= nu.require(t,dtype=nu.float64,requirements=['C','W'])
+
+    #Set up result and error arrays
+    result= nu.empty((len(t),4))
+    err= ctypes.c_int(0)
+    nsteps= ctypes.c_int(0)
+    nevents= ctypes.c_int(0)
 
-    return (result,err.value)
+    #Run the C code; when the initial guess of the number of steps or events
+    #is too small, run again with the actual number
+    maxsteps= 10*len(t)*dense
+    maxevents= len(t)*(nevtypes > 0)
+    while True:
+        dense_out= nu.empty((max(maxsteps,1),2+5*4))
+        events_out= nu.empty((max(maxevents,1),2+4))
+        _lib.integratePlanarOrbit_dense(yo,
+                                  ctypes.c_int(len(t)),
+                                  t,
+                                  ctypes.c_int(npot),
+                                  pot_type,
+                                  pot_args,
+                                  ctypes.c_double(dt),
+                                  ctypes.c_double(rtol),ctypes.c_double(atol),
+                                  ctypes.c_int(maxsteps),
+                                  result,
+                                  dense_out,
+                                  ctypes.byref(nsteps),
+                                  ctypes.c_int(nevtypes),
+                                  ev_types,
+                                  ev_args,
+                                  ctypes.c_int(maxevents),
+                                  events_out,
+                                  ctypes.byref(nevents),
+                                  ctypes.byref(err),
+                                  ctypes.c_int(int_method_c))
+        if int(err.value) == -10: #pragma: no cover
+            raise KeyboardInterrupt("Orbit integration interrupted by CTRL-C (SIGINT)")
+        if (not dense or nsteps.value <= maxsteps) \
+                and nevents.value <= maxevents: break
+        if dense: maxsteps= nsteps.value
+        maxevents= nevents.value
 
+    if dense:
+        dense_out= dense_out[:nsteps.value]
+    else:
+        dense_out= None
+    if not events is None:
+        events_out= events_out[:nevents.value]
+        events_out= [(events_out[events_out[:,0] == ii,1],
+                      events_out[events_out[:,0] == ii,2:])
+                     for ii in range(nevtypes)]
+    else:
+        events_out= None
+    return (result,dense_out,events_out,err.value)
 
 def integratePlanarOrbit_dxdv_c(pot,yo,dyo,t,int_method,rtol=None,atol=None,
-                                dt=None):
+                                dt=None,numcores=None):
     """
     NAME:
        integratePlanarOrbit_dxdv_c
@@ -364,57 +669,48 @@ def integratePlanarOrbit_dxdv_c(pot,yo,dyo,t,int_method,rtol=None,atol=None,
        C integrate an ode for a planarOrbit+phase space volume dxdv
     INPUT:
        pot - Potential or list of such instances
-       yo - initial condition [q,p]
-       dyo - initial condition [dq,dp]
+       yo - initial condition [q,p]; can be a [N,4] array of initial conditions for N orbits that are integrated in a single call
+       dyo - initial condition [dq,dp]; [N,4] array when yo is [N,4]
        t - set of times at which one wants the result
-       int_method= 'leapfrog_c', 'rk4_c', 'rk6_c', 'symplec4_c'
+       int_method= 'rk4_c', 'rk6_c', 'dopr54_c'
        rtol, atol
        dt= (None) force integrator to use this stepsize (default is to automatically determine one))
+       numcores= (None) number of OpenMP threads to spread multiple orbits over (default: OpenMP's default, usually the number of cores)
     OUTPUT:
        (y,err)
-       y : array, shape (len(y0), len(t))
+       y : array, shape (len(t),8) or (N,len(t),8) for [N,4] yo
        Array containing the value of y for each desired time in t, \
        with the initial value y0 in the first row.
-       err: error message if not zero, 1: maximum step reduction happened for adaptive integrators
+       err: error message if not zero, 1: maximum step reduction happened for adaptive integrators; array of shape (N,) for [N,4] yo
     HISTORY:
        2011-10-19 - Written - Bovy (IAS)
+       2026-10-17 - Allow multiple initial conditions to be integrated at once in parallel
     """
     rtol, atol= _parse_tol(rtol,atol)
     npot, pot_type, pot_args= _parse_pot(pot)
     int_method_c= _parse_integrator(int_method)
     if dt is None: 
         dt= -9999.99
-    yo= nu.concatenate((yo,dyo))
+    if numcores is None:
+        numcores= -1
 
-    #Set up result array
-    result= nu.empty((len(t),8))
-    err= ctypes.c_int(0)
+    #Array requirements
+    scalarOut= len(nu.shape(yo)) == 1
+    yo= nu.require(nu.hstack((nu.atleast_2d(yo),nu.atleast_2d(dyo))),
+                   dtype=nu.float64,requirements=['C','W'])
+    t= nu.require(t,dtype=nu.float64,requirements=['C','W'])
+    nobj= yo.shape[0]
+
+    #Set up result and error arrays
+    result= nu.empty((nobj,len(t),8))
+    err= nu.zeros(nobj,dtype=nu.int32)
 
     #Set up the C code
-    ndarrayFlags= ('C_CONTIGUOUS','WRITEABLE')
     integrationFunc= _lib.integratePlanarOrbit_dxdv
-    integrationFunc.argtypes= [ndpointer(dtype=nu.float64,flags=ndarrayFlags),
-                               ctypes.c_int,                             
-                               ndpointer(dtype=nu.float64,flags=ndarrayFlags),
-                               ctypes.c_int,
-                               ndpointer(dtype=nu.int32,flags=ndarrayFlags),
-                               ndpointer(dtype=nu.float64,flags=ndarrayFlags),
-                               ctypes.c_double,
-                               ctypes.c_double,
-                               ctypes.c_double,
-                               ndpointer(dtype=nu.float64,flags=ndarrayFlags),
-                               ctypes.POINTER(ctypes.c_int),
-                               ctypes.c_int]
-
-    #Array requirements, first store old order
-    f_cont= [yo.flags['F_CONTIGUOUS'],
-             t.flags['F_CONTIGUOUS']]
-    yo= nu.require(yo,dtype=nu.float64,requirements=['C','W'])
-    t= nu.require(t,dtype=nu.float64,requirements=['C','W'])
-    result= nu.require(result,dtype=nu.float64,requirements=['C','W'])
 
     #Run the C code
-    integrationFunc(yo,
+    integrationFunc(ctypes.c_int(nobj),
+                    yo,
                     ctypes.c_int(len(t)),
                     t,
                     ctypes.c_int(npot),
@@ -422,15 +718,83 @@ def integratePlanarOrbit_dxdv_c(pot,yo,dyo,t,int_method,rtol=None,atol=None,
                     pot_args,
                     ctypes.c_double(dt),                    
                     ctypes.c_double(rtol),ctypes.c_double(atol),
+                    ctypes.c_int(numcores),
                     result,
-                    ctypes.byref(err),
+                    err,
                     ctypes.c_int(int_method_c))
 
-    if err.value == -10: #pragma: no cover
+    if nu.any(err == -10): #pragma: no cover
         raise KeyboardInterrupt("Orbit integration interrupted by CTRL-C (SIGINT)")
 
-    #Reset input arrays
-    if f_cont[0]: yo= nu.asfortranarray(yo)
-    if f_cont[1]: t= nu.asfortranarray(t)
+    if scalarOut:
+        return (result[0],int(err[0]))
+    else:
+        return (result,err)
 
-    return (result,err.value)
+def integratePlanarOrbit_lyapunov_c(pot,yo,dyo,t,int_method,rtol=None,
+                                    atol=None,dt=None,numcores=None):
+    """
+    NAME:
+       integratePlanarOrbit_lyapunov_c
+    PURPOSE:
+       C estimate the maximal Lyapunov exponent of planar orbits by integrating them together with a deviation vector that is renormalized at each time in t, without storing the orbits
+    INPUT:
+       pot - Potential or list of such instances
+       yo - initial condition [q,p]; can be a [N,4] array of initial conditions for N orbits that are integrated in a single call
+       dyo - initial deviation vector [dq,dp]; [N,4] array when yo is [N,4]
+       t - set of times at which to renormalize the deviation vector and estimate the Lyapunov exponent
+       int_method= 'rk4_c', 'rk6_c', 'dopr54_c'
+       rtol, atol
+       dt= (None) force integrator to use this stepsize (default is to automatically determine one))
+       numcores= (None) number of OpenMP threads to spread multiple orbits over (default: OpenMP's default, usually the number of cores)
+    OUTPUT:
+       (lyap,err)
+       lyap : array, shape (len(t)) or (N,len(t)) for [N,4] yo with the finite-time estimate of the maximal Lyapunov exponent at each time in t
+       err: error message if not zero, 1: maximum step reduction happened for adaptive integrators; array of shape (N,) for [N,4] yo
+    HISTORY:
+       2026-10-17 - Written
+    """
+    rtol, atol= _parse_tol(rtol,atol)
+    npot, pot_type, pot_args= _parse_pot(pot)
+    int_method_c= _parse_integrator(int_method)
+    if dt is None: 
+        dt= -9999.99
+    if numcores is None:
+        numcores= -1
+
+    #Array requirements
+    scalarOut= len(nu.shape(yo)) == 1
+    yo= nu.require(nu.hstack((nu.atleast_2d(yo),nu.atleast_2d(dyo))),
+                   dtype=nu.float64,requirements=['C','W'])
+    t= nu.require(t,dtype=nu.float64,requirements=['C','W'])
+    nobj= yo.shape[0]
+
+    #Set up result and error arrays
+    lyap= nu.empty((nobj,len(t)))
+    err= nu.zeros(nobj,dtype=nu.int32)
+
+    #Set up the C code
+    integrationFunc= _lib.integratePlanarOrbit_lyapunov
+
+    #Run the C code
+    integrationFunc(ctypes.c_int(nobj),
+                    yo,
+                    ctypes.c_int(len(t)),
+                    t,
+                    ctypes.c_int(npot),
+                    pot_type,
+                    pot_args,
+                    ctypes.c_double(dt),                    
+                    ctypes.c_double(rtol),ctypes.c_double(atol),
+                    ctypes.c_int(numcores),
+                    lyap,
+                    err,
+                    ctypes.c_int(int_method_c))
+
+    if nu.any(err == -10): #pragma: no cover
+        raise KeyboardInterrupt("Orbit integration interrupted by CTRL-C (SIGINT)")
+
+    if scalarOut:
+        return (lyap[0],int(err[0]))
+    else:
+        return (lyap,err)
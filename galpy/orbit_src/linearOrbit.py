@@ -1,6 +1,7 @@
 import numpy as nu
 from scipy import integrate
-from galpy.orbit_src.OrbitTop import OrbitTop
+from galpy.orbit_src.OrbitTop import OrbitTop, _integrate_twosided
+from galpy.orbit_src.integratePlanarOrbit import _parse_t0index
 from galpy.potential_src.linearPotential import _evaluatelinearForces,\
     evaluatelinearPotentials
 import galpy.util.bovy_plot as plot
@@ -39,7 +40,7 @@ class linearOrbit(OrbitTop):
                           ro=ro,zo=None,vo=vo,solarmotion=None)
         return None
 
-    def integrate(self,t,pot,method='odeint',dt=None):
+    def integrate(self,t,pot,method='odeint',dt=None,t0index=None):
         """
         NAME:
            integrate
@@ -50,6 +51,7 @@ class linearOrbit(OrbitTop):
            pot - potential instance or list of instances
            method= 'odeint'= scipy's odeint, or 'leapfrog'
            dt= (None) if set, force the integrator to use this basic stepsize; must be an integer divisor of output stepsize (NOT USED FOR LINEAR ORBIT SO FAR)
+           t0index= (None) if set, the index of t=0 in the interior of the monotonic times t; the orbit is then integrated backward and forward from the initial condition at t=0
         OUTPUT:
            (none) (get the actual orbit using getOrbit()
         HISTORY:
@@ -58,7 +60,8 @@ class linearOrbit(OrbitTop):
         if hasattr(self,'_orbInterp'): delattr(self,'_orbInterp')
         self.t= nu.array(t)
         self._pot= pot
-        self.orbit= _integrateLinearOrbit(self.vxvv,pot,t,method)
+        self.orbit= _integrateLinearOrbit(self.vxvv,pot,t,method,
+                                          t0index=t0index)
 
     @physical_conversion('energy')
     def E(self,*args,**kwargs):
@@ -125,7 +128,7 @@ class linearOrbit(OrbitTop):
     def zmax(self): #pragma: no cover
         raise AttributeError("linearOrbit does not have a zmax")
 
-def _integrateLinearOrbit(vxvv,pot,t,method):
+def _integrateLinearOrbit(vxvv,pot,t,method,t0index=None):
     """
     NAME:
        integrateLinearOrbit
@@ -136,6 +139,7 @@ def _integrateLinearOrbit(vxvv,pot,t,method):
        pot - linearPotential or list of linearPotentials
        t - list of times at which to output (0 has to be in this!)
        method - 'odeint' or 'leapfrog'
+       t0index= (None) if set, the index of t=0 in the interior of the monotonic times t, from which the orbit is integrated backward and forward
     OUTPUT:
        [:,2] array of [x,vx] at each t
     HISTORY:
@@ -146,7 +150,11 @@ def _integrateLinearOrbit(vxvv,pot,t,method):
             method= 'leapfrog'
         else:
             method= 'odeint'
-    if method.lower() == 'leapfrog':
+    if _parse_t0index(t,t0index) > 0:
+        return _integrate_twosided(lambda tt: _integrateLinearOrbit(vxvv,pot,
+                                                                    tt,method),
+                                   t,_parse_t0index(t,t0index))
+    elif method.lower() == 'leapfrog':
         return symplecticode.leapfrog(lambda x,t=t: _evaluatelinearForces(pot,x,
                                                                          t=t),
                                       nu.array(vxvv),
@@ -4,7 +4,12 @@
 #include <stdio.h>
 #include <stdlib.h>
 #include <stdbool.h>
+#include <string.h>
 #include <math.h>
+#ifdef _OPENMP
+#include <omp.h>
+#endif
+#define CHUNKSIZE 1
 #include <bovy_symplecticode.h>
 #include <bovy_rk.h>
 //Potentials
@@ -99,7 +104,9 @@ void parse_leapFuncArgs_Full(int npot,
       potentialArgs->zforce= &DoubleExponentialDiskPotentialzforce;
       potentialArgs->phiforce= &ZeroForce;
       //Look at pot_args to figure out the number of arguments
-      potentialArgs->nargs= (int) (8 + 2 * *(pot_args+5) + 4 * ( *(pot_args+4) + 1 ));
+      potentialArgs->nargs= (int) (11 + 2 * *(pot_args+5) + 4 * ( *(pot_args+4) + 1 )
+				   + 2 * *(pot_args + 9 + 2 * (int) *(pot_args+5) + 4 * ( (int) *(pot_args+4) + 1 ))
+				   + 2 * *(pot_args + 10 + 2 * (int) *(pot_args+5) + 4 * ( (int) *(pot_args+4) + 1 )));
       break;
     case 12: //FlattenedPowerPotential, 4 arguments
       potentialArgs->Rforce= &FlattenedPowerPotentialRforce;
@@ -238,6 +245,25 @@ void parse_leapFuncArgs_Full(int npot,
       potentialArgs->Rphideriv = &SpiralArmsPotentialRphideriv;
       potentialArgs->nargs = (int) 10 + *pot_args;
       break;    
+    case 28: //interp3DPotential, 18 arguments + array of spline coefficients
+      potentialArgs->Rforce= &interp3DPotentialRforce;
+      potentialArgs->zforce= &interp3DPotentialzforce;
+      potentialArgs->phiforce= &interp3DPotentialphiforce;
+      potentialArgs->nargs= (int) (18 + *(pot_args+4) * *(pot_args+5)
+				   * *(pot_args+6));
+      break;
+    case 29: //FerrersPotential, 22 arguments + 2 x Gauss-Legendre order
+      potentialArgs->Rforce= &FerrersPotentialRforce;
+      potentialArgs->zforce= &FerrersPotentialzforce;
+      potentialArgs->phiforce= &FerrersPotentialphiforce;
+      potentialArgs->nargs= (int) (22 + 2 * *(pot_args+8));
+      break;
+    case 30: //MovingObjectPotential, 9 + 13 x number of intervals arguments
+      potentialArgs->Rforce= &MovingObjectPotentialRforce;
+      potentialArgs->zforce= &MovingObjectPotentialzforce;
+      potentialArgs->phiforce= &MovingObjectPotentialphiforce;
+      potentialArgs->nargs= (int) (9 + 13 * *(pot_args+2));
+      break;
 //////////////////////////////// WRAPPERS /////////////////////////////////////
     case -1: //DehnenSmoothWrapperPotential
       potentialArgs->Rforce= &DehnenSmoothWrapperPotentialRforce;
@@ -265,22 +291,45 @@ void parse_leapFuncArgs_Full(int npot,
   }
   potentialArgs-= npot;
 }
-void integrateFullOrbit(double *yo,
+void integrateFullOrbit(int nobj,
+			double *yo,
 			int nt, 
 			double *t,
+			int ti0,
 			int npot,
 			int * pot_type,
 			double * pot_args,
 			double dt,
 			double rtol,
 			double atol,
+			int nthreads,
 			double *result,
 			int * err,
 			int odeint_type){
   //Set up the forces, first count
+  int ii, tid;
   int dim;
-  struct potentialArg * potentialArgs= (struct potentialArg *) malloc ( npot * sizeof (struct potentialArg) );
-  parse_leapFuncArgs_Full(npot,potentialArgs,pot_type,pot_args);
+  //When the initial condition is in the interior of t (at index ti0), each
+  //object is integrated backward from t[ti0] to t[0] and forward from
+  //t[ti0] to t[nt-1], as separate tasks
+  int ntask= ( ti0 > 0 ) ? 2 * nobj : nobj;
+  //Use at most one thread per task
+#ifdef _OPENMP
+  if ( nthreads <= 0 )
+    nthreads= omp_get_max_threads();
+#else
+  nthreads= 1;
+#endif
+  if ( nthreads > ntask )
+    nthreads= ntask;
+  if ( nthreads < 1 )
+    nthreads= 1;
+  //Each thread gets its own copy of the potential, because some potentials
+  //cache intermediate results and interpolated potentials carry their own
+  //interpolation accelerators
+  struct potentialArg * potentialArgs= (struct potentialArg *) malloc ( nthreads * npot * sizeof (struct potentialArg) );
+  for (tid=0; tid < nthreads; tid++)
+    parse_leapFuncArgs_Full(npot,potentialArgs+tid*npot,pot_type,pot_args);
   //Integrate
   void (*odeint_func)(void (*func)(double, double *, double *,
 			   int, struct potentialArg *),
@@ -323,31 +372,119 @@ void integrateFullOrbit(double *yo,
     odeint_deriv_func= &evalRectDeriv;
     dim= 6;
     break;
+  case 6: //symplec4 with block timesteps
+    odeint_func= &symplec4_block;
+    odeint_deriv_func= &evalRectForce;
+    dim= 3;
+    break;
+  case 7: //symplec6 with block timesteps
+    odeint_func= &symplec6_block;
+    odeint_deriv_func= &evalRectForce;
+    dim= 3;
+    break;
+  }
+  // Handle KeyboardInterrupt gracefully
+  struct sigaction action;
+  memset(&action, 0, sizeof(struct sigaction));
+  action.sa_handler= handle_sigint;
+  sigaction(SIGINT,&action,NULL);
+  //Set up the backward integrations: reversed times, opposite fixed
+  //stepsize, and separate output that is stitched in below
+  double *tb= NULL, *resultb= NULL;
+  int *errb= NULL;
+  double dtb= ( dt == -9999.99 ) ? dt : -dt;
+  if ( ti0 > 0 ) {
+    tb= (double *) malloc ( (ti0+1) * sizeof(double) );
+    for (ii=0; ii <= ti0; ii++)
+      *(tb+ii)= *(t+ti0-ii);
+    resultb= (double *) malloc ( nobj * 6 * (ti0+1) * sizeof(double) );
+    errb= (int *) malloc ( nobj * sizeof(int) );
+  }
+  //Integrate all tasks, spread over the threads
+  UNUSED int chunk= CHUNKSIZE;
+#pragma omp parallel for schedule(dynamic,chunk) private(ii,tid) num_threads(nthreads)
+  for (ii=0; ii < ntask; ii++){
+#ifdef _OPENMP
+    tid= omp_get_thread_num();
+#else
+    tid= 0;
+#endif
+    if ( ii < nobj )
+      odeint_func(odeint_deriv_func,dim,yo+6*ii,nt-ti0,dt,t+ti0,npot,
+		  potentialArgs+tid*npot,rtol,atol,result+6*(nt*ii+ti0),
+		  err+ii);
+    else
+      odeint_func(odeint_deriv_func,dim,yo+6*(ii-nobj),ti0+1,dtb,tb,npot,
+		  potentialArgs+tid*npot,rtol,atol,
+		  resultb+6*(ti0+1)*(ii-nobj),errb+ii-nobj);
+  }
+  if ( ti0 > 0 ) {
+    int jj, kk;
+    for (ii=0; ii < nobj; ii++) {
+      for (jj=0; jj < ti0; jj++)
+	for (kk=0; kk < 6; kk++)
+	  *(result+6*(nt*ii+jj)+kk)= *(resultb+6*((ti0+1)*ii+ti0-jj)+kk);
+      if ( *(errb+ii) == -10 || *(err+ii) == 0 )
+	*(err+ii)= *(errb+ii);
+    }
+    free(tb);
+    free(resultb);
+    free(errb);
   }
-  odeint_func(odeint_deriv_func,dim,yo,nt,dt,t,npot,potentialArgs,rtol,atol,
-	      result,err);
+  // need to reset, bc library and vars stay in memory
+  interrupted= 0;
+  // Back to default handler
+  action.sa_handler= SIG_DFL;
+  sigaction(SIGINT,&action,NULL);
   //Free allocated memory
-  free_potentialArgs(npot,potentialArgs);
+  for (tid=0; tid < nthreads; tid++)
+    free_potentialArgs(npot,potentialArgs+tid*npot);
   free(potentialArgs);
   //Done!
 }
 // LCOV_EXCL_START
-void integrateOrbit_dxdv(double *yo,
-			 int nt, 
-			 double *t,
-			 int npot,
-			 int * pot_type,
-			 double * pot_args,
-			 double rtol,
-			 double atol,
-			 double *result,
-			 int * err,
-			 int odeint_type){
-  //Set up the forces, first count
-  int dim;
+void integrateFullOrbit_dense(double *yo,
+			      int nt, 
+			      double *t,
+			      int npot,
+			      int * pot_type,
+			      double * pot_args,
+			      double dt,
+			      double rtol,
+			      double atol,
+			      int maxsteps,
+			      double *result,
+			      double *dense_steps,
+			      int * nsteps,
+			      int nevtypes,
+			      int * evtypes,
+			      double * evargs,
+			      int maxevents,
+			      double *events,
+			      int * nevents,
+			      int * err,
+			      int odeint_type){
+  //Integrate a single orbit and store the interpolating polynomial of each
+  //step (at most maxsteps; nsteps is set to the number of steps that were
+  //taken) and the events (at most maxevents; nevents is set to the number
+  //of events that happened)
   struct potentialArg * potentialArgs= (struct potentialArg *) malloc ( npot * sizeof (struct potentialArg) );
   parse_leapFuncArgs_Full(npot,potentialArgs,pot_type,pot_args);
-  //Integrate
+  struct denseOutput dense;
+  dense.maxsteps= maxsteps;
+  dense.nsteps= 0;
+  dense.steps= dense_steps;
+  struct orbitEvents orbevents;
+  orbevents.ntypes= nevtypes;
+  orbevents.types= evtypes;
+  orbevents.args= evargs;
+  orbevents.maxevents= maxevents;
+  orbevents.nevents= 0;
+  orbevents.events= events;
+  dense.events= nevtypes > 0 ? &orbevents : NULL;
+  int dim;
+  void (*odeint_deriv_func)(double, double *, double *,
+			    int,struct potentialArg *);
   void (*odeint_func)(void (*func)(double, double *, double *,
 			   int, struct potentialArg *),
 		      int,
@@ -355,45 +492,233 @@ void integrateOrbit_dxdv(double *yo,
 		      int, double, double *,
 		      int, struct potentialArg *,
 		      double, double,
-		      double *,int *);
-  void (*odeint_deriv_func)(double, double *, double *,
-			    int,struct potentialArg *);
+		      double *,int *,struct denseOutput *);
   switch ( odeint_type ) {
   case 0: //leapfrog
-    odeint_func= &leapfrog;
+    odeint_func= &leapfrog_dense;
     odeint_deriv_func= &evalRectForce;
-    dim= 6;
+    dim= 3;
     break;
   case 1: //RK4
-    odeint_func= &bovy_rk4;
-    odeint_deriv_func= &evalRectDeriv_dxdv;
-    dim= 12;
+    odeint_func= &bovy_rk4_dense;
+    odeint_deriv_func= &evalRectDeriv;
+    dim= 6;
     break;
   case 2: //RK6
-    odeint_func= &bovy_rk6;
-    odeint_deriv_func= &evalRectDeriv_dxdv;
-    dim= 12;
+    odeint_func= &bovy_rk6_dense;
+    odeint_deriv_func= &evalRectDeriv;
+    dim= 6;
     break;
   case 3: //symplec4
-    odeint_func= &symplec4;
+    odeint_func= &symplec4_dense;
     odeint_deriv_func= &evalRectForce;
-    dim= 6;
+    dim= 3;
     break;
   case 4: //symplec6
-    odeint_func= &symplec6;
+    odeint_func= &symplec6_dense;
     odeint_deriv_func= &evalRectForce;
+    dim= 3;
+    break;
+  case 5: //DOPR54
+    odeint_func= &bovy_dopr54_dense;
+    odeint_deriv_func= &evalRectDeriv;
     dim= 6;
     break;
+  case 6: //symplec4 with block timesteps
+    odeint_func= &symplec4_block_dense;
+    odeint_deriv_func= &evalRectForce;
+    dim= 3;
+    break;
+  case 7: //symplec6 with block timesteps
+    odeint_func= &symplec6_block_dense;
+    odeint_deriv_func= &evalRectForce;
+    dim= 3;
+    break;
+  }
+  // Handle KeyboardInterrupt gracefully
+  struct sigaction action;
+  memset(&action, 0, sizeof(struct sigaction));
+  action.sa_handler= handle_sigint;
+  sigaction(SIGINT,&action,NULL);
+  odeint_func(odeint_deriv_func,dim,yo,nt,dt,t,npot,potentialArgs,
+	      rtol,atol,result,err,&dense);
+  *nsteps= dense.nsteps;
+  *nevents= orbevents.nevents;
+  interrupted= 0;
+  // Back to default handler
+  action.sa_handler= SIG_DFL;
+  sigaction(SIGINT,&action,NULL);
+  //Free allocated memory
+  free_potentialArgs(npot,potentialArgs);
+  free(potentialArgs);
+  //Done!
+}
+
+void integrateFullOrbit_dxdv(int nobj,
+			     double *yo,
+			     int nt, 
+			     double *t,
+			     int npot,
+			     int * pot_type,
+			     double * pot_args,
+			     double dt,
+			     double rtol,
+			     double atol,
+			     int nthreads,
+			     double *result,
+			     int * err,
+			     int odeint_type){
+  //Set up the forces, first count
+  int ii, tid;
+  int dim;
+  //Use at most one thread per object
+#ifdef _OPENMP
+  if ( nthreads <= 0 )
+    nthreads= omp_get_max_threads();
+#else
+  nthreads= 1;
+#endif
+  if ( nthreads > nobj )
+    nthreads= nobj;
+  if ( nthreads < 1 )
+    nthreads= 1;
+  struct potentialArg * potentialArgs= (struct potentialArg *) malloc ( nthreads * npot * sizeof (struct potentialArg) );
+  for (tid=0; tid < nthreads; tid++)
+    parse_leapFuncArgs_Full(npot,potentialArgs+tid*npot,pot_type,pot_args);
+  //Integrate
+  void (*odeint_func)(void (*func)(double, double *, double *,
+			   int, struct potentialArg *),
+		      int,
+		      double *,
+		      int, double, double *,
+		      int, struct potentialArg *,
+		      double, double,
+		      double *,int *);
+  void (*odeint_deriv_func)(double, double *, double *,
+			    int,struct potentialArg *);
+  switch ( odeint_type ) {
+  case 1: //RK4
+    odeint_func= &bovy_rk4;
+    odeint_deriv_func= &evalRectDeriv_dxdv;
+    dim= 12;
+    break;
+  case 2: //RK6
+    odeint_func= &bovy_rk6;
+    odeint_deriv_func= &evalRectDeriv_dxdv;
+    dim= 12;
+    break;
   case 5: //DOPR54
     odeint_func= &bovy_dopr54;
     odeint_deriv_func= &evalRectDeriv_dxdv;
     dim= 12;
     break;
   }
-  odeint_func(odeint_deriv_func,dim,yo,nt,-9999.99,t,npot,potentialArgs,
-	      rtol,atol,result,err);
+  // Handle KeyboardInterrupt gracefully
+  struct sigaction action;
+  memset(&action, 0, sizeof(struct sigaction));
+  action.sa_handler= handle_sigint;
+  sigaction(SIGINT,&action,NULL);
+  //Integrate all objects, spread over the threads
+  UNUSED int chunk= CHUNKSIZE;
+#pragma omp parallel for schedule(dynamic,chunk) private(ii,tid) num_threads(nthreads)
+  for (ii=0; ii < nobj; ii++){
+#ifdef _OPENMP
+    tid= omp_get_thread_num();
+#else
+    tid= 0;
+#endif
+    odeint_func(odeint_deriv_func,dim,yo+dim*ii,nt,dt,t,npot,
+		potentialArgs+tid*npot,rtol,atol,result+dim*nt*ii,err+ii);
+  }
+  // need to reset, bc library and vars stay in memory
+  interrupted= 0;
+  // Back to default handler
+  action.sa_handler= SIG_DFL;
+  sigaction(SIGINT,&action,NULL);
   //Free allocated memory
-  free_potentialArgs(npot,potentialArgs);
+  for (tid=0; tid < nthreads; tid++)
+    free_potentialArgs(npot,potentialArgs+tid*npot);
+  free(potentialArgs);
+  //Done!
+}
+void integrateFullOrbit_lyapunov(int nobj,
+				 double *yo,
+				 int nt, 
+				 double *t,
+				 int npot,
+				 int * pot_type,
+				 double * pot_args,
+				 double dt,
+				 double rtol,
+				 double atol,
+				 int nthreads,
+				 double *lyap,
+				 int * err,
+				 int odeint_type){
+  //Estimate the maximal Lyapunov exponent of each orbit on the fly, only
+  //storing the finite-time estimate at each time in t
+  int ii, tid;
+  int dim;
+  //Use at most one thread per object
+#ifdef _OPENMP
+  if ( nthreads <= 0 )
+    nthreads= omp_get_max_threads();
+#else
+  nthreads= 1;
+#endif
+  if ( nthreads > nobj )
+    nthreads= nobj;
+  if ( nthreads < 1 )
+    nthreads= 1;
+  struct potentialArg * potentialArgs= (struct potentialArg *) malloc ( nthreads * npot * sizeof (struct potentialArg) );
+  for (tid=0; tid < nthreads; tid++)
+    parse_leapFuncArgs_Full(npot,potentialArgs+tid*npot,pot_type,pot_args);
+  //Integrate
+  void (*odeint_func)(void (*func)(double, double *, double *,
+			   int, struct potentialArg *),
+		      int,
+		      double *,
+		      int, double, double *,
+		      int, struct potentialArg *,
+		      double, double,
+		      double *,int *);
+  switch ( odeint_type ) {
+  case 1: //RK4
+    odeint_func= &bovy_rk4;
+    break;
+  case 2: //RK6
+    odeint_func= &bovy_rk6;
+    break;
+  case 5: //DOPR54
+    odeint_func= &bovy_dopr54;
+    break;
+  }
+  dim= 12;
+  // Handle KeyboardInterrupt gracefully
+  struct sigaction action;
+  memset(&action, 0, sizeof(struct sigaction));
+  action.sa_handler= handle_sigint;
+  sigaction(SIGINT,&action,NULL);
+  //Integrate all objects, spread over the threads
+  UNUSED int chunk= CHUNKSIZE;
+#pragma omp parallel for schedule(dynamic,chunk) private(ii,tid) num_threads(nthreads)
+  for (ii=0; ii < nobj; ii++){
+#ifdef _OPENMP
+    tid= omp_get_thread_num();
+#else
+    tid= 0;
+#endif
+    bovy_lyapunov(odeint_func,&evalRectDeriv_dxdv,dim,yo+dim*ii,nt,dt,t,
+		  npot,potentialArgs+tid*npot,rtol,atol,lyap+nt*ii,err+ii);
+  }
+  // need to reset, bc library and vars stay in memory
+  interrupted= 0;
+  // Back to default handler
+  action.sa_handler= SIG_DFL;
+  sigaction(SIGINT,&action,NULL);
+  //Free allocated memory
+  for (tid=0; tid < nthreads; tid++)
+    free_potentialArgs(npot,potentialArgs+tid*npot);
   free(potentialArgs);
   //Done!
 }
@@ -444,64 +769,38 @@ void evalRectDeriv(double t, double *q, double *a,
   *a= zforce;
 }
 
-// LCOV_EXCL_START
 void evalRectDeriv_dxdv(double t, double *q, double *a,
 			int nargs, struct potentialArg * potentialArgs){
-  double sinphi, cosphi, x, y, phi,R,Rforce,phiforce,z,zforce;
-  double R2deriv, phi2deriv, Rphideriv, dFxdx, dFxdy, dFydx, dFydy;
+  //The 3D potentials do not all have second derivatives implemented in C,
+  //so the tidal tensor is computed by central finite differences of the
+  //forces, with steps that balance truncation and round-off error
+  int ii, jj;
+  double r, h, qh[3], fp[3], fm[3], dFdx[9];
   //first three derivatives are just the velocities
-  *a++= *(q+3);
-  *a++= *(q+4);
-  *a++= *(q+5);
+  *a= *(q+3);
+  *(a+1)= *(q+4);
+  *(a+2)= *(q+5);
   //Rest is force
-  //q is rectangular so calculate R and phi
-  x= *q;
-  y= *(q+1);
-  z= *(q+2);
-  R= sqrt(x*x+y*y);
-  phi= acos(x/R);
-  sinphi= y/R;
-  cosphi= x/R;
-  if ( y < 0. ) phi= 2.*M_PI-phi;
-  //Calculate the forces
-  Rforce= calcRforce(R,z,phi,t,nargs,potentialArgs);
-  zforce= calczforce(R,z,phi,t,nargs,potentialArgs);
-  phiforce= calcPhiforce(R,z,phi,t,nargs,potentialArgs);
-  *a++= cosphi*Rforce-1./R*sinphi*phiforce;
-  *a++= sinphi*Rforce+1./R*cosphi*phiforce;
-  *a++= zforce;
+  evalRectForce(t,q,a+3,nargs,potentialArgs);
   //dx derivatives are just dv
-  *a++= *(q+9);
-  *a++= *(q+10);
-  *a++= *(q+11);
-  //for the dv derivatives we need also R2deriv, phi2deriv, and Rphideriv
-  R2deriv= calcR2deriv(R,z,phi,t,nargs,potentialArgs);
-  phi2deriv= calcphi2deriv(R,z,phi,t,nargs,potentialArgs);
-  Rphideriv= calcRphideriv(R,z,phi,t,nargs,potentialArgs);
-  //..and dFxdx, dFxdy, dFydx, dFydy
-  dFxdx= -cosphi*cosphi*R2deriv
-    +2.*cosphi*sinphi/R/R*phiforce
-    +sinphi*sinphi/R*Rforce
-    +2.*sinphi*cosphi/R*Rphideriv
-    -sinphi*sinphi/R/R*phi2deriv;
-  dFxdy= -sinphi*cosphi*R2deriv
-    +(sinphi*sinphi-cosphi*cosphi)/R/R*phiforce
-    -cosphi*sinphi/R*Rforce
-    -(cosphi*cosphi-sinphi*sinphi)/R*Rphideriv
-    +cosphi*sinphi/R/R*phi2deriv;
-  dFydx= -cosphi*sinphi*R2deriv
-    +(sinphi*sinphi-cosphi*cosphi)/R/R*phiforce
-    +(sinphi*sinphi-cosphi*cosphi)/R*Rphideriv
-    -sinphi*cosphi/R*Rforce
-    +sinphi*cosphi/R/R*phi2deriv;
-  dFydy= -sinphi*sinphi*R2deriv
-    -2.*sinphi*cosphi/R/R*phiforce
-    -2.*sinphi*cosphi/R*Rphideriv
-    +cosphi*cosphi/R*Rforce
-    -cosphi*cosphi/R/R*phi2deriv;
-  *a++= dFxdx * *(q+4) + dFxdy * *(q+5);
-  *a++= dFydx * *(q+4) + dFydy * *(q+5);
-  *a= 0; //BOVY: PUT IN Z2DERIVS
+  *(a+6)= *(q+9);
+  *(a+7)= *(q+10);
+  *(a+8)= *(q+11);
+  //dv derivatives are the tidal tensor times dx
+  r= sqrt(*q * *q + *(q+1) * *(q+1) + *(q+2) * *(q+2));
+  for (jj=0; jj < 3; jj++) {
+    h= 6.0554544523933395e-06 * fmax(fabs(*(q+jj)),r); // cbrt(DBL_EPSILON)
+    for (ii=0; ii < 3; ii++) qh[ii]= *(q+ii);
+    qh[jj]= *(q+jj) + h;
+    h= qh[jj] - *(q+jj); // exactly representable step
+    evalRectForce(t,qh,fp,nargs,potentialArgs);
+    qh[jj]= *(q+jj) - h;
+    evalRectForce(t,qh,fm,nargs,potentialArgs);
+    for (ii=0; ii < 3; ii++)
+      dFdx[3*ii+jj]= ( fp[ii] - fm[ii] ) / 2. / h;
+  }
+  for (ii=0; ii < 3; ii++)
+    *(a+9+ii)= dFdx[3*ii] * *(q+6) + dFdx[3*ii+1] * *(q+7)
+      + dFdx[3*ii+2] * *(q+8);
 }
 
-// LCOV_EXCL_STOP
@@ -4,7 +4,12 @@
 #include <stdio.h>
 #include <stdlib.h>
 #include <stdbool.h>
+#include <string.h>
 #include <math.h>
+#ifdef _OPENMP
+#include <omp.h>
+#endif
+#define CHUNKSIZE 1
 #include <bovy_symplecticode.h>
 #include <bovy_rk.h>
 //Potentials
@@ -120,7 +125,9 @@ void parse_leapFuncArgs(int npot,struct potentialArg * potentialArgs,
       potentialArgs->planarphi2deriv= &ZeroPlanarForce;
       potentialArgs->planarRphideriv= &ZeroPlanarForce;
       //Look at pot_args to figure out the number of arguments
-      potentialArgs->nargs= (int) (8 + 2 * *(pot_args+5) + 4 * ( *(pot_args+4) + 1 ));
+      potentialArgs->nargs= (int) (11 + 2 * *(pot_args+5) + 4 * ( *(pot_args+4) + 1 )
+				   + 2 * *(pot_args + 9 + 2 * (int) *(pot_args+5) + 4 * ( (int) *(pot_args+4) + 1 ))
+				   + 2 * *(pot_args + 10 + 2 * (int) *(pot_args+5) + 4 * ( (int) *(pot_args+4) + 1 )));
       break;
     case 12: //FlattenedPowerPotential, 4 arguments
       potentialArgs->planarRforce= &FlattenedPowerPotentialPlanarRforce;
@@ -227,6 +234,25 @@ void parse_leapFuncArgs(int npot,struct potentialArg * potentialArgs,
       potentialArgs->planarRphideriv = &SpiralArmsPotentialPlanarRphideriv;
       potentialArgs->nargs = (int) 10 + *pot_args;
       break;
+    case 28: //interp3DPotential, 18 arguments + array of spline coefficients
+      potentialArgs->planarRforce= &interp3DPotentialPlanarRforce;
+      potentialArgs->planarphiforce= &interp3DPotentialPlanarphiforce;
+      potentialArgs->nargs= (int) (18 + *(pot_args+4) * *(pot_args+5)
+				   * *(pot_args+6));
+      break;
+    case 29: //FerrersPotential, 22 arguments + 2 x Gauss-Legendre order
+      potentialArgs->planarRforce= &FerrersPotentialPlanarRforce;
+      potentialArgs->planarphiforce= &FerrersPotentialPlanarphiforce;
+      potentialArgs->planarR2deriv= &FerrersPotentialPlanarR2deriv;
+      potentialArgs->planarphi2deriv= &FerrersPotentialPlanarphi2deriv;
+      potentialArgs->planarRphideriv= &FerrersPotentialPlanarRphideriv;
+      potentialArgs->nargs= (int) (22 + 2 * *(pot_args+8));
+      break;
+    case 30: //MovingObjectPotential, 9 + 13 x number of intervals arguments
+      potentialArgs->planarRforce= &MovingObjectPotentialPlanarRforce;
+      potentialArgs->planarphiforce= &MovingObjectPotentialPlanarphiforce;
+      potentialArgs->nargs= (int) (9 + 13 * *(pot_args+2));
+      break;
 //////////////////////////////// WRAPPERS /////////////////////////////////////
     case -1: //DehnenSmoothWrapperPotential
       potentialArgs->planarRforce= &DehnenSmoothWrapperPotentialPlanarRforce;
@@ -256,22 +282,44 @@ void parse_leapFuncArgs(int npot,struct potentialArg * potentialArgs,
   }
   potentialArgs-= npot;
 }
-void integratePlanarOrbit(double *yo,
+void integratePlanarOrbit(int nobj,
+			  double *yo,
 			  int nt, 
 			  double *t,
+			  int ti0,
 			  int npot,
 			  int * pot_type,
 			  double * pot_args,
 			  double dt,
 			  double rtol,
 			  double atol,
+			  int nthreads,
 			  double *result,
 			  int * err,
 			  int odeint_type){
   //Set up the forces, first count
+  int ii, tid;
   int dim;
-  struct potentialArg * potentialArgs= (struct potentialArg *) malloc ( npot * sizeof (struct potentialArg) );
-  parse_leapFuncArgs(npot,potentialArgs,pot_type,pot_args);
+  //When the initial condition is in the interior of t (at index ti0), each
+  //object is integrated backward from t[ti0] to t[0] and forward from
+  //t[ti0] to t[nt-1], as separate tasks
+  int ntask= ( ti0 > 0 ) ? 2 * nobj : nobj;
+  //Use at most one thread per task
+#ifdef _OPENMP
+  if ( nthreads <= 0 )
+    nthreads= omp_get_max_threads();
+#else
+  nthreads= 1;
+#endif
+  if ( nthreads > ntask )
+    nthreads= ntask;
+  if ( nthreads < 1 )
+    nthreads= 1;
+  //Each thread gets its own copy of the potential, because some potentials
+  //cache intermediate results
+  struct potentialArg * potentialArgs= (struct potentialArg *) malloc ( nthreads * npot * sizeof (struct potentialArg) );
+  for (tid=0; tid < nthreads; tid++)
+    parse_leapFuncArgs(npot,potentialArgs+tid*npot,pot_type,pot_args);
   //Integrate
   void (*odeint_func)(void (*func)(double, double *, double *,
 			   int, struct potentialArg *),
@@ -314,16 +362,190 @@ void integratePlanarOrbit(double *yo,
     odeint_deriv_func= &evalPlanarRectDeriv;
     dim= 4;
     break;
+  case 6: //symplec4 with block timesteps
+    odeint_func= &symplec4_block;
+    odeint_deriv_func= &evalPlanarRectForce;
+    dim= 2;
+    break;
+  case 7: //symplec6 with block timesteps
+    odeint_func= &symplec6_block;
+    odeint_deriv_func= &evalPlanarRectForce;
+    dim= 2;
+    break;
   }
-  odeint_func(odeint_deriv_func,dim,yo,nt,dt,t,npot,potentialArgs,rtol,atol,
-	      result,err);
+  // Handle KeyboardInterrupt gracefully
+  struct sigaction action;
+  memset(&action, 0, sizeof(struct sigaction));
+  action.sa_handler= handle_sigint;
+  sigaction(SIGINT,&action,NULL);
+  //Set up the backward integrations: reversed times, opposite fixed
+  //stepsize, and separate output that is stitched in below
+  double *tb= NULL, *resultb= NULL;
+  int *errb= NULL;
+  double dtb= ( dt == -9999.99 ) ? dt : -dt;
+  if ( ti0 > 0 ) {
+    tb= (double *) malloc ( (ti0+1) * sizeof(double) );
+    for (ii=0; ii <= ti0; ii++)
+      *(tb+ii)= *(t+ti0-ii);
+    resultb= (double *) malloc ( nobj * 4 * (ti0+1) * sizeof(double) );
+    errb= (int *) malloc ( nobj * sizeof(int) );
+  }
+  //Integrate all tasks, spread over the threads
+  UNUSED int chunk= CHUNKSIZE;
+#pragma omp parallel for schedule(dynamic,chunk) private(ii,tid) num_threads(nthreads)
+  for (ii=0; ii < ntask; ii++){
+#ifdef _OPENMP
+    tid= omp_get_thread_num();
+#else
+    tid= 0;
+#endif
+    if ( ii < nobj )
+      odeint_func(odeint_deriv_func,dim,yo+4*ii,nt-ti0,dt,t+ti0,npot,
+		  potentialArgs+tid*npot,rtol,atol,result+4*(nt*ii+ti0),
+		  err+ii);
+    else
+      odeint_func(odeint_deriv_func,dim,yo+4*(ii-nobj),ti0+1,dtb,tb,npot,
+		  potentialArgs+tid*npot,rtol,atol,
+		  resultb+4*(ti0+1)*(ii-nobj),errb+ii-nobj);
+  }
+  if ( ti0 > 0 ) {
+    int jj, kk;
+    for (ii=0; ii < nobj; ii++) {
+      for (jj=0; jj < ti0; jj++)
+	for (kk=0; kk < 4; kk++)
+	  *(result+4*(nt*ii+jj)+kk)= *(resultb+4*((ti0+1)*ii+ti0-jj)+kk);
+      if ( *(errb+ii) == -10 || *(err+ii) == 0 )
+	*(err+ii)= *(errb+ii);
+    }
+    free(tb);
+    free(resultb);
+    free(errb);
+  }
+  // need to reset, bc library and vars stay in memory
+  interrupted= 0;
+  // Back to default handler
+  action.sa_handler= SIG_DFL;
+  sigaction(SIGINT,&action,NULL);
+  //Free allocated memory
+  for (tid=0; tid < nthreads; tid++)
+    free_potentialArgs(npot,potentialArgs+tid*npot);
+  free(potentialArgs);
+  //Done!
+}
+
+void integratePlanarOrbit_dense(double *yo,
+				int nt, 
+				double *t,
+				int npot,
+				int * pot_type,
+				double * pot_args,
+				double dt,
+				double rtol,
+				double atol,
+				int maxsteps,
+				double *result,
+				double *dense_steps,
+				int * nsteps,
+				int nevtypes,
+				int * evtypes,
+				double * evargs,
+				int maxevents,
+				double *events,
+				int * nevents,
+				int * err,
+				int odeint_type){
+  //Integrate a single orbit and store the interpolating polynomial of each
+  //step (at most maxsteps; nsteps is set to the number of steps that were
+  //taken) and the events (at most maxevents; nevents is set to the number
+  //of events that happened)
+  struct potentialArg * potentialArgs= (struct potentialArg *) malloc ( npot * sizeof (struct potentialArg) );
+  parse_leapFuncArgs(npot,potentialArgs,pot_type,pot_args);
+  struct denseOutput dense;
+  dense.maxsteps= maxsteps;
+  dense.nsteps= 0;
+  dense.steps= dense_steps;
+  struct orbitEvents orbevents;
+  orbevents.ntypes= nevtypes;
+  orbevents.types= evtypes;
+  orbevents.args= evargs;
+  orbevents.maxevents= maxevents;
+  orbevents.nevents= 0;
+  orbevents.events= events;
+  dense.events= nevtypes > 0 ? &orbevents : NULL;
+  int dim;
+  void (*odeint_deriv_func)(double, double *, double *,
+			    int,struct potentialArg *);
+  void (*odeint_func)(void (*func)(double, double *, double *,
+			   int, struct potentialArg *),
+		      int,
+		      double *,
+		      int, double, double *,
+		      int, struct potentialArg *,
+		      double, double,
+		      double *,int *,struct denseOutput *);
+  switch ( odeint_type ) {
+  case 0: //leapfrog
+    odeint_func= &leapfrog_dense;
+    odeint_deriv_func= &evalPlanarRectForce;
+    dim= 2;
+    break;
+  case 1: //RK4
+    odeint_func= &bovy_rk4_dense;
+    odeint_deriv_func= &evalPlanarRectDeriv;
+    dim= 4;
+    break;
+  case 2: //RK6
+    odeint_func= &bovy_rk6_dense;
+    odeint_deriv_func= &evalPlanarRectDeriv;
+    dim= 4;
+    break;
+  case 3: //symplec4
+    odeint_func= &symplec4_dense;
+    odeint_deriv_func= &evalPlanarRectForce;
+    dim= 2;
+    break;
+  case 4: //symplec6
+    odeint_func= &symplec6_dense;
+    odeint_deriv_func= &evalPlanarRectForce;
+    dim= 2;
+    break;
+  case 5: //DOPR54
+    odeint_func= &bovy_dopr54_dense;
+    odeint_deriv_func= &evalPlanarRectDeriv;
+    dim= 4;
+    break;
+  case 6: //symplec4 with block timesteps
+    odeint_func= &symplec4_block_dense;
+    odeint_deriv_func= &evalPlanarRectForce;
+    dim= 2;
+    break;
+  case 7: //symplec6 with block timesteps
+    odeint_func= &symplec6_block_dense;
+    odeint_deriv_func= &evalPlanarRectForce;
+    dim= 2;
+    break;
+  }
+  // Handle KeyboardInterrupt gracefully
+  struct sigaction action;
+  memset(&action, 0, sizeof(struct sigaction));
+  action.sa_handler= handle_sigint;
+  sigaction(SIGINT,&action,NULL);
+  odeint_func(odeint_deriv_func,dim,yo,nt,dt,t,npot,potentialArgs,
+	      rtol,atol,result,err,&dense);
+  *nsteps= dense.nsteps;
+  *nevents= orbevents.nevents;
+  interrupted= 0;
+  // Back to default handler
+  action.sa_handler= SIG_DFL;
+  sigaction(SIGINT,&action,NULL);
   //Free allocated memory
   free_potentialArgs(npot,potentialArgs);
   free(potentialArgs);
   //Done!
 }
 
-void integratePlanarOrbit_dxdv(double *yo,
+void integratePlanarOrbit_dxdv(int nobj,
+			       double *yo,
 			       int nt, 
 			       double *t,
 			       int npot,
@@ -332,13 +554,27 @@ void integratePlanarOrbit_dxdv(double *yo,
 			       double dt,
 			       double rtol,
 			       double atol,
+			       int nthreads,
 			       double *result,
 			       int * err,
 			       int odeint_type){
   //Set up the forces, first count
+  int ii, tid;
   int dim;
-  struct potentialArg * potentialArgs= (struct potentialArg *) malloc ( npot * sizeof (struct potentialArg) );
-  parse_leapFuncArgs(npot,potentialArgs,pot_type,pot_args);
+  //Use at most one thread per object
+#ifdef _OPENMP
+  if ( nthreads <= 0 )
+    nthreads= omp_get_max_threads();
+#else
+  nthreads= 1;
+#endif
+  if ( nthreads > nobj )
+    nthreads= nobj;
+  if ( nthreads < 1 )
+    nthreads= 1;
+  struct potentialArg * potentialArgs= (struct potentialArg *) malloc ( nthreads * npot * sizeof (struct potentialArg) );
+  for (tid=0; tid < nthreads; tid++)
+    parse_leapFuncArgs(npot,potentialArgs+tid*npot,pot_type,pot_args);
   //Integrate
   void (*odeint_func)(void (*func)(double, double *, double *,
 			   int, struct potentialArg *),
@@ -367,10 +603,112 @@ void integratePlanarOrbit_dxdv(double *yo,
     dim= 8;
     break;
   }
-  odeint_func(odeint_deriv_func,dim,yo,nt,dt,t,npot,potentialArgs,rtol,atol,
-	      result,err);
+  // Handle KeyboardInterrupt gracefully
+  struct sigaction action;
+  memset(&action, 0, sizeof(struct sigaction));
+  action.sa_handler= handle_sigint;
+  sigaction(SIGINT,&action,NULL);
+  //Integrate all objects, spread over the threads
+  UNUSED int chunk= CHUNKSIZE;
+#pragma omp parallel for schedule(dynamic,chunk) private(ii,tid) num_threads(nthreads)
+  for (ii=0; ii < nobj; ii++){
+#ifdef _OPENMP
+    tid= omp_get_thread_num();
+#else
+    tid= 0;
+#endif
+    odeint_func(odeint_deriv_func,dim,yo+dim*ii,nt,dt,t,npot,
+		potentialArgs+tid*npot,rtol,atol,result+dim*nt*ii,err+ii);
+  }
+  // need to reset, bc library and vars stay in memory
+  interrupted= 0;
+  // Back to default handler
+  action.sa_handler= SIG_DFL;
+  sigaction(SIGINT,&action,NULL);
   //Free allocated memory
-  free_potentialArgs(npot,potentialArgs);
+  for (tid=0; tid < nthreads; tid++)
+    free_potentialArgs(npot,potentialArgs+tid*npot);
+  free(potentialArgs);
+  //Done!
+}
+void integratePlanarOrbit_lyapunov(int nobj,
+				   double *yo,
+				   int nt, 
+				   double *t,
+				   int npot,
+				   int * pot_type,
+				   double * pot_args,
+				   double dt,
+				   double rtol,
+				   double atol,
+				   int nthreads,
+				   double *lyap,
+				   int * err,
+				   int odeint_type){
+  //Estimate the maximal Lyapunov exponent of each orbit on the fly, only
+  //storing the finite-time estimate at each time in t
+  int ii, tid;
+  int dim;
+  //Use at most one thread per object
+#ifdef _OPENMP
+  if ( nthreads <= 0 )
+    nthreads= omp_get_max_threads();
+#else
+  nthreads= 1;
+#endif
+  if ( nthreads > nobj )
+    nthreads= nobj;
+  if ( nthreads < 1 )
+    nthreads= 1;
+  struct potentialArg * potentialArgs= (struct potentialArg *) malloc ( nthreads * npot * sizeof (struct potentialArg) );
+  for (tid=0; tid < nthreads; tid++)
+    parse_leapFuncArgs(npot,potentialArgs+tid*npot,pot_type,pot_args);
+  //Integrate
+  void (*odeint_func)(void (*func)(double, double *, double *,
+			   int, struct potentialArg *),
+		      int,
+		      double *,
+		      int, double, double *,
+		      int, struct potentialArg *,
+		      double, double,
+		      double *,int *);
+  switch ( odeint_type ) {
+  case 1: //RK4
+    odeint_func= &bovy_rk4;
+    break;
+  case 2: //RK6
+    odeint_func= &bovy_rk6;
+    break;
+  case 5: //DOPR54
+    odeint_func= &bovy_dopr54;
+    break;
+  }
+  dim= 8;
+  // Handle KeyboardInterrupt gracefully
+  struct sigaction action;
+  memset(&action, 0, sizeof(struct sigaction));
+  action.sa_handler= handle_sigint;
+  sigaction(SIGINT,&action,NULL);
+  //Integrate all objects, spread over the threads
+  UNUSED int chunk= CHUNKSIZE;
+#pragma omp parallel for schedule(dynamic,chunk) private(ii,tid) num_threads(nthreads)
+  for (ii=0; ii < nobj; ii++){
+#ifdef _OPENMP
+    tid= omp_get_thread_num();
+#else
+    tid= 0;
+#endif
+    bovy_lyapunov(odeint_func,&evalPlanarRectDeriv_dxdv,dim,yo+dim*ii,nt,dt,t,
+		  npot,potentialArgs+tid*npot,rtol,atol,lyap+nt*ii,err+ii);
+  }
+  // need to reset, bc library and vars stay in memory
+  interrupted= 0;
+  // Back to default handler
+  action.sa_handler= SIG_DFL;
+  sigaction(SIGINT,&action,NULL);
+  //Free allocated memory
+  for (tid=0; tid < nthreads; tid++)
+    free_potentialArgs(npot,potentialArgs+tid*npot);
   free(potentialArgs);
   //Done!
 }
@@ -4,7 +4,8 @@ import numpy as nu
 from scipy import integrate
 import galpy.util.bovy_symplecticode as symplecticode
 from galpy.util.bovy_conversion import physical_conversion
-from galpy.orbit_src.OrbitTop import OrbitTop
+from galpy.orbit_src.OrbitTop import OrbitTop, _rect_to_cyl, _cyl_to_rect, \
+    _cyl_to_rect_dxdv, _rect_to_cyl_dxdv, _integrate_twosided
 from galpy.potential_src.planarPotential import _evaluateplanarRforces,\
     RZToplanarPotential, toPlanarPotential, _evaluateplanarphiforces,\
     _evaluateplanarPotentials
@@ -12,7 +13,8 @@ from galpy.potential_src.Potential import Potential, _check_c
 from galpy.util import galpyWarning
 #try:
 from galpy.orbit_src.integratePlanarOrbit import integratePlanarOrbit_c,\
-    integratePlanarOrbit_dxdv_c, _ext_loaded
+    integratePlanarOrbit_dxdv_c, integratePlanarOrbit_dense_c, \
+    integratePlanarOrbit_lyapunov_c, _parse_t0index, _ext_loaded
 ext_loaded= _ext_loaded
 class planarOrbitTop(OrbitTop):
     """Top-level class representing a planar orbit (i.e., one in the plane 
@@ -71,11 +73,8 @@ class planarOrbitTop(OrbitTop):
             self._setupaA(pot=pot,type='adiabatic')
             (rperi,rap)= self._aA.calcRapRperi(self)
             return (rap-rperi)/(rap+rperi)
-        if not hasattr(self,'orbit'):
-            raise AttributeError("Integrate the orbit first")
-        if not hasattr(self,'rs'):
-            self.rs= self.orbit[:,0]
-        return (nu.amax(self.rs)-nu.amin(self.rs))/(nu.amax(self.rs)+nu.amin(self.rs))
+        rperi, rap= self._rperirap()
+        return (rap-rperi)/(rap+rperi)
 
     @physical_conversion('energy')
     def Jacobi(self,*args,**kwargs):
@@ -142,11 +141,7 @@ class planarOrbitTop(OrbitTop):
             self._setupaA(pot=pot,type='adiabatic')
             (rperi,rap)= self._aA.calcRapRperi(self)
             return rap
-        if not hasattr(self,'orbit'):
-            raise AttributeError("Integrate the orbit first")
-        if not hasattr(self,'rs'):
-            self.rs= self.orbit[:,0]
-        return nu.amax(self.rs)
+        return self._rperirap()[1]
 
     @physical_conversion('position')
     def rperi(self,analytic=False,pot=None,**kwargs):
@@ -167,11 +162,22 @@ class planarOrbitTop(OrbitTop):
             self._setupaA(pot=pot,type='adiabatic')
             (rperi,rap)= self._aA.calcRapRperi(self)
             return rperi
+        return self._rperirap()[0]
+
+    def _rperirap(self):
+        """Pericenter and apocenter radius from the integrated orbit, including the pericenters and apocenters detected during the integration"""
         if not hasattr(self,'orbit'):
             raise AttributeError("Integrate the orbit first")
         if not hasattr(self,'rs'):
             self.rs= self.orbit[:,0]
-        return nu.amin(self.rs)
+        rperi, rap= nu.amin(self.rs), nu.amax(self.rs)
+        evs= self._eventsOfType('pericenter')
+        if not evs is None and len(evs) > 0:
+            rperi= min(rperi,nu.amin(evs[:,0]))
+        evs= self._eventsOfType('apocenter')
+        if not evs is None and len(evs) > 0:
+            rap= max(rap,nu.amax(evs[:,0]))
+        return (rperi,rap)
 
     @physical_conversion('position')
     def zmax(self,pot=None,analytic=False,**kwargs):
@@ -217,7 +223,7 @@ class planarROrbit(planarOrbitTop):
                           ro=ro,zo=zo,vo=vo,solarmotion=solarmotion)
         return None
 
-    def integrate(self,t,pot,method='symplec4_c',dt=None):
+    def integrate(self,t,pot,method='symplec4_c',dt=None,t0index=None):
         """
         NAME:
            integrate
@@ -233,6 +239,7 @@ class planarROrbit(planarOrbitTop):
                    'rk6_c' for a 6-th order Runge-Kutta integrator in C
                    'dopr54_c' for a Dormand-Prince integrator in C (generally the fastest)
            dt= (None) if set, force the integrator to use this basic stepsize; must be an integer divisor of output stepsize
+           t0index= (None) if set, the index of t=0 in the interior of the monotonic times t; the orbit is then integrated backward and forward from the initial condition at t=0
         OUTPUT:
            error message number (get the actual orbit using getOrbit()
         HISTORY:
@@ -243,7 +250,8 @@ class planarROrbit(planarOrbitTop):
         thispot= RZToplanarPotential(pot)
         self.t= nu.array(t)
         self._pot= thispot
-        self.orbit, msg= _integrateROrbit(self.vxvv,thispot,t,method,dt)
+        self.orbit, msg= _integrateROrbit(self.vxvv,thispot,t,method,dt,
+                                          t0index=t0index)
         return msg
 
     @physical_conversion('energy')
@@ -338,7 +346,8 @@ class planarOrbit(planarOrbitTop):
                           ro=ro,zo=zo,vo=vo,solarmotion=solarmotion)
         return None
 
-    def integrate(self,t,pot,method='symplec4_c',dt=None):
+    def integrate(self,t,pot,method='symplec4_c',dt=None,dense=False,
+                  events=None,t0index=None):
         """
         NAME:
            integrate
@@ -354,17 +363,36 @@ class planarOrbit(planarOrbitTop):
                    'rk6_c' for a 6-th order Runge-Kutta integrator in C
                    'dopr54_c' for a Dormand-Prince integrator in C (generally the fastest)
            dt= (None) if set, force the integrator to use this basic stepsize; must be an integer divisor of output stepsize
+           dense= (False) if True, store the dense output of the Runge-Kutta integrators and use it to evaluate the orbit in between the output times
+           events= (None) list of events to detect during the integration with the C integrators (get them using getEvents())
+           t0index= (None) if set, the index of t=0 in the interior of the monotonic times t; the orbit is then integrated backward and forward from the initial condition at t=0
         OUTPUT:
            (none) (get the actual orbit using getOrbit()
         HISTORY:
            2010-07-20
+           2026-10-17 - Added dense keyword
+           2026-10-17 - Added events keyword
         """
         if hasattr(self,'_orbInterp'): delattr(self,'_orbInterp')
+        if hasattr(self,'_dense'): delattr(self,'_dense')
+        if hasattr(self,'_events'): delattr(self,'_events')
         if hasattr(self,'rs'): delattr(self,'rs')
         thispot= toPlanarPotential(pot)
         self.t= nu.array(t)
         self._pot= thispot
-        self.orbit, msg= _integrateOrbit(self.vxvv,thispot,t,method,dt)
+        if dense or not events is None:
+            self.orbit, msg, thisdense, thisevents=\
+                _integrateOrbit(self.vxvv,thispot,t,method,dt,
+                                dense=dense,events=events)
+            if not thisdense is None: self._dense= thisdense
+            elif dense:
+                warnings.warn("Dense output was requested, but is only available for the C integrators and potentials implemented in C; the orbit will be interpolated in between the output times instead",galpyWarning)
+            if not thisevents is None:
+                self._events= thisevents
+                self._event_specs= list(events)
+        else:
+            self.orbit, msg= _integrateOrbit(self.vxvv,thispot,t,method,dt,
+                                             t0index=t0index)
         return msg
 
     def integrate_dxdv(self,dxdv,t,pot,method='dopr54_c',
@@ -391,6 +419,7 @@ class planarOrbit(planarOrbitTop):
            2014-06-29 - Added rectIn and rectOut - Bovy (IAS)
         """
         if hasattr(self,'_orbInterp'): delattr(self,'_orbInterp')
+        if hasattr(self,'_dense'): delattr(self,'_dense')
         if hasattr(self,'rs'): delattr(self,'rs')
         thispot= toPlanarPotential(pot)
         self.t= nu.array(t)
@@ -401,6 +430,26 @@ class planarOrbit(planarOrbitTop):
         self.orbit= self.orbit_dxdv[:,:4]
         return msg
 
+    def lyapunov(self,t,pot,method='dopr54_c',dxdv=None,rectIn=False):
+        """
+        NAME:
+           lyapunov
+        PURPOSE:
+           estimate the maximal Lyapunov exponent of the orbit
+        INPUT:
+           t - list of times at which to renormalize the deviation vector and estimate the exponent (0 has to be in this!)
+           pot - potential instance or list of instances
+           method= 'rk4_c', 'rk6_c', or 'dopr54_c'
+           dxdv= (None) initial deviation vector [dR,dvR,dvT,dphi] (default: equal components in rectangular coordinates)
+           rectIn= (False) if True, input dxdv is in rectangular coordinates
+        OUTPUT:
+           finite-time estimate of the maximal Lyapunov exponent at each t
+        HISTORY:
+           2026-10-17 - Written
+        """
+        return _lyapunovOrbit(self.vxvv,dxdv,toPlanarPotential(pot),t,
+                              method,rectIn)[0]
+
     @physical_conversion('energy')
     def E(self,*args,**kwargs):
         """
@@ -471,13 +520,10 @@ class planarOrbit(planarOrbitTop):
             self._setupaA(pot=pot,type='adiabatic')
             (rperi,rap)= self._aA.calcRapRperi(self)
             return (rap-rperi)/(rap+rperi)
-        if not hasattr(self,'orbit'):
-            raise AttributeError("Integrate the orbit first")
-        if not hasattr(self,'rs'):
-            self.rs= self.orbit[:,0]
-        return (nu.amax(self.rs)-nu.amin(self.rs))/(nu.amax(self.rs)+nu.amin(self.rs))
+        rperi, rap= self._rperirap()
+        return (rap-rperi)/(rap+rperi)
 
-def _integrateROrbit(vxvv,pot,t,method,dt):
+def _integrateROrbit(vxvv,pot,t,method,dt,t0index=None):
     """
     NAME:
        _integrateROrbit
@@ -490,6 +536,7 @@ def _integrateROrbit(vxvv,pot,t,method,dt):
        t - list of times at which to output (0 has to be in this!)
        method - 'odeint' or 'leapfrog'
        dt - if set, force the integrator to use this basic stepsize; must be an integer divisor of output stepsize
+       t0index= (None) if set, the index of t=0 in the interior of the monotonic times t, from which the orbit is integrated backward and forward
     OUTPUT:
        [:,3] array of [R,vR,vT] at each t
     HISTORY:
@@ -507,18 +554,26 @@ def _integrateROrbit(vxvv,pot,t,method,dt):
         #We hack this by putting in a dummy phi
         this_vxvv= nu.zeros(len(vxvv)+1)
         this_vxvv[0:len(vxvv)]= vxvv
-        tmp_out, msg= _integrateOrbit(this_vxvv,pot,t,method,dt)
+        tmp_out, msg= _integrateOrbit(this_vxvv,pot,t,method,dt,
+                                      t0index=t0index)
         #tmp_out is (nt,4)
         out= tmp_out[:,0:3]
     elif method.lower() == 'leapfrog_c' or method.lower() == 'rk4_c' \
             or method.lower() == 'rk6_c' or method.lower() == 'symplec4_c' \
-            or method.lower() == 'symplec6_c' or method.lower() == 'dopr54_c':
+            or method.lower() == 'symplec6_c' or method.lower() == 'dopr54_c' \
+            or method.lower() == 'symplec4_block_c' \
+            or method.lower() == 'symplec6_block_c':
         #We hack this by putting in a dummy phi
         this_vxvv= nu.zeros(len(vxvv)+1)
         this_vxvv[0:len(vxvv)]= vxvv
-        tmp_out, msg= _integrateOrbit(this_vxvv,pot,t,method,dt)
+        tmp_out, msg= _integrateOrbit(this_vxvv,pot,t,method,dt,
+                                      t0index=t0index)
         #tmp_out is (nt,4)
         out= tmp_out[:,0:3]
+    elif _parse_t0index(t,t0index) > 0:
+        out, msg= _integrate_twosided(lambda tt: _integrateROrbit(vxvv,pot,tt,
+                                                                  method,dt),
+                                      t,_parse_t0index(t,t0index))
     elif method.lower() == 'odeint':
         l= vxvv[0]*vxvv[2]
         l2= l**2.
@@ -556,7 +611,8 @@ def _REOM(y,t,pot,l2):
     return [y[1],
             l2/y[0]**3.+_evaluateplanarRforces(pot,y[0],t=t)]
 
-def _integrateOrbit(vxvv,pot,t,method,dt):
+def _integrateOrbit(vxvv,pot,t,method,dt,dense=False,events=None,
+                    t0index=None):
     """
     NAME:
        _integrateOrbit
@@ -569,11 +625,20 @@ def _integrateOrbit(vxvv,pot,t,method,dt):
        t - list of times at which to output (0 has to be in this!)
        method - 'odeint' or 'leapfrog'
        dt- if set, force the integrator to use this basic stepsize; must be an integer divisor of output stepsize
+       dense= (False) if True, also return the dense output in rectangular coordinates of the C integrators (None if the orbit was not integrated with C)
+       events= (None) if set, also return the events detected by the C integrators as a list of (t,[:,4] array of [R,vR,vT,phi]) (None if the orbit was not integrated with C)
+       t0index= (None) if set, the index of t=0 in the interior of the monotonic times t, from which the orbit is integrated backward and forward
     OUTPUT:
-       [:,4] array of [R,vR,vT,phi] at each t
+       ([:,4] array of [R,vR,vT,phi] at each t,error message[,dense output,events])
     HISTORY:
        2010-07-20 - Written - Bovy (NYU)
+       2026-10-17 - Added dense keyword
+       2026-10-17 - Added events keyword
     """
+    dense_out, events_out= None, None
+    ti0= _parse_t0index(t,t0index)
+    if ti0 > 0 and (dense or not events is None):
+        raise ValueError("Integrating backward and forward from t[t0index]=0 cannot be combined with dense output or events")
     #First check that the potential has C
     if '_c' in method:
         if not _check_c(pot):
@@ -582,6 +647,11 @@ def _integrateOrbit(vxvv,pot,t,method,dt):
             else:
                 method= 'odeint'
             warnings.warn("Cannot use C integration because some of the potentials are not implemented in C (using %s instead)" % (method), galpyWarning)
+    if ti0 > 0 and not (ext_loaded and '_c' in method.lower()):
+        # The C integrators do this in a single call
+        return _integrate_twosided(lambda tt: _integrateOrbit(vxvv,pot,tt,
+                                                              method,dt),
+                                   t,ti0)
     if method.lower() == 'leapfrog':
         #go to the rectangular frame
         this_vxvv= nu.array([vxvv[0]*nu.cos(vxvv[3]),
@@ -605,7 +675,9 @@ def _integrateOrbit(vxvv,pot,t,method,dt):
         msg= 0
     elif method.lower() == 'leapfrog_c' or method.lower() == 'rk4_c' \
             or method.lower() == 'rk6_c' or method.lower() == 'symplec4_c' \
-            or method.lower() == 'symplec6_c' or method.lower() == 'dopr54_c':
+            or method.lower() == 'symplec6_c' or method.lower() == 'dopr54_c' \
+            or method.lower() == 'symplec4_block_c' \
+            or method.lower() == 'symplec6_block_c':
         warnings.warn("Using C implementation to integrate orbits",galpyWarning)
         #go to the rectangular frame
         this_vxvv= nu.array([vxvv[0]*nu.cos(vxvv[3]),
@@ -613,8 +685,16 @@ def _integrateOrbit(vxvv,pot,t,method,dt):
                              vxvv[1]*nu.cos(vxvv[3])-vxvv[2]*nu.sin(vxvv[3]),
                              vxvv[2]*nu.cos(vxvv[3])+vxvv[1]*nu.sin(vxvv[3])])
         #integrate
-        tmp_out, msg= integratePlanarOrbit_c(pot,this_vxvv,
-                                             t,method,dt=dt)
+        if dense or not events is None:
+            tmp_out, dense_out, events_out, msg=\
+                integratePlanarOrbit_dense_c(pot,this_vxvv,t,method,dt=dt,
+                                             dense=dense,events=events)
+            if not events_out is None:
+                events_out= [(evt,_rect_to_cyl(evy)) 
+                             for evt,evy in events_out]
+        else:
+            tmp_out, msg= integratePlanarOrbit_c(pot,this_vxvv,
+                                                 t,method,dt=dt,t0index=ti0)
         #go back to the cylindrical frame
         R= nu.sqrt(tmp_out[:,0]**2.+tmp_out[:,1]**2.)
         phi= nu.arccos(tmp_out[:,0]/R)
@@ -644,9 +724,14 @@ def _integrateOrbit(vxvv,pot,t,method,dt):
     out[neg_radii,0]= -out[neg_radii,0]
     out[neg_radii,3]+= m.pi
     _parse_warnmessage(msg)
+    if dense or not events is None:
+        if events_out is None and not events is None:
+            warnings.warn("Events are only detected by the C integrators; no events were detected",galpyWarning)
+        return (out,msg,dense_out,events_out)
     return (out,msg)
 
-def _integrateOrbit_dxdv(vxvv,dxdv,pot,t,method,rectIn,rectOut):
+def _integrateOrbit_dxdv(vxvv,dxdv,pot,t,method,rectIn,rectOut,
+                         numcores=None):
     """
     NAME:
        _integrateOrbit_dxdv
@@ -655,19 +740,24 @@ def _integrateOrbit_dxdv(vxvv,dxdv,pot,t,method,rectIn,rectOut):
        in the (R,phi)-plane
     INPUT:
        vxvv - array with the initial conditions stacked like
-              [R,vR,vT,phi]; vR outward!
-       dxdv - difference to integrate [dR,dvR,dvT,dphi]
+              [R,vR,vT,phi]; vR outward!; can be [N,4] for N orbits (C integrators only)
+       dxdv - difference to integrate [dR,dvR,dvT,dphi]; [N,4] for [N,4] vxvv
        pot - Potential instance
        t - list of times at which to output (0 has to be in this!)
        method - 'odeint' or 'leapfrog'
        rectIn= (False) if True, input dxdv is in rectangular coordinates
        rectOut= (False) if True, output dxdv (that in orbit_dxdv) is in rectangular coordinates
+       numcores= (None) number of OpenMP threads to use for multiple orbits
     OUTPUT:
-       [:,8] array of [R,vR,vT,phi,dR,dvR,dvT,dphi] at each t
+       [:,8] (or [N,:,8]) array of [R,vR,vT,phi,dR,dvR,dvT,dphi] at each t
        error message from integrator
     HISTORY:
        2010-10-17 - Written - Bovy (IAS)
+       2026-10-17 - Allow multiple orbits to be integrated at once
     """
+    if nu.ndim(vxvv) == 2:
+        return _integrateOrbits_dxdv_c(vxvv,dxdv,pot,t,method,rectIn,rectOut,
+                                       numcores)
     #First check that the potential has C
     if '_c' in method:
         allHasC= _check_c(pot) and _check_c(pot,dxdv=True)
@@ -736,6 +826,64 @@ def _integrateOrbit_dxdv(vxvv,dxdv,pot,t,method,rectIn,rectOut):
     _parse_warnmessage(msg)
     return (out,msg)
 
+def _integrateOrbits_dxdv_c(vxvv,dxdv,pot,t,method,rectIn,rectOut,numcores):
+    """Integrate [N,4] orbits and deviation vectors at once with the C integrators"""
+    if not method.lower() in ['rk4_c','rk6_c','dopr54_c']:
+        raise NotImplementedError("Integrating phase-space volumes of multiple orbits at once is only supported for the 'rk4_c', 'rk6_c', and 'dopr54_c' methods")
+    if not ext_loaded or not (_check_c(pot) and _check_c(pot,dxdv=True)):
+        raise NotImplementedError("Integrating phase-space volumes of multiple orbits at once requires all potentials to have adequate C implementations")
+    warnings.warn("Using C implementation to integrate orbits",galpyWarning)
+    vxvv= nu.array(vxvv,dtype='float')
+    dxdv= nu.array(dxdv,dtype='float')
+    this_vxvv= _cyl_to_rect(vxvv)
+    if not rectIn:
+        this_dxdv= _cyl_to_rect_dxdv(vxvv,dxdv)
+    else:
+        this_dxdv= dxdv
+    tmp_out, msg= integratePlanarOrbit_dxdv_c(pot,this_vxvv,this_dxdv,t,method,
+                                              numcores=numcores)
+    out= _rect_to_cyl_dxdv(tmp_out)
+    if rectOut:
+        out[...,4:]= tmp_out[...,4:]
+    return (out,msg)
+
+def _lyapunovOrbit(vxvv,dxdv,pot,t,method,rectIn,numcores=None):
+    """
+    NAME:
+       _lyapunovOrbit
+    PURPOSE:
+       estimate the maximal Lyapunov exponent of an orbit in a Phi(R,phi) potential
+    INPUT:
+       vxvv - array with the initial conditions stacked like
+              [R,vR,vT,phi]; vR outward!; can be [N,4] for N orbits
+       dxdv - initial deviation vector [dR,dvR,dvT,dphi] ([N,4] for [N,4] vxvv); if None, equal components in rectangular coordinates
+       pot - (planar) Potential instance
+       t - list of times at which to renormalize the deviation vector (0 has to be in this!)
+       method - 'rk4_c', 'rk6_c', or 'dopr54_c'
+       rectIn= (False) if True, input dxdv is in rectangular coordinates
+       numcores= (None) number of OpenMP threads to use for multiple orbits
+    OUTPUT:
+       [nt] (or [N,nt]) array of the finite-time Lyapunov exponent at each t
+       error message from integrator
+    HISTORY:
+       2026-10-17 - Written
+    """
+    if not method.lower() in ['rk4_c','rk6_c','dopr54_c']:
+        raise NotImplementedError("Lyapunov exponents are only computed with the 'rk4_c', 'rk6_c', and 'dopr54_c' methods")
+    if not ext_loaded or not (_check_c(pot) and _check_c(pot,dxdv=True)):
+        raise NotImplementedError("Lyapunov exponents require all potentials to have adequate C implementations")
+    vxvv= nu.array(vxvv,dtype='float')
+    #go to the rectangular frame
+    this_vxvv= _cyl_to_rect(vxvv)
+    if dxdv is None:
+        this_dxdv= nu.ones(vxvv.shape)
+    elif not rectIn:
+        this_dxdv= _cyl_to_rect_dxdv(vxvv,nu.array(dxdv,dtype='float'))
+    else:
+        this_dxdv= nu.array(dxdv,dtype='float')
+    return integratePlanarOrbit_lyapunov_c(pot,this_vxvv,this_dxdv,t,method,
+                                           numcores=numcores)
+
 def _EOM_dxdv(x,t,pot):
     """
     NAME:
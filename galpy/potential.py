@@ -16,6 +16,7 @@ from galpy.potential_src import plotRotcurve
 from galpy.potential_src import plotEscapecurve
 from galpy.potential_src import KGPotential
 from galpy.potential_src import interpRZPotential
+from galpy.potential_src import interp3DPotential
 from galpy.potential_src import DehnenBarPotential
 from galpy.potential_src import SteadyLogSpiralPotential
 from galpy.potential_src import TransientLogSpiralPotential
@@ -89,6 +90,7 @@ _isNonAxi= Potential._isNonAxi
 scf_compute_coeffs_spherical = SCFPotential.scf_compute_coeffs_spherical
 scf_compute_coeffs_axi = SCFPotential.scf_compute_coeffs_axi
 scf_compute_coeffs = SCFPotential.scf_compute_coeffs
+scf_compute_coeffs_nbody = SCFPotential.scf_compute_coeffs_nbody
 #
 # Classes
 #
@@ -109,6 +111,7 @@ HernquistPotential= TwoPowerSphericalPotential.HernquistPotential
 TwoPowerSphericalPotential= TwoPowerSphericalPotential.TwoPowerSphericalPotential
 KGPotential= KGPotential.KGPotential
 interpRZPotential= interpRZPotential.interpRZPotential
+interp3DPotential= interp3DPotential.interp3DPotential
 DehnenBarPotential= DehnenBarPotential.DehnenBarPotential
 SteadyLogSpiralPotential= SteadyLogSpiralPotential.SteadyLogSpiralPotential
 TransientLogSpiralPotential= TransientLogSpiralPotential.TransientLogSpiralPotential
@@ -14,6 +14,8 @@ if _APY_LOADED:
     from astropy import units
 _TOL= 1.4899999999999999e-15
 _MAXITER= 20
+_CHUNKSIZE= 1000 # number of points for which the integrands are evaluated at once
+_DE_RMINFAC= 100. # double-exponential quadrature used for R >= _DE_RMINFAC x de_h x max(h_R,h_z)
 class DoubleExponentialDiskPotential(Potential):
     """Class that implements the double exponential disk potential
 
@@ -25,7 +27,7 @@ class DoubleExponentialDiskPotential(Potential):
     def __init__(self,amp=1.,hr=1./3.,hz=1./16.,
                  maxiter=_MAXITER,tol=0.001,normalize=False,
                  ro=None,vo=None,
-                 new=True,kmaxFac=2.,glorder=10):
+                 new=True,kmaxFac=2.,glorder=10,de_h=None):
         """
         NAME:
 
@@ -51,6 +53,8 @@ class DoubleExponentialDiskPotential(Potential):
 
            ro=, vo= distance and velocity scales for translation into internal units (default from configuration file)
 
+           de_h= (None) if set, compute the Hankel transforms that give the potential and forces using the double-exponential quadrature of Ogata (2005) with this step size rather than using Gaussian quadrature between the zeros of the Bessel functions; this is accurate to ~1e-8 or better at R >= 100 x de_h x max(hr,hz), below which Gaussian quadrature is still used, and does not approximate the disk as a point mass at large R; the number of quadrature points scales as 1/de_h (de_h=0.01 is faster than the default method, de_h=0.001 is accurate down to smaller R)
+
         OUTPUT:
 
            DoubleExponentialDiskPotential object
@@ -61,6 +65,8 @@ class DoubleExponentialDiskPotential(Potential):
 
            2013-01-01 - Re-implemented using faster integration techniques - Bovy (IAS)
 
+           2026-10-17 - Added precomputed quadrature tables and the double-exponential quadrature
+
         """
         Potential.__init__(self,amp=amp,ro=ro,vo=vo,amp_units='density')
         if _APY_LOADED and isinstance(hr,units.Quantity):
@@ -68,6 +74,7 @@ class DoubleExponentialDiskPotential(Potential):
         if _APY_LOADED and isinstance(hz,units.Quantity):
             hz= hz.to(units.kpc).value/self._ro
         self.hasC= True
+        self._approxC= True # C uses a different quadrature
         self._kmaxFac= kmaxFac
         self._glorder= glorder
         self._hr= hr
@@ -97,6 +104,26 @@ class DoubleExponentialDiskPotential(Potential):
         self._j2zeros[1:self._nzeros+1]= special.jn_zeros(2,self._nzeros)
         self._dj2zeros= self._j2zeros-nu.roll(self._j2zeros,1)
         self._dj2zeros[0]= self._j2zeros[0]
+        #Gauss-Legendre nodes and weights between all zeros
+        self._jzeros= [self._j0zeros,self._j1zeros,self._j2zeros]
+        self._glks= []
+        self._glweights= []
+        for zeros, dzeros in zip(self._jzeros,
+                                 [self._dj0zeros,self._dj1zeros,
+                                  self._dj2zeros]):
+            self._glks.append((0.5*(self._glx[None,:]+1.)*dzeros[1:,None]
+                               +zeros[:-1,None]).flatten())
+            self._glweights.append((self._glw[None,:]
+                                    *dzeros[1:,None]).flatten())
+        #Double-exponential quadrature nodes and weights
+        self._de_h= de_h
+        if not self._de_h is None:
+            self._de_nodes= [_de_hankel_nodes(order,self._de_h)
+                             for order in range(3)]
+            self._de_rmin= _DE_RMINFAC*self._de_h/min(self._alpha,self._beta)
+        else:
+            self._de_nodes= [(nu.array([]),nu.array([])) for order in range(3)]
+            self._de_rmin= 0.
         if normalize or \
                 (isinstance(normalize,(int,float)) \
                      and not isinstance(normalize,bool)): #pragma: no cover
@@ -120,35 +147,24 @@ class DoubleExponentialDiskPotential(Potential):
         HISTORY:
            2010-04-16 - Written - Bovy (NYU)
            2012-12-26 - New method using Gaussian quadrature between zeros - Bovy (IAS)
+           2026-10-17 - Vectorized
         DOCTEST:
            >>> doubleExpPot= DoubleExponentialDiskPotential()
            >>> r= doubleExpPot(1.,0) #doctest: +ELLIPSIS
            ...
            >>> assert( r+1.89595350484)**2.< 10.**-6.
         """
-        if True:
-            if isinstance(R,float):
-                floatIn= True
-                R= nu.array([R])
-                z= nu.array([z])
-            else:
-                floatIn= False
-            out= nu.empty(len(R))
-            indx= (R <= 6.)
-            out[True^indx]= self._kp(R[True^indx],z[True^indx])
-            R4max= nu.copy(R)
-            R4max[(R < 1.)]= 1.
-            kmax= self._kmaxFac*self._beta
-            for jj in range(len(R)):
-                if not indx[jj]: continue
-                maxj0zeroIndx= nu.argmin((self._j0zeros-kmax*R4max[jj])**2.) #close enough
-                ks= nu.array([0.5*(self._glx+1.)*self._dj0zeros[ii+1] + self._j0zeros[ii] for ii in range(maxj0zeroIndx)]).flatten()
-                weights= nu.array([self._glw*self._dj0zeros[ii+1] for ii in range(maxj0zeroIndx)]).flatten()
-                evalInt= special.jn(0,ks*R[jj])*(self._alpha**2.+ks**2.)**-1.5*(self._beta*nu.exp(-ks*nu.fabs(z[jj]))-ks*nu.exp(-self._beta*nu.fabs(z[jj])))/(self._beta**2.-ks**2.)
-                out[jj]= -2.*nu.pi*self._alpha*nu.sum(weights*evalInt)
-            if floatIn: return out[0]
-            else: return out
-    
+        R, z, floatIn, shape= _setup_Rz(R,z)
+        kpindx= self._keplerIndx(R,6.)
+        out= nu.empty(len(R))
+        if nu.any(kpindx):
+            out[kpindx]= self._kp(R[kpindx],z[kpindx])
+        indx= True^kpindx
+        out[indx]= -4.*nu.pi*self._alpha\
+            *self._hankel(0,self._potIntegrand,R[indx],z[indx])
+        if floatIn: return out[0]
+        else: return nu.reshape(out,shape)
+
     def _Rforce(self,R,z,phi=0.,t=0.):
         """
         NAME:
@@ -164,24 +180,21 @@ class DoubleExponentialDiskPotential(Potential):
            K_R (R,z)
         HISTORY:
            2010-04-16 - Written - Bovy (NYU)
+           2026-10-17 - Vectorized
         DOCTEST:
         """
-        if True:
-            if isinstance(R,nu.ndarray):
-                if not isinstance(z,nu.ndarray): z= nu.ones_like(R)*z
-                out= nu.array([self._Rforce(rr,zz) for rr,zz in zip(R,z)])
-                return out
-            if (R > 16.*self._hr or R > 6.) and hasattr(self,'_kp'): return self._kp.Rforce(R,z)
-            if R < 1.: R4max= 1.
-            else: R4max= R
-            kmax= self._kmaxFac*self._beta
-            kmax= 2.*self._kmaxFac*self._beta
-            maxj1zeroIndx= nu.argmin((self._j1zeros-kmax*R4max)**2.) #close enough
-            ks= nu.array([0.5*(self._glx+1.)*self._dj1zeros[ii+1] + self._j1zeros[ii] for ii in range(maxj1zeroIndx)]).flatten()
-            weights= nu.array([self._glw*self._dj1zeros[ii+1] for ii in range(maxj1zeroIndx)]).flatten()
-            evalInt= ks*special.jn(1,ks*R)*(self._alpha**2.+ks**2.)**-1.5*(self._beta*nu.exp(-ks*nu.fabs(z))-ks*nu.exp(-self._beta*nu.fabs(z)))/(self._beta**2.-ks**2.)
-            return -2.*nu.pi*self._alpha*nu.sum(weights*evalInt)
-    
+        R, z, floatIn, shape= _setup_Rz(R,z)
+        kpindx= self._keplerIndx(R,min(16.*self._hr,6.))
+        out= nu.empty(len(R))
+        if nu.any(kpindx):
+            out[kpindx]= self._kp.Rforce(R[kpindx],z[kpindx])
+        indx= True^kpindx
+        out[indx]= -4.*nu.pi*self._alpha\
+            *self._hankel(1,lambda k,z: k*self._potIntegrand(k,z),
+                          R[indx],z[indx],kmaxFac=2.)
+        if floatIn: return out[0]
+        else: return nu.reshape(out,shape)
+
     def _zforce(self,R,z,phi=0.,t=0.):
         """
         NAME:
@@ -197,25 +210,19 @@ class DoubleExponentialDiskPotential(Potential):
            K_z (R,z)
         HISTORY:
            2010-04-16 - Written - Bovy (NYU)
+           2026-10-17 - Vectorized
         DOCTEST:
         """
-        if True:
-            if isinstance(R,nu.ndarray):
-                if not isinstance(z,nu.ndarray): z= nu.ones_like(R)*z
-                out= nu.array([self._zforce(rr,zz) for rr,zz in zip(R,z)])
-                return out
-            if R > 16.*self._hr or R > 6.: return self._kp.zforce(R,z)
-            if R < 1.: R4max= 1.
-            else: R4max= R
-            kmax= self._kmaxFac*self._beta
-            maxj0zeroIndx= nu.argmin((self._j0zeros-kmax*R4max)**2.) #close enough
-            ks= nu.array([0.5*(self._glx+1.)*self._dj0zeros[ii+1] + self._j0zeros[ii] for ii in range(maxj0zeroIndx)]).flatten()
-            weights= nu.array([self._glw*self._dj0zeros[ii+1] for ii in range(maxj0zeroIndx)]).flatten()
-            evalInt= ks*special.jn(0,ks*R)*(self._alpha**2.+ks**2.)**-1.5*(nu.exp(-ks*nu.fabs(z))-nu.exp(-self._beta*nu.fabs(z)))/(self._beta**2.-ks**2.)
-            if z > 0.:
-                return -2.*nu.pi*self._alpha*self._beta*nu.sum(weights*evalInt)
-            else:
-                return 2.*nu.pi*self._alpha*self._beta*nu.sum(weights*evalInt)
+        R, z, floatIn, shape= _setup_Rz(R,z)
+        kpindx= self._keplerIndx(R,min(16.*self._hr,6.))
+        out= nu.empty(len(R))
+        if nu.any(kpindx):
+            out[kpindx]= self._kp.zforce(R[kpindx],z[kpindx])
+        indx= True^kpindx
+        out[indx]= -4.*nu.pi*self._alpha*self._beta*nu.sign(z[indx])\
+            *self._hankel(0,self._zforceIntegrand,R[indx],z[indx])
+        if floatIn: return out[0]
+        else: return nu.reshape(out,shape)
 
     def _R2deriv(self,R,z,phi=0.,t=0.):
         """
@@ -232,26 +239,20 @@ class DoubleExponentialDiskPotential(Potential):
            -d K_R (R,z) d R
         HISTORY:
            2012-12-27 - Written - Bovy (IAS)
+           2026-10-17 - Vectorized
         """
-        if True:
-            if isinstance(R,nu.ndarray):
-                if not isinstance(z,nu.ndarray): z= nu.ones_like(R)*z
-                out= nu.array([self._R2deriv(rr,zz) for rr,zz in zip(R,z)])
-                return out
-            if R > 16.*self._hr or R > 6.: return self._kp.R2deriv(R,z)
-            if R < 1.: R4max= 1.
-            else: R4max= R
-            kmax= 2.*self._kmaxFac*self._beta
-            maxj0zeroIndx= nu.argmin((self._j0zeros-kmax*R4max)**2.) #close enough
-            maxj2zeroIndx= nu.argmin((self._j2zeros-kmax*R4max)**2.) #close enough
-            ks0= nu.array([0.5*(self._glx+1.)*self._dj0zeros[ii+1] + self._j0zeros[ii] for ii in range(maxj0zeroIndx)]).flatten()
-            weights0= nu.array([self._glw*self._dj0zeros[ii+1] for ii in range(maxj0zeroIndx)]).flatten()
-            ks2= nu.array([0.5*(self._glx+1.)*self._dj2zeros[ii+1] + self._j2zeros[ii] for ii in range(maxj2zeroIndx)]).flatten()
-            weights2= nu.array([self._glw*self._dj2zeros[ii+1] for ii in range(maxj2zeroIndx)]).flatten()
-            evalInt0= ks0**2.*special.jn(0,ks0*R)*(self._alpha**2.+ks0**2.)**-1.5*(self._beta*nu.exp(-ks0*nu.fabs(z))-ks0*nu.exp(-self._beta*nu.fabs(z)))/(self._beta**2.-ks0**2.)
-            evalInt2= ks2**2.*special.jn(2,ks2*R)*(self._alpha**2.+ks2**2.)**-1.5*(self._beta*nu.exp(-ks2*nu.fabs(z))-ks2*nu.exp(-self._beta*nu.fabs(z)))/(self._beta**2.-ks2**2.)
-            return nu.pi*self._alpha*(nu.sum(weights0*evalInt0)
-                                      -nu.sum(weights2*evalInt2))
+        R, z, floatIn, shape= _setup_Rz(R,z)
+        kpindx= self._keplerIndx(R,min(16.*self._hr,6.))
+        out= nu.empty(len(R))
+        if nu.any(kpindx):
+            out[kpindx]= self._kp.R2deriv(R[kpindx],z[kpindx])
+        indx= True^kpindx
+        integrand= lambda k,z: k**2.*self._potIntegrand(k,z)
+        out[indx]= 2.*nu.pi*self._alpha\
+            *(self._hankel(0,integrand,R[indx],z[indx],kmaxFac=2.)
+              -self._hankel(2,integrand,R[indx],z[indx],kmaxFac=2.))
+        if floatIn: return out[0]
+        else: return nu.reshape(out,shape)
     
     def _z2deriv(self,R,z,phi=0.,t=0.):
         """
@@ -268,21 +269,18 @@ class DoubleExponentialDiskPotential(Potential):
            -d K_Z (R,z) d Z
         HISTORY:
            2012-12-26 - Written - Bovy (IAS)
+           2026-10-17 - Vectorized
         """
-        if True:
-            if isinstance(R,nu.ndarray):
-                if not isinstance(z,nu.ndarray): z= nu.ones_like(R)*z
-                out= nu.array([self._z2deriv(rr,zz) for rr,zz in zip(R,z)])
-                return out
-            if R > 16.*self._hr or R > 6.: return self._kp.z2deriv(R,z)
-            if R < 1.: R4max= 1.
-            else: R4max= R
-            kmax= self._kmaxFac*self._beta
-            maxj0zeroIndx= nu.argmin((self._j0zeros-kmax*R4max)**2.) #close enough
-            ks= nu.array([0.5*(self._glx+1.)*self._dj0zeros[ii+1] + self._j0zeros[ii] for ii in range(maxj0zeroIndx)]).flatten()
-            weights= nu.array([self._glw*self._dj0zeros[ii+1] for ii in range(maxj0zeroIndx)]).flatten()
-            evalInt= ks*special.jn(0,ks*R)*(self._alpha**2.+ks**2.)**-1.5*(ks*nu.exp(-ks*nu.fabs(z))-self._beta*nu.exp(-self._beta*nu.fabs(z)))/(self._beta**2.-ks**2.)
-            return -2.*nu.pi*self._alpha*self._beta*nu.sum(weights*evalInt)
+        R, z, floatIn, shape= _setup_Rz(R,z)
+        kpindx= self._keplerIndx(R,min(16.*self._hr,6.))
+        out= nu.empty(len(R))
+        if nu.any(kpindx):
+            out[kpindx]= self._kp.z2deriv(R[kpindx],z[kpindx])
+        indx= True^kpindx
+        out[indx]= -4.*nu.pi*self._alpha*self._beta\
+            *self._hankel(0,self._z2derivIntegrand,R[indx],z[indx])
+        if floatIn: return out[0]
+        else: return nu.reshape(out,shape)
 
     def _Rzderiv(self,R,z,phi=0.,t=0.):
         """
@@ -299,24 +297,97 @@ class DoubleExponentialDiskPotential(Potential):
            d2phi/dR/dz
         HISTORY:
            2013-08-28 - Written - Bovy (IAS)
+           2026-10-17 - Vectorized
+        """
+        R, z, floatIn, shape= _setup_Rz(R,z)
+        kpindx= self._keplerIndx(R,6.)
+        out= nu.empty(len(R))
+        if nu.any(kpindx):
+            out[kpindx]= self._kp.Rzderiv(R[kpindx],z[kpindx])
+        indx= True^kpindx
+        zsign= 2.*(z[indx] >= 0.)-1.
+        out[indx]= -4.*nu.pi*self._alpha*self._beta*zsign\
+            *self._hankel(1,lambda k,z: k*self._zforceIntegrand(k,z),
+                          R[indx],z[indx],kmaxFac=2.)
+        if floatIn: return out[0]
+        else: return nu.reshape(out,shape)
+
+    def _potIntegrand(self,k,z):
+        """Integrand of the Hankel transform for the potential, z >= 0"""
+        return (self._alpha**2.+k**2.)**-1.5\
+            *(self._beta*nu.exp(-k*z)-k*nu.exp(-self._beta*z))\
+            /(self._beta**2.-k**2.)
+
+    def _zforceIntegrand(self,k,z):
+        """Integrand of the Hankel transform for the vertical force, z >= 0"""
+        return k*(self._alpha**2.+k**2.)**-1.5\
+            *(nu.exp(-k*z)-nu.exp(-self._beta*z))/(self._beta**2.-k**2.)
+
+    def _z2derivIntegrand(self,k,z):
+        """Integrand of the Hankel transform for the z2 derivative, z >= 0"""
+        return k*(self._alpha**2.+k**2.)**-1.5\
+            *(k*nu.exp(-k*z)-self._beta*nu.exp(-self._beta*z))\
+            /(self._beta**2.-k**2.)
+
+    def _keplerIndx(self,R,Rkepler):
+        """Points at which the Gauss-Legendre method approximates the disk as a point mass"""
+        if not self._de_h is None or not hasattr(self,'_kp'):
+            return nu.zeros(R.shape,dtype='bool')
+        return R > Rkepler
+
+    def _hankel(self,order,integrand,R,z,kmaxFac=1.):
         """
-        if True:
-            if isinstance(R,nu.ndarray):
-                if not isinstance(z,nu.ndarray): z= nu.ones_like(R)*z
-                out= nu.array([self._Rzderiv(rr,zz) for rr,zz in zip(R,z)])
-                return out
-            if R > 6.: return self._kp.Rzderiv(R,z)
-            if R < 1.: R4max= 1.
-            else: R4max= R
-            kmax= 2.*self._kmaxFac*self._beta
-            maxj1zeroIndx= nu.argmin((self._j1zeros-kmax*R4max)**2.) #close enough
-            ks= nu.array([0.5*(self._glx+1.)*self._dj1zeros[ii+1] + self._j1zeros[ii] for ii in range(maxj1zeroIndx)]).flatten()
-            weights= nu.array([self._glw*self._dj1zeros[ii+1] for ii in range(maxj1zeroIndx)]).flatten()
-            evalInt= ks**2.*special.jn(1,ks*R)*(self._alpha**2.+ks**2.)**-1.5*(nu.exp(-ks*nu.fabs(z))-nu.exp(-self._beta*nu.fabs(z)))/(self._beta**2.-ks**2.)
-            if z >= 0.:
-                return -2.*nu.pi*self._alpha*self._beta*nu.sum(weights*evalInt)
-            else:
-                return 2.*nu.pi*self._alpha*self._beta*nu.sum(weights*evalInt)
+        NAME:
+           _hankel
+        PURPOSE:
+           compute int_0^infty integrand(k,|z|) J_order(kR) dk at many points at once
+        INPUT:
+           order - order of the Bessel function (0, 1, or 2)
+           integrand - function of (k,|z|) that broadcasts over its inputs
+           R - Cylindrical Galactocentric radius (array)
+           z - vertical height (array)
+           kmaxFac= (1.) maximum k in units of kmaxFac x beta used by the Gauss-Legendre method
+        OUTPUT:
+           integral at each (R,z)
+        HISTORY:
+           2026-10-17 - Written
+        """
+        out= nu.empty(len(R))
+        z= nu.fabs(z)
+        # Double-exponential quadrature for all but the smallest R
+        if self._de_h is None:
+            deindx= nu.zeros(len(R),dtype='bool')
+        else:
+            deindx= R >= self._de_rmin
+        if nu.any(deindx):
+            x, w= self._de_nodes[order]
+            tR, tz= R[deindx], z[deindx]
+            deout= nu.empty(len(tR))
+            for ii in range(0,len(tR),_CHUNKSIZE):
+                c= slice(ii,ii+_CHUNKSIZE)
+                deout[c]= nu.dot(integrand(x/tR[c,None],tz[c,None]),w)/tR[c]
+            out[deindx]= deout
+        # Gauss-Legendre quadrature between the zeros of J_order; points
+        # that need the same number of zeros share the same nodes
+        glindx= True^deindx
+        if not nu.any(glindx): return out
+        tR, tz= R[glindx], z[glindx]
+        R4max= nu.copy(tR)
+        R4max[(tR < 1.)]= 1.
+        kmax= kmaxFac*self._kmaxFac*self._beta
+        maxzeroIndx= nu.argmin((self._jzeros[order][None,:]
+                                -kmax*R4max[:,None])**2.,axis=1) #close enough
+        glout= nu.empty(len(tR))
+        for maxIndx in nu.unique(maxzeroIndx):
+            gindx= nu.arange(len(tR))[maxzeroIndx == maxIndx]
+            ks= self._glks[order][:maxIndx*self._glorder]
+            weights= self._glweights[order][:maxIndx*self._glorder]
+            for ii in range(0,len(gindx),_CHUNKSIZE):
+                c= gindx[ii:ii+_CHUNKSIZE]
+                glout[c]= nu.dot(special.jn(order,ks*tR[c,None])
+                                 *integrand(ks,tz[c,None]),weights)
+        out[glindx]= 0.5*glout
+        return out
 
     def _dens(self,R,z,phi=0.,t=0.):
         """
@@ -335,3 +406,37 @@ class DoubleExponentialDiskPotential(Potential):
            2010-08-08 - Written - Bovy (NYU)
         """
         return nu.exp(-self._alpha*R-self._beta*nu.fabs(z))
+
+def _setup_Rz(R,z):
+    """Broadcast R and z to 1D float arrays, remembering whether the input was scalar and its shape"""
+    floatIn= not isinstance(R,nu.ndarray) and not isinstance(z,nu.ndarray)
+    R, z= nu.broadcast_arrays(nu.atleast_1d(R),nu.atleast_1d(z))
+    return R.flatten().astype('float'), z.flatten().astype('float'), \
+        floatIn, R.shape
+
+def _de_hankel_nodes(order,h):
+    """
+    NAME:
+       _de_hankel_nodes
+    PURPOSE:
+       compute the nodes and weights of the double-exponential quadrature of Ogata (2005) for Hankel transforms, int_0^infty f(x) J_order(x) dx ~ sum_j w_j f(x_j)
+    INPUT:
+       order - order of the Bessel function
+       h - step size
+    OUTPUT:
+       (nodes,weights)
+    HISTORY:
+       2026-10-17 - Written
+    """
+    xi= special.jn_zeros(order,int(nu.ceil(4./h)))/nu.pi
+    t= h*xi
+    # Beyond this the nodes coincide with the zeros of J_order to machine
+    # precision and contribute nothing to the sum
+    tanh= nu.tanh(0.5*nu.pi*nu.sinh(t))
+    xi, t, tanh= xi[tanh < 1.], t[tanh < 1.], tanh[tanh < 1.]
+    x= nu.pi/h*t*tanh
+    dpsi= (nu.pi*t*nu.cosh(t)+nu.sinh(nu.pi*nu.sinh(t)))\
+        /(1.+nu.cosh(nu.pi*nu.sinh(t)))
+    w= 2./(nu.pi*xi*special.jv(order+1,nu.pi*xi)**2.)\
+        *special.jv(order,x)*dpsi
+    return (x,w)
@@ -8,11 +8,11 @@
 #       m^2 = x^2 + y^2/b^2 + z^2/c^2
 ########################################################################
 import numpy as np
-import hashlib
 from scipy import integrate
 from scipy.special import gamma
 from galpy.util import bovy_conversion, bovy_coords
 from galpy.potential_src.Potential import Potential, _APY_LOADED
+from galpy.potential_src.forceCache import ForceCache, force_cache_key
 if _APY_LOADED:
     from astropy import units
 
@@ -31,8 +31,6 @@ class FerrersPotential(Potential):
 
     and :math:`(x',y',z')` is a rotated frame wrt :math:`(x,y,z)`
     so that the major axis is aligned with :math:`x'`.
-
-    Note that this potential has not yet been optimized for speed and has no C implementation, so orbit integration is currently slow.
     """
 
     def __init__(self,amp=1.,a=1.,n=2,b=0.35,c=0.2375,omegab=0.,
@@ -90,9 +88,11 @@ class FerrersPotential(Potential):
         self._a2= self.a**2
         self._b2= self._b**2.
         self._c2= self._c**2.
-        self._force_hash= None
+        self._force_cache= ForceCache()
         self._pa = pa
         self._rhoc_M = gamma(n+2.5)/gamma(n+1) / np.pi**1.5/a**3/b/c
+        self.hasC= True
+        self.hasC_dxdv= True
         if normalize or \
                 (isinstance(normalize,(int,float)) \
                      and not isinstance(normalize,bool)): #pragma: no cover
@@ -144,8 +144,8 @@ class FerrersPotential(Potential):
         """
         if not self.isNonAxi:
             phi= 0.
-        self._compute_xyzforces(R,z,phi,t)
-        return np.cos(phi)*self._cached_Fx+np.sin(phi)*self._cached_Fy
+        Fx, Fy, Fz= self._compute_xyzforces(R,z,phi,t)
+        return np.cos(phi)*Fx+np.sin(phi)*Fy
 
     def _phiforce(self,R,z,phi=0.,t=0.):
         """
@@ -163,9 +163,8 @@ class FerrersPotential(Potential):
         """
         if not self.isNonAxi:
             phi= 0.
-        self._compute_xyzforces(R,z,phi,t)
-        return R*(-np.sin(phi)*self._cached_Fx\
-                       +np.cos(phi)*self._cached_Fy)
+        Fx, Fy, Fz= self._compute_xyzforces(R,z,phi,t)
+        return R*(-np.sin(phi)*Fx+np.cos(phi)*Fy)
 
     def _zforce(self,R,z,phi=0.,t=0.):
         """
@@ -183,30 +182,26 @@ class FerrersPotential(Potential):
         """
         if not self.isNonAxi:
             phi= 0.
-        self._compute_xyzforces(R,z,phi,t)
-        return self._cached_Fz
+        Fx, Fy, Fz= self._compute_xyzforces(R,z,phi,t)
+        return Fz
 
     def _compute_xyz(self,R,phi,z,t):
         return bovy_coords.cyl_to_rect(R,phi-self._pa-self._omegab*t,z)
 
     def _compute_xyzforces(self,R,z,phi,t):
         # Compute all rectangular forces
-        new_hash= hashlib.md5(np.array([R,phi,z,t])).hexdigest()
-        if new_hash == self._force_hash:
-            Fx= self._cached_Fx
-            Fy= self._cached_Fy
-            Fz= self._cached_Fz
-        else:
+        key= force_cache_key(R,phi,z,t)
+        out= self._force_cache.get(key)
+        if out is None:
             x,y,z= self._compute_xyz(R,phi,z,t)
             Fx= self._xforce_xyz(x,y,z)
             Fy= self._yforce_xyz(x,y,z)
             Fz= self._zforce_xyz(x,y,z)
-            self._force_hash= new_hash
             tp= self._pa+self._omegab*t
             cp, sp= np.cos(tp), np.sin(tp)
-            self._cached_Fx= cp*Fx-sp*Fy
-            self._cached_Fy= sp*Fx+cp*Fy
-            self._cached_Fz= Fz
+            out= (cp*Fx-sp*Fy,sp*Fx+cp*Fy,Fz)
+            self._force_cache.put(key,out)
+        return out
 
     def _xforce_xyz(self,x,y,z):
         """Evaluation of the x force as a function of (x,y,z) in the aligned
@@ -248,9 +243,9 @@ class FerrersPotential(Potential):
         phiyya= self._2ndderiv_xyz(x,y,z,1,1)
         ang = self._omegab*t + self._pa
         c, s = np.cos(ang), np.sin(ang)
-        phixx = c**2*phixxa + 2.*c*s*phixya + s**2*phiyya
-        phixy = (c**2-s**2)*phixya + c*s*(phiyya - phixxa)
-        phiyy = s**2*phixxa - 2.*c*s*phixya + c**2*phiyya
+        phixx = c**2*phixxa - 2.*c*s*phixya + s**2*phiyya
+        phixy = (c**2-s**2)*phixya + c*s*(phixxa - phiyya)
+        phiyy = s**2*phixxa + 2.*c*s*phixya + c**2*phiyya
         return np.cos(phi)**2.*phixx + np.sin(phi)**2.*phiyy + \
             2.*np.cos(phi)*np.sin(phi)*phixy
 
@@ -275,8 +270,8 @@ class FerrersPotential(Potential):
         phiyza= self._2ndderiv_xyz(x,y,z,1,2)
         ang = self._omegab*t + self._pa
         c, s = np.cos(ang), np.sin(ang)
-        phixz = c*phixza + s*phiyza
-        phiyz = c*phixza - s*phiyza
+        phixz = c*phixza - s*phiyza
+        phiyz = s*phixza + c*phiyza
         return np.cos(phi)*phixz + np.sin(phi)*phiyz
 
     def _z2deriv(self,R,z,phi=0.,t=0.):
@@ -324,9 +319,9 @@ class FerrersPotential(Potential):
         phiyya= self._2ndderiv_xyz(x,y,z,1,1)
         ang = self._omegab*t + self._pa
         c, s = np.cos(ang), np.sin(ang)
-        phixx = c**2*phixxa + 2.*c*s*phixya + s**2*phiyya
-        phixy = (c**2-s**2)*phixya + c*s*(phiyya - phixxa)
-        phiyy = s**2*phixxa - 2.*c*s*phixya + c**2*phiyya
+        phixx = c**2*phixxa - 2.*c*s*phixya + s**2*phiyya
+        phixy = (c**2-s**2)*phixya + c*s*(phixxa - phiyya)
+        phiyy = s**2*phixxa + 2.*c*s*phixya + c**2*phiyya
         return R**2.*(np.sin(phi)**2.*phixx+np.cos(phi)**2.*phiyy\
                           -2.*np.cos(phi)*np.sin(phi)*phixy)\
                           +R*(np.cos(phi)*Fx+np.sin(phi)*Fy)
@@ -357,9 +352,9 @@ class FerrersPotential(Potential):
         phiyya= self._2ndderiv_xyz(x,y,z,1,1)
         ang = self._omegab*t + self._pa
         c, s = np.cos(ang), np.sin(ang)
-        phixx = c**2*phixxa + 2.*c*s*phixya + s**2*phiyya
-        phixy = (c**2-s**2)*phixya + c*s*(phiyya - phixxa)
-        phiyy = s**2*phixxa - 2.*c*s*phixya + c**2*phiyya
+        phixx = c**2*phixxa - 2.*c*s*phixya + s**2*phiyya
+        phixy = (c**2-s**2)*phixya + c*s*(phixxa - phiyya)
+        phiyy = s**2*phixxa + 2.*c*s*phixya + c**2*phiyya
         return R*np.cos(phi)*np.sin(phi)*\
             (phiyy-phixx)+R*np.cos(2.*(phi))*phixy\
             +np.sin(phi)*Fx-np.cos(phi)*Fy
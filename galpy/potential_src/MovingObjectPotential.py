@@ -7,6 +7,7 @@
 ###############################################################################
 import copy
 import numpy as nu
+from scipy import interpolate
 from galpy.potential_src.Potential import Potential, _APY_LOADED
 if _APY_LOADED:
     from astropy import units
@@ -66,6 +67,8 @@ class MovingObjectPotential(Potential):
 
            2011-04-10 - Started - Bovy (NYU)
 
+           2026-10-17 - Added the trajectory table for the C implementation
+
         """
         Potential.__init__(self,amp=amp*GM,ro=ro,vo=vo,amp_units='mass')
         if _APY_LOADED and isinstance(softening_length,units.Quantity):
@@ -79,6 +82,15 @@ class MovingObjectPotential(Potential):
         else:
             self._softening= softening
         self.isNonAxi= True
+        # The C implementation evaluates the object's trajectory as
+        # piecewise-cubic polynomials and only supports Plummer softening
+        try:
+            self._tbreak, self._xcoeffs, self._ycoeffs, self._zcoeffs= \
+                _trajectory_table(self._orb)
+        except (ValueError,TypeError): # e.g., too few times for a spline
+            self.hasC= False
+        else:
+            self.hasC= isinstance(self._softening,PlummerSoftening)
         return None
 
     def _evaluate(self,R,z,phi=0.,t=0.):
@@ -197,6 +209,24 @@ class MovingObjectPotential(Potential):
                        self._orb.R(t),self._orb.phi(t),self._orb.z(t))
         return self._softening.density(dist)
 
+def _check_movingobject_times(pot,t):
+    """Raise a ValueError when the times t fall outside of the time range over which the orbit of a MovingObjectPotential in pot (or in a wrapper in pot) was integrated, because the object's position would be extrapolated there (and the C implementation returns NaN)"""
+    if isinstance(pot,list):
+        for p in pot: _check_movingobject_times(p,t)
+        return None
+    if hasattr(pot,'_Pot'): # planar or linear potential from a 3D potential
+        return _check_movingobject_times(pot._Pot,t)
+    if hasattr(pot,'_pot'): # wrapper potential
+        return _check_movingobject_times(pot._pot,t)
+    if not isinstance(pot,MovingObjectPotential) \
+            or not hasattr(pot._orb._orb,'t'):
+        return None
+    tmin, tmax= nu.amin(pot._orb._orb.t), nu.amax(pot._orb._orb.t)
+    ttol= 10.**-10.*(tmax-tmin)
+    if nu.amin(t) < tmin-ttol or nu.amax(t) > tmax+ttol:
+        raise ValueError("Times [%g,%g] are outside of the time range [%g,%g] over which the orbit of the MovingObjectPotential was integrated" % (nu.amin(t),nu.amax(t),tmin,tmax))
+    return None
+
 def _cyldist(R1,phi1,z1,R2,phi2,z2):
     return nu.sqrt( (R1*nu.cos(phi1)-R2*nu.cos(phi2))**2.
                     +(R1*nu.sin(phi1)-R2*nu.sin(phi2))**2.
@@ -208,3 +238,29 @@ def _cyldiffdist(R1,phi1,z1,R2,phi2,z2):
     z= z1-z2
     return (x,y,z,nu.sqrt(x**2.+y**2.+z**2.))
 
+def _trajectory_table(orb):
+    """
+    NAME:
+       _trajectory_table
+    PURPOSE:
+       represent the spline interpolation of the rectangular coordinates of an orbit as a function of time as piecewise-cubic polynomials
+    INPUT:
+       orb - Orbit instance
+    OUTPUT:
+       (breakpoints in time [nint+1],coefficients for x,y,z [nint,4], highest power first)
+    HISTORY:
+       2026-10-17 - Written
+    """
+    if not len(orb._orb.vxvv) == 6 or not hasattr(orb._orb,'t'):
+        raise ValueError("Trajectory table requires an integrated, full 3D Orbit")
+    orb._orb._setupOrbitInterp()
+    out= []
+    for interp in [orb._orb._orbInterp[0],orb._orb._orbInterp[-1],
+                   orb._orb._orbInterp[3]]: # x, y, z
+        pp= interpolate.PPoly.from_spline(interp._eval_args)
+        # Remove the zero-length intervals at the repeated end knots
+        indx= pp.x[1:] > pp.x[:-1]
+        if len(out) == 0:
+            out.append(nu.append(pp.x[:-1][indx],pp.x[1:][indx][-1]))
+        out.append(pp.c[:,indx].T.copy())
+    return tuple(out)
@@ -19,11 +19,12 @@ import os, os.path
 import pickle
 from functools import wraps
 import math
+import warnings
 import numpy as nu
 from scipy import optimize, integrate
 import galpy.util.bovy_plot as plot
 from galpy.util import bovy_coords
-from galpy.util import config
+from galpy.util import config, galpyWarning
 from galpy.util.bovy_conversion import velocity_in_kpcGyr, \
     physical_conversion, potential_physical_input, freq_in_Gyr
 from galpy.util import bovy_conversion
@@ -53,6 +54,7 @@ class Potential(object):
         self.isNonAxi= False
         self.hasC= False
         self.hasC_dxdv= False
+        self._approxC= False # whether C only approximates the Python implementation
         # Parse ro and vo
         if ro is None:
             self._ro= config.__config__.getfloat('normalization','ro')
@@ -1500,6 +1502,65 @@ class Potential(object):
         except AttributeError:
             raise AttributeError('NEMO acceleration parameters not supported for %s' % self.__class__.__name__)
 
+    def force_cache_info(self):
+        """
+        NAME:
+
+           force_cache_info
+
+        PURPOSE:
+
+           return the statistics of the cache of force evaluations (for potentials that cache the rectangular forces shared between Rforce, zforce, and phiforce)
+
+        INPUT:
+
+           (none)
+
+        OUTPUT:
+
+           CacheInfo(hits,misses,maxsize,currsize) named tuple or None if this potential does not cache its forces
+
+        HISTORY:
+
+           2026-10-17 - Written
+
+        """
+        try:
+            return self._force_cache.cache_info()
+        except AttributeError:
+            return None
+
+    def force_cache_clear(self,maxsize=None):
+        """
+        NAME:
+
+           force_cache_clear
+
+        PURPOSE:
+
+           clear the cache of force evaluations and its statistics
+
+        INPUT:
+
+           maxsize= (None) if set, change the maximum number of cached evaluations
+
+        OUTPUT:
+
+           (none)
+
+        HISTORY:
+
+           2026-10-17 - Written
+
+        """
+        try:
+            self._force_cache.cache_clear()
+        except AttributeError:
+            return None
+        if not maxsize is None:
+            self._force_cache._maxsize= maxsize
+        return None
+
 class PotentialError(Exception): #pragma: no cover
     def __init__(self, value):
         self.value = value
@@ -1508,7 +1569,7 @@ class PotentialError(Exception): #pragma: no cover
 
 @potential_physical_input
 @physical_conversion('energy',pop=True)
-def evaluatePotentials(Pot,R,z,phi=None,t=0.,dR=0,dphi=0):
+def evaluatePotentials(Pot,R,z,phi=None,t=0.,dR=0,dphi=0,c=None):
     """
     NAME:
 
@@ -1532,6 +1593,8 @@ def evaluatePotentials(Pot,R,z,phi=None,t=0.,dR=0,dphi=0):
 
        dR= dphi=, if set to non-zero integers, return the dR, dphi't derivative instead
 
+       c= (None) if True, evaluate the potential of all points at once in C, parallelized over the points; by default, C is used for array input when all potentials have a C implementation that agrees with the Python implementation to numerical precision
+
     OUTPUT:
 
        Phi(R,z)
@@ -1540,14 +1603,19 @@ def evaluatePotentials(Pot,R,z,phi=None,t=0.,dR=0,dphi=0):
 
        2010-04-16 - Written - Bovy (NYU)
 
+       2026-10-17 - Added c keyword
+
     """
-    return _evaluatePotentials(Pot,R,z,phi=phi,t=t,dR=dR,dphi=dphi)
+    return _evaluatePotentials(Pot,R,z,phi=phi,t=t,dR=dR,dphi=dphi,c=c)
 
-def _evaluatePotentials(Pot,R,z,phi=None,t=0.,dR=0,dphi=0):
+def _evaluatePotentials(Pot,R,z,phi=None,t=0.,dR=0,dphi=0,c=False):
     """Raw, undecorated function for internal use"""
     nonAxi= _isNonAxi(Pot)
     if nonAxi and phi is None:
         raise PotentialError("The (list of) Potential instances is non-axisymmetric, but you did not provide phi")
+    if dR == 0 and dphi == 0:
+        out= _evaluate_c(Pot,R,z,phi,t,'potential',c)
+        if not out is None: return out
     isList= isinstance(Pot,list)
     if isList:
         sum= 0.
@@ -1614,7 +1682,7 @@ def evaluateDensities(Pot,R,z,phi=None,t=0.,forcepoisson=False):
 
 @potential_physical_input
 @physical_conversion('force',pop=True)
-def evaluateRforces(Pot,R,z,phi=None,t=0.):
+def evaluateRforces(Pot,R,z,phi=None,t=0.,c=None):
     """
     NAME:
 
@@ -1636,6 +1704,8 @@ def evaluateRforces(Pot,R,z,phi=None,t=0.):
 
        t - time (optional; can be Quantity)
 
+       c= (None) if True, evaluate the radial force of all points at once in C, parallelized over the points; by default, C is used for array input when all potentials have a C implementation that agrees with the Python implementation to numerical precision
+
     OUTPUT:
 
        F_R(R,z,phi,t)
@@ -1644,15 +1714,19 @@ def evaluateRforces(Pot,R,z,phi=None,t=0.):
 
        2010-04-16 - Written - Bovy (NYU)
 
+       2026-10-17 - Added c keyword
+
     """
-    return _evaluateRforces(Pot,R,z,phi=phi,t=t)
+    return _evaluateRforces(Pot,R,z,phi=phi,t=t,c=c)
 
-def _evaluateRforces(Pot,R,z,phi=None,t=0.):
+def _evaluateRforces(Pot,R,z,phi=None,t=0.,c=False):
     """Raw, undecorated function for internal use"""
     isList= isinstance(Pot,list)
     nonAxi= _isNonAxi(Pot)
     if nonAxi and phi is None:
         raise PotentialError("The (list of) Potential instances is non-axisymmetric, but you did not provide phi")
+    out= _evaluate_c(Pot,R,z,phi,t,'Rforce',c)
+    if not out is None: return out
     if isList:
         sum= 0.
         for pot in Pot:
@@ -1665,7 +1739,7 @@ def _evaluateRforces(Pot,R,z,phi=None,t=0.):
 
 @potential_physical_input
 @physical_conversion('force',pop=True)
-def evaluatephiforces(Pot,R,z,phi=None,t=0.):
+def evaluatephiforces(Pot,R,z,phi=None,t=0.,c=None):
     """
     NAME:
 
@@ -1686,6 +1760,8 @@ def evaluatephiforces(Pot,R,z,phi=None,t=0.):
 
        t - time (optional; can be Quantity)
 
+       c= (None) if True, evaluate the azimuthal force of all points at once in C, parallelized over the points; by default, C is used for array input when all potentials have a C implementation that agrees with the Python implementation to numerical precision
+
     OUTPUT:
 
        F_phi(R,z,phi,t)
@@ -1694,15 +1770,19 @@ def evaluatephiforces(Pot,R,z,phi=None,t=0.):
 
        2010-04-16 - Written - Bovy (NYU)
 
+       2026-10-17 - Added c keyword
+
     """
-    return _evaluatephiforces(Pot,R,z,phi=phi,t=t)
+    return _evaluatephiforces(Pot,R,z,phi=phi,t=t,c=c)
 
-def _evaluatephiforces(Pot,R,z,phi=None,t=0.):
+def _evaluatephiforces(Pot,R,z,phi=None,t=0.,c=False):
     """Raw, undecorated function for internal use"""
     isList= isinstance(Pot,list)
     nonAxi= _isNonAxi(Pot)
     if nonAxi and phi is None:
         raise PotentialError("The (list of) Potential instances is non-axisymmetric, but you did not provide phi")
+    out= _evaluate_c(Pot,R,z,phi,t,'phiforce',c)
+    if not out is None: return out
     if isList:
         sum= 0.
         for pot in Pot:
@@ -1715,7 +1795,7 @@ def _evaluatephiforces(Pot,R,z,phi=None,t=0.):
 
 @potential_physical_input
 @physical_conversion('force',pop=True)
-def evaluatezforces(Pot,R,z,phi=None,t=0.):
+def evaluatezforces(Pot,R,z,phi=None,t=0.,c=None):
     """
     NAME:
 
@@ -1737,6 +1817,8 @@ def evaluatezforces(Pot,R,z,phi=None,t=0.):
 
        t - time (optional; can be Quantity)
 
+       c= (None) if True, evaluate the vertical force of all points at once in C, parallelized over the points; by default, C is used for array input when all potentials have a C implementation that agrees with the Python implementation to numerical precision
+
     OUTPUT:
 
        F_z(R,z,phi,t)
@@ -1745,15 +1827,19 @@ def evaluatezforces(Pot,R,z,phi=None,t=0.):
 
        2010-04-16 - Written - Bovy (NYU)
 
+       2026-10-17 - Added c keyword
+
     """
-    return _evaluatezforces(Pot,R,z,phi=phi,t=t)
+    return _evaluatezforces(Pot,R,z,phi=phi,t=t,c=c)
 
-def _evaluatezforces(Pot,R,z,phi=None,t=0.):
+def _evaluatezforces(Pot,R,z,phi=None,t=0.,c=False):
     """Raw, undecorated function for internal use"""
     isList= isinstance(Pot,list)
     nonAxi= _isNonAxi(Pot)
     if nonAxi and phi is None:
         raise PotentialError("The (list of) Potential instances is non-axisymmetric, but you did not provide phi")
+    out= _evaluate_c(Pot,R,z,phi,t,'zforce',c)
+    if not out is None: return out
     if isList:
         sum= 0.
         for pot in Pot:
@@ -2330,7 +2416,7 @@ def rl(Pot,lz):
 
        Pot - Potential instance or list thereof
 
-       lz - Angular momentum (can be Quantity)
+       lz - Angular momentum (can be Quantity); can be an array, in which case the radii are found for all lz at once using a vectorized root finder
 
     OUTPUT:
 
@@ -2340,6 +2426,8 @@ def rl(Pot,lz):
 
        2012-07-30 - Written - Bovy (IAS@MPIA)
 
+       2026-10-17 - Added array input
+
     NOTE:
 
        seems to take about ~0.5 ms for a Miyamoto-Nagai potential; 
@@ -2351,6 +2439,8 @@ def rl(Pot,lz):
             lz= lz.to(units.km/units.s*units.kpc).value/Pot._vo/Pot._ro
         elif hasattr(Pot[0],'_ro'):
             lz= lz.to(units.km/units.s*units.kpc).value/Pot[0]._vo/Pot[0]._ro
+    if nu.ndim(lz) > 0:
+        return _rl_vec(Pot,lz)
     #Find interval
     rstart= _rlFindStart(math.fabs(lz),#assumes vo=1.
                          math.fabs(lz),
@@ -2384,6 +2474,55 @@ def _rlFindStart(rl,lz,pot,lower=False):
             rtry*= 2.
     return rtry
 
+def _rl_vec(Pot,lz):
+    """rl for an array of lz"""
+    lz= nu.fabs(nu.array(lz,dtype='float'))
+    out= nu.zeros(lz.shape)
+    indx= lz > 0.
+    lz= lz[indx]
+    #Find intervals, as in _rlFindStart
+    rupper= 2.*lz
+    tindx= _rlfunc(rupper,lz,Pot) < 0.
+    while nu.any(tindx):
+        rupper[tindx]*= 2.
+        tindx[tindx]= _rlfunc(rupper[tindx],lz[tindx],Pot) < 0.
+    rlower= 10.**-5.*nu.ones_like(lz)
+    tindx= _rlfunc(rlower,lz,Pot) > 0.
+    while nu.any(tindx):
+        rlower[tindx]/= 2.
+        tindx[tindx]= _rlfunc(rlower[tindx],lz[tindx],Pot) > 0.
+    out[indx]= _rootfind_vec(lambda r,l: _rlfunc(r,l,Pot),rlower,rupper,
+                             args=(lz,),maxiter=200)
+    return out
+
+def _rootfind_vec(func,a,b,args=(),xtol=2e-12,rtol=4.*nu.finfo(float).eps,
+                  maxiter=100):
+    """Find the roots of func(x,*args) for arrays of brackets [a,b] at once, using the Illinois variant of the regula falsi method; args are arrays of the same length as a and b"""
+    a= nu.array(a,dtype='float')
+    b= nu.array(b,dtype='float')
+    fa= func(a,*args)
+    fb= func(b,*args)
+    out= nu.where(fa == 0.,a,b)
+    active= (fa != 0.)*(fb != 0.)
+    for ii in range(maxiter):
+        if not nu.any(active): break
+        ta, tb, tfa, tfb= a[active], b[active], fa[active], fb[active]
+        c= tb-tfb*(tb-ta)/(tfb-tfa)
+        fc= func(c,*[arg[active] for arg in args])
+        # If the root is between b and c, b becomes the other end,
+        # otherwise the other end stays and its value is halved
+        swap= fc*tfb < 0.
+        ta[swap]= tb[swap]
+        tfa[swap]= tfb[swap]
+        tfa[True^swap]*= 0.5
+        a[active]= ta
+        fa[active]= tfa
+        b[active]= c
+        fb[active]= fc
+        out[active]= c
+        active[active]= (fc != 0.)*(nu.fabs(c-ta) > xtol+rtol*nu.fabs(c))
+    return out
+
 @physical_conversion('position',pop=True)
 def lindbladR(Pot,OmegaP,m=2,**kwargs):
     """
@@ -2407,12 +2546,14 @@ def lindbladR(Pot,OmegaP,m=2,**kwargs):
 
     OUTPUT:
 
-       radius of Linblad resonance, None if there is no resonance
+       radius of Linblad resonance, None if there is no resonance; if OmegaP is an array, the radii for all OmegaP are found at once using a vectorized root finder and NaN is returned where there is no resonance
 
     HISTORY:
 
        2011-10-09 - Written - Bovy (IAS)
 
+       2026-10-17 - Added array input
+
     """
     if _APY_LOADED and isinstance(OmegaP,units.Quantity):
         if hasattr(Pot,'_ro'):
@@ -2427,6 +2568,8 @@ def lindbladR(Pot,OmegaP,m=2,**kwargs):
             raise IOError("'m' input not recognized, should be an integer or 'corotation'")
     else:
         corotation= False
+    if nu.ndim(OmegaP) > 0:
+        return _lindbladR_vec(Pot,OmegaP,m,corotation,**kwargs)
     if corotation:
         try:
             out= optimize.brentq(_corotationR_eq,0.0000001,1000.,
@@ -2446,6 +2589,23 @@ def lindbladR(Pot,OmegaP,m=2,**kwargs):
             raise
         return out
 
+def _lindbladR_vec(Pot,OmegaP,m,corotation,**kwargs):
+    """lindbladR for an array of OmegaP"""
+    OmegaP= nu.array(OmegaP,dtype='float')
+    if corotation:
+        func= lambda R,Op: _corotationR_eq(R,Pot,Op)
+    else:
+        func= lambda R,Op: _lindbladR_eq(R,Pot,Op,m)
+    Rlower= 0.0000001*nu.ones_like(OmegaP)
+    Rupper= 1000.*nu.ones_like(OmegaP)
+    out= nu.empty(OmegaP.shape)
+    out[:]= nu.nan
+    # No resonance where there is no sign change
+    indx= func(Rlower,OmegaP)*func(Rupper,OmegaP) <= 0.
+    out[indx]= _rootfind_vec(func,Rlower[indx],Rupper[indx],
+                             args=(OmegaP[indx],),**kwargs)
+    return out
+
 def _corotationR_eq(R,Pot,OmegaP):
     return omegac(Pot,R,use_physical=False)-OmegaP
 def _lindbladR_eq(R,Pot,OmegaP,m):
@@ -2622,6 +2782,41 @@ def turn_physical_on(Pot,ro=None,vo=None):
         Pot.turn_physical_on(ro=ro,vo=vo)
     return None
 
+def _evaluate_c(Pot,R,z,phi,t,quantity,c):
+    """Evaluate the potential or a force for many points at once in C if requested (c=True) or by default for array input (c=None) when C agrees with Python; returns None if this is not possible and the Python implementation should be used"""
+    if c is False \
+            or (c is None and nu.ndim(R) == 0 and nu.ndim(z) == 0 \
+                    and nu.ndim(phi) == 0 and nu.ndim(t) == 0):
+        return None
+    if c is None and _check_approx_c(Pot):
+        # Array and scalar input should give the same result by default
+        return None
+    from galpy.potential_src.interpRZPotential import ext_loaded, \
+        eval_potentials_c
+    if ext_loaded and _check_c(Pot):
+        if phi is None: phi= 0.
+        R,z,phi,t= nu.broadcast_arrays(R,z,phi,t)
+        try:
+            out, err= eval_potentials_c(Pot,R.flatten(),z.flatten(),
+                                        phi.flatten(),t.flatten(),
+                                        quantity=quantity)
+        except NotImplementedError:
+            pass
+        else:
+            if err == 0:
+                if R.ndim == 0: return out[0]
+                else: return nu.reshape(out,R.shape)
+            elif c:
+                warnings.warn("Evaluating the %s in C failed with error code %i (using Python instead)" % (quantity,err),
+                              galpyWarning)
+                return None
+            else: #pragma: no cover
+                return None
+    if c:
+        warnings.warn("Cannot evaluate the %s in C, because some of the potentials are not implemented in C (using Python instead)" % quantity,
+                      galpyWarning)
+    return None
+
 def _check_c(Pot,dxdv=False):
     """
 
@@ -2662,6 +2857,17 @@ def _check_c(Pot,dxdv=False):
     elif isinstance(Pot,Potential) or isinstance(Pot,planarPotential):
         return Pot.__dict__[hasC_attr]
 
+def _check_approx_c(Pot):
+    """Check whether the C implementation of a potential or of any of a list of potentials only approximates the Python implementation (e.g., because it uses a different quadrature), such that C should not be used unless requested"""
+    from galpy.potential_src.WrapperPotential import WrapperPotential
+    if isinstance(Pot,list):
+        return nu.any(nu.array([_check_approx_c(p) for p in Pot],
+                               dtype='bool'))
+    elif isinstance(Pot,WrapperPotential):
+        return bool(getattr(Pot,'_approxC',False) or _check_approx_c(Pot._pot))
+    else:
+        return bool(getattr(Pot,'_approxC',False))
+
 def _dim(Pot):
     """
     NAME:                                                                       
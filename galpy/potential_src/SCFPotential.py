@@ -4,14 +4,18 @@ from galpy.potential_src.Potential import Potential, _APY_LOADED
 if _APY_LOADED:
     from astropy import units
     
-from galpy.util import bovy_coords
+from galpy.util import bovy_coords, multi
 from scipy.special import eval_gegenbauer, lpmn, gamma
 
 from numpy.polynomial.legendre import leggauss
 
 from scipy.special import gammaln
 
-import hashlib
+from galpy.potential_src.forceCache import ForceCache, force_cache_key
+from galpy.potential_src.interpRZPotential import ext_loaded, \
+    eval_potentials_c
+
+_CHUNKSIZE= 10000 # number of points for which the basis functions are evaluated at once
 
 
 class SCFPotential(Potential):
@@ -127,7 +131,7 @@ class SCFPotential(Potential):
             self._Asin = Asin*NN[nu.newaxis,:,:]
         else:
             self._Asin = nu.zeros_like(Acos)
-        self._force_hash= None
+        self._force_cache= ForceCache()
         self.hasC= True
         self.hasC_dxdv=True
         
@@ -183,23 +187,23 @@ class SCFPotential(Potential):
         PURPOSE:
            Evaluate rho_tilde as defined in equation 3.9 and 2.24 for 0 <= n < N and 0 <= l < L
         INPUT:
-           r - Evaluate at radius r
+           r - Evaluate at radius r (can be an array)
            N - size of the N dimension
            L - size of the L dimension
         OUTPUT:
-           rho tilde 
+           rho tilde (NxL array, with the shape of r prepended for array r)
         HISTORY:
-           2016-05-17 - Written - Aladdin 
+           2016-05-17 - Written - Aladdin
+           2026-10-17 - Vectorized over r
         """
         xi = self._calculateXi(r)
         CC = _C(xi,N,L)
         a = self._a
-        rho = nu.zeros((N,L), float)
+        r = nu.asarray(r, dtype=float)[...,nu.newaxis,nu.newaxis]
         n = nu.arange(0,N, dtype=float)[:, nu.newaxis]
         l = nu.arange(0, L, dtype=float)[nu.newaxis,:]
         K = 0.5 * n * (n + 4*l + 3) + (l + 1.)*(2*l + 1)
-        rho[:,:] = K * ((a*r)**l) / ((r/a)*(a + r)**(2*l + 3.)) * CC[:,:]* (nu.pi)**-0.5
-        return rho   
+        return K * ((a*r)**l) / ((r/a)*(a + r)**(2*l + 3.)) * CC* (nu.pi)**-0.5
 
     def _phiTilde(self, r, N,L):
         """
@@ -208,56 +212,90 @@ class SCFPotential(Potential):
         PURPOSE:
            Evaluate phi_tilde as defined in equation 3.10 and 2.25 for 0 <= n < N and 0 <= l < L
         INPUT:
-           r - Evaluate at radius r
+           r - Evaluate at radius r (can be an array)
            N - size of the N dimension
            L - size of the L dimension
         OUTPUT:
-           phi tilde 
+           phi tilde (NxL array, with the shape of r prepended for array r)
         HISTORY:
-           2016-05-17 - Written - Aladdin 
+           2016-05-17 - Written - Aladdin
+           2026-10-17 - Vectorized over r
         """
         xi = self._calculateXi(r)
         CC = _C(xi,N,L)
         a = self._a
-        phi = nu.zeros((N,L), float)
-        n = nu.arange(0,N)[:, nu.newaxis]
+        r = nu.asarray(r, dtype=float)[...,nu.newaxis,nu.newaxis]
         l = nu.arange(0, L)[nu.newaxis,:]
-        phi[:,:] = - (r*a)**l/ ((a + r)**(2*l + 1.)) * CC[:,:]* (4*nu.pi)**0.5
-        return phi  
-        
+        return - (r*a)**l/ ((a + r)**(2*l + 1.)) * CC* (4*nu.pi)**0.5
+
+    def _coeffs(self):
+        """
+        NAME:
+           _coeffs
+        PURPOSE:
+           return the expansion coefficients that contribute, dropping the m > 0 terms for axisymmetric potentials
+        INPUT:
+           (none)
+        OUTPUT:
+           (Acos,Asin); Asin is None for axisymmetric potentials
+        HISTORY:
+           2026-10-17 - Written
+        """
+        if self.isNonAxi:
+            return self._Acos, self._Asin
+        return self._Acos[:,:,:1], None
+
+    def _sumN(self, func_tilde, Acos, Asin):
+        """
+        NAME:
+           _sumN
+        PURPOSE:
+           sum func_tilde times the expansion coefficients over n for many points at once
+        INPUT:
+           func_tilde - PxNxL tilde function evaluated at P points
+           Acos - NxLxM cosine coefficients
+           Asin - NxLxM sine coefficients or None
+        OUTPUT:
+           (PxLxM cosine sum, PxLxM sine sum or None)
+        HISTORY:
+           2026-10-17 - Written
+        """
+        ##One matrix product for each l: (P,N) x (N,M)
+        func_tilde = func_tilde.transpose(2,0,1)
+        Bcos = nu.matmul(func_tilde, Acos.transpose(1,0,2)).transpose(1,0,2)
+        if Asin is None:
+            return Bcos, None
+        Bsin = nu.matmul(func_tilde, Asin.transpose(1,0,2)).transpose(1,0,2)
+        return Bcos, Bsin
+
     def _compute(self, funcTilde, R, z, phi):
         """
         NAME:
            _compute
         PURPOSE:
-           evaluate the NxLxM density or potential
+           evaluate the density or potential for a 1D array of coordinates at once
         INPUT:
            funcTidle - must be _rhoTilde or _phiTilde
            R - Cylindrical Galactocentric radius
            z - vertical height
            phi - azimuth
         OUTPUT:
-           An NxLxM density or potential at (R,z, phi)
+           density or potential at (R,z, phi)
         HISTORY:
-           2016-05-18 - Written - Aladdin 
+           2016-05-18 - Written - Aladdin
+           2026-10-17 - Vectorized over the coordinates
         """
-        Acos, Asin = self._Acos, self._Asin
+        Acos, Asin = self._coeffs()
         N, L, M = Acos.shape    
         r, theta, phi = bovy_coords.cyl_to_spher(R,z,phi)
-        
-        
-   
-        PP = lpmn(M-1,L-1,nu.cos(theta))[0].T ##Get the Legendre polynomials
-        func_tilde = funcTilde(r, N, L) ## Tilde of the function of interest 
-        
-        func = nu.zeros((N,L,M), float) ## The function of interest (density or potential)
-        
+        PP = _legendre(L, M, nu.cos(theta)) ##Get the Legendre polynomials
+        Bcos, Bsin = self._sumN(funcTilde(r, N, L), Acos, Asin)
+        if Asin is None:
+            return nu.sum(Bcos[:,:,0]*PP[:,:,0], axis=1)
         m = nu.arange(0, M)[nu.newaxis, nu.newaxis, :]
-        mcos = nu.cos(m*phi)
-        msin = nu.sin(m*phi)
-        func = func_tilde[:,:,None]*(Acos[:,:,:]*mcos + Asin[:,:,:]*msin)*PP[None,:,:]
-        return func
-        
+        mcos = nu.cos(m*phi[:,nu.newaxis,nu.newaxis])
+        msin = nu.sin(m*phi[:,nu.newaxis,nu.newaxis])
+        return nu.sum((Bcos*mcos + Bsin*msin)*PP, axis=(1,2))
         
     def _computeArray(self, funcTilde, R, z, phi):
         """
@@ -273,21 +311,46 @@ class SCFPotential(Potential):
         OUTPUT:
            density or potential evaluated at (R,z, phi)
         HISTORY:
-           2016-06-02 - Written - Aladdin 
+           2016-06-02 - Written - Aladdin
+           2026-10-17 - Evaluate in vectorized chunks of points
         """
         R = nu.array(R,dtype=float); z = nu.array(z,dtype=float); phi = nu.array(phi,dtype=float);
         
         shape = (R*z*phi).shape
-        if shape == (): return nu.sum(self._compute(funcTilde, R,z,phi))
-        R = R*nu.ones(shape); z = z*nu.ones(shape); phi = phi*nu.ones(shape);
-        func = nu.zeros(shape, float)
-
-        
-        li = _cartesian(shape)
-        for i in range(li.shape[0]):
-            j = nu.split(li[i], li.shape[1])
-            func[j] = nu.sum(self._compute(funcTilde, R[j][0],z[j][0],phi[j][0]))
-        return func
+        R, z, phi = [x.flatten() for x in nu.broadcast_arrays(R, z, phi)]
+        func = nu.empty(R.shape, float)
+        for i in range(0, len(R), _CHUNKSIZE):
+            c = slice(i, i + _CHUNKSIZE)
+            func[c] = self._compute(funcTilde, R[c], z[c], phi[c])
+        if shape == (): return func[0]
+        return func.reshape(shape)
+
+    def _computeArray_c(self, quantity, R, z, phi, t):
+        """
+        NAME:
+           _computeArray_c
+        PURPOSE:
+           evaluate the potential or a force for a given array of coordinates in C, parallelized over the coordinates
+        INPUT:
+           quantity - 'potential', 'Rforce', 'zforce', or 'phiforce'
+           R - Cylindrical Galactocentric radius
+           z - vertical height
+           phi - azimuth
+           t - time
+        OUTPUT:
+           quantity evaluated at (R,z, phi) (without the amplitude) or None if the input is not an array or the C extension is not available
+        HISTORY:
+           2026-10-17 - Written
+        """
+        if not ext_loaded or self._amp == 0.:
+            return None
+        R, z, phi, t = nu.broadcast_arrays(R, z, phi, t)
+        if R.ndim == 0:
+            return None
+        out, err = eval_potentials_c(self, R.flatten(), z.flatten(),
+                                     phi.flatten(), t.flatten(),
+                                     quantity=quantity)
+        return nu.reshape(out, R.shape)/self._amp
         
     def _dens(self, R, z, phi=0., t=0.):
         """
@@ -327,6 +390,8 @@ class SCFPotential(Potential):
         """
         if not self.isNonAxi and phi is None:
             phi= 0.
+        out = self._computeArray_c('potential', R,z,phi,t)
+        if out is not None: return out
         return self._computeArray(self._phiTilde, R,z,phi)
 
     def _dphiTilde(self, r, N, L):
@@ -336,20 +401,23 @@ class SCFPotential(Potential):
         PURPOSE:
            Evaluate the derivative of phiTilde with respect to r
         INPUT:
-           r - spherical radius
+           r - spherical radius (can be an array)
            N - size of the N dimension
            L - size of the L dimension
         OUTPUT:
-           the derivative of phiTilde with respect to r
+           the derivative of phiTilde with respect to r (NxL array, with the shape of r prepended for array r)
         HISTORY:
-           2016-06-06 - Written - Aladdin 
+           2016-06-06 - Written - Aladdin
+           2026-10-17 - Vectorized over r
         """
         a = self._a
         l = nu.arange(0, L, dtype=float)[nu.newaxis, :]
-        n = nu.arange(0, N, dtype=float)[:, nu.newaxis]
         xi = self._calculateXi(r)
+        CC = _C(xi,N,L)
         dC = _dC(xi,N,L)
-        return -(4*nu.pi)**.5 * (nu.power(a*r, l)*(l*(a + r)*nu.power(r,-1) -(2*l + 1))/((a + r)**(2*l + 2))*_C(xi,N,L) + 
+        r = nu.asarray(r, dtype=float)[...,nu.newaxis,nu.newaxis]
+        xi = nu.asarray(xi, dtype=float)[...,nu.newaxis,nu.newaxis]
+        return -(4*nu.pi)**.5 * (nu.power(a*r, l)*(l*(a + r)*nu.power(r,-1) -(2*l + 1))/((a + r)**(2*l + 2))*CC + 
         a**-1*(1 - xi)**2 * (a*r)**l / (a + r)**(2*l + 1) *dC/2.)
         
         
@@ -360,43 +428,44 @@ class SCFPotential(Potential):
         PURPOSE:
            Evaluate the first derivative of Phi with respect to R, z and phi
         INPUT:
-           R - Cylindrical Galactocentric radius
-           z - vertical height
-           phi - azimuth
+           R - Cylindrical Galactocentric radius (float or 1D array)
+           z - vertical height (float or 1D array)
+           phi - azimuth (float or 1D array)
            t - time
         OUTPUT:
            dPhi/dr, dPhi/dtheta, dPhi/dphi
         HISTORY:
-           2016-06-07 - Written - Aladdin 
+           2016-06-07 - Written - Aladdin
+           2026-10-17 - Vectorized over the coordinates
         """
-        Acos, Asin = self._Acos, self._Asin
+        Acos, Asin = self._coeffs()
         N, L, M = Acos.shape    
         r, theta, phi = bovy_coords.cyl_to_spher(R,z,phi)
-        new_hash= hashlib.md5(nu.array([R, z,phi])).hexdigest()
-        
-        if new_hash == self._force_hash:
-            dPhi_dr = self._cached_dPhi_dr  
-            dPhi_dtheta = self._cached_dPhi_dtheta 
-            dPhi_dphi = self._cached_dPhi_dphi
-            
-        else:        
-            PP, dPP = lpmn(M-1,L-1,nu.cos(theta)) ##Get the Legendre polynomials
-            PP = PP.T[None,:,:]
-            dPP = dPP.T[None,:,:]
-            phi_tilde = self._phiTilde(r, N, L)[:,:,nu.newaxis] 
-            dphi_tilde = self._dphiTilde(r,N,L)[:,:,nu.newaxis]
-            
+        scalar = nu.ndim(r) == 0
+        if scalar:
+            key= force_cache_key(R,z,phi)
+            cached= self._force_cache.get(key)
+            if not cached is None:
+                return cached
+            r, theta, phi = nu.atleast_1d(r, theta, phi)
+        PP, dPP = _legendre(L, M, nu.cos(theta), deriv=True) ##Get the Legendre polynomials
+        Bcos, Bsin = self._sumN(self._phiTilde(r, N, L), Acos, Asin)
+        dBcos, dBsin = self._sumN(self._dphiTilde(r, N, L), Acos, Asin)
+        if Asin is None:
+            dPhi_dr = -nu.sum(dBcos[:,:,0]*PP[:,:,0], axis=1)
+            dPhi_dtheta = -nu.sum(Bcos[:,:,0]*dPP[:,:,0], axis=1)
+            dPhi_dphi = nu.zeros_like(dPhi_dr)
+        else:
             m = nu.arange(0, M)[nu.newaxis, nu.newaxis, :]
-            mcos = nu.cos(m*phi)
-            msin = nu.sin(m*phi)
-            dPhi_dr = -nu.sum((Acos*mcos + Asin*msin)*PP*dphi_tilde)
-            dPhi_dtheta = -nu.sum((Acos*mcos + Asin*msin)*phi_tilde*dPP*(-nu.sin(theta)))
-            dPhi_dphi =-nu.sum(m*(Asin*mcos - Acos*msin)*phi_tilde*PP)
-            
-            self._force_hash = new_hash
-            self._cached_dPhi_dr = dPhi_dr
-            self._cached_dPhi_dtheta = dPhi_dtheta
-            self._cached_dPhi_dphi = dPhi_dphi
+            mcos = nu.cos(m*phi[:,nu.newaxis,nu.newaxis])
+            msin = nu.sin(m*phi[:,nu.newaxis,nu.newaxis])
+            dPhi_dr = -nu.sum((dBcos*mcos + dBsin*msin)*PP, axis=(1,2))
+            dPhi_dtheta = -nu.sum((Bcos*mcos + Bsin*msin)*dPP, axis=(1,2))
+            dPhi_dphi = -nu.sum(m*(Bsin*mcos - Bcos*msin)*PP, axis=(1,2))
+        if scalar:
+            out = (dPhi_dr[0], dPhi_dtheta[0], dPhi_dphi[0])
+            self._force_cache.put(key,out)
+            return out
         return dPhi_dr,dPhi_dtheta,dPhi_dphi
         
     def _computeforceArray(self,dr_dx, dtheta_dx, dphi_dx, R, z, phi):
@@ -416,7 +485,8 @@ class SCFPotential(Potential):
         OUTPUT:
            The forces in the x direction
         HISTORY:
-           2016-06-02 - Written - Aladdin 
+           2016-06-02 - Written - Aladdin
+           2026-10-17 - Evaluate in vectorized chunks of points
         """     
         R = nu.array(R,dtype=float); z = nu.array(z,dtype=float); phi = nu.array(phi,dtype=float);
         shape = (R*z*phi).shape
@@ -425,19 +495,16 @@ class SCFPotential(Potential):
             self._computeforce(R,z,phi)
             return dr_dx*dPhi_dr + dtheta_dx*dPhi_dtheta +dPhi_dphi*dphi_dx
         
-        R = R*nu.ones(shape);
-        z = z* nu.ones(shape);
-        phi = phi* nu.ones(shape);
-        force = nu.zeros(shape, float)
-        dr_dx = dr_dx*nu.ones(shape); dtheta_dx = dtheta_dx*nu.ones(shape);dphi_dx = dphi_dx*nu.ones(shape);  
-        li = _cartesian(shape)
-
-        for i in range(li.shape[0]):
-            j = nu.split(li[i], li.shape[1])
+        R, z, phi, dr_dx, dtheta_dx, dphi_dx = \
+            [x.flatten() for x in nu.broadcast_arrays(R, z, phi, dr_dx,
+                                                      dtheta_dx, dphi_dx)]
+        force = nu.empty(R.shape, float)
+        for i in range(0, len(R), _CHUNKSIZE):
+            c = slice(i, i + _CHUNKSIZE)
             dPhi_dr,dPhi_dtheta,dPhi_dphi = \
-            self._computeforce(R[j][0],z[j][0],phi[j][0])
-            force[j] = dr_dx[j][0]*dPhi_dr + dtheta_dx[j][0]*dPhi_dtheta +dPhi_dphi*dphi_dx[j][0]
-        return force
+            self._computeforce(R[c],z[c],phi[c])
+            force[c] = dr_dx[c]*dPhi_dr + dtheta_dx[c]*dPhi_dtheta +dPhi_dphi*dphi_dx[c]
+        return force.reshape(shape)
     def _Rforce(self, R, z, phi=0, t=0):
         """
         NAME:
@@ -456,6 +523,8 @@ class SCFPotential(Potential):
         """
         if not self.isNonAxi and phi is None:
             phi= 0.
+        out = self._computeArray_c('Rforce', R,z,phi,t)
+        if out is not None: return out
         r, theta, phi = bovy_coords.cyl_to_spher(R,z,phi)
         #x = R
         dr_dR = nu.divide(R,r); dtheta_dR = nu.divide(z,r**2); dphi_dR = 0
@@ -479,6 +548,8 @@ class SCFPotential(Potential):
         """
         if not self.isNonAxi and phi is None:
             phi= 0.
+        out = self._computeArray_c('zforce', R,z,phi,t)
+        if out is not None: return out
         r, theta, phi = bovy_coords.cyl_to_spher(R,z,phi)
         #x = z
         dr_dz = nu.divide(z,r); dtheta_dz = nu.divide(-R,r**2); dphi_dz = 0
@@ -502,6 +573,8 @@ class SCFPotential(Potential):
         """
         if not self.isNonAxi and phi is None:
             phi= 0.
+        out = self._computeArray_c('phiforce', R,z,phi,t)
+        if out is not None: return out
         r, theta, phi = bovy_coords.cyl_to_spher(R,z,phi)
         #x = phi
         dr_dphi = 0; dtheta_dphi = 0; dphi_dphi = 1
@@ -522,36 +595,70 @@ def _C(xi, N,L, alpha = lambda x: 2*x + 3./2):
     PURPOSE:
        Evaluate C_n,l (the Gegenbauer polynomial) for 0 <= l < L and 0<= n < N 
     INPUT:
-       xi - radial transformed variable
+       xi - radial transformed variable (can be an array)
        N - Size of the N dimension
        L - Size of the L dimension
        alpha = A lambda function of l. Default alpha = 2l + 3/2 
        
     OUTPUT:
-       An LxN Gegenbauer Polynomial 
+       An NxL Gegenbauer Polynomial (with the shape of xi prepended for array xi)
     HISTORY:
-       2016-05-16 - Written - Aladdin 
+       2016-05-16 - Written - Aladdin
+       2026-10-17 - Vectorized over l and xi
     """
-    CC = nu.zeros((N,L), float) 
-     
-    for l in range(L):
-        for n in range(N):
-            a = alpha(l)
-            if n==0:
-                CC[n][l] = 1.
-                continue 
-            elif n==1: CC[n][l] = 2.*a*xi
-            if n + 1 != N:
-                CC[n+1][l] = (n + 1.)**-1. * (2*(n + a)*xi*CC[n][l] - (n + 2*a - 1)*CC[n-1][l])
+    xi = nu.asarray(xi, dtype=float)[...,nu.newaxis]
+    a = alpha(nu.arange(0, L, dtype=float))
+    CC = nu.zeros(xi.shape[:-1] + (N,L), float)
+    CC[...,0,:] = 1.
+    if N > 1: CC[...,1,:] = 2.*a*xi
+    for n in range(1, N - 1):
+        CC[...,n+1,:] = (n + 1.)**-1. * (2*(n + a)*xi*CC[...,n,:] - (n + 2*a - 1)*CC[...,n-1,:])
     return CC 
     
 def _dC(xi, N, L):
     l = nu.arange(0,L)[nu.newaxis, :]
     CC = _C(xi,N + 1,L, alpha = lambda x: 2*x + 5./2)
-    CC = nu.roll(CC, 1, axis=0)[:-1,:]
-    CC[0, :] = 0
+    CC = nu.roll(CC, 1, axis=-2)[...,:-1,:]
+    CC[...,0, :] = 0
     CC *= 2*(2*l + 3./2)
     return CC
+
+def _legendre(L, M, x, deriv=False):
+    """
+    NAME:
+       _legendre
+    PURPOSE:
+       Evaluate the associated Legendre functions P_lm(x) (with the Condon-Shortley phase, as scipy.special.lpmn) for 0 <= l < L and 0 <= m < M, for many x at once
+    INPUT:
+       L - Size of the L dimension
+       M - Size of the M dimension
+       x - cos(theta) (can be an array)
+       deriv= (False) if True, also return the derivative of P_lm(cos(theta)) with respect to theta
+    OUTPUT:
+       LxM array of P_lm (with the shape of x prepended for array x)[, LxM array of dP_lm/dtheta]
+    HISTORY:
+       2026-10-17 - Written
+    """
+    x = nu.asarray(x, dtype=float)
+    sintheta = nu.sqrt(nu.fmax(1. - x**2., 0.))
+    ##The derivative requires m+1
+    PP = nu.zeros(x.shape + (L,M + 1), float)
+    pmm = nu.ones_like(x)
+    for m in range(min(M + deriv, L)):
+        if m > 0: pmm = -(2*m - 1.)*sintheta*pmm
+        PP[...,m,m] = pmm
+        if m + 1 < L: PP[...,m+1,m] = x*(2*m + 1.)*pmm
+        for l in range(m + 2, L):
+            PP[...,l,m] = ((2*l - 1.)*x*PP[...,l-1,m] - (l + m - 1.)*PP[...,l-2,m])/(l - m)
+    if not deriv:
+        return PP[...,:M]
+    ##dP_lm/dtheta = [P_l(m+1) - (l+m)(l-m+1) P_l(m-1)]/2, which is regular at the poles
+    l = nu.arange(0, L)[:, nu.newaxis]
+    m = nu.arange(1, M)[nu.newaxis, :]
+    dPP = nu.empty(x.shape + (L,M), float)
+    dPP[...,0] = PP[...,1]
+    dPP[...,1:] = 0.5*(PP[...,2:M+1] - (l + m)*(l - m + 1.)*PP[...,:M-1])
+    return PP[...,:M], dPP
      
 def scf_compute_coeffs_spherical(dens, N, a=1., radial_order=None):
         """
@@ -754,25 +861,132 @@ def scf_compute_coeffs(dens, N, L, a=1., radial_order=None, costheta_order=None,
         if phi_order != None:
             Ksample[2] = phi_order
         integrated = _gaussianQuadrature(integrand, [[-1., 1.], [-1., 1.], [0, 2*nu.pi]], Ksample = Ksample)
-        n = nu.arange(0,N)[:,nu.newaxis, nu.newaxis]
-        l = nu.arange(0,L)[nu.newaxis,:, nu.newaxis]
-        m = nu.arange(0,L)[nu.newaxis,nu.newaxis,:]
-        K = .5*n*(n + 4*l + 3) + (l + 1)*(2*l + 1)
-        
+        Acos[:,:,:],Asin[:,:,:] = 2*_coeffsNormalization(N, L)[nu.newaxis,:,:,:] * integrated
         
-        Nln = .5*gammaln(l - m + 1) - .5*gammaln(l + m + 1) - (2*l)*nu.log(2)
-        NN = nu.e**(Nln)
+        return Acos, Asin
 
-        NN[nu.where(NN == nu.inf)] = 0 ## To account for the fact that m cant be bigger than l
-            
-        constants = NN*(2*l + 1.)**.5
-        
-        lnI = -(8*l + 6)*nu.log(2) + gammaln(n + 4*l + 3) - gammaln(n + 1) - nu.log(n + 2*l + 3./2) - 2*gammaln(2*l + 3./2)
-        I = -K*(4*nu.pi) * nu.e**(lnI)
-        Acos[:,:,:],Asin[:,:,:] = 2*(I**-1.)[nu.newaxis,:,:,:] * integrated * constants[nu.newaxis,:,:,:]
-        
+def scf_compute_coeffs_nbody(pos, N, L, mass=1., a=1., chunksize=100000, numcores=None):
+        """
+        NAME:
+
+           scf_compute_coeffs_nbody
+
+        PURPOSE:
+
+           Compute the expansion coefficients for a set of particles (e.g., an N-body snapshot)
+
+        INPUT:
+
+           pos - positions of the particles in rectangular coordinates with shape [3,n]; can be a numpy.memmap (e.g., from numpy.load(filename,mmap_mode='r')), which is then read one chunk at a time
+
+           N - size of the Nth dimension of the expansion coefficients
+
+           L - size of the Lth and Mth dimension of the expansion coefficients
+
+           mass= (1.) mass of the particles: scalar or array (or numpy.memmap) with size n
+
+           a - parameter used to shift the basis functions
+
+           chunksize= (100000) number of particles for which the basis functions are evaluated at once
+
+           numcores= if set to an integer, use this many cores to compute the coefficients, with each core handling a contiguous block of particles
+
+        OUTPUT:
+
+           (Acos,Asin) - Expansion coefficients for the density of the particles that can be given to SCFPotential.__init__
+
+        HISTORY:
+
+           2026-10-17 - Written
+
+        """
+        npart = pos.shape[1]
+        starts = nu.arange(0, npart, chunksize)
+        def _block_sums(block):
+            sums = nu.zeros((2,N,L,L), float)
+            for start in block:
+                c = slice(start, start + chunksize)
+                if nu.ndim(mass) == 0: m = mass
+                else: m = nu.array(mass[c], dtype=float)
+                sums += _nbody_sums(nu.array(pos[0,c], dtype=float),
+                                    nu.array(pos[1,c], dtype=float),
+                                    nu.array(pos[2,c], dtype=float),
+                                    m, N, L, a)
+            return sums
+        if numcores is None or numcores == 1 or len(starts) == 1:
+            sums = _block_sums(starts)
+        else:
+            blocks = [block for block in nu.array_split(starts, numcores) if len(block) > 0]
+            sums = nu.sum(list(multi.parallel_map(_block_sums, blocks,
+                                                  numcores=numcores)), axis=0)
+        Acos, Asin = _coeffsNormalization(N, L)[nu.newaxis,:,:,:] * sums
         return Acos, Asin
 
+def _nbody_sums(x, y, z, mass, N, L, a):
+    """
+    NAME:
+       _nbody_sums
+    PURPOSE:
+       Sum the mass-weighted basis functions over a chunk of particles
+    INPUT:
+       x, y, z - rectangular coordinates of the particles
+       mass - mass of the particles (scalar or array)
+       N - size of the Nth dimension of the expansion coefficients
+       L - size of the Lth and Mth dimension of the expansion coefficients
+       a - parameter used to shift the basis functions
+    OUTPUT:
+       2xNxLxL array of the sums for the cosine and sine coefficients
+    HISTORY:
+       2026-10-17 - Written
+    """
+    r = nu.sqrt(x**2. + y**2. + z**2.)
+    costheta = nu.divide(z, r, out=nu.ones_like(r), where=r > 0.)
+    phi = nu.arctan2(y, x)
+    xi = (r - a)/(r + a)
+    l = nu.arange(0, L)[nu.newaxis, nu.newaxis, :]
+    m = nu.arange(0, L)[nu.newaxis, :]
+    ##PxNxL radial and PxLxM angular basis functions
+    phi_nl = - (mass*nu.ones_like(r))[:,nu.newaxis,nu.newaxis] \
+        *(1. + xi[:,nu.newaxis,nu.newaxis])**l \
+        *(1. - xi[:,nu.newaxis,nu.newaxis])**(l + 1.)*_C(xi, N, L)
+    PP = _legendre(L, L, costheta)
+    phi_nl = phi_nl.transpose(2,1,0)
+    ##One matrix product for each l: (N,P) x (P,M)
+    return nu.array([nu.matmul(phi_nl, (PP*nu.cos(m*phi[:,nu.newaxis])[:,nu.newaxis,:]).transpose(1,0,2)).transpose(1,0,2),
+                     nu.matmul(phi_nl, (PP*nu.sin(m*phi[:,nu.newaxis])[:,nu.newaxis,:]).transpose(1,0,2)).transpose(1,0,2)])
+
+def _coeffsNormalization(N, L):
+    """
+    NAME:
+       _coeffsNormalization
+    PURPOSE:
+       Compute the normalization that converts the integrals (or sums) of the density times the basis functions into the expansion coefficients
+    INPUT:
+       N - size of the Nth dimension of the expansion coefficients
+       L - size of the Lth and Mth dimension of the expansion coefficients
+    OUTPUT:
+       NxLxL normalization
+    HISTORY:
+       2016-05-27 - Written as part of scf_compute_coeffs - Aladdin
+       2026-10-17 - Split off into its own function
+    """
+    n = nu.arange(0,N)[:,nu.newaxis, nu.newaxis]
+    l = nu.arange(0,L)[nu.newaxis,:, nu.newaxis]
+    m = nu.arange(0,L)[nu.newaxis,nu.newaxis,:]
+    K = .5*n*(n + 4*l + 3) + (l + 1)*(2*l + 1)
+    
+    
+    Nln = .5*gammaln(l - m + 1) - .5*gammaln(l + m + 1) - (2*l)*nu.log(2)
+    NN = nu.e**(Nln)
+
+    NN[nu.where(NN == nu.inf)] = 0 ## To account for the fact that m cant be bigger than l
+        
+    constants = NN*(2*l + 1.)**.5
+    
+    lnI = -(8*l + 6)*nu.log(2) + gammaln(n + 4*l + 3) - gammaln(n + 1) - nu.log(n + 2*l + 3./2) - 2*gammaln(2*l + 3./2)
+    I = -K*(4*nu.pi) * nu.e**(lnI)
+    return I**-1. * constants
+
 def _cartesian(arraySizes, out=None):
     """
     NAME:
@@ -853,7 +1067,7 @@ def _gaussianQuadrature(integrand, bounds, Ksample=[20], roundoff=0):
     
     ##Performs the actual integration
     for i in range(li.shape[0]):
-        index = [nu.arange(len(bounds)),li[i]]
+        index = (nu.arange(len(bounds)),li[i])
         s+= nu.prod(wp[index])*integrand(*xp[index])
     
     ##Rounds values that are less than roundoff to zero    
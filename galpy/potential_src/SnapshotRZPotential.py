@@ -1,8 +1,8 @@
 from os import system
-import hashlib
 import numpy as np
 from scipy import interpolate 
 from galpy.potential_src.Potential import Potential
+from galpy.potential_src.forceCache import ForceCache, force_cache_key
 from galpy.potential_src import interpRZPotential
 from galpy.potential_src.interpRZPotential import scalarVectorDecorator, \
     zsymDecorator
@@ -17,11 +17,12 @@ else:
 class SnapshotRZPotential(Potential):
     """Class that implements an axisymmetrized version of the potential of an N-body snapshot (requires `pynbody <http://pynbody.github.io>`__)
 
-    `_evaluate`, `_Rforce`, and `_zforce` calculate a hash for the
-    array of points that is passed in by the user. The hash and
-    corresponding potential/force arrays are stored -- if a subsequent
-    request matches a previously computed hash, the previous results
-    are returned and not recalculated.
+    `_evaluate`, `_Rforce`, and `_zforce` calculate a key for the
+    array of points that is passed in by the user. The key and
+    corresponding potential/force arrays are stored in a bounded
+    least-recently-used cache -- if a subsequent request matches a
+    previously computed key, the previous results are returned and not
+    recalculated.
     """
     def __init__(self, s, num_threads=None,nazimuths=4,
                  ro=None,vo=None):
@@ -60,7 +61,7 @@ class SnapshotRZPotential(Potential):
             raise ImportError("The SnapShotRZPotential class is designed to work with pynbody snapshots, which cannot be loaded (probably because it is not installed) -- obtain from pynbody.github.io")
         Potential.__init__(self,amp=1.0,ro=ro,vo=vo)
         self._s = s
-        self._point_hash = {}
+        self._force_cache= ForceCache()
         if num_threads is None:
             self._num_threads= pynbody.config['number_of_threads']
         else:
@@ -91,12 +92,13 @@ class SnapshotRZPotential(Potential):
         return acc[:,1]
 
     def _setup_potential(self, R, z, use_pkdgrav = False) : 
-        # compute the hash for the requested grid
-        new_hash = hashlib.md5(np.array([R,z])).hexdigest()
+        # compute the key for the requested grid
+        key= force_cache_key(R,z)
 
         # if we computed for these points before, return; otherwise compute
-        if new_hash in self._point_hash : 
-            pot, rz_acc = self._point_hash[new_hash]
+        cached= self._force_cache.get(key)
+        if not cached is None : 
+            pot, rz_acc = cached
 
 #        if use_pkdgrav :
             
@@ -129,7 +131,7 @@ class SnapshotRZPotential(Potential):
             rz_acc /= self._naz
             
             # store the computed values for reuse
-            self._point_hash[new_hash] = [pot,rz_acc]
+            self._force_cache.put(key,(pot,rz_acc))
 
         return pot, rz_acc
 
@@ -2,10 +2,10 @@
 #   SoftenedNeedleBarPotential.py: class that implements the softened needle
 #                                  bar potential from Long & Murali (1992)
 ###############################################################################
-import hashlib
 import numpy
 from galpy.potential_src.Potential import Potential, \
     _APY_LOADED
+from galpy.potential_src.forceCache import ForceCache, force_cache_key
 if _APY_LOADED:
     from astropy import units
 from galpy.util import bovy_coords, bovy_conversion
@@ -80,7 +80,7 @@ class SoftenedNeedleBarPotential(Potential):
         self._c2= c**2.
         self._pa= pa
         self._omegab= omegab
-        self._force_hash= None
+        self._force_cache= ForceCache()
         self.hasC= True
         self.hasC_dxdv= False
         if normalize or \
@@ -126,8 +126,8 @@ class SoftenedNeedleBarPotential(Potential):
         HISTORY:
            2016-11-02 - Written - Bovy (UofT)
         """
-        self._compute_xyzforces(R,z,phi,t)
-        return numpy.cos(phi)*self._cached_Fx+numpy.sin(phi)*self._cached_Fy
+        Fx, Fy, Fz= self._compute_xyzforces(R,z,phi,t)
+        return numpy.cos(phi)*Fx+numpy.sin(phi)*Fy
 
     def _phiforce(self,R,z,phi=0.,t=0.):
         """
@@ -145,9 +145,8 @@ class SoftenedNeedleBarPotential(Potential):
         HISTORY:
            2016-11-02 - Written - Bovy (UofT)
         """
-        self._compute_xyzforces(R,z,phi,t)
-        return R*(-numpy.sin(phi)*self._cached_Fx\
-                       +numpy.cos(phi)*self._cached_Fy)
+        Fx, Fy, Fz= self._compute_xyzforces(R,z,phi,t)
+        return R*(-numpy.sin(phi)*Fx+numpy.cos(phi)*Fy)
 
     def _zforce(self,R,z,phi=0.,t=0.):
         """
@@ -165,8 +164,8 @@ class SoftenedNeedleBarPotential(Potential):
         HISTORY:
            2016-11-02 - Written - Bovy (UofT)
         """
-        self._compute_xyzforces(R,z,phi,t)
-        return self._cached_Fz
+        Fx, Fy, Fz= self._compute_xyzforces(R,z,phi,t)
+        return Fz
 
     def OmegaP(self):
         """
@@ -193,19 +192,19 @@ class SoftenedNeedleBarPotential(Potential):
 
     def _compute_xyzforces(self,R,z,phi,t):
         # Compute all rectangular forces
-        new_hash= hashlib.md5(numpy.array([R,phi,z,t])).hexdigest()
-        if new_hash != self._force_hash:
+        key= force_cache_key(R,phi,z,t)
+        out= self._force_cache.get(key)
+        if out is None:
             x,y,z= self._compute_xyz(R,phi,z,t)
             Tp, Tm= self._compute_TpTm(x,y,z)
             Fx= self._xforce_xyz(x,y,z,Tp,Tm)
             Fy= self._yforce_xyz(x,y,z,Tp,Tm)
             Fz= self._zforce_xyz(x,y,z,Tp,Tm)
-            self._force_hash= new_hash
             tp= self._pa+self._omegab*t
             cp, sp= numpy.cos(tp), numpy.sin(tp)
-            self._cached_Fx= cp*Fx-sp*Fy
-            self._cached_Fy= sp*Fx+cp*Fy
-            self._cached_Fz= Fz
+            out= (cp*Fx-sp*Fy,sp*Fx+cp*Fy,Fz)
+            self._force_cache.put(key,out)
+        return out
     def _xforce_xyz(self,x,y,z,Tp,Tm):
         return -2.*x/Tp/Tm/(Tp+Tm)
     def _yforce_xyz(self,x,y,z,Tp,Tm):
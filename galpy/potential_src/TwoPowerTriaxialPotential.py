@@ -10,12 +10,12 @@
 #
 #                             m^2 = x^2 + y^2/b^2 + z^2/c^2
 ###############################################################################
-import hashlib
 import numpy
 from scipy import integrate, special
 from galpy.util import bovy_conversion, bovy_coords
 from galpy.util import _rotate_to_arbitrary_vector
 from galpy.potential_src.Potential import Potential, _APY_LOADED
+from galpy.potential_src.forceCache import ForceCache, force_cache_key
 if _APY_LOADED:
     from astropy import units
 class TwoPowerTriaxialPotential(Potential):
@@ -122,7 +122,7 @@ class TwoPowerTriaxialPotential(Potential):
         self._c= c
         self._b2= self._b**2.
         self._c2= self._c**2.
-        self._force_hash= None
+        self._force_cache= ForceCache()
         self._setup_zvec_pa(zvec,pa)
         self._setup_gl(glorder)
         if normalize or \
@@ -239,25 +239,7 @@ class TwoPowerTriaxialPotential(Potential):
         if not self.isNonAxi:
             phi= 0.
         x,y,z= bovy_coords.cyl_to_rect(R,phi,z)
-        # Compute all rectangular forces
-        new_hash= hashlib.md5(numpy.array([x,y,z])).hexdigest()
-        if new_hash == self._force_hash:
-            Fx= self._cached_Fx
-            Fy= self._cached_Fy
-            Fz= self._cached_Fz
-        else:
-            if self._aligned:
-                xp, yp, zp= x, y, z
-            else:
-                xyzp= numpy.dot(self._rot,numpy.array([x,y,z]))
-                xp, yp, zp= xyzp[0], xyzp[1], xyzp[2]
-            Fx= self._xforce_xyz(xp,yp,zp)
-            Fy= self._yforce_xyz(xp,yp,zp)
-            Fz= self._zforce_xyz(xp,yp,zp)
-            self._force_hash= new_hash
-            self._cached_Fx= Fx
-            self._cached_Fy= Fy
-            self._cached_Fz= Fz
+        Fx, Fy, Fz= self._compute_xyzforces(x,y,z)
         if not self._aligned:
             Fxyz= numpy.dot(self._rot.T,numpy.array([Fx,Fy,Fz]))
             Fx, Fy= Fxyz[0], Fxyz[1]
@@ -282,25 +264,7 @@ class TwoPowerTriaxialPotential(Potential):
         if not self.isNonAxi:
             phi= 0.
         x,y,z= bovy_coords.cyl_to_rect(R,phi,z)
-        # Compute all rectangular forces
-        new_hash= hashlib.md5(numpy.array([x,y,z])).hexdigest()
-        if new_hash == self._force_hash:
-            Fx= self._cached_Fx
-            Fy= self._cached_Fy
-            Fz= self._cached_Fz
-        else:
-            if self._aligned:
-                xp, yp, zp= x, y, z
-            else:
-                xyzp= numpy.dot(self._rot,numpy.array([x,y,z]))
-                xp, yp, zp= xyzp[0], xyzp[1], xyzp[2]
-            Fx= self._xforce_xyz(xp,yp,zp)
-            Fy= self._yforce_xyz(xp,yp,zp)
-            Fz= self._zforce_xyz(xp,yp,zp)
-            self._force_hash= new_hash
-            self._cached_Fx= Fx
-            self._cached_Fy= Fy
-            self._cached_Fz= Fz
+        Fx, Fy, Fz= self._compute_xyzforces(x,y,z)
         if not self._aligned:
             Fxyz= numpy.dot(self._rot.T,numpy.array([Fx,Fy,Fz]))
             Fx, Fy= Fxyz[0], Fxyz[1]
@@ -325,29 +289,27 @@ class TwoPowerTriaxialPotential(Potential):
         if not self.isNonAxi:
             phi= 0.
         x,y,z= bovy_coords.cyl_to_rect(R,phi,z)
-        # Compute all rectangular forces
-        new_hash= hashlib.md5(numpy.array([x,y,z])).hexdigest()
-        if new_hash == self._force_hash:
-            Fx= self._cached_Fx
-            Fy= self._cached_Fy
-            Fz= self._cached_Fz
-        else:
+        Fx, Fy, Fz= self._compute_xyzforces(x,y,z)
+        if not self._aligned:
+            Fxyz= numpy.dot(self._rot.T,numpy.array([Fx,Fy,Fz]))
+            Fz= Fxyz[2]
+        return Fz
+
+    def _compute_xyzforces(self,x,y,z):
+        # Compute all rectangular forces in the aligned coordinate frame
+        key= force_cache_key(x,y,z)
+        out= self._force_cache.get(key)
+        if out is None:
             if self._aligned:
                 xp, yp, zp= x, y, z
             else:
                 xyzp= numpy.dot(self._rot,numpy.array([x,y,z]))
                 xp, yp, zp= xyzp[0], xyzp[1], xyzp[2]
-            Fx= self._xforce_xyz(xp,yp,zp)
-            Fy= self._yforce_xyz(xp,yp,zp)
-            Fz= self._zforce_xyz(xp,yp,zp)
-            self._force_hash= new_hash
-            self._cached_Fx= Fx
-            self._cached_Fy= Fy
-            self._cached_Fz= Fz
-        if not self._aligned:
-            Fxyz= numpy.dot(self._rot.T,numpy.array([Fx,Fy,Fz]))
-            Fz= Fxyz[2]
-        return Fz
+            out= (self._xforce_xyz(xp,yp,zp),
+                  self._yforce_xyz(xp,yp,zp),
+                  self._zforce_xyz(xp,yp,zp))
+            self._force_cache.put(key,out)
+        return out
 
     def _xforce_xyz(self,x,y,z):
         """Evaluation of the x force as a function of (x,y,z) in the aligned
@@ -626,7 +588,7 @@ class TriaxialHernquistPotential(TwoPowerTriaxialPotential):
         self._c2= self._c**2
         self._setup_gl(glorder)
         self._setup_zvec_pa(zvec,pa)
-        self._force_hash= None
+        self._force_cache= ForceCache()
         if normalize or \
                 (isinstance(normalize,(int,float)) \
                      and not isinstance(normalize,bool)):
@@ -713,7 +675,7 @@ class TriaxialJaffePotential(TwoPowerTriaxialPotential):
         self._c2= self._c**2.
         self._setup_gl(glorder)
         self._setup_zvec_pa(zvec,pa)
-        self._force_hash= None
+        self._force_cache= ForceCache()
         if normalize or \
                 (isinstance(normalize,(int,float)) \
                      and not isinstance(normalize,bool)): #pragma: no cover
@@ -818,7 +780,7 @@ class TriaxialNFWPotential(TwoPowerTriaxialPotential):
         self._c2= self._c**2.
         self._setup_gl(glorder)
         self._setup_zvec_pa(zvec,pa)
-        self._force_hash= None
+        self._force_cache= ForceCache()
         if conc is None:
             self.a= a
             if normalize or \
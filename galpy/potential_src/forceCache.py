@@ -0,0 +1,144 @@
+###############################################################################
+#   forceCache.py: bounded least-recently-used cache for force evaluations
+#                  that are shared between the Rforce, zforce, and phiforce
+#                  of a potential
+###############################################################################
+from collections import OrderedDict, namedtuple
+import numpy
+CacheInfo= namedtuple('CacheInfo',['hits','misses','maxsize','currsize'])
+class ForceCache(object):
+    """Bounded least-recently-used cache for (rectangular) forces, keyed on the position and time at which they are evaluated; at most one entry for array input is kept, because such entries hold the input and the forces at all of its points"""
+    def __init__(self,maxsize=128):
+        """
+        NAME:
+
+           __init__
+
+        PURPOSE:
+
+           initialize a force cache
+
+        INPUT:
+
+           maxsize= (128) maximum number of entries to keep
+
+        OUTPUT:
+
+           instance
+
+        HISTORY:
+
+           2026-10-17 - Written
+
+        """
+        self._maxsize= maxsize
+        self._cache= OrderedDict()
+        self._arraykey= None
+        self._hits= 0
+        self._misses= 0
+        return None
+
+    def get(self,key):
+        """
+        NAME:
+           get
+        PURPOSE:
+           look up the entry for a key (from force_cache_key), marking it as the most recently used one
+        INPUT:
+           key - key
+        OUTPUT:
+           cached value or None if the key is not in the cache
+        HISTORY:
+           2026-10-17 - Written
+        """
+        try:
+            value= self._cache.pop(key)
+        except KeyError:
+            self._misses+= 1
+            return None
+        self._cache[key]= value
+        self._hits+= 1
+        return value
+
+    def put(self,key,value):
+        """
+        NAME:
+           put
+        PURPOSE:
+           add an entry to the cache, evicting the least recently used entry if the cache is full; an entry for array input replaces the previous entry for array input
+        INPUT:
+           key - key (from force_cache_key)
+           value - value to cache
+        OUTPUT:
+           (none)
+        HISTORY:
+           2026-10-17 - Written
+        """
+        if self._maxsize <= 0: return None
+        self._cache.pop(key,None)
+        if _is_array_key(key):
+            if not self._arraykey is None:
+                self._cache.pop(self._arraykey,None)
+            self._arraykey= key
+        if len(self._cache) >= self._maxsize:
+            evicted, _= self._cache.popitem(last=False)
+            if evicted == self._arraykey: self._arraykey= None
+        self._cache[key]= value
+        return None
+
+    def cache_info(self):
+        """
+        NAME:
+           cache_info
+        PURPOSE:
+           return statistics of the cache
+        INPUT:
+           (none)
+        OUTPUT:
+           CacheInfo(hits,misses,maxsize,currsize) named tuple
+        HISTORY:
+           2026-10-17 - Written
+        """
+        return CacheInfo(self._hits,self._misses,self._maxsize,
+                         len(self._cache))
+
+    def cache_clear(self):
+        """
+        NAME:
+           cache_clear
+        PURPOSE:
+           clear the cache and its statistics
+        INPUT:
+           (none)
+        OUTPUT:
+           (none)
+        HISTORY:
+           2026-10-17 - Written
+        """
+        self._cache.clear()
+        self._arraykey= None
+        self._hits= 0
+        self._misses= 0
+        return None
+
+def force_cache_key(*args):
+    """
+    NAME:
+       force_cache_key
+    PURPOSE:
+       compute a cheap key for a ForceCache from the coordinates at which the forces are evaluated
+    INPUT:
+       coordinates (floats or arrays)
+    OUTPUT:
+       tuple with a float for each scalar coordinate and a (shape,bytes) tuple for each array coordinate, such that scalars and arrays with the same values (e.g., of shape (1,)) have different keys
+    HISTORY:
+       2026-10-17 - Written
+    """
+    return tuple([(numpy.shape(arg),
+                   numpy.ascontiguousarray(arg,dtype='float').tobytes())
+                  if isinstance(arg,(numpy.ndarray,list,tuple))
+                  else float(arg) for arg in args])
+
+def _is_array_key(key):
+    """Whether a key from force_cache_key is for array input"""
+    return any([isinstance(arg,tuple) for arg in key])
@@ -0,0 +1,316 @@
+###############################################################################
+#   interp3DPotential.py: class that interpolates a non-axisymmetric potential
+#                         on a 3D grid in cylindrical coordinates (R,z,phi)
+###############################################################################
+import numpy
+from scipy import ndimage
+from galpy.util import multi, bovy_conversion
+from galpy.potential_src.Potential import Potential, _APY_LOADED
+from galpy.potential_src.interpRZPotential import ext_loaded, \
+    eval_potentials_c, _grid_cache_key, _load_cached_grid, _save_cached_grid
+if _APY_LOADED:
+    from astropy import units
+class interp3DPotential(Potential):
+    """Class that interpolates a given (non-axisymmetric) potential on a 3D grid in cylindrical coordinates :math:`(R,z,\\phi)` using cubic B-splines, for fast orbit integration. The interpolated potential is periodic in :math:`\\phi` and can rotate rigidly with a pattern speed :math:`\\Omega_b`, such that :math:`\\Phi(R,z,\\phi,t) = \\Phi_{\\mathrm{grid}}(R,z,\\phi-\\Omega_b\\,t)`. Forces are the derivatives of the interpolated potential."""
+    def __init__(self,pot=None,rgrid=(numpy.log(0.01),numpy.log(20.),101),
+                 zgrid=(0.,1.,101),nphi=32,logR=True,zsym=True,omegab=0.,
+                 numcores=None,cachedir=None,ro=None,vo=None):
+        """
+        NAME:
+
+           __init__
+
+        PURPOSE:
+
+           Initialize an interp3DPotential instance
+
+        INPUT:
+
+           pot - Potential instance or list of such instances to be interpolated; evaluated at t=0
+
+           rgrid - R grid to be given to linspace as in rs= linspace(*rgrid)
+
+           zgrid - z grid to be given to linspace as in zs= linspace(*zgrid)
+
+           nphi= (32) number of points in the periodic phi grid, phis= 2 pi arange(nphi)/nphi
+
+           logR - if True, rgrid is in the log of R so logrs= linspace(*rgrid)
+
+           zsym= if True (default), the potential is assumed to be symmetric around z=0 (so you can use, e.g.,  zgrid=(0.,1.,101)).
+
+           omegab= (0.) pattern speed with which the interpolated potential rotates (can be Quantity)
+
+           numcores= if set to an integer, use this many cores to compute the grid
+
+           cachedir= if set, directory of a persistent on-disk cache of the grid and its spline coefficients (see interpRZPotential)
+
+           ro=, vo= distance and velocity scales for translation into internal units (default from configuration file)
+
+        OUTPUT:
+
+           instance
+
+        NOTE:
+
+           Outside of the grid, the potential and forces are those at the nearest point of the grid, so make sure that orbits stay within the grid
+
+        HISTORY:
+
+           2026-10-17 - Written
+
+        """
+        if isinstance(pot,interp3DPotential):
+            from galpy.potential import PotentialError
+            raise PotentialError('Cannot setup interp3DPotential with another interp3DPotential')
+        # Propagate ro and vo
+        roSet= True
+        voSet= True
+        firstPot= pot[0] if isinstance(pot,list) else pot
+        if ro is None:
+            ro= firstPot._ro
+            roSet= firstPot._roSet
+        if vo is None:
+            vo= firstPot._vo
+            voSet= firstPot._voSet
+        Potential.__init__(self,amp=1.,ro=ro,vo=vo)
+        # Turn off physical if it hadn't been on
+        if not roSet: self._roSet= False
+        if not voSet: self._voSet= False
+        if _APY_LOADED and isinstance(omegab,units.Quantity):
+            omegab= omegab.to(units.km/units.s/units.kpc).value\
+                /bovy_conversion.freq_in_kmskpc(self._vo,self._ro)
+        self._origPot= pot
+        self._rgrid= numpy.linspace(*rgrid)
+        self._logR= logR
+        if self._logR:
+            self._logrgrid= self._rgrid
+            self._rgrid= numpy.exp(self._logrgrid)
+            self._xgrid= self._logrgrid
+        else:
+            self._xgrid= self._rgrid
+        self._zgrid= numpy.linspace(*zgrid)
+        self._nphi= nphi
+        self._phigrid= 2.*numpy.pi*numpy.arange(nphi)/nphi
+        self._zsym= zsym
+        self._omegab= omegab
+        if cachedir is None:
+            cachekey= None
+        else:
+            cachekey= _grid_cache_key(self._origPot,rgrid,zgrid,logR)
+        gridname= 'potGrid3D_%i' % nphi
+        self._potGrid= _load_cached_grid(cachedir,cachekey,gridname)
+        if self._potGrid is None:
+            self._potGrid= _calc_potential_grid(self._origPot,self._rgrid,
+                                                self._zgrid,self._phigrid,
+                                                numcores=numcores)
+            _save_cached_grid(cachedir,cachekey,gridname,self._potGrid)
+        self._potGrid_splinecoeffs= _load_cached_grid(cachedir,cachekey,
+                                                      gridname+'_splinecoeffs')
+        if self._potGrid_splinecoeffs is None:
+            self._potGrid_splinecoeffs= calc_3dsplinecoeffs(self._potGrid)
+            _save_cached_grid(cachedir,cachekey,gridname+'_splinecoeffs',
+                              self._potGrid_splinecoeffs)
+        self.isNonAxi= True
+        self.hasC= True
+        self.hasC_dxdv= False
+        return None
+
+    def _evaluate(self,R,z,phi=0.,t=0.):
+        """
+        NAME:
+           _evaluate
+        PURPOSE:
+           evaluate the potential at R,z,phi
+        INPUT:
+           R - Galactocentric cylindrical radius
+           z - vertical height
+           phi - azimuth
+           t - time
+        OUTPUT:
+           Phi(R,z,phi)
+        HISTORY:
+           2026-10-17 - Written
+        """
+        return self._interp(R,z,phi,t,0)
+
+    def _Rforce(self,R,z,phi=0.,t=0.):
+        """
+        NAME:
+           _Rforce
+        PURPOSE:
+           evaluate the radial force for this potential
+        INPUT:
+           R - Galactocentric cylindrical radius
+           z - vertical height
+           phi - azimuth
+           t - time
+        OUTPUT:
+           the radial force
+        HISTORY:
+           2026-10-17 - Written
+        """
+        return -self._interp(R,z,phi,t,1)
+
+    def _zforce(self,R,z,phi=0.,t=0.):
+        """
+        NAME:
+           _zforce
+        PURPOSE:
+           evaluate the vertical force for this potential
+        INPUT:
+           R - Galactocentric cylindrical radius
+           z - vertical height
+           phi - azimuth
+           t - time
+        OUTPUT:
+           the vertical force
+        HISTORY:
+           2026-10-17 - Written
+        """
+        return -self._interp(R,z,phi,t,2)
+
+    def _phiforce(self,R,z,phi=0.,t=0.):
+        """
+        NAME:
+           _phiforce
+        PURPOSE:
+           evaluate the azimuthal force for this potential
+        INPUT:
+           R - Galactocentric cylindrical radius
+           z - vertical height
+           phi - azimuth
+           t - time
+        OUTPUT:
+           the azimuthal force
+        HISTORY:
+           2026-10-17 - Written
+        """
+        return -self._interp(R,z,phi,t,3)
+
+    def OmegaP(self):
+        """
+        NAME:
+           OmegaP
+        PURPOSE:
+           return the pattern speed
+        INPUT:
+           (none)
+        OUTPUT:
+           pattern speed
+        HISTORY:
+           2026-10-17 - Written
+        """
+        return self._omegab
+
+    def _interp(self,R,z,phi,t,quantity):
+        """Evaluate the B-spline interpolation (quantity=0) or its derivative with respect to R (1), z (2), or phi (3), in the same way as the C implementation"""
+        R,z,phi,t= numpy.broadcast_arrays(R,z,phi,t)
+        shape= R.shape
+        R= R.flatten()
+        z= z.flatten()
+        phi= phi.flatten()
+        t= t.flatten()
+        if self._logR:
+            x= numpy.log(numpy.where(R > 0.,R,numpy.exp(-20.72326583694641)))
+        else:
+            x= R
+        if self._zsym:
+            zz= numpy.fabs(z)
+        else:
+            zz= z
+        dx= self._xgrid[1]-self._xgrid[0]
+        dz= self._zgrid[1]-self._zgrid[0]
+        ix,wx,dwx= _grid_indices_weights(\
+            numpy.clip((x-self._xgrid[0])/dx,0.,len(self._xgrid)-1),
+            len(self._xgrid),False)
+        iz,wz,dwz= _grid_indices_weights(\
+            numpy.clip((zz-self._zgrid[0])/dz,0.,len(self._zgrid)-1),
+            len(self._zgrid),False)
+        ip,wp,dwp= _grid_indices_weights(\
+            (phi-self._omegab*t)/2./numpy.pi*self._nphi,self._nphi,True)
+        if quantity == 1: wx= dwx
+        elif quantity == 2: wz= dwz
+        elif quantity == 3: wp= dwp
+        coeffs= self._potGrid_splinecoeffs[ix[:,:,None,None],
+                                           iz[:,None,:,None],
+                                           ip[:,None,None,:]]
+        out= numpy.einsum('nijk,ni,nj,nk->n',coeffs,wx,wz,wp)
+        # Chain rule back to (R,z,phi)
+        if quantity == 1:
+            out/= dx
+            if self._logR: out/= R
+        elif quantity == 2:
+            out/= dz
+            if self._zsym: out[z < 0.]*= -1.
+        elif quantity == 3:
+            out*= self._nphi/2./numpy.pi
+        if len(shape) == 0: return out[0]
+        else: return numpy.reshape(out,shape)
+
+def _grid_indices_weights(xn,n,periodic):
+    """Indices and weights (and their derivatives) of the cubic B-spline coefficients that contribute at the normalized grid coordinates xn, for mirror or periodic boundary conditions"""
+    k= numpy.floor(xn).astype(int)
+    w= xn-k
+    indx= k[:,None]+numpy.arange(-1,3)[None,:]
+    if periodic:
+        indx= indx % n
+    elif n == 1:
+        indx[:]= 0
+    else:
+        n2= 2*n-2
+        indx= numpy.fabs(indx) % n2
+        indx[indx >= n]= n2-indx[indx >= n]
+    w3= w**3./6.
+    w0= 1./6.+0.5*w*(w-1.)-w3
+    w2= w+w0-2.*w3
+    w1= 1.-w0-w2-w3
+    dw= numpy.array([-0.5*(1.-w)**2.,1.5*w**2.-2.*w,0.5+w-1.5*w**2.,0.5*w**2.]).T
+    return (indx.astype(int),numpy.array([w0,w1,w2,w3]).T,dw)
+
+def _calc_potential_grid(pot,R,z,phi,numcores=None):
+    """Evaluate the potential on the grid, in C if possible"""
+    RR,zz,pp= numpy.meshgrid(R,z,phi,indexing='ij')
+    if ext_loaded:
+        try:
+            out, err= eval_potentials_c(pot,RR.flatten(),zz.flatten(),
+                                        pp.flatten(),numpy.zeros(RR.size),
+                                        numcores=numcores)
+        except NotImplementedError:
+            pass
+        else:
+            return numpy.reshape(out,RR.shape)
+    from galpy.potential import evaluatePotentials
+    def _calc_slice(ii):
+        return numpy.array([[evaluatePotentials(pot,R[ii],zj,phi=phik,t=0.,
+                                                use_physical=False)
+                             for phik in phi] for zj in z])
+    if numcores is None:
+        return numpy.array([_calc_slice(ii) for ii in range(len(R))])
+    else:
+        return numpy.array(multi.parallel_map(_calc_slice,
+                                              list(range(len(R))),
+                                              numcores=numcores))
+
+def calc_3dsplinecoeffs(array3d):
+    """
+    NAME:
+       calc_3dsplinecoeffs
+    PURPOSE:
+       Calculate cubic B-spline coefficients for a 3D array on an (R,z,phi) grid, with mirror boundary conditions in R and z and periodic boundary conditions in phi
+    INPUT:
+       array3d
+    OUTPUT:
+       new array with spline coeffs
+    HISTORY:
+       2026-10-17 - Written
+    """
+    out= ndimage.spline_filter1d(array3d,order=3,axis=0)
+    out= ndimage.spline_filter1d(out,order=3,axis=1)
+    # Periodic in phi: (c[k-1]+4c[k]+c[k+1])/6 = f[k], solved using the FFT
+    nphi= array3d.shape[2]
+    out= numpy.fft.irfft(numpy.fft.rfft(out,axis=2)*6.\
+                             /(4.+2.*numpy.cos(2.*numpy.pi\
+                                                   *numpy.arange(nphi//2+1)\
+                                                   /nphi)),
+                         n=nphi,axis=2)
+    return numpy.require(out,dtype=numpy.float64,requirements=['C'])
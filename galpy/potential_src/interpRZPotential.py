@@ -2,6 +2,8 @@ import os
 import sys
 import sysconfig
 import copy
+import hashlib
+import tempfile
 import ctypes
 import ctypes.util
 import warnings
@@ -10,7 +12,7 @@ import numpy
 from numpy.ctypeslib import ndpointer
 from scipy import interpolate
 from galpy.util import multi, galpyWarning
-from galpy.potential_src.Potential import Potential
+from galpy.potential_src.Potential import Potential, _check_c
 from galpy.util.bovy_conversion import physical_conversion
 _DEBUG= False
 #Find and load the library
@@ -110,7 +112,7 @@ class interpRZPotential(Potential):
                  interpepifreq=False,interpverticalfreq=False,
                  ro=None,vo=None,
                  use_c=False,enable_c=False,zsym=True,
-                 numcores=None):
+                 numcores=None,cachedir=None):
         """
         NAME:
 
@@ -140,6 +142,8 @@ class interpRZPotential(Potential):
 
            numcores= if set to an integer, use this many cores (only used for vcirc, dvcircdR, epifreq, and verticalfreq; NOT NECESSARILY FASTER, TIME TO MAKE SURE)
 
+           cachedir= if set, directory of a persistent on-disk cache of the interpolation grids and spline coefficients, keyed on the parameters of RZPot and on rgrid, zgrid, and logR; grids found in the cache are memory-mapped from it rather than computed, newly computed grids are added to it
+
            ro=, vo= distance and velocity scales for translation into internal units (default from configuration file)
 
         OUTPUT:
@@ -152,6 +156,8 @@ class interpRZPotential(Potential):
 
            2013-01-24 - Started with new implementation - Bovy (IAS)
 
+           2026-10-17 - Added cachedir
+
         """
         if isinstance(RZPot,interpRZPotential):
             from galpy.potential import PotentialError
@@ -195,16 +201,26 @@ class interpRZPotential(Potential):
         self._enable_c= enable_c*ext_loaded
         self.hasC= self._enable_c
         self._zsym= zsym
+        if cachedir is None:
+            cachekey= None
+        else:
+            cachekey= _grid_cache_key(self._origPot,rgrid,zgrid,logR)
+            if cachekey is None:
+                warnings.warn("Not using the grid cache in %s, because some parameters of the potential cannot be fingerprinted, such that a cached grid could belong to a different potential" % cachedir,galpyWarning)
+                cachedir= None
         if interpPot:
-            if use_c*ext_loaded:
-                self._potGrid, err= calc_potential_c(self._origPot,self._rgrid,self._zgrid)
-            else:
-                from galpy.potential import evaluatePotentials
-                potGrid= numpy.zeros((len(self._rgrid),len(self._zgrid)))
-                for ii in range(len(self._rgrid)):
-                    for jj in range(len(self._zgrid)):
-                        potGrid[ii,jj]= evaluatePotentials(self._origPot,self._rgrid[ii],self._zgrid[jj])
-                self._potGrid= potGrid
+            self._potGrid= _load_cached_grid(cachedir,cachekey,'potGrid')
+            if self._potGrid is None:
+                if use_c*ext_loaded:
+                    self._potGrid, err= calc_potential_c(self._origPot,self._rgrid,self._zgrid)
+                else:
+                    from galpy.potential import evaluatePotentials
+                    potGrid= numpy.zeros((len(self._rgrid),len(self._zgrid)))
+                    for ii in range(len(self._rgrid)):
+                        for jj in range(len(self._zgrid)):
+                            potGrid[ii,jj]= evaluatePotentials(self._origPot,self._rgrid[ii],self._zgrid[jj])
+                    self._potGrid= potGrid
+                _save_cached_grid(cachedir,cachekey,'potGrid',self._potGrid)
             if self._logR:
                 self._potInterp= interpolate.RectBivariateSpline(self._logrgrid,
                                                                  self._zgrid,
@@ -216,17 +232,23 @@ class interpRZPotential(Potential):
                                                                  self._potGrid,
                                                                  kx=3,ky=3,s=0.)
             if enable_c*ext_loaded:
-                self._potGrid_splinecoeffs= calc_2dsplinecoeffs_c(self._potGrid)
+                self._potGrid_splinecoeffs= _load_cached_grid(cachedir,cachekey,'potGrid_splinecoeffs')
+                if self._potGrid_splinecoeffs is None:
+                    self._potGrid_splinecoeffs= calc_2dsplinecoeffs_c(self._potGrid)
+                    _save_cached_grid(cachedir,cachekey,'potGrid_splinecoeffs',self._potGrid_splinecoeffs)
         if interpRforce:
-            if use_c*ext_loaded:
-                self._rforceGrid, err= calc_potential_c(self._origPot,self._rgrid,self._zgrid,rforce=True)
-            else:
-                from galpy.potential import evaluateRforces
-                rforceGrid= numpy.zeros((len(self._rgrid),len(self._zgrid)))
-                for ii in range(len(self._rgrid)):
-                    for jj in range(len(self._zgrid)):
-                        rforceGrid[ii,jj]= evaluateRforces(self._origPot,self._rgrid[ii],self._zgrid[jj])
-                self._rforceGrid= rforceGrid
+            self._rforceGrid= _load_cached_grid(cachedir,cachekey,'rforceGrid')
+            if self._rforceGrid is None:
+                if use_c*ext_loaded:
+                    self._rforceGrid, err= calc_potential_c(self._origPot,self._rgrid,self._zgrid,rforce=True)
+                else:
+                    from galpy.potential import evaluateRforces
+                    rforceGrid= numpy.zeros((len(self._rgrid),len(self._zgrid)))
+                    for ii in range(len(self._rgrid)):
+                        for jj in range(len(self._zgrid)):
+                            rforceGrid[ii,jj]= evaluateRforces(self._origPot,self._rgrid[ii],self._zgrid[jj])
+                    self._rforceGrid= rforceGrid
+                _save_cached_grid(cachedir,cachekey,'rforceGrid',self._rforceGrid)
             if self._logR:
                 self._rforceInterp= interpolate.RectBivariateSpline(self._logrgrid,
                                                                     self._zgrid,
@@ -238,17 +260,23 @@ class interpRZPotential(Potential):
                                                                     self._rforceGrid,
                                                                     kx=3,ky=3,s=0.)
             if enable_c*ext_loaded:
-                self._rforceGrid_splinecoeffs= calc_2dsplinecoeffs_c(self._rforceGrid)
+                self._rforceGrid_splinecoeffs= _load_cached_grid(cachedir,cachekey,'rforceGrid_splinecoeffs')
+                if self._rforceGrid_splinecoeffs is None:
+                    self._rforceGrid_splinecoeffs= calc_2dsplinecoeffs_c(self._rforceGrid)
+                    _save_cached_grid(cachedir,cachekey,'rforceGrid_splinecoeffs',self._rforceGrid_splinecoeffs)
         if interpzforce:
-            if use_c*ext_loaded:
-                self._zforceGrid, err= calc_potential_c(self._origPot,self._rgrid,self._zgrid,zforce=True)
-            else:
-                from galpy.potential import evaluatezforces
-                zforceGrid= numpy.zeros((len(self._rgrid),len(self._zgrid)))
-                for ii in range(len(self._rgrid)):
-                    for jj in range(len(self._zgrid)):
-                        zforceGrid[ii,jj]= evaluatezforces(self._origPot,self._rgrid[ii],self._zgrid[jj])
-                self._zforceGrid= zforceGrid
+            self._zforceGrid= _load_cached_grid(cachedir,cachekey,'zforceGrid')
+            if self._zforceGrid is None:
+                if use_c*ext_loaded:
+                    self._zforceGrid, err= calc_potential_c(self._origPot,self._rgrid,self._zgrid,zforce=True)
+                else:
+                    from galpy.potential import evaluatezforces
+                    zforceGrid= numpy.zeros((len(self._rgrid),len(self._zgrid)))
+                    for ii in range(len(self._rgrid)):
+                        for jj in range(len(self._zgrid)):
+                            zforceGrid[ii,jj]= evaluatezforces(self._origPot,self._rgrid[ii],self._zgrid[jj])
+                    self._zforceGrid= zforceGrid
+                _save_cached_grid(cachedir,cachekey,'zforceGrid',self._zforceGrid)
             if self._logR:
                 self._zforceInterp= interpolate.RectBivariateSpline(self._logrgrid,
                                                                     self._zgrid,
@@ -260,14 +288,20 @@ class interpRZPotential(Potential):
                                                                     self._zforceGrid,
                                                                     kx=3,ky=3,s=0.)
             if enable_c*ext_loaded:
-                self._zforceGrid_splinecoeffs= calc_2dsplinecoeffs_c(self._zforceGrid)
+                self._zforceGrid_splinecoeffs= _load_cached_grid(cachedir,cachekey,'zforceGrid_splinecoeffs')
+                if self._zforceGrid_splinecoeffs is None:
+                    self._zforceGrid_splinecoeffs= calc_2dsplinecoeffs_c(self._zforceGrid)
+                    _save_cached_grid(cachedir,cachekey,'zforceGrid_splinecoeffs',self._zforceGrid_splinecoeffs)
         if interpDens:
-            from galpy.potential import evaluateDensities
-            densGrid= numpy.zeros((len(self._rgrid),len(self._zgrid)))
-            for ii in range(len(self._rgrid)):
-                for jj in range(len(self._zgrid)):
-                    densGrid[ii,jj]= evaluateDensities(self._origPot,self._rgrid[ii],self._zgrid[jj])
-            self._densGrid= densGrid
+            self._densGrid= _load_cached_grid(cachedir,cachekey,'densGrid')
+            if self._densGrid is None:
+                from galpy.potential import evaluateDensities
+                densGrid= numpy.zeros((len(self._rgrid),len(self._zgrid)))
+                for ii in range(len(self._rgrid)):
+                    for jj in range(len(self._zgrid)):
+                        densGrid[ii,jj]= evaluateDensities(self._origPot,self._rgrid[ii],self._zgrid[jj])
+                self._densGrid= densGrid
+                _save_cached_grid(cachedir,cachekey,'densGrid',self._densGrid)
             if self._logR:
                 self._densInterp= interpolate.RectBivariateSpline(self._logrgrid,
                                                                   self._zgrid,
@@ -279,34 +313,43 @@ class interpRZPotential(Potential):
                                                                   numpy.log(self._densGrid+10.**-10.),
                                                                   kx=3,ky=3,s=0.)
         if interpvcirc:
-            from galpy.potential import vcirc
-            if not numcores is None:
-                self._vcircGrid= multi.parallel_map((lambda x: vcirc(self._origPot,self._rgrid[x])),
-                                                    list(range(len(self._rgrid))),numcores=numcores)
-            else:
-                self._vcircGrid= numpy.array([vcirc(self._origPot,r) for r in self._rgrid])
+            self._vcircGrid= _load_cached_grid(cachedir,cachekey,'vcircGrid')
+            if self._vcircGrid is None:
+                from galpy.potential import vcirc
+                if not numcores is None:
+                    self._vcircGrid= multi.parallel_map((lambda x: vcirc(self._origPot,self._rgrid[x])),
+                                                        list(range(len(self._rgrid))),numcores=numcores)
+                else:
+                    self._vcircGrid= numpy.array([vcirc(self._origPot,r) for r in self._rgrid])
+                _save_cached_grid(cachedir,cachekey,'vcircGrid',self._vcircGrid)
             if self._logR:
                 self._vcircInterp= interpolate.InterpolatedUnivariateSpline(self._logrgrid,self._vcircGrid,k=3)
             else:
                 self._vcircInterp= interpolate.InterpolatedUnivariateSpline(self._rgrid,self._vcircGrid,k=3)
         if interpdvcircdr:
-            from galpy.potential import dvcircdR
-            if not numcores is None:
-                self._dvcircdrGrid= multi.parallel_map((lambda x: dvcircdR(self._origPot,self._rgrid[x])),
-                                                       list(range(len(self._rgrid))),numcores=numcores)
-            else:
-                self._dvcircdrGrid= numpy.array([dvcircdR(self._origPot,r) for r in self._rgrid])
+            self._dvcircdrGrid= _load_cached_grid(cachedir,cachekey,'dvcircdrGrid')
+            if self._dvcircdrGrid is None:
+                from galpy.potential import dvcircdR
+                if not numcores is None:
+                    self._dvcircdrGrid= multi.parallel_map((lambda x: dvcircdR(self._origPot,self._rgrid[x])),
+                                                           list(range(len(self._rgrid))),numcores=numcores)
+                else:
+                    self._dvcircdrGrid= numpy.array([dvcircdR(self._origPot,r) for r in self._rgrid])
+                _save_cached_grid(cachedir,cachekey,'dvcircdrGrid',self._dvcircdrGrid)
             if self._logR:
                 self._dvcircdrInterp= interpolate.InterpolatedUnivariateSpline(self._logrgrid,self._dvcircdrGrid,k=3)
             else:
                 self._dvcircdrInterp= interpolate.InterpolatedUnivariateSpline(self._rgrid,self._dvcircdrGrid,k=3)
         if interpepifreq:
-            from galpy.potential import epifreq
-            if not numcores is None:
-                self._epifreqGrid= numpy.array(multi.parallel_map((lambda x: epifreq(self._origPot,self._rgrid[x])),
-                                                      list(range(len(self._rgrid))),numcores=numcores))
-            else:
-                self._epifreqGrid= numpy.array([epifreq(self._origPot,r) for r in self._rgrid])
+            self._epifreqGrid= _load_cached_grid(cachedir,cachekey,'epifreqGrid')
+            if self._epifreqGrid is None:
+                from galpy.potential import epifreq
+                if not numcores is None:
+                    self._epifreqGrid= numpy.array(multi.parallel_map((lambda x: epifreq(self._origPot,self._rgrid[x])),
+                                                          list(range(len(self._rgrid))),numcores=numcores))
+                else:
+                    self._epifreqGrid= numpy.array([epifreq(self._origPot,r) for r in self._rgrid])
+                _save_cached_grid(cachedir,cachekey,'epifreqGrid',self._epifreqGrid)
             indx= True^numpy.isnan(self._epifreqGrid)
             if numpy.sum(indx) < 4:
                 if self._logR:
@@ -319,12 +362,15 @@ class interpRZPotential(Potential):
                 else:
                     self._epifreqInterp= interpolate.InterpolatedUnivariateSpline(self._rgrid[indx],self._epifreqGrid[indx],k=3)
         if interpverticalfreq:
-            from galpy.potential import verticalfreq
-            if not numcores is None:
-                self._verticalfreqGrid= multi.parallel_map((lambda x: verticalfreq(self._origPot,self._rgrid[x])),
-                                                       list(range(len(self._rgrid))),numcores=numcores)
-            else:
-                self._verticalfreqGrid= numpy.array([verticalfreq(self._origPot,r) for r in self._rgrid])
+            self._verticalfreqGrid= _load_cached_grid(cachedir,cachekey,'verticalfreqGrid')
+            if self._verticalfreqGrid is None:
+                from galpy.potential import verticalfreq
+                if not numcores is None:
+                    self._verticalfreqGrid= multi.parallel_map((lambda x: verticalfreq(self._origPot,self._rgrid[x])),
+                                                           list(range(len(self._rgrid))),numcores=numcores)
+                else:
+                    self._verticalfreqGrid= numpy.array([verticalfreq(self._origPot,r) for r in self._rgrid])
+                _save_cached_grid(cachedir,cachekey,'verticalfreqGrid',self._verticalfreqGrid)
             if self._logR:
                 self._verticalfreqInterp= interpolate.InterpolatedUnivariateSpline(self._logrgrid,self._verticalfreqGrid,k=3)
             else:
@@ -718,6 +764,125 @@ def eval_force_c(pot,R,z,zforce=False):
 
     return (out,err.value)
 
+# Potential types (see _parse_pot) for which the C code can evaluate the
+# potential itself, rather than only the forces
+_potentialEval_c_types= set([-1,0,5,7,8,9,10,11,12,13,14,15,16,17,18,19,20,
+                             21,22,23,24,25,26,28,29,30])
+_eval_potentials_c_quantities= {'potential':0,'Rforce':1,'zforce':2,
+                                'phiforce':3}
+def eval_potentials_c(pot,R,z,phi,t,quantity='potential',numcores=None):
+    """
+    NAME:
+       eval_potentials_c
+    PURPOSE:
+       Use C to evaluate a (list of) potential(s) or its forces at many points at once, parallelized over the points
+    INPUT:
+       pot - Potential or list of such instances
+       R, z, phi, t - arrays of the same length
+       quantity= ('potential') 'potential', 'Rforce', 'zforce', or 'phiforce'
+       numcores= (None) number of OpenMP threads to use (default: OpenMP's default)
+    OUTPUT:
+       (quantity evaluated at the points,error code)
+    HISTORY:
+       2026-10-17 - Written
+    """
+    from galpy.orbit_src.integrateFullOrbit import _parse_pot #here bc otherwise there is an infinite loop
+    if not _check_c(pot):
+        raise NotImplementedError("C evaluation of the %s is not available for this potential" % quantity)
+    #Parse the potential
+    try:
+        npot, pot_type, pot_args= _parse_pot(pot,
+                                             potforactions=\
+                                                 quantity == 'potential')
+    except AttributeError: # e.g., interpRZPotential without potential grid
+        raise NotImplementedError("C evaluation of the %s is not available for this potential" % quantity)
+    if quantity == 'potential' \
+            and not set(pot_type.tolist()) <= _potentialEval_c_types:
+        raise NotImplementedError("C evaluation of the potential is not available for this potential")
+
+    #Set up result arrays
+    out= numpy.empty((len(R)))
+    err= ctypes.c_int(0)
+    if numcores is None: numcores= -1
+
+    #Set up the C code
+    ndarrayFlags= ('C_CONTIGUOUS','WRITEABLE')
+    interppotential_eval_potentialsFunc= _lib.eval_potentials
+    interppotential_eval_potentialsFunc.argtypes= [ctypes.c_int,
+                                                   ctypes.c_int,
+                                                   ndpointer(dtype=numpy.float64,flags=ndarrayFlags),
+                                                   ndpointer(dtype=numpy.float64,flags=ndarrayFlags),
+                                                   ndpointer(dtype=numpy.float64,flags=ndarrayFlags),
+                                                   ndpointer(dtype=numpy.float64,flags=ndarrayFlags),
+                                                   ctypes.c_int,
+                                                   ndpointer(dtype=numpy.int32,flags=ndarrayFlags),
+                                                   ndpointer(dtype=numpy.float64,flags=ndarrayFlags),
+                                                   ctypes.c_int,
+                                                   ndpointer(dtype=numpy.float64,flags=ndarrayFlags),
+                                                   ctypes.POINTER(ctypes.c_int)]
+
+    #Array requirements
+    R= numpy.require(R,dtype=numpy.float64,requirements=['C','W'])
+    z= numpy.require(z,dtype=numpy.float64,requirements=['C','W'])
+    phi= numpy.require(phi,dtype=numpy.float64,requirements=['C','W'])
+    t= numpy.require(t,dtype=numpy.float64,requirements=['C','W'])
+    out= numpy.require(out,dtype=numpy.float64,requirements=['C','W'])
+
+    #Run the C code
+    interppotential_eval_potentialsFunc(\
+        ctypes.c_int(_eval_potentials_c_quantities[quantity]),
+        len(R),
+        R,
+        z,
+        phi,
+        t,
+        ctypes.c_int(npot),
+        pot_type,
+        pot_args,
+        ctypes.c_int(numcores),
+        out,
+        ctypes.byref(err))
+
+    return (out,err.value)
+
+def _grid_cache_key(pot,rgrid,zgrid,logR):
+    """Key of the on-disk grid cache: a hash of the parameters of the potential (with arrays hashed in full) and of the grid specification; None when some parameters of the potential cannot be fingerprinted"""
+    from galpy.orbit_src.integratePlanarOrbit import _pot_fingerprint, \
+        _fingerprint_complete, _UNFINGERPRINTABLE #here bc otherwise there is an infinite loop
+    fingerprint= _pot_fingerprint(pot,
+                                  checksum=lambda x: hashlib.sha1(x).hexdigest(),
+                                  unknown=_UNFINGERPRINTABLE)
+    if not _fingerprint_complete(fingerprint):
+        return None
+    return hashlib.sha1(repr((fingerprint,
+                              tuple([float(x) for x in rgrid[:2]])+(int(rgrid[2]),),
+                              tuple([float(x) for x in zgrid[:2]])+(int(zgrid[2]),),
+                              bool(logR))).encode('utf-8')).hexdigest()
+
+def _load_cached_grid(cachedir,cachekey,name):
+    """Memory-map the grid name from the on-disk cache, returns None if it is not cached"""
+    if cachedir is None: return None
+    filename= os.path.join(cachedir,cachekey,'%s.npy' % name)
+    if not os.path.exists(filename): return None
+    return numpy.load(filename,mmap_mode='r')
+
+def _save_cached_grid(cachedir,cachekey,name,grid):
+    """Save the grid name to the on-disk cache; the file is written under a temporary name and then renamed, such that processes building the same grid simultaneously never read partially written files"""
+    if cachedir is None: return None
+    dirname= os.path.join(cachedir,cachekey)
+    try:
+        os.makedirs(dirname)
+    except OSError:
+        if not os.path.isdir(dirname): raise
+    fd, tmpname= tempfile.mkstemp(suffix='.npy',dir=dirname)
+    with os.fdopen(fd,'wb') as tmpfile:
+        numpy.save(tmpfile,numpy.asarray(grid,dtype=numpy.float64))
+    try:
+        os.rename(tmpname,os.path.join(dirname,'%s.npy' % name))
+    except OSError: #pragma: no cover, e.g., on Windows when the file exists
+        os.remove(tmpname)
+    return None
+
 def sign(x):
     out= numpy.ones_like(x)
     out[(x < 0.)]= -1.
@@ -189,3 +189,88 @@ void eval_zforce(int nR,
   free_potentialArgs(npot,potentialArgs);
   free(potentialArgs);
 }
+/*
+  Evaluate the potential or one of the forces of a list of potentials at
+  n points (R,z,phi,t), parallelized over the points
+*/
+static double evaluatePotentials_full(double R, double Z, double phi,
+				      double t, int nargs,
+				      struct potentialArg * potentialArgs){
+  int ii;
+  double pot= 0.;
+  for (ii=0; ii < nargs; ii++){
+    pot+= potentialArgs->potentialEval(R,Z,phi,t,potentialArgs);
+    potentialArgs++;
+  }
+  potentialArgs-= nargs;
+  return pot;
+}
+void eval_potentials(int quantity,
+		     int n,
+		     double *R,
+		     double *z,
+		     double *phi,
+		     double *t,
+		     int npot,
+		     int * pot_type,
+		     double * pot_args,
+		     int nthreads,
+		     double *out,
+		     int * err){
+  //quantity: 0 = potential, 1 = Rforce, 2 = zforce, 3 = phiforce
+  int ii, tid;
+  double (*func)(double,double,double,double,int,struct potentialArg *);
+  switch ( quantity ) {
+  case 0:
+    func= &evaluatePotentials_full;
+    break;
+  case 1:
+    func= &calcRforce;
+    break;
+  case 2:
+    func= &calczforce;
+    break;
+  case 3:
+    func= &calcPhiforce;
+    break;
+  default:
+    *err= -1;
+    return;
+  }
+#ifdef _OPENMP
+  if ( nthreads <= 0 )
+    nthreads= omp_get_max_threads();
+#else
+  nthreads= 1;
+#endif
+  if ( nthreads > n )
+    nthreads= n;
+  if ( nthreads < 1 )
+    nthreads= 1;
+  //Set up the potentials, one copy per thread, because some potentials
+  //cache intermediate results in their arguments
+  struct potentialArg * potentialArgs= (struct potentialArg *) malloc ( nthreads * npot * sizeof (struct potentialArg) );
+  for (ii=0; ii < nthreads; ii++){
+    if ( quantity == 0 )
+      parse_actionAngleArgs(npot,potentialArgs+ii*npot,pot_type,pot_args,
+			    false);
+    else
+      parse_leapFuncArgs_Full(npot,potentialArgs+ii*npot,pot_type,pot_args);
+  }
+  //Run through and evaluate
+#pragma omp parallel for schedule(static) private(ii,tid)	\
+  num_threads(nthreads)
+  for (ii=0; ii < n; ii++){
+#ifdef _OPENMP
+    tid= omp_get_thread_num();
+#else
+    tid = 0;
+#endif
+    *(out+ii)= func(*(R+ii),*(z+ii),*(phi+ii),*(t+ii),npot,
+		    potentialArgs+tid*npot);
+  }
+  for (ii=0; ii < nthreads; ii++)
+    free_potentialArgs(npot,potentialArgs+ii*npot);
+  free(potentialArgs);
+  *err= 0;
+}
@@ -5,12 +5,41 @@
 #define M_PI 3.14159265358979323846
 #endif
 //Double exponential disk potential
+//Arguments: amp, alpha, beta, kmaxFac, nzeros, glorder, glx, glw, j0zeros,
+//dj0zeros, j1zeros, dj1zeros, Kepler amp, Kepler alpha, followed by
+//the minimum R for the double-exponential quadrature, the number of
+//double-exponential nodes for J0 and J1 (zero if not used), and the
+//J0 nodes, J0 weights, J1 nodes, and J1 weights
+static inline double * DoubleExponentialDiskPotentialDEArgs(double * args){
+  int nzeros= (int) *(args+4);
+  int glorder= (int) *(args+5);
+  return args + 8 + 2 * glorder + 4 * ( nzeros + 1 );
+}
 double DoubleExponentialDiskPotentialEval(double R,double z, double phi,
 					  double t,
 					  struct potentialArg * potentialArgs){
   double * args= potentialArgs->args;
   double amp, alpha;
   int nzeros, glorder;
+  double * deargs= DoubleExponentialDiskPotentialDEArgs(args);
+  int den= (int) *(deargs+1);
+  if ( den > 0 && R >= *deargs ) { //Double-exponential quadrature
+    double * dex= deargs + 3;
+    double * dew= deargs + 3 + den;
+    double debeta= *(args+2);
+    double debz= exp(-debeta * fabs(z) );
+    double deout= 0.;
+    double dek, des;
+    int kk;
+    alpha= *(args+1);
+    for (kk=0; kk < den; kk++) {
+      dek= *(dex+kk) / R;
+      des= alpha * alpha + dek * dek;
+      deout+= *(dew+kk) / des / sqrt(des) * ( debeta * exp(-dek * fabs(z) ) - dek * debz )
+	/ (debeta * debeta - dek * dek);
+    }
+    return - *args * 4. * M_PI * alpha * deout / R;
+  }
   if ( R > 6. ) { //Approximate as Keplerian
     nzeros= (int) *(args+4);
     glorder= (int) *(args+5);
@@ -53,6 +82,25 @@ double DoubleExponentialDiskPotentialRforce(double R,double z, double phi,
   double * args= potentialArgs->args;
   double amp, alpha;
   int nzeros,glorder;
+  double * deargs= DoubleExponentialDiskPotentialDEArgs(args);
+  int den= (int) *(deargs+2);
+  if ( den > 0 && R >= *deargs ) { //Double-exponential quadrature
+    double * dex= deargs + 3 + 2 * (int) *(deargs+1);
+    double * dew= deargs + 3 + 2 * (int) *(deargs+1) + den;
+    double debeta= *(args+2);
+    double debz= exp(-debeta * fabs(z) );
+    double deout= 0.;
+    double dek, des;
+    int kk;
+    alpha= *(args+1);
+    for (kk=0; kk < den; kk++) {
+      dek= *(dex+kk) / R;
+      des= alpha * alpha + dek * dek;
+      deout+= *(dew+kk) / des / sqrt(des) * dek * ( debeta * exp(-dek * fabs(z) ) - dek * debz )
+	/ (debeta * debeta - dek * dek);
+    }
+    return - *args * 4. * M_PI * alpha * deout / R;
+  }
   if ( R > 6. ) { //Approximate as Keplerian
     nzeros= (int) *(args+4);
     glorder= (int) *(args+5);
@@ -95,6 +143,23 @@ double DoubleExponentialDiskPotentialPlanarRforce(double R,double phi,
   double * args= potentialArgs->args;
   double amp, alpha;
   int nzeros, glorder;
+  double * deargs= DoubleExponentialDiskPotentialDEArgs(args);
+  int den= (int) *(deargs+2);
+  if ( den > 0 && R >= *deargs ) { //Double-exponential quadrature
+    double * dex= deargs + 3 + 2 * (int) *(deargs+1);
+    double * dew= deargs + 3 + 2 * (int) *(deargs+1) + den;
+    double debeta= *(args+2);
+    double deout= 0.;
+    double dek, des;
+    int kk;
+    alpha= *(args+1);
+    for (kk=0; kk < den; kk++) {
+      dek= *(dex+kk) / R;
+      des= alpha * alpha + dek * dek;
+      deout+= *(dew+kk) / des / sqrt(des) * dek / (debeta + dek);
+    }
+    return - *args * 4. * M_PI * alpha * deout / R;
+  }
   if ( R > 6. ) { //Approximate as Keplerian
     nzeros= (int) *(args+4);
     glorder= (int) *(args+5);
@@ -136,6 +201,28 @@ double DoubleExponentialDiskPotentialzforce(double R,double z,double phi,
   double * args= potentialArgs->args;
   double amp, alpha;
   int nzeros, glorder;
+  double * deargs= DoubleExponentialDiskPotentialDEArgs(args);
+  int den= (int) *(deargs+1);
+  if ( den > 0 && R >= *deargs ) { //Double-exponential quadrature
+    double * dex= deargs + 3;
+    double * dew= deargs + 3 + den;
+    double debeta= *(args+2);
+    double debz= exp(-debeta * fabs(z) );
+    double deout= 0.;
+    double dek, des;
+    int kk;
+    alpha= *(args+1);
+    for (kk=0; kk < den; kk++) {
+      dek= *(dex+kk) / R;
+      des= alpha * alpha + dek * dek;
+      deout+= *(dew+kk) / des / sqrt(des) * dek * ( exp(-dek * fabs(z) ) - debz )
+	/ (debeta * debeta - dek * dek);
+    }
+    if ( z > 0. )
+      return - *args * 4. * M_PI * alpha * debeta * deout / R;
+    else
+      return *args * 4. * M_PI * alpha * debeta * deout / R;
+  }
   if ( R > 6. ) { //Approximate as Keplerian
     nzeros= (int) *(args+4);
     glorder= (int) *(args+5);
@@ -0,0 +1,261 @@
+#include <math.h>
+#include <galpy_potentials.h>
+//FerrersPotential
+//22 + 2 * glorder arguments: amp, a2, b2, c2, n, prefac, omegab, pa, glorder,
+//7 caching slots for the forces, 6 caching slots for the second derivatives,
+//Gauss-Legendre points and weights on [0,1]
+static double lowerlim(double x2,double y2,double z2,
+		       double a2,double b2,double c2){
+  // Positive root of x^2/(a^2+t)+y^2/(b^2+t)+z^2/(c^2+t) = 1 if (x,y,z) is
+  // outside of the ellipsoid, zero otherwise; the LHS is convex and
+  // decreasing, so Newton's method starting at zero converges monotonically
+  double t= 0.;
+  double f, df, dt;
+  int ii;
+  if ( x2 / a2 + y2 / b2 + z2 / c2 <= 1. ) return 0.;
+  for (ii=0; ii < 100; ii++){
+    f= x2 / ( a2 + t ) + y2 / ( b2 + t ) + z2 / ( c2 + t ) - 1.;
+    df= x2 / ( a2 + t ) / ( a2 + t ) + y2 / ( b2 + t ) / ( b2 + t )
+      + z2 / ( c2 + t ) / ( c2 + t );
+    dt= f / df;
+    t+= dt;
+    if ( fabs(dt) < 1e-15 * ( 1. + t ) ) break;
+  }
+  return t;
+}
+static inline double FracInt_B(double x2,double y2,double z2,
+			       double a2,double b2,double c2,double tau){
+  // B = 1-x^2/(tau+a^2)-y^2/(tau+b^2)-z^2/(tau+c^2), >= 0 for tau >= lambda
+  double B= 1. - x2 / ( a2 + tau ) - y2 / ( b2 + tau ) - z2 / ( c2 + tau );
+  return ( B > 0. ) ? B : 0.;
+}
+// Integrals from lambda to infinity, evaluated using Gauss-Legendre
+// integration after changing variables to tau= lambda + a^2 (1/s^2-1)
+static double potInt(double x,double y,double z,
+		     double a2,double b2,double c2,double n,
+		     int glorder,double * glx,double * glw){
+  int ii;
+  double tau, jac, B;
+  double x2= x * x, y2= y * y, z2= z * z;
+  double lambda= lowerlim(x2,y2,z2,a2,b2,c2);
+  double out= 0.;
+  for (ii=0; ii < glorder; ii++){
+    tau= lambda + a2 * ( 1. / *(glx+ii) / *(glx+ii) - 1. );
+    jac= 2. * a2 / *(glx+ii) / *(glx+ii) / *(glx+ii);
+    B= FracInt_B(x2,y2,z2,a2,b2,c2,tau);
+    out+= *(glw+ii) * jac * pow(B,n+1.)
+      / sqrt( ( a2 + tau ) * ( b2 + tau ) * ( c2 + tau ) );
+  }
+  return out;
+}
+static void forceInt(double x,double y,double z,
+		     double a2,double b2,double c2,double n,
+		     int glorder,double * glx,double * glw,
+		     double * Ix,double * Iy,double * Iz){
+  int ii;
+  double tau, td, B;
+  double x2= x * x, y2= y * y, z2= z * z;
+  double lambda= lowerlim(x2,y2,z2,a2,b2,c2);
+  *Ix= 0.;
+  *Iy= 0.;
+  *Iz= 0.;
+  for (ii=0; ii < glorder; ii++){
+    tau= lambda + a2 * ( 1. / *(glx+ii) / *(glx+ii) - 1. );
+    B= FracInt_B(x2,y2,z2,a2,b2,c2,tau);
+    td= *(glw+ii) * 2. * a2 / *(glx+ii) / *(glx+ii) / *(glx+ii)
+      * pow(B,n) / sqrt( ( a2 + tau ) * ( b2 + tau ) * ( c2 + tau ) );
+    *Ix+= td * x / ( a2 + tau );
+    *Iy+= td * y / ( b2 + tau );
+    *Iz+= td * z / ( c2 + tau );
+  }
+}
+static void planar2ndDerivInt(double x,double y,
+			      double a2,double b2,double c2,double n,
+			      int glorder,double * glx,double * glw,
+			      double * Ixx,double * Ixy,double * Iyy){
+  // Integrals for the second derivatives in the z=0 plane
+  int ii;
+  double tau, td, tdm1, B, xa, yb;
+  double x2= x * x, y2= y * y;
+  double lambda= lowerlim(x2,y2,0.,a2,b2,c2);
+  *Ixx= 0.;
+  *Ixy= 0.;
+  *Iyy= 0.;
+  for (ii=0; ii < glorder; ii++){
+    tau= lambda + a2 * ( 1. / *(glx+ii) / *(glx+ii) - 1. );
+    B= FracInt_B(x2,y2,0.,a2,b2,c2,tau);
+    td= *(glw+ii) * 2. * a2 / *(glx+ii) / *(glx+ii) / *(glx+ii)
+      / sqrt( ( a2 + tau ) * ( b2 + tau ) * ( c2 + tau ) );
+    tdm1= td * n * pow(B,n-1.);
+    td*= pow(B,n);
+    xa= x / ( a2 + tau );
+    yb= y / ( b2 + tau );
+    *Ixx+= 4. * tdm1 * xa * xa - 2. * td / ( a2 + tau );
+    *Ixy+= 4. * tdm1 * xa * yb;
+    *Iyy+= 4. * tdm1 * yb * yb - 2. * td / ( b2 + tau );
+  }
+}
+double FerrersPotentialEval(double R,double z, double phi,
+			    double t,
+			    struct potentialArg * potentialArgs){
+  double * args= potentialArgs->args;
+  //Get args
+  double amp= *args;
+  double a2= *(args+1);
+  double b2= *(args+2);
+  double c2= *(args+3);
+  double n= *(args+4);
+  double prefac= *(args+5);
+  double omegab= *(args+6);
+  double pa= *(args+7);
+  int glorder= (int) *(args+8);
+  double * glx= args+22;
+  double * glw= args+22+glorder;
+  double x,y;
+  //Calculate potential
+  cyl_to_rect(R,phi-pa-omegab*t,&x,&y);
+  return -amp * prefac / ( n + 1. ) * potInt(x,y,z,a2,b2,c2,n,
+					     glorder,glx,glw);
+}
+static void FerrersPotentialxyzforces(double R,double z,double phi,double t,
+				      double * args){
+  double a2= *(args+1);
+  double b2= *(args+2);
+  double c2= *(args+3);
+  double n= *(args+4);
+  double prefac= *(args+5);
+  double omegab= *(args+6);
+  double pa= *(args+7);
+  int glorder= (int) *(args+8);
+  double * glx= args+22;
+  double * glw= args+22+glorder;
+  double * cache= args+9;
+  double x,y;
+  double Fx, Fy, Fz;
+  double cp, sp;
+  if ( R != *cache || z != *(cache+1) || phi != *(cache+2)
+       || t != *(cache+3) ) {
+    // Set up cache
+    *cache= R;
+    *(cache+1)= z;
+    *(cache+2)= phi;
+    *(cache+3)= t;
+    // Compute forces in rectangular, aligned frame
+    cyl_to_rect(R,phi-pa-omegab*t,&x,&y);
+    forceInt(x,y,z,a2,b2,c2,n,glorder,glx,glw,&Fx,&Fy,&Fz);
+    Fx*= -2. * prefac;
+    Fy*= -2. * prefac;
+    Fz*= -2. * prefac;
+    // Rotate to rectangular, correct frame
+    cp= cos ( pa + omegab * t );
+    sp= sin ( pa + omegab * t );
+    *(cache+4)= cp * Fx - sp * Fy;
+    *(cache+5)= sp * Fx + cp * Fy;
+    *(cache+6)= Fz;
+  }
+}
+double FerrersPotentialRforce(double R,double z, double phi,
+			      double t,
+			      struct potentialArg * potentialArgs){
+  double * args= potentialArgs->args;
+  double amp= *args;
+  FerrersPotentialxyzforces(R,z,phi,t,args);
+  return amp * ( cos ( phi ) * *(args + 13) + sin( phi ) * *(args + 14) );
+}
+double FerrersPotentialPlanarRforce(double R,double phi,double t,
+				    struct potentialArg * potentialArgs){
+  return FerrersPotentialRforce(R,0.,phi,t,potentialArgs);
+}
+double FerrersPotentialphiforce(double R,double z, double phi,
+				double t,
+				struct potentialArg * potentialArgs){
+  double * args= potentialArgs->args;
+  double amp= *args;
+  FerrersPotentialxyzforces(R,z,phi,t,args);
+  return amp * R * ( -sin ( phi ) * *(args + 13)
+		     + cos( phi ) * *(args + 14) );
+}
+double FerrersPotentialPlanarphiforce(double R,double phi,double t,
+				      struct potentialArg * potentialArgs){
+  return FerrersPotentialphiforce(R,0.,phi,t,potentialArgs);
+}
+double FerrersPotentialzforce(double R,double z, double phi,
+			      double t,
+			      struct potentialArg * potentialArgs){
+  double * args= potentialArgs->args;
+  double amp= *args;
+  FerrersPotentialxyzforces(R,z,phi,t,args);
+  return amp * *(args + 15);
+}
+static void FerrersPotentialPlanar2ndderivs(double R,double phi,double t,
+					    double * args){
+  double a2= *(args+1);
+  double b2= *(args+2);
+  double c2= *(args+3);
+  double n= *(args+4);
+  double prefac= *(args+5);
+  double omegab= *(args+6);
+  double pa= *(args+7);
+  int glorder= (int) *(args+8);
+  double * glx= args+22;
+  double * glw= args+22+glorder;
+  double * cache= args+16;
+  double x,y;
+  double phixxa, phixya, phiyya;
+  double cp, sp;
+  if ( R != *cache || phi != *(cache+1) || t != *(cache+2) ) {
+    // Set up cache
+    *cache= R;
+    *(cache+1)= phi;
+    *(cache+2)= t;
+    // Compute second derivatives in rectangular, aligned frame
+    cyl_to_rect(R,phi-pa-omegab*t,&x,&y);
+    planar2ndDerivInt(x,y,a2,b2,c2,n,glorder,glx,glw,
+		      &phixxa,&phixya,&phiyya);
+    phixxa*= -prefac;
+    phixya*= -prefac;
+    phiyya*= -prefac;
+    // Rotate to rectangular, correct frame
+    cp= cos ( pa + omegab * t );
+    sp= sin ( pa + omegab * t );
+    *(cache+3)= cp * cp * phixxa - 2. * cp * sp * phixya + sp * sp * phiyya;
+    *(cache+4)= ( cp * cp - sp * sp ) * phixya + cp * sp * ( phixxa - phiyya );
+    *(cache+5)= sp * sp * phixxa + 2. * cp * sp * phixya + cp * cp * phiyya;
+  }
+}
+double FerrersPotentialPlanarR2deriv(double R,double phi,double t,
+				     struct potentialArg * potentialArgs){
+  double * args= potentialArgs->args;
+  double amp= *args;
+  double cosphi= cos ( phi );
+  double sinphi= sin ( phi );
+  FerrersPotentialPlanar2ndderivs(R,phi,t,args);
+  return amp * ( cosphi * cosphi * *(args + 19)
+		 + 2. * cosphi * sinphi * *(args + 20)
+		 + sinphi * sinphi * *(args + 21) );
+}
+double FerrersPotentialPlanarphi2deriv(double R,double phi,double t,
+				       struct potentialArg * potentialArgs){
+  double * args= potentialArgs->args;
+  double amp= *args;
+  double cosphi= cos ( phi );
+  double sinphi= sin ( phi );
+  FerrersPotentialxyzforces(R,0.,phi,t,args);
+  FerrersPotentialPlanar2ndderivs(R,phi,t,args);
+  return amp * ( R * R * ( sinphi * sinphi * *(args + 19)
+			   - 2. * cosphi * sinphi * *(args + 20)
+			   + cosphi * cosphi * *(args + 21) )
+		 + R * ( cosphi * *(args + 13) + sinphi * *(args + 14) ) );
+}
+double FerrersPotentialPlanarRphideriv(double R,double phi,double t,
+				       struct potentialArg * potentialArgs){
+  double * args= potentialArgs->args;
+  double amp= *args;
+  double cosphi= cos ( phi );
+  double sinphi= sin ( phi );
+  FerrersPotentialxyzforces(R,0.,phi,t,args);
+  FerrersPotentialPlanar2ndderivs(R,phi,t,args);
+  return amp * ( R * cosphi * sinphi * ( *(args + 21) - *(args + 19) )
+		 + R * ( cosphi * cosphi - sinphi * sinphi ) * *(args + 20)
+		 + sinphi * *(args + 13) - cosphi * *(args + 14) );
+}
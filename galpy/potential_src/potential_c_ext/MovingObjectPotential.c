@@ -0,0 +1,109 @@
+#include <math.h>
+#include <galpy_potentials.h>
+//MovingObjectPotential with Plummer softening
+//9 + 13 x nint arguments: amp, softening_length, nint, 4 caching slots for the
+//time and the object's x, y, and z at that time, the index of the last
+//interval used, nint+1 breakpoints in time, and 4 x nint coefficients of
+//the piecewise-cubic polynomials in time for each of x, y, and z
+//Outside of the time range of the breakpoints, the object's position (and
+//therefore the potential and forces) is NaN rather than extrapolated
+static void MovingObjectPotentialxyz(double t,double * args){
+  double * cache= args+3;
+  int nint= (int) *(args+2);
+  int ii= (int) *(args+7);
+  int lo, hi, mid;
+  double * tbreak= args+8;
+  double * cx= args+9+nint;
+  double * cy= cx + 4 * nint;
+  double * cz= cy + 4 * nint;
+  double dt;
+  double ttol;
+  if ( t == *cache ) return;
+  ttol= 1e-10 * ( *(tbreak+nint) - *tbreak );
+  if ( t < *tbreak - ttol || t > *(tbreak+nint) + ttol ) {
+    *cache= t;
+    *(cache+1)= NAN;
+    *(cache+2)= NAN;
+    *(cache+3)= NAN;
+    return;
+  }
+  // Consecutive calls are typically in the same interval, otherwise bisect;
+  // the first and last intervals are used for times within the tolerance
+  // at either end
+  if ( ( ii > 0 && t < *(tbreak+ii) )
+       || ( ii < nint - 1 && t >= *(tbreak+ii+1) ) ) {
+    lo= 0;
+    hi= nint;
+    while ( hi - lo > 1 ) {
+      mid= ( lo + hi ) / 2;
+      if ( t >= *(tbreak+mid) ) lo= mid;
+      else hi= mid;
+    }
+    ii= lo;
+    *(args+7)= (double) ii;
+  }
+  dt= t - *(tbreak+ii);
+  cx+= 4 * ii;
+  cy+= 4 * ii;
+  cz+= 4 * ii;
+  *cache= t;
+  *(cache+1)= ( ( *cx * dt + *(cx+1) ) * dt + *(cx+2) ) * dt + *(cx+3);
+  *(cache+2)= ( ( *cy * dt + *(cy+1) ) * dt + *(cy+2) ) * dt + *(cy+3);
+  *(cache+3)= ( ( *cz * dt + *(cz+1) ) * dt + *(cz+2) ) * dt + *(cz+3);
+}
+static double MovingObjectPotentialDiff(double R,double z,double phi,double t,
+					double * args,
+					double * xd,double * yd,double * zd){
+  // Returns amp / (d^2+softening_length^2)^1.5, with d the distance to the
+  // object, and sets the difference vector object - (R,z,phi)
+  double x, y, d2;
+  double eps= *(args+1);
+  MovingObjectPotentialxyz(t,args);
+  cyl_to_rect(R,phi,&x,&y);
+  *xd= *(args+4) - x;
+  *yd= *(args+5) - y;
+  *zd= *(args+6) - z;
+  d2= *xd * *xd + *yd * *yd + *zd * *zd + eps * eps;
+  return *args / d2 / sqrt(d2);
+}
+double MovingObjectPotentialEval(double R,double z,double phi,double t,
+				 struct potentialArg * potentialArgs){
+  double * args= potentialArgs->args;
+  double x, y, d2;
+  double eps= *(args+1);
+  MovingObjectPotentialxyz(t,args);
+  cyl_to_rect(R,phi,&x,&y);
+  d2= ( *(args+4) - x ) * ( *(args+4) - x )
+    + ( *(args+5) - y ) * ( *(args+5) - y )
+    + ( *(args+6) - z ) * ( *(args+6) - z ) + eps * eps;
+  return - *args / sqrt(d2);
+}
+double MovingObjectPotentialRforce(double R,double z,double phi,double t,
+				   struct potentialArg * potentialArgs){
+  double xd, yd, zd;
+  double fac= MovingObjectPotentialDiff(R,z,phi,t,potentialArgs->args,
+					&xd,&yd,&zd);
+  return fac * ( cos ( phi ) * xd + sin ( phi ) * yd );
+}
+double MovingObjectPotentialzforce(double R,double z,double phi,double t,
+				   struct potentialArg * potentialArgs){
+  double xd, yd, zd;
+  double fac= MovingObjectPotentialDiff(R,z,phi,t,potentialArgs->args,
+					&xd,&yd,&zd);
+  return fac * zd;
+}
+double MovingObjectPotentialphiforce(double R,double z,double phi,double t,
+				     struct potentialArg * potentialArgs){
+  double xd, yd, zd;
+  double fac= MovingObjectPotentialDiff(R,z,phi,t,potentialArgs->args,
+					&xd,&yd,&zd);
+  return fac * R * ( cos ( phi ) * yd - sin ( phi ) * xd );
+}
+double MovingObjectPotentialPlanarRforce(double R,double phi,double t,
+					 struct potentialArg * potentialArgs){
+  return MovingObjectPotentialRforce(R,0.,phi,t,potentialArgs);
+}
+double MovingObjectPotentialPlanarphiforce(double R,double phi,double t,
+					   struct potentialArg * potentialArgs){
+  return MovingObjectPotentialphiforce(R,0.,phi,t,potentialArgs);
+}
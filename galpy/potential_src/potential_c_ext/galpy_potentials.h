@@ -8,6 +8,20 @@
 extern "C" {
 #endif
 #include <interp_2d.h>
+/*
+  Macro for dealing with potentially unused variables due to OpenMP
+ */
+/* If we're not using GNU C, elide __attribute__ if it doesn't exist*/
+#ifndef __has_attribute      // Compatibility with non-clang compilers. 
+#define __has_attribute(x) 0  
+#endif
+#ifndef UNUSED
+#if defined(__GNUC__) || __has_attribute(unused)
+#  define UNUSED __attribute__((unused))
+#else
+#  define UNUSED /*NOTHING*/
+#endif
+#endif
 struct potentialArg{
   double (*potentialEval)(double R, double Z, double phi, double t,
 			  struct potentialArg *);
@@ -414,6 +428,52 @@ double SpiralArmsPotentialPlanarphi2deriv(double, double, double,
 double SpiralArmsPotentialPlanarRphideriv(double, double, double,
                             struct potentialArg*);
 
+//interp3DPotential
+double interp3DPotentialEval(double,double,double,double,
+			     struct potentialArg *);
+double interp3DPotentialRforce(double,double,double,double,
+			       struct potentialArg *);
+double interp3DPotentialzforce(double,double,double,double,
+			       struct potentialArg *);
+double interp3DPotentialphiforce(double,double,double,double,
+				 struct potentialArg *);
+double interp3DPotentialPlanarRforce(double,double,double,
+				     struct potentialArg *);
+double interp3DPotentialPlanarphiforce(double,double,double,
+				       struct potentialArg *);
+//FerrersPotential
+double FerrersPotentialEval(double,double,double,double,
+			    struct potentialArg *);
+double FerrersPotentialRforce(double,double,double,double,
+			      struct potentialArg *);
+double FerrersPotentialzforce(double,double,double,double,
+			      struct potentialArg *);
+double FerrersPotentialphiforce(double,double,double,double,
+				struct potentialArg *);
+double FerrersPotentialPlanarRforce(double,double,double,
+				    struct potentialArg *);
+double FerrersPotentialPlanarphiforce(double,double,double,
+				      struct potentialArg *);
+double FerrersPotentialPlanarR2deriv(double,double,double,
+				     struct potentialArg *);
+double FerrersPotentialPlanarphi2deriv(double,double,double,
+				       struct potentialArg *);
+double FerrersPotentialPlanarRphideriv(double,double,double,
+				       struct potentialArg *);
+//MovingObjectPotential
+double MovingObjectPotentialEval(double,double,double,double,
+				 struct potentialArg *);
+double MovingObjectPotentialRforce(double,double,double,double,
+				   struct potentialArg *);
+double MovingObjectPotentialzforce(double,double,double,double,
+				   struct potentialArg *);
+double MovingObjectPotentialphiforce(double,double,double,double,
+				     struct potentialArg *);
+double MovingObjectPotentialPlanarRforce(double,double,double,
+					 struct potentialArg *);
+double MovingObjectPotentialPlanarphiforce(double,double,double,
+					   struct potentialArg *);
+
 //////////////////////////////// WRAPPERS /////////////////////////////////////
 //DehnenSmoothWrapperPotential
 double DehnenSmoothWrapperPotentialEval(double,double,double,double,
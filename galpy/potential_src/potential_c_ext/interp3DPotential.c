@@ -0,0 +1,167 @@
+#include <math.h>
+#include <galpy_potentials.h>
+#ifndef M_PI
+#define M_PI 3.14159265358979323846
+#endif
+//interp3DPotential: potential interpolated in (R,z,phi) with cubic B-splines
+//18 + nR * nz * nphi arguments: amp, logR, zsym, omegab, nR, nz, nphi,
+//x0, dx, z0, dz, 7 caching slots, spline coefficients [R][z][phi]
+static inline void cubic_bspline_weights(double w,double * wt,double * dwt){
+  // Weights of the coefficients at floor(x) + {-1,0,1,2} and their
+  // derivatives with respect to w= x - floor(x)
+  wt[3]= w * w * w / 6.;
+  wt[0]= 1. / 6. + 0.5 * w * ( w - 1. ) - wt[3];
+  wt[2]= w + wt[0] - 2. * wt[3];
+  wt[1]= 1. - wt[0] - wt[2] - wt[3];
+  dwt[3]= 0.5 * w * w;
+  dwt[0]= -0.5 * ( 1. - w ) * ( 1. - w );
+  dwt[2]= 0.5 + w - 1.5 * w * w;
+  dwt[1]= 1.5 * w * w - 2. * w;
+}
+static inline long mirror_index(long k,long n){
+  // Mirror boundary conditions, as for the 2D interpolation
+  long n2= 2L * n - 2L;
+  if ( n == 1L ) return 0L;
+  k= ( k < 0L ) ? ( -k - n2 * ( ( -k ) / n2 ) ) : ( k - n2 * ( k / n2 ) );
+  return ( n <= k ) ? n2 - k : k;
+}
+static inline void grid_position(double x,double x0,double dx,long n,
+				 long * indx,double * w){
+  // Position on a uniform grid, clamped to the grid
+  double xn= ( x - x0 ) / dx;
+  long k;
+  if ( xn < 0. ) xn= 0.;
+  if ( xn > n - 1 ) xn= n - 1;
+  k= (long) floor(xn);
+  *w= xn - k;
+  indx[0]= mirror_index(k-1,n);
+  indx[1]= mirror_index(k,n);
+  indx[2]= mirror_index(k+1,n);
+  indx[3]= mirror_index(k+2,n);
+}
+static void interp3D_eval(double R,double z,double phi,double t,
+			  double * args,int deriv,double * out){
+  // deriv == 0: out[0] = Phi/amp; deriv == 1: out[0:3] = dPhi/d(R,z,phi)/amp
+  int logR= (int) args[1];
+  int zsym= (int) args[2];
+  double omegab= args[3];
+  long nR= (long) args[4];
+  long nz= (long) args[5];
+  long nphi= (long) args[6];
+  double x0= args[7];
+  double dx= args[8];
+  double z0= args[9];
+  double dz= args[10];
+  double * coeffs= args+18;
+  double x, zz, pn, wx, wz, wp;
+  long ix[4], iz[4], ip[4], kp;
+  double wtx[4], dwtx[4], wtz[4], dwtz[4], wtp[4], dwtp[4];
+  double c, cx, cz, val= 0., dval_dx= 0., dval_dz= 0., dval_dp= 0.;
+  int ii, jj, kk;
+  double * cR, * cRz;
+  if ( logR == 1 )
+    x= ( R > 0. ) ? log(R): -20.72326583694641;
+  else
+    x= R;
+  zz= ( zsym == 1 ) ? fabs(z) : z;
+  grid_position(x,x0,dx,nR,ix,&wx);
+  grid_position(zz,z0,dz,nz,iz,&wz);
+  // Periodic in phi
+  pn= ( phi - omegab * t ) / 2. / M_PI * nphi;
+  kp= (long) floor(pn);
+  wp= pn - kp;
+  for (ii=0; ii < 4; ii++){
+    ip[ii]= ( kp - 1 + ii ) % nphi;
+    if ( ip[ii] < 0 ) ip[ii]+= nphi;
+  }
+  cubic_bspline_weights(wx,wtx,dwtx);
+  cubic_bspline_weights(wz,wtz,dwtz);
+  cubic_bspline_weights(wp,wtp,dwtp);
+  for (ii=0; ii < 4; ii++){
+    cR= coeffs + ix[ii] * nz * nphi;
+    for (jj=0; jj < 4; jj++){
+      cRz= cR + iz[jj] * nphi;
+      c= 0.;
+      cx= 0.;
+      for (kk=0; kk < 4; kk++){
+	c+= *(cRz + ip[kk]) * wtp[kk];
+	if ( deriv == 1 )
+	  cx+= *(cRz + ip[kk]) * dwtp[kk];
+      }
+      if ( deriv == 0 )
+	val+= c * wtx[ii] * wtz[jj];
+      else {
+	cz= c * wtx[ii];
+	dval_dx+= c * dwtx[ii] * wtz[jj];
+	dval_dz+= cz * dwtz[jj];
+	dval_dp+= cx * wtx[ii] * wtz[jj];
+      }
+    }
+  }
+  if ( deriv == 0 ) {
+    *out= val;
+    return;
+  }
+  // Chain rule back to (R,z,phi)
+  *out= dval_dx / dx;
+  if ( logR == 1 )
+    *out/= R;
+  *(out+1)= dval_dz / dz;
+  if ( zsym == 1 && z < 0. )
+    *(out+1)*= -1.;
+  *(out+2)= dval_dp / 2. / M_PI * nphi;
+}
+static inline void interp3D_deriv_cached(double R,double z,double phi,
+					 double t,double * args){
+  // Caching slots: R, z, phi, t, dPhi/dR, dPhi/dz, dPhi/dphi
+  double * cache= args+11;
+  if ( R != *cache || z != *(cache+1) || phi != *(cache+2)
+       || t != *(cache+3) ) {
+    *cache= R;
+    *(cache+1)= z;
+    *(cache+2)= phi;
+    *(cache+3)= t;
+    interp3D_eval(R,z,phi,t,args,1,cache+4);
+  }
+}
+double interp3DPotentialEval(double R,double z, double phi,
+			     double t,
+			     struct potentialArg * potentialArgs){
+  double * args= potentialArgs->args;
+  double amp= *args;
+  double out;
+  interp3D_eval(R,z,phi,t,args,0,&out);
+  return amp * out;
+}
+double interp3DPotentialRforce(double R,double z, double phi,
+			       double t,
+			       struct potentialArg * potentialArgs){
+  double * args= potentialArgs->args;
+  double amp= *args;
+  interp3D_deriv_cached(R,z,phi,t,args);
+  return -amp * *(args+15);
+}
+double interp3DPotentialzforce(double R,double z, double phi,
+			       double t,
+			       struct potentialArg * potentialArgs){
+  double * args= potentialArgs->args;
+  double amp= *args;
+  interp3D_deriv_cached(R,z,phi,t,args);
+  return -amp * *(args+16);
+}
+double interp3DPotentialphiforce(double R,double z, double phi,
+				 double t,
+				 struct potentialArg * potentialArgs){
+  double * args= potentialArgs->args;
+  double amp= *args;
+  interp3D_deriv_cached(R,z,phi,t,args);
+  return -amp * *(args+17);
+}
+double interp3DPotentialPlanarRforce(double R,double phi,double t,
+				     struct potentialArg * potentialArgs){
+  return interp3DPotentialRforce(R,0.,phi,t,potentialArgs);
+}
+double interp3DPotentialPlanarphiforce(double R,double phi,double t,
+				       struct potentialArg * potentialArgs){
+  return interp3DPotentialphiforce(R,0.,phi,t,potentialArgs);
+}
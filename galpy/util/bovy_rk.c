@@ -39,6 +39,12 @@ POSSIBILITY OF SUCH DAMAGE.
 #define _MIN_STEPCHANGE_POWERTWO -3.
 #define _MAX_STEPREDUCE 10000.
 #define _MAX_DT_REDUCE 10000.
+static inline void save_dense_hermite(void (*func)(double t, double *y, double *a,int nargs, struct potentialArg *),
+				      int, double *, double *,
+				      double, double,
+				      int, struct potentialArg *,
+				      double *, double *,
+				      struct denseOutput *);
 /*
 Runge-Kutta 4 integrator
 Usage:
@@ -61,7 +67,7 @@ Usage:
        double rtol, double atol: relative and absolute tolerance levels desired
   Output:
        double *result: result (nt blocks of size 2dim)
-       int *err: error: -10 if interrupted by CTRL-C (SIGINT)
+       int *err: error: -10 if interrupted by CTRL-C (SIGINT; the caller needs to install handle_sigint and reset interrupted afterwards)
 */
 void bovy_rk4(void (*func)(double t, double *q, double *a,
 			   int nargs, struct potentialArg * potentialArgs),
@@ -71,11 +77,31 @@ void bovy_rk4(void (*func)(double t, double *q, double *a,
 	      int nargs, struct potentialArg * potentialArgs,
 	      double rtol, double atol,
 	      double *result, int * err){
+  bovy_rk4_dense(func,dim,yo,nt,dt,t,nargs,potentialArgs,rtol,atol,
+		 result,err,NULL);
+}
+/*
+  RK4 integrator with dense output, same calling sequence as RK4, but with
+  an additional argument
+       struct denseOutput * dense: if not NULL, the cubic Hermite
+                                   interpolant of each step is stored here
+                                   and events are detected
+*/
+void bovy_rk4_dense(void (*func)(double t, double *q, double *a,
+				 int nargs, struct potentialArg * potentialArgs),
+		    int dim,
+		    double * yo,
+		    int nt, double dt, double *t,
+		    int nargs, struct potentialArg * potentialArgs,
+		    double rtol, double atol,
+		    double *result, int * err,
+		    struct denseOutput * dense){
   //Declare and initialize
   double *yn= (double *) malloc ( dim * sizeof(double) );
   double *yn1= (double *) malloc ( dim * sizeof(double) );
   double *ynk= (double *) malloc ( dim * sizeof(double) );
   double *a= (double *) malloc ( dim * sizeof(double) );
+  double *f0= NULL, *f1= NULL;
   int ii, jj, kk;
   save_rk(dim,yo,result);
   result+= dim;
@@ -91,24 +117,30 @@ void bovy_rk4(void (*func)(double t, double *q, double *a,
   long ndt= (long) (init_dt/dt);
   //Integrate the system
   double to= *t;
-  // Handle KeyboardInterrupt gracefully
-  struct sigaction action;
-  memset(&action, 0, sizeof(struct sigaction));
-  action.sa_handler= handle_sigint;
-  sigaction(SIGINT,&action,NULL);
+  if ( dense ) {
+    f0= (double *) malloc ( dim * sizeof(double) );
+    f1= (double *) malloc ( dim * sizeof(double) );
+    dense->nsteps= 0;
+    func(to,yn,f0,nargs,potentialArgs);
+  }
   for (ii=0; ii < (nt-1); ii++){
     if ( interrupted ) {
       *err= -10;
-      interrupted= 0; // need to reset, bc library and vars stay in memory
       break;
     }
     for (jj=0; jj < (ndt-1); jj++) {
       bovy_rk4_onestep(func,dim,yn,yn1,to,dt,nargs,potentialArgs,ynk,a);
+      if ( dense )
+	save_dense_hermite(func,dim,yn,yn1,to,dt,nargs,potentialArgs,
+			   f0,f1,dense);
       to+= dt;
       //reset yn
       for (kk=0; kk < dim; kk++) *(yn+kk)= *(yn1+kk);
     }
     bovy_rk4_onestep(func,dim,yn,yn1,to,dt,nargs,potentialArgs,ynk,a);
+    if ( dense )
+      save_dense_hermite(func,dim,yn,yn1,to,dt,nargs,potentialArgs,
+			 f0,f1,dense);
     to+= dt;
     //save
     save_rk(dim,yn1,result);
@@ -116,14 +148,15 @@ void bovy_rk4(void (*func)(double t, double *q, double *a,
     //reset yn
     for (kk=0; kk < dim; kk++) *(yn+kk)= *(yn1+kk);
   }
-  // Back to default handler
-  action.sa_handler= SIG_DFL;
-  sigaction(SIGINT,&action,NULL);
   //Free allocated memory
   free(yn);
   free(yn1);
   free(ynk);
   free(a);
+  if ( dense ) {
+    free(f0);
+    free(f1);
+  }
   //We're done
 }
 
@@ -164,6 +197,21 @@ void bovy_rk6(void (*func)(double t, double *q, double *a,
 	      int nargs, struct potentialArg * potentialArgs,
 	      double rtol, double atol,
 	      double *result, int * err){
+  bovy_rk6_dense(func,dim,yo,nt,dt,t,nargs,potentialArgs,rtol,atol,
+		 result,err,NULL);
+}
+/*
+  RK6 integrator with dense output, same calling sequence as RK4_DENSE
+*/
+void bovy_rk6_dense(void (*func)(double t, double *q, double *a,
+				 int nargs, struct potentialArg * potentialArgs),
+		    int dim,
+		    double * yo,
+		    int nt, double dt, double *t,
+		    int nargs, struct potentialArg * potentialArgs,
+		    double rtol, double atol,
+		    double *result, int * err,
+		    struct denseOutput * dense){
   //Declare and initialize
   double *yn= (double *) malloc ( dim * sizeof(double) );
   double *yn1= (double *) malloc ( dim * sizeof(double) );
@@ -174,6 +222,7 @@ void bovy_rk6(void (*func)(double t, double *q, double *a,
   double *k3= (double *) malloc ( dim * sizeof(double) );
   double *k4= (double *) malloc ( dim * sizeof(double) );
   double *k5= (double *) malloc ( dim * sizeof(double) );
+  double *f0= NULL, *f1= NULL;
   int ii, jj, kk;
   save_rk(dim,yo,result);
   result+= dim;
@@ -189,26 +238,32 @@ void bovy_rk6(void (*func)(double t, double *q, double *a,
   long ndt= (long) (init_dt/dt);
   //Integrate the system
   double to= *t;
-  // Handle KeyboardInterrupt gracefully
-  struct sigaction action;
-  memset(&action, 0, sizeof(struct sigaction));
-  action.sa_handler= handle_sigint;
-  sigaction(SIGINT,&action,NULL);
+  if ( dense ) {
+    f0= (double *) malloc ( dim * sizeof(double) );
+    f1= (double *) malloc ( dim * sizeof(double) );
+    dense->nsteps= 0;
+    func(to,yn,f0,nargs,potentialArgs);
+  }
   for (ii=0; ii < (nt-1); ii++){
     if ( interrupted ) {
       *err= -10;
-      interrupted= 0; // need to reset, bc library and vars stay in memory
       break;
     }
     for (jj=0; jj < (ndt-1); jj++) {
       bovy_rk6_onestep(func,dim,yn,yn1,to,dt,nargs,potentialArgs,ynk,a,
 		       k1,k2,k3,k4,k5);
+      if ( dense )
+	save_dense_hermite(func,dim,yn,yn1,to,dt,nargs,potentialArgs,
+			   f0,f1,dense);
       to+= dt;
       //reset yn
       for (kk=0; kk < dim; kk++) *(yn+kk)= *(yn1+kk);
     }
     bovy_rk6_onestep(func,dim,yn,yn1,to,dt,nargs,potentialArgs,ynk,a,
 		     k1,k2,k3,k4,k5);
+    if ( dense )
+      save_dense_hermite(func,dim,yn,yn1,to,dt,nargs,potentialArgs,
+			 f0,f1,dense);
     to+= dt;
     //save
     save_rk(dim,yn1,result);
@@ -216,9 +271,6 @@ void bovy_rk6(void (*func)(double t, double *q, double *a,
     //reset yn
     for (kk=0; kk < dim; kk++) *(yn+kk)= *(yn1+kk);
   }
-  // Back to default handler
-  action.sa_handler= SIG_DFL;
-  sigaction(SIGINT,&action,NULL);
   //Free allocated memory
   free(yn);
   free(yn1);
@@ -229,6 +281,10 @@ void bovy_rk6(void (*func)(double t, double *q, double *a,
   free(k3);
   free(k4);
   free(k5);
+  if ( dense ) {
+    free(f0);
+    free(f1);
+  }
   //We're done
 }
 /* RK6 SOLVER: needs 7 function evaluations per step
@@ -301,6 +357,19 @@ void bovy_rk6_onestep(void (*func)(double t, double *q, double *a,
   //yn1 is new value
 }
 
+//Cubic Hermite dense output for the fixed-step integrators, f0 has the derivative at the start of the step and is updated to that at the end
+static inline void save_dense_hermite(void (*func)(double t, double *y, double *a,int nargs, struct potentialArg *),
+				      int dim, double * yn, double * yn1,
+				      double to, double dt,
+				      int nargs,
+				      struct potentialArg * potentialArgs,
+				      double * f0, double * f1,
+				      struct denseOutput * dense){
+  int ii;
+  func(to+dt,yn1,f1,nargs,potentialArgs);
+  save_dense(dim,to,dt,yn,yn1,f0,f1,NULL,dense);
+  for (ii=0; ii < dim; ii++) *(f0+ii)= *(f1+ii);
+}
 double rk4_estimate_step(void (*func)(double t, double *y, double *a,int nargs, struct potentialArg *),
 			 int dim, double *yo,
 			 double dt, double *t,
@@ -472,7 +541,7 @@ Usage:
        double rtol, double atol: relative and absolute tolerance levels desired
   Output:
        double *result: result (nt blocks of size 2dim)
-       int * err: if non-zero, something bad happened (1: maximum step reduction happened; -10: interrupted by CTRL-C (SIGINT)
+       int * err: if non-zero, something bad happened (1: maximum step reduction happened; -10: interrupted by CTRL-C (SIGINT; the caller needs to install handle_sigint and reset interrupted afterwards)
 */
 void bovy_dopr54(void (*func)(double t, double *q, double *a,
 			      int nargs, struct potentialArg * potentialArgs),
@@ -482,6 +551,25 @@ void bovy_dopr54(void (*func)(double t, double *q, double *a,
 		 int nargs, struct potentialArg * potentialArgs,
 		 double rtol, double atol,
 		 double *result, int * err){
+  bovy_dopr54_dense(func,dim,yo,nt,dt_one,t,nargs,potentialArgs,rtol,atol,
+		    result,err,NULL);
+}
+/*
+  Dormand-Prince 5/4 integrator with dense output, same calling sequence as
+  DOPR54, but with an additional argument
+       struct denseOutput * dense: if not NULL, the 4th order continuous
+                                   extension of each accepted step is
+                                   stored here and events are detected
+*/
+void bovy_dopr54_dense(void (*func)(double t, double *q, double *a,
+				    int nargs, struct potentialArg * potentialArgs),
+		       int dim,
+		       double * yo,
+		       int nt, double dt_one, double *t,
+		       int nargs, struct potentialArg * potentialArgs,
+		       double rtol, double atol,
+		       double *result, int * err,
+		       struct denseOutput * dense){
   //Declare and initialize
   double *a= (double *) malloc ( dim * sizeof(double) );
   double *a1= (double *) malloc ( dim * sizeof(double) );
@@ -509,27 +597,19 @@ void bovy_dopr54(void (*func)(double t, double *q, double *a,
   double to= *t;
   //set up a1
   func(to,yn,a1,nargs,potentialArgs);
-  // Handle KeyboardInterrupt gracefully
-  struct sigaction action;
-  memset(&action, 0, sizeof(struct sigaction));
-  action.sa_handler= handle_sigint;
-  sigaction(SIGINT,&action,NULL);
+  if ( dense ) dense->nsteps= 0;
   for (ii=0; ii < (nt-1); ii++){
     if ( interrupted ) {
       *err= -10;
-      interrupted= 0; // need to reset, bc library and vars stay in memory
       break;
     }
     bovy_dopr54_onestep(func,dim,yn,dt,&to,&dt_one,
 			nargs,potentialArgs,rtol,atol,
-			a1,a,k1,k2,k3,k4,k5,k6,yn1,yerr,ynk,err);
+			a1,a,k1,k2,k3,k4,k5,k6,yn1,yerr,ynk,err,dense);
     //save
     save_rk(dim,yn,result);
     result+= dim;
   }
-  // Back to default handler
-  action.sa_handler= SIG_DFL;
-  sigaction(SIGINT,&action,NULL);
   // Free allocated memory
   free(a);
   free(a1);
@@ -554,7 +634,8 @@ void bovy_dopr54_onestep(void (*func)(double t, double *y, double *a,int nargs,
 			 double * k1, double * k2,
 			 double * k3, double * k4,
 			 double * k5, double * k6,
-			 double * yn1, double * yerr,double * ynk, int * err){
+			 double * yn1, double * yerr,double * ynk, int * err,
+			 struct denseOutput * dense){
   double init_dt_one= *dt_one;
   double init_to= *to;
   unsigned char accept;
@@ -575,7 +656,7 @@ void bovy_dopr54_onestep(void (*func)(double t, double *y, double *a,int nargs,
     *dt_one= bovy_dopr54_actualstep(func,dim,yo,*dt_one,to,nargs,potentialArgs,
 				    rtol,atol,
 				    a1,a,k1,k2,k3,k4,k5,k6,yn1,yerr,ynk,
-				    accept);
+				    accept,dense);
   }
 }
 double bovy_dopr54_actualstep(void (*func)(double t, double *y, double *a,int nargs, struct potentialArg *),
@@ -588,7 +669,8 @@ double bovy_dopr54_actualstep(void (*func)(double t, double *y, double *a,int na
 			      double * k3, double * k4,
 			      double * k5, double * k6,
 			      double * yn1, double * yerr,double * ynk,
-			      unsigned char accept){
+			      unsigned char accept,
+			      struct denseOutput * dense){
   //constant
   static const double c2= 0.2;
   static const double c3= 0.3;
@@ -626,6 +708,13 @@ double bovy_dopr54_actualstep(void (*func)(double t, double *y, double *a,int na
   const double be5= b5+92097./339200.;
   const double be6= b6-187./2100.;
   static const double be7= -1./40.;
+  //coefficients of the continuous extension (Hairer, Norsett, & Wanner)
+  static const double d1= -12715105075./11282082432.;
+  static const double d3= 87487479700./32700410799.;
+  static const double d4= -10690763975./1880347072.;
+  static const double d5= 701980252875./199316789632.;
+  static const double d6= -1453857185./822651844.;
+  static const double d7= 69997945./29380423.;
   int ii;
   //setup yn1
   for (ii=0; ii < dim; ii++) *(yn1+ii) = *(yo+ii);
@@ -713,6 +802,13 @@ double bovy_dopr54_actualstep(void (*func)(double t, double *y, double *a,int na
   //accept or reject
   double dt_one;
   if ( ( powertwo >= 0. ) || accept ) {//accept, if the step is the smallest possible, always accept
+    if ( dense ) {
+      //a has the derivative at the end of the step, re-use ynk for r5
+      for (ii= 0; ii < dim; ii++)
+	*(ynk+ii)= d1 * *(k1+ii) + d3 * *(k3+ii) + d4 * *(k4+ii)
+	  + d5 * *(k5+ii) + d6 * *(k6+ii) + d7 * dt * *(a+ii);
+      save_dense(dim,*to,dt,yo,yn1,a1,a,ynk,dense);
+    }
     for (ii= 0; ii < dim; ii++) {
       *(a1+ii)= *(a+ii);
       *(yo+ii)= *(yn1+ii);
@@ -723,3 +819,78 @@ double bovy_dopr54_actualstep(void (*func)(double t, double *y, double *a,int na
   dt_one= dt*pow(2.,powertwo);
   return dt_one;
 }
+/*
+Estimate the maximal Lyapunov exponent by integrating an orbit together with
+a deviation vector using any of the integrators above, renormalizing the
+deviation vector to unit length at each output time (Benettin et al. 1976)
+Usage:
+   Provide the integrator odeint_func (e.g., bovy_dopr54) and the function
+   func that gives the derivative of the orbit+deviation vector, with calling
+   sequences as for the integrators above
+  Other arguments are:
+       int dim: dimension of the orbit+deviation vector (first half: orbit, second half: deviation)
+       double *yo: initial value [orbit,deviation], dimension: dim
+       int nt: number of times at which the estimate is wanted
+       double dt: (optional) stepsize to use, see the integrators above
+       double *t: times at which the estimate is wanted, the deviation vector is renormalized at each of these
+       int nargs, struct potentialArg * potentialArgs: see above
+       double rtol, double atol: relative and absolute tolerance levels desired
+  Output:
+       double *lyap: finite-time estimate of the maximal Lyapunov exponent at each time (0 at t[0])
+       int *err: error: 1 if the maximum step reduction happened for adaptive integrators, -10 if interrupted by CTRL-C (SIGINT; the caller needs to install handle_sigint and reset interrupted afterwards)
+*/
+void bovy_lyapunov(void (*odeint_func)(void (*func)(double, double *, double *,
+						    int, struct potentialArg *),
+				       int,
+				       double *,
+				       int, double, double *,
+				       int, struct potentialArg *,
+				       double, double,
+				       double *,int *),
+		   void (*func)(double t, double *y, double *a,
+				int nargs, struct potentialArg * potentialArgs),
+		   int dim,
+		   double * yo,
+		   int nt, double dt, double *t,
+		   int nargs, struct potentialArg * potentialArgs,
+		   double rtol, double atol,
+		   double *lyap,int * err){
+  int ii, jj, thiserr;
+  int ndim= dim/2;
+  double norm, sumlog= 0.;
+  double *y= (double *) malloc ( dim * sizeof(double) );
+  double *res= (double *) malloc ( 2 * dim * sizeof(double) );
+  *err= 0;
+  for (jj=0; jj < dim; jj++) *(y+jj)= *(yo+jj);
+  //Start from a unit deviation vector
+  norm= 0.;
+  for (jj=ndim; jj < dim; jj++) norm+= *(y+jj) * *(y+jj);
+  norm= sqrt(norm);
+  for (jj=ndim; jj < dim; jj++) *(y+jj)/= norm;
+  *lyap= 0.;
+  for (ii=1; ii < nt; ii++) {
+    if ( interrupted ) {
+      *err= -10;
+      for (; ii < nt; ii++) *(lyap+ii)= NAN;
+      break;
+    }
+    odeint_func(func,dim,y,2,dt,t+ii-1,nargs,potentialArgs,rtol,atol,
+		res,&thiserr);
+    if ( thiserr == -10 ) {
+      *err= -10;
+      for (; ii < nt; ii++) *(lyap+ii)= NAN;
+      break;
+    }
+    if ( thiserr > *err ) *err= thiserr;
+    for (jj=0; jj < dim; jj++) *(y+jj)= *(res+dim+jj);
+    //Renormalize
+    norm= 0.;
+    for (jj=ndim; jj < dim; jj++) norm+= *(y+jj) * *(y+jj);
+    norm= sqrt(norm);
+    for (jj=ndim; jj < dim; jj++) *(y+jj)/= norm;
+    sumlog+= log(norm);
+    *(lyap+ii)= sumlog / ( *(t+ii) - *t );
+  }
+  free(y);
+  free(res);
+}
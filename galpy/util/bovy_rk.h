@@ -49,6 +49,14 @@ void bovy_rk4(void (*func)(double, double *, double *,
 	      int, struct potentialArg *,
 	      double, double,
 	      double *,int *);
+void bovy_rk4_dense(void (*func)(double, double *, double *,
+				 int, struct potentialArg *),
+		    int,
+		    double *,
+		    int, double, double *,
+		    int, struct potentialArg *,
+		    double, double,
+		    double *,int *,struct denseOutput *);
 void bovy_rk4_onestep(void (*func)(double, double *, double *,
 				   int, struct potentialArg *),
 		      int,
@@ -64,6 +72,14 @@ void bovy_rk6(void (*func)(double, double *, double *,
 	      int, struct potentialArg *,
 	      double, double,
 	      double *,int *);
+void bovy_rk6_dense(void (*func)(double, double *, double *,
+				 int, struct potentialArg *),
+		    int,
+		    double *,
+		    int, double, double *,
+		    int, struct potentialArg *,
+		    double, double,
+		    double *,int *,struct denseOutput *);
 void bovy_rk6_onestep(void (*func)(double, double *, double *,
 				   int, struct potentialArg *),
 		      int,
@@ -95,6 +111,14 @@ void bovy_dopr54(void (*func)(double, double *, double *,
 		 int, struct potentialArg *,
 		 double, double,
 		 double *,int *);
+void bovy_dopr54_dense(void (*func)(double, double *, double *,
+				    int, struct potentialArg *),
+		       int,
+		       double *,
+		       int, double, double *,
+		       int, struct potentialArg *,
+		       double, double,
+		       double *,int *,struct denseOutput *);
 void bovy_dopr54_onestep(void (*func)(double, double *, double *,int, struct potentialArg *),
 			 int, double *,
 			 double, double *,double *,
@@ -105,7 +129,7 @@ void bovy_dopr54_onestep(void (*func)(double, double *, double *,int, struct pot
 			 double *, double *,
 			 double *, double *,
 			 double *, double *,
-			 double *,int *);
+			 double *,int *,struct denseOutput *);
 double bovy_dopr54_actualstep(void (*func)(double, double *, double *,int, struct potentialArg *),
 			      int, double *,
 			      double, double *,
@@ -116,7 +140,24 @@ double bovy_dopr54_actualstep(void (*func)(double, double *, double *,int, struc
 			      double *, double *,
 			      double *, double *,
 			      double *, double *,
-			      double *,unsigned char);
+			      double *,unsigned char,
+			      struct denseOutput *);
+void bovy_lyapunov(void (*odeint_func)(void (*func)(double, double *, double *,
+						    int, struct potentialArg *),
+				       int,
+				       double *,
+				       int, double, double *,
+				       int, struct potentialArg *,
+				       double, double,
+				       double *,int *),
+		   void (*func)(double, double *, double *,
+				int, struct potentialArg *),
+		   int,
+		   double *,
+		   int, double, double *,
+		   int, struct potentialArg *,
+		   double, double,
+		   double *,int *);
 #ifdef __cplusplus
 }
 #endif
@@ -35,6 +35,7 @@ POSSIBILITY OF SUCH DAMAGE.
 #include "signal.h"
 #include <bovy_symplecticode.h>
 #define _MAX_DT_REDUCE 10000.
+#define _MAX_BLOCK_LEVEL 30
 volatile sig_atomic_t interrupted= 0;
 void handle_sigint(int signum)
 {
@@ -54,6 +55,165 @@ inline void save_qp(int dim, double *qo, double *po, double *result){
   for (ii=0; ii < dim; ii++) *result++= *qo++;
   for (ii=0; ii < dim; ii++) *result++= *po++;
 }
+/*
+  Event detection: the event function g(y) of each type, an event happens
+  when g changes sign in the requested direction
+*/
+static inline double event_func(int type, double * args, int dim,
+				double * y){
+  int ii;
+  double out= 0.;
+  switch ( type ) {
+  case 0: case 1: //pericenter or apocenter: x.v
+    for (ii=0; ii < dim/2; ii++) out+= *(y+ii) * *(y+dim/2+ii);
+    break;
+  case 2: //z=0 crossing
+    out= *(y+2);
+    break;
+  case 3: //vertical turning point
+    out= *(y+5);
+    break;
+  case 4: //surface of section c.y = offset
+    for (ii=0; ii < dim; ii++) out+= *(args+ii) * *(y+ii);
+    out-= *(args+dim);
+    break;
+  }
+  return out;
+}
+static inline int event_direction(int type, double * args, int dim){
+  switch ( type ) {
+  case 0: //pericenter: x.v goes from negative to positive
+    return 1;
+  case 1: //apocenter
+    return -1;
+  case 4:
+    return (int) *(args+dim+1);
+  default:
+    return 0;
+  }
+}
+//Evaluate the interpolating polynomial r of a step at theta
+static inline void eval_dense(int dim, double theta, double * r, double * y){
+  int ii;
+  for (ii=0; ii < dim; ii++)
+    *(y+ii)= *(r+ii) + theta * ( *(r+dim+ii) + (1.-theta) 
+				 * ( *(r+2*dim+ii) + theta 
+				     * ( *(r+3*dim+ii) + (1.-theta) 
+					 * *(r+4*dim+ii))));
+}
+/*
+  Check whether any of the events happens during the step from to to to+dt
+  with interpolating polynomial r and store the root-refined time and
+  phase-space position of each event that does
+*/
+void check_events(int dim, double to, double dt, double * r,
+		  struct orbitEvents * events){
+  int ii, kk, side, direction;
+  double g0, g1, a, b, c, ga, gb, gc, cold;
+  double y[dim];
+  double *args, *ev;
+  for (kk=0; kk < events->ntypes; kk++) {
+    args= events->args + kk * ( dim + 2 );
+    direction= event_direction(*(events->types+kk),args,dim);
+    if ( dt < 0. ) direction*= -1; //direction is defined forward in time
+    g0= event_func(*(events->types+kk),args,dim,r);
+    eval_dense(dim,1.,r,y);
+    g1= event_func(*(events->types+kk),args,dim,y);
+    if ( !( ( direction >= 0 && g0 < 0. && g1 >= 0. )
+	    || ( direction <= 0 && g0 > 0. && g1 <= 0. ) ) )
+      continue;
+    //Find the root using the Illinois variant of regula falsi
+    a= 0.;
+    b= 1.;
+    ga= g0;
+    gb= g1;
+    c= 1.;
+    side= 0;
+    for (ii=0; ii < 100; ii++) {
+      cold= c;
+      c= ( ga * b - gb * a ) / ( ga - gb );
+      eval_dense(dim,c,r,y);
+      gc= event_func(*(events->types+kk),args,dim,y);
+      if ( gc == 0. || fabs(c-cold) < 1e-15 ) break;
+      if ( gc * gb > 0. ) {
+	b= c;
+	gb= gc;
+	if ( side == -1 ) ga/= 2.;
+	side= -1;
+      }
+      else {
+	a= c;
+	ga= gc;
+	if ( side == 1 ) gb/= 2.;
+	side= 1;
+      }
+    }
+    if ( events->nevents < events->maxevents ) {
+      ev= events->events + events->nevents * EVENT_BLOCKSIZE(dim);
+      *ev++= (double) kk;
+      *ev++= to + c * dt;
+      for (ii=0; ii < dim; ii++) *ev++= *(y+ii);
+    }
+    events->nevents+= 1;
+  }
+}
+/*
+  Store the coefficients of the interpolating polynomial of a single step
+  from to to to+dt, which is evaluated as
+     y(to+theta dt)= r1+theta(r2+(1-theta)(r3+theta(r4+(1-theta)r5)))
+  f0 and f1 are the derivatives at the start and the end of the step, r5 can
+  be NULL (cubic Hermite interpolation); also detects events
+*/
+void save_dense(int dim, double to, double dt,
+		double * y0, double * y1, double * f0, double * f1,
+		double * r5, struct denseOutput * dense){
+  int ii;
+  double r[5*dim];
+  for (ii=0; ii < dim; ii++) {
+    *(r+ii)= *(y0+ii);
+    *(r+dim+ii)= *(y1+ii) - *(y0+ii);
+    *(r+2*dim+ii)= dt * *(f0+ii) - *(r+dim+ii);
+    *(r+3*dim+ii)= *(r+dim+ii) - dt * *(f1+ii) - *(r+2*dim+ii);
+    *(r+4*dim+ii)= r5 ? *(r5+ii) : 0.;
+  }
+  if ( dense->nsteps < dense->maxsteps ) {
+    *(dense->steps + dense->nsteps * DENSE_BLOCKSIZE(dim))= to;
+    *(dense->steps + dense->nsteps * DENSE_BLOCKSIZE(dim) + 1)= dt;
+    for (ii=0; ii < 5*dim; ii++)
+      *(dense->steps + dense->nsteps * DENSE_BLOCKSIZE(dim) + 2 + ii)= *(r+ii);
+  }
+  dense->nsteps+= 1;
+  if ( dense->events )
+    check_events(dim,to,dt,r,dense->events);
+}
+/*
+  Cubic Hermite dense output for the symplectic integrators: the position at
+  the end of the step is q+cdt*p (the symplectic integrators combine the
+  last drift of a step with the first drift of the next step), y0 and f0
+  hold the phase-space position and its derivative at the start of the step
+  and are updated to those at the end
+*/
+static inline void save_dense_symplec(void (*func)(double t, double *q, double *a,int nargs, struct potentialArg *),
+				      int dim, double * q, double * p,
+				      double cdt, double tstep, double dt,
+				      int nargs,
+				      struct potentialArg * potentialArgs,
+				      double * y0, double * y1,
+				      double * f0, double * f1,
+				      struct denseOutput * dense){
+  int ii;
+  for (ii=0; ii < dim; ii++) {
+    *(y1+ii)= *(q+ii) + cdt * *(p+ii);
+    *(y1+dim+ii)= *(p+ii);
+    *(f1+ii)= *(p+ii);
+  }
+  func(tstep+dt,y1,f1+dim,nargs,potentialArgs);
+  save_dense(2*dim,tstep,dt,y0,y1,f0,f1,NULL,dense);
+  for (ii=0; ii < 2*dim; ii++) {
+    *(y0+ii)= *(y1+ii);
+    *(f0+ii)= *(f1+ii);
+  }
+}
 /*
 Leapfrog integrator
 Usage:
@@ -76,7 +236,7 @@ Usage:
        double rtol, double atol: relative and absolute tolerance levels desired
   Output:
        double *result: result (nt blocks of size 2dim)
-       int *err: error: -10 if interrupted by CTRL-C (SIGINT)
+       int *err: error: -10 if interrupted by CTRL-C (SIGINT; the caller needs to install handle_sigint and reset interrupted afterwards)
 */
 void leapfrog(void (*func)(double t, double *q, double *a,
 			   int nargs, struct potentialArg * potentialArgs),
@@ -86,12 +246,32 @@ void leapfrog(void (*func)(double t, double *q, double *a,
 	      int nargs, struct potentialArg * potentialArgs,
 	      double rtol, double atol,
 	      double *result,int * err){
+  leapfrog_dense(func,dim,yo,nt,dt,t,nargs,potentialArgs,rtol,atol,
+		 result,err,NULL);
+}
+/*
+  Leapfrog integrator with dense output (cubic Hermite interpolation of each
+  step, which requires one additional force evaluation per step) and event
+  detection, same calling sequence as above, but with an additional argument
+       struct denseOutput * dense: if not NULL, the dense output is stored
+                                   here and events are detected
+*/
+void leapfrog_dense(void (*func)(double t, double *q, double *a,
+				 int nargs, struct potentialArg * potentialArgs),
+		    int dim,
+		    double * yo,
+		    int nt, double dt, double *t,
+		    int nargs, struct potentialArg * potentialArgs,
+		    double rtol, double atol,
+		    double *result,int * err,
+		    struct denseOutput * dense){
   //Initialize
   double *qo= (double *) malloc ( dim * sizeof(double) );
   double *po= (double *) malloc ( dim * sizeof(double) );
   double *q12= (double *) malloc ( dim * sizeof(double) );
   double *p12= (double *) malloc ( dim * sizeof(double) );
   double *a= (double *) malloc ( dim * sizeof(double) );
+  double *y0= NULL, *y1= NULL, *f0= NULL, *f1= NULL;
   int ii, jj, kk;
   for (ii=0; ii < dim; ii++) {
     *qo++= *(yo+ii);
@@ -111,15 +291,20 @@ void leapfrog(void (*func)(double t, double *q, double *a,
   long ndt= (long) (init_dt/dt);
   //Integrate the system
   double to= *t;
-  // Handle KeyboardInterrupt gracefully
-  struct sigaction action;
-  memset(&action, 0, sizeof(struct sigaction));
-  action.sa_handler= handle_sigint;
-  sigaction(SIGINT,&action,NULL);
+  double tstep= *t;
+  if ( dense ) {
+    y0= (double *) malloc ( 2 * dim * sizeof(double) );
+    y1= (double *) malloc ( 2 * dim * sizeof(double) );
+    f0= (double *) malloc ( 2 * dim * sizeof(double) );
+    f1= (double *) malloc ( 2 * dim * sizeof(double) );
+    dense->nsteps= 0;
+    for (ii=0; ii < 2*dim; ii++) *(y0+ii)= *(yo+ii);
+    for (ii=0; ii < dim; ii++) *(f0+ii)= *(po+ii);
+    func(to,qo,f0+dim,nargs,potentialArgs);
+  }
   for (ii=0; ii < (nt-1); ii++){
     if ( interrupted ) {
       *err= -10;
-      interrupted= 0; // need to reset, bc library and vars stay in memory
       break;
     }
     //drift half
@@ -129,6 +314,10 @@ void leapfrog(void (*func)(double t, double *q, double *a,
       //kick
       func(to+dt/2.,q12,a,nargs,potentialArgs);
       leapfrog_leapp(dim,po,dt,a,p12);
+      if ( dense )
+	save_dense_symplec(func,dim,q12,p12,dt/2.,tstep,dt,nargs,potentialArgs,
+			   y0,y1,f0,f1,dense);
+      tstep+= dt;
       //drift
       leapfrog_leapq(dim,q12,p12,dt,qo);
       //reset
@@ -145,18 +334,25 @@ void leapfrog(void (*func)(double t, double *q, double *a,
     //drift
     leapfrog_leapq(dim,q12,po,dt/2.,qo);
     to= to+dt;
+    if ( dense )
+      save_dense_symplec(func,dim,qo,po,0.,tstep,dt,nargs,potentialArgs,
+			 y0,y1,f0,f1,dense);
+    tstep+= dt;
     //save
     save_qp(dim,qo,po,result);
     result+= 2 * dim;
   }
-  // Back to default handler
-  action.sa_handler= SIG_DFL;
-  sigaction(SIGINT,&action,NULL);
   //Free allocated memory
   free(qo);
   free(po);
   free(q12);
   free(a);
+  if ( dense ) {
+    free(y0);
+    free(y1);
+    free(f0);
+    free(f1);
+  }
   //We're done
 }
 
@@ -182,7 +378,7 @@ Usage:
        double rtol, double atol: relative and absolute tolerance levels desired
   Output:
        double *result: result (nt blocks of size 2dim)
-       int *err: error: -10 if interrupted by CTRL-C (SIGINT)
+       int *err: error: -10 if interrupted by CTRL-C (SIGINT; the caller needs to install handle_sigint and reset interrupted afterwards)
 */
 void symplec4(void (*func)(double t, double *q, double *a,
 			   int nargs, struct potentialArg * potentialArgs),
@@ -192,6 +388,25 @@ void symplec4(void (*func)(double t, double *q, double *a,
 	      int nargs, struct potentialArg * potentialArgs,
 	      double rtol, double atol,
 	      double *result,int * err){
+  symplec4_dense(func,dim,yo,nt,dt,t,nargs,potentialArgs,rtol,atol,
+		 result,err,NULL);
+}
+/*
+  Fourth order symplectic integrator with dense output (cubic Hermite interpolation of each
+  step, which requires one additional force evaluation per step) and event
+  detection, same calling sequence as above, but with an additional argument
+       struct denseOutput * dense: if not NULL, the dense output is stored
+                                   here and events are detected
+*/
+void symplec4_dense(void (*func)(double t, double *q, double *a,
+				 int nargs, struct potentialArg * potentialArgs),
+		    int dim,
+		    double * yo,
+		    int nt, double dt, double *t,
+		    int nargs, struct potentialArg * potentialArgs,
+		    double rtol, double atol,
+		    double *result,int * err,
+		    struct denseOutput * dense){
   //coefficients
   double c1= 0.6756035959798289;
   double c4= c1;
@@ -206,6 +421,7 @@ void symplec4(void (*func)(double t, double *q, double *a,
   double *q12= (double *) malloc ( dim * sizeof(double) );
   double *p12= (double *) malloc ( dim * sizeof(double) );
   double *a= (double *) malloc ( dim * sizeof(double) );
+  double *y0= NULL, *y1= NULL, *f0= NULL, *f1= NULL;
   int ii, jj, kk;
   for (ii=0; ii < dim; ii++) {
     *qo++= *(yo+ii);
@@ -225,15 +441,20 @@ void symplec4(void (*func)(double t, double *q, double *a,
   long ndt= (long) (init_dt/dt);
   //Integrate the system
   double to= *t;
-  // Handle KeyboardInterrupt gracefully
-  struct sigaction action;
-  memset(&action, 0, sizeof(struct sigaction));
-  action.sa_handler= handle_sigint;
-  sigaction(SIGINT,&action,NULL);
+  double tstep= *t;
+  if ( dense ) {
+    y0= (double *) malloc ( 2 * dim * sizeof(double) );
+    y1= (double *) malloc ( 2 * dim * sizeof(double) );
+    f0= (double *) malloc ( 2 * dim * sizeof(double) );
+    f1= (double *) malloc ( 2 * dim * sizeof(double) );
+    dense->nsteps= 0;
+    for (ii=0; ii < 2*dim; ii++) *(y0+ii)= *(yo+ii);
+    for (ii=0; ii < dim; ii++) *(f0+ii)= *(po+ii);
+    func(to,qo,f0+dim,nargs,potentialArgs);
+  }
   for (ii=0; ii < (nt-1); ii++){
     if ( interrupted ) {
       *err= -10;
-      interrupted= 0; // need to reset, bc library and vars stay in memory
       break;
     }
     //drift for c1*dt
@@ -256,6 +477,10 @@ void symplec4(void (*func)(double t, double *q, double *a,
       //kick for d3*dt
       func(to,q12,a,nargs,potentialArgs);
       leapfrog_leapp(dim,po,d3*dt,a,p12);
+      if ( dense )
+	save_dense_symplec(func,dim,q12,p12,c4*dt,tstep,dt,nargs,potentialArgs,
+			   y0,y1,f0,f1,dense);
+      tstep+= dt;
       //drift for (c4+c1)*dt
       leapfrog_leapq(dim,q12,p12,(c4+c1)*dt,qo);
       to+= (c4+c1)*dt;
@@ -286,18 +511,25 @@ void symplec4(void (*func)(double t, double *q, double *a,
     to+= c4*dt;
     //p4=p3
     for (kk=0; kk < dim; kk++) *(po+kk)= *(p12+kk);
+    if ( dense )
+      save_dense_symplec(func,dim,qo,po,0.,tstep,dt,nargs,potentialArgs,
+			 y0,y1,f0,f1,dense);
+    tstep+= dt;
     //save
     save_qp(dim,qo,po,result);
     result+= 2 * dim;
   }
-  // Back to default handler
-  action.sa_handler= SIG_DFL;
-  sigaction(SIGINT,&action,NULL);
   //Free allocated memory
   free(qo);
   free(po);
   free(q12);
   free(a);
+  if ( dense ) {
+    free(y0);
+    free(y1);
+    free(f0);
+    free(f1);
+  }
   //We're done
 }
 
@@ -323,7 +555,7 @@ Usage:
        double rtol, double atol: relative and absolute tolerance levels desired
   Output:
        double *result: result (nt blocks of size 2dim)
-       int *err: error: -10 if interrupted by CTRL-C (SIGINT)
+       int *err: error: -10 if interrupted by CTRL-C (SIGINT; the caller needs to install handle_sigint and reset interrupted afterwards)
 */
 void symplec6(void (*func)(double t, double *q, double *a,
 			   int nargs, struct potentialArg * potentialArgs),
@@ -333,6 +565,25 @@ void symplec6(void (*func)(double t, double *q, double *a,
 	      int nargs, struct potentialArg * potentialArgs,
 	      double rtol, double atol,
 	      double *result,int * err){
+  symplec6_dense(func,dim,yo,nt,dt,t,nargs,potentialArgs,rtol,atol,
+		 result,err,NULL);
+}
+/*
+  Sixth order symplectic integrator with dense output (cubic Hermite interpolation of each
+  step, which requires one additional force evaluation per step) and event
+  detection, same calling sequence as above, but with an additional argument
+       struct denseOutput * dense: if not NULL, the dense output is stored
+                                   here and events are detected
+*/
+void symplec6_dense(void (*func)(double t, double *q, double *a,
+				 int nargs, struct potentialArg * potentialArgs),
+		    int dim,
+		    double * yo,
+		    int nt, double dt, double *t,
+		    int nargs, struct potentialArg * potentialArgs,
+		    double rtol, double atol,
+		    double *result,int * err,
+		    struct denseOutput * dense){
   //coefficients
   double c1= 0.392256805238780;
   double c8= c1;
@@ -355,6 +606,7 @@ void symplec6(void (*func)(double t, double *q, double *a,
   double *q12= (double *) malloc ( dim * sizeof(double) );
   double *p12= (double *) malloc ( dim * sizeof(double) );
   double *a= (double *) malloc ( dim * sizeof(double) );
+  double *y0= NULL, *y1= NULL, *f0= NULL, *f1= NULL;
   int ii, jj, kk;
   for (ii=0; ii < dim; ii++) {
     *qo++= *(yo+ii);
@@ -374,15 +626,20 @@ void symplec6(void (*func)(double t, double *q, double *a,
   long ndt= (long) (init_dt/dt);
   //Integrate the system
   double to= *t;
-  // Handle KeyboardInterrupt gracefully
-  struct sigaction action;
-  memset(&action, 0, sizeof(struct sigaction));
-  action.sa_handler= handle_sigint;
-  sigaction(SIGINT,&action,NULL);
+  double tstep= *t;
+  if ( dense ) {
+    y0= (double *) malloc ( 2 * dim * sizeof(double) );
+    y1= (double *) malloc ( 2 * dim * sizeof(double) );
+    f0= (double *) malloc ( 2 * dim * sizeof(double) );
+    f1= (double *) malloc ( 2 * dim * sizeof(double) );
+    dense->nsteps= 0;
+    for (ii=0; ii < 2*dim; ii++) *(y0+ii)= *(yo+ii);
+    for (ii=0; ii < dim; ii++) *(f0+ii)= *(po+ii);
+    func(to,qo,f0+dim,nargs,potentialArgs);
+  }
   for (ii=0; ii < (nt-1); ii++){
     if ( interrupted ) {
       *err= -10;
-      interrupted= 0; // need to reset, bc library and vars stay in memory
       break;
     }
     //drift for c1*dt
@@ -429,6 +686,10 @@ void symplec6(void (*func)(double t, double *q, double *a,
       //kick for d7*dt
       func(to,q12,a,nargs,potentialArgs);
       leapfrog_leapp(dim,po,d7*dt,a,p12);
+      if ( dense )
+	save_dense_symplec(func,dim,q12,p12,c8*dt,tstep,dt,nargs,potentialArgs,
+			   y0,y1,f0,f1,dense);
+      tstep+= dt;
       //drift for (c8+c1)*dt
       leapfrog_leapq(dim,q12,p12,(c8+c1)*dt,qo);
       to+= (c8+c1)*dt;
@@ -483,21 +744,268 @@ void symplec6(void (*func)(double t, double *q, double *a,
     to+= c8*dt;
     //p8=p7
     for (kk=0; kk < dim; kk++) *(po+kk)= *(p12+kk);
+    if ( dense )
+      save_dense_symplec(func,dim,qo,po,0.,tstep,dt,nargs,potentialArgs,
+			 y0,y1,f0,f1,dense);
+    tstep+= dt;
     //save
     save_qp(dim,qo,po,result);
     result+= 2 * dim;
   }
-  // Back to default handler
-  action.sa_handler= SIG_DFL;
-  sigaction(SIGINT,&action,NULL);
   //Free allocated memory
   free(qo);
   free(po);
   free(q12);
   free(a);
+  if ( dense ) {
+    free(y0);
+    free(y1);
+    free(f0);
+    free(f1);
+  }
   //We're done
 }
 
+/*
+  Block-timestep versions of the symplectic integrators: each step is one
+  step of the symmetric composition (c: drift coefficients, d: kick
+  coefficients), with a stepsize dt/2^level that is adapted to the local
+  dynamical time sqrt(|q|/|a|) of the orbit. The level is chosen such that
+  the step is smaller than the allowed step at both the first and the last
+  kick of the step, which is a time-symmetric criterion that does not
+  require any additional force evaluations; steps are only coarsened by one
+  level at a time and only at times that are commensurate with the coarser
+  level, such that the output times are always hit exactly
+*/
+static const double symplec4_c[4]= {0.6756035959798289,-0.1756035959798288,
+				    -0.1756035959798288,0.6756035959798289};
+static const double symplec4_d[3]= {1.3512071919596578,-1.7024143839193153,
+				    1.3512071919596578};
+static const double symplec6_c[8]= {0.392256805238780,0.510043411918458,
+				    -0.471053385409758,0.687531682525198e-1,
+				    0.687531682525198e-1,-0.471053385409758,
+				    0.510043411918458,0.392256805238780};
+static const double symplec6_d[7]= {0.784513610477560,0.235573213359357,
+				    -0.117767998417887e1,0.131518632068391e1,
+				    -0.117767998417887e1,0.235573213359357,
+				    0.784513610477560};
+static inline double symplec_block_tdyn(int dim, double * q, double * a){
+  int ii;
+  double r2= 0., a2= 0.;
+  for (ii=0; ii < dim; ii++) {
+    r2+= *(q+ii) * *(q+ii);
+    a2+= *(a+ii) * *(a+ii);
+  }
+  if ( a2 == 0. ) return INFINITY;
+  return sqrt(sqrt(r2/a2));
+}
+/*
+  Take one step of size dt of the composition, starting from (q,p) at time
+  to; returns the state before the last drift in (qn,pn) and the minimum
+  dynamical time at the first and last kick
+*/
+static inline double symplec_block_step(void (*func)(double t, double *q, double *a,int nargs, struct potentialArg *),
+					int dim, int nkick,
+					const double * c, const double * d,
+					double * q, double * p,
+					double to, double dt,
+					int nargs,
+					struct potentialArg * potentialArgs,
+					double * qn, double * pn, double * a){
+  int ii;
+  double tdyn, out= INFINITY;
+  for (ii=0; ii < dim; ii++) {
+    *(qn+ii)= *(q+ii);
+    *(pn+ii)= *(p+ii);
+  }
+  for (ii=0; ii < nkick; ii++) {
+    leapfrog_leapq(dim,qn,pn,*(c+ii)*dt,qn);
+    to+= *(c+ii)*dt;
+    func(to,qn,a,nargs,potentialArgs);
+    leapfrog_leapp(dim,pn,*(d+ii)*dt,a,pn);
+    if ( ii == 0 || ii == nkick-1 ) {
+      tdyn= symplec_block_tdyn(dim,qn,a);
+      if ( tdyn < out ) out= tdyn;
+    }
+  }
+  return out;
+}
+static void symplec_block(void (*func)(double t, double *q, double *a,
+				       int nargs, struct potentialArg * potentialArgs),
+			  int dim,
+			  double * yo,
+			  int nt, double dt, double *t,
+			  int nargs, struct potentialArg * potentialArgs,
+			  double rtol, double atol,
+			  double *result,int * err,
+			  struct denseOutput * dense,
+			  int nkick, const double * c, const double * d,
+			  double (*estimate_step)(void (*func)(double , double *, double *,int, struct potentialArg *),
+						  int, double *,double *,
+						  double, double *,
+						  int,struct potentialArg *,
+						  double,double)){
+  //Initialize
+  double *qo= (double *) malloc ( dim * sizeof(double) );
+  double *po= (double *) malloc ( dim * sizeof(double) );
+  double *qn= (double *) malloc ( dim * sizeof(double) );
+  double *pn= (double *) malloc ( dim * sizeof(double) );
+  double *a= (double *) malloc ( dim * sizeof(double) );
+  double *y0= NULL, *y1= NULL, *f0= NULL, *f1= NULL;
+  int ii, kk, level;
+  unsigned long long pos, size, end= 1ULL << _MAX_BLOCK_LEVEL;
+  long jj, nblock;
+  double tblock, to, h, hallow, scale, tdyn;
+  for (ii=0; ii < dim; ii++) {
+    *(qo+ii)= *(yo+ii);
+    *(po+ii)= *(yo+dim+ii);
+  }
+  save_qp(dim,qo,po,result);
+  result+= 2 * dim;
+  *err= 0;
+  //The largest step is the output step or the given dt
+  double init_dt= (*(t+1))-(*t);
+  if ( dt == -9999.99 )
+    dt= init_dt;
+  nblock= lround(init_dt/dt);
+  //Calibrate the relation between the allowed step and the dynamical time
+  //using the step that the fixed-step integrator would use initially
+  func(*t,qo,a,nargs,potentialArgs);
+  tdyn= symplec_block_tdyn(dim,qo,a);
+  hallow= estimate_step(*func,dim,qo,po,dt,t,nargs,potentialArgs,rtol,atol);
+  if ( tdyn > 0. && isfinite(tdyn) )
+    scale= fabs(hallow) / tdyn;
+  else
+    scale= fabs(hallow);
+  for (level=0; level < _MAX_BLOCK_LEVEL; level++)
+    if ( fabs(dt) / (double) (1ULL << level) <= fabs(hallow) ) break;
+  if ( dense ) {
+    y0= (double *) malloc ( 2 * dim * sizeof(double) );
+    y1= (double *) malloc ( 2 * dim * sizeof(double) );
+    f0= (double *) malloc ( 2 * dim * sizeof(double) );
+    f1= (double *) malloc ( 2 * dim * sizeof(double) );
+    dense->nsteps= 0;
+    for (ii=0; ii < 2*dim; ii++) *(y0+ii)= *(yo+ii);
+    for (ii=0; ii < dim; ii++) {
+      *(f0+ii)= *(po+ii);
+      *(f0+dim+ii)= *(a+ii);
+    }
+  }
+  //Integrate the system
+  tblock= *t;
+  for (ii=0; ii < (nt-1); ii++){
+    if ( interrupted ) {
+      *err= -10;
+      break;
+    }
+    for (jj=0; jj < nblock; jj++){
+      pos= 0;
+      while ( pos < end ) {
+	size= 1ULL << (_MAX_BLOCK_LEVEL-level);
+	h= dt / (double) (1ULL << level);
+	to= tblock + dt * ( (double) pos / (double) end );
+	hallow= scale * symplec_block_step(func,dim,nkick,c,d,qo,po,to,h,
+					   nargs,potentialArgs,qn,pn,a);
+	if ( hallow < fabs(h) ) {
+	  if ( level < _MAX_BLOCK_LEVEL ) {
+	    //Reject, refine to the level that the step requires
+	    do level++;
+	    while ( level < _MAX_BLOCK_LEVEL 
+		    && fabs(dt) / (double) (1ULL << level) > hallow );
+	    continue;
+	  }
+	  *err= 1;
+	}
+	//Accept
+	if ( dense )
+	  save_dense_symplec(func,dim,qn,pn,*(c+nkick)*h,to,h,
+			     nargs,potentialArgs,y0,y1,f0,f1,dense);
+	leapfrog_leapq(dim,qn,pn,*(c+nkick)*h,qo);
+	for (kk=0; kk < dim; kk++) *(po+kk)= *(pn+kk);
+	pos+= size;
+	//Coarsen when allowed and commensurate with the coarser level
+	if ( level > 0 && hallow >= 2. * fabs(h) && pos % (2*size) == 0 )
+	  level--;
+      }
+      tblock+= dt;
+    }
+    //save
+    save_qp(dim,qo,po,result);
+    result+= 2 * dim;
+  }
+  //Free allocated memory
+  free(qo);
+  free(po);
+  free(qn);
+  free(pn);
+  free(a);
+  if ( dense ) {
+    free(y0);
+    free(y1);
+    free(f0);
+    free(f1);
+  }
+  //We're done
+}
+/*
+Block-timestep fourth and sixth order symplectic integrators, same calling
+sequence as symplec4 and symplec6, but dt (optional) is the largest step
+that is taken rather than the fixed step; rtol and atol set the step at the
+initial condition in the same way as for symplec4 and symplec6 and the
+step elsewhere scales with the local dynamical time
+  Output:
+       double *result: result (nt blocks of size 2dim)
+       int *err: error: 1 if the smallest allowed step was insufficient; -10 if interrupted by CTRL-C (SIGINT; the caller needs to install handle_sigint and reset interrupted afterwards)
+*/
+void symplec4_block(void (*func)(double t, double *q, double *a,
+				 int nargs, struct potentialArg * potentialArgs),
+		    int dim,
+		    double * yo,
+		    int nt, double dt, double *t,
+		    int nargs, struct potentialArg * potentialArgs,
+		    double rtol, double atol,
+		    double *result,int * err){
+  symplec4_block_dense(func,dim,yo,nt,dt,t,nargs,potentialArgs,rtol,atol,
+		       result,err,NULL);
+}
+void symplec4_block_dense(void (*func)(double t, double *q, double *a,
+				       int nargs, struct potentialArg * potentialArgs),
+			  int dim,
+			  double * yo,
+			  int nt, double dt, double *t,
+			  int nargs, struct potentialArg * potentialArgs,
+			  double rtol, double atol,
+			  double *result,int * err,
+			  struct denseOutput * dense){
+  symplec_block(func,dim,yo,nt,dt,t,nargs,potentialArgs,rtol,atol,
+		result,err,dense,3,symplec4_c,symplec4_d,
+		&symplec4_estimate_step);
+}
+void symplec6_block(void (*func)(double t, double *q, double *a,
+				 int nargs, struct potentialArg * potentialArgs),
+		    int dim,
+		    double * yo,
+		    int nt, double dt, double *t,
+		    int nargs, struct potentialArg * potentialArgs,
+		    double rtol, double atol,
+		    double *result,int * err){
+  symplec6_block_dense(func,dim,yo,nt,dt,t,nargs,potentialArgs,rtol,atol,
+		       result,err,NULL);
+}
+void symplec6_block_dense(void (*func)(double t, double *q, double *a,
+				       int nargs, struct potentialArg * potentialArgs),
+			  int dim,
+			  double * yo,
+			  int nt, double dt, double *t,
+			  int nargs, struct potentialArg * potentialArgs,
+			  double rtol, double atol,
+			  double *result,int * err,
+			  struct denseOutput * dense){
+  symplec_block(func,dim,yo,nt,dt,t,nargs,potentialArgs,rtol,atol,
+		result,err,dense,7,symplec6_c,symplec6_d,
+		&symplec6_estimate_step);
+}
+
 double leapfrog_estimate_step(void (*func)(double t, double *q, double *a,int nargs, struct potentialArg *),
 			      int dim, double *qo,double *po,
 			      double dt, double *t,
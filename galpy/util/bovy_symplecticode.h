@@ -40,10 +40,39 @@ extern "C" {
   Global variables
 */
 extern volatile sig_atomic_t interrupted;
+/*
+  Structure that holds the events (pericenters, apocenters, ...) that are
+  detected during the integration; each event is stored as
+  [index of the event type,time,phase-space position (dim)]
+*/
+struct orbitEvents{
+  int ntypes; //number of event types to detect
+  int * types; //0: pericenter, 1: apocenter, 2: z=0 crossing, 3: vertical turning point (vz=0), 4: surface of section
+  double * args; //ntypes blocks of size dim+2; for a surface of section: coefficients c of the phase-space position y, offset, and direction of the surface c.y = offset (+1: c.y increasing, -1: decreasing, 0: both)
+  int maxevents; //number of events that fit in events
+  int nevents; //number of events detected (can be > maxevents, then only the first maxevents are stored)
+  double * events; //maxevents blocks of size EVENT_BLOCKSIZE(dim)
+};
+#define EVENT_BLOCKSIZE(dim) (2+(dim))
+/*
+  Structure that holds the dense output of the integrators: for each step,
+  the start time, the stepsize, and the 5 x dim coefficients of the
+  polynomial that interpolates the solution within the step; events are
+  detected using this polynomial when events is not NULL
+*/
+struct denseOutput{
+  int maxsteps; //number of steps that fit in steps
+  int nsteps; //number of steps taken (can be > maxsteps, then only the first maxsteps are stored)
+  double * steps; //maxsteps blocks of size DENSE_BLOCKSIZE(dim)
+  struct orbitEvents * events;
+};
+#define DENSE_BLOCKSIZE(dim) (2+5*(dim))
 /*
   Function declarations
 */
 void handle_sigint(int);
+void save_dense(int,double,double,double *,double *,double *,double *,
+		double *,struct denseOutput *);
 void leapfrog(void (*func)(double, double *, double *,
 			   int, struct potentialArg *),
 	      int,
@@ -52,6 +81,14 @@ void leapfrog(void (*func)(double, double *, double *,
 	      int, struct potentialArg *,
 	      double, double,
 	      double *,int *);
+void leapfrog_dense(void (*func)(double, double *, double *,
+				 int, struct potentialArg *),
+		    int,
+		    double *,
+		    int, double, double *,
+		    int, struct potentialArg *,
+		    double, double,
+		    double *,int *,struct denseOutput *);
 double leapfrog_estimate_step(void (*func)(double , double *, double *,int, struct potentialArg *),
 			      int, double *,double *,
 			      double, double *,
@@ -65,6 +102,14 @@ void symplec4(void (*func)(double, double *, double *,
 	      int, struct potentialArg *,
 	      double, double,
 	      double *,int *);
+void symplec4_dense(void (*func)(double, double *, double *,
+				 int, struct potentialArg *),
+		    int,
+		    double *,
+		    int, double, double *,
+		    int, struct potentialArg *,
+		    double, double,
+		    double *,int *,struct denseOutput *);
 double symplec4_estimate_step(void (*func)(double , double *, double *,int, struct potentialArg *),
 			      int, double *,double *,
 			      double, double *,
@@ -78,11 +123,51 @@ void symplec6(void (*func)(double, double *, double *,
 	      int, struct potentialArg *,
 	      double, double,
 	      double *,int *);
+void symplec6_dense(void (*func)(double, double *, double *,
+				 int, struct potentialArg *),
+		    int,
+		    double *,
+		    int, double, double *,
+		    int, struct potentialArg *,
+		    double, double,
+		    double *,int *,struct denseOutput *);
 double symplec6_estimate_step(void (*func)(double , double *, double *,int, struct potentialArg *),
 			      int, double *,double *,
 			      double, double *,
 			      int,struct potentialArg *,
 			      double,double);
+void symplec4_block(void (*func)(double, double *, double *,
+				 int, struct potentialArg *),
+		    int,
+		    double *,
+		    int, double, double *,
+		    int, struct potentialArg *,
+		    double, double,
+		    double *,int *);
+void symplec4_block_dense(void (*func)(double, double *, double *,
+				       int, struct potentialArg *),
+			  int,
+			  double *,
+			  int, double, double *,
+			  int, struct potentialArg *,
+			  double, double,
+			  double *,int *,struct denseOutput *);
+void symplec6_block(void (*func)(double, double *, double *,
+				 int, struct potentialArg *),
+		    int,
+		    double *,
+		    int, double, double *,
+		    int, struct potentialArg *,
+		    double, double,
+		    double *,int *);
+void symplec6_block_dense(void (*func)(double, double *, double *,
+				       int, struct potentialArg *),
+			  int,
+			  double *,
+			  int, double, double *,
+			  int, struct potentialArg *,
+			  double, double,
+			  double *,int *,struct denseOutput *);
 #ifdef __cplusplus
 }
 #endif
@@ -298,6 +298,62 @@ def test_actionAngleSpherical_otherIsochrone_angles():
     assert daz < 10.**-6., 'actionAngleSpherical applied to isochrone potential fails for az at %g%%' % (daz*100.)
     return None
 
+# Test that the C implementation of actionAngleSpherical agrees with Python
+def test_actionAngleSpherical_c_vs_python():
+    from galpy.potential import NFWPotential, PlummerPotential
+    from galpy.actionAngle import actionAngleSpherical
+    numpy.random.seed(1)
+    nobj= 20
+    R= numpy.random.uniform(0.5,2.,nobj)
+    vR= numpy.random.normal(0.,0.2,nobj)
+    vT= numpy.random.normal(0.8,0.2,nobj)
+    z= numpy.random.normal(0.,0.3,nobj)
+    vz= numpy.random.normal(0.,0.2,nobj)
+    phi= numpy.random.uniform(0.,2.*numpy.pi,nobj)
+    for pot in [NFWPotential(a=3.,normalize=1.),
+                [PlummerPotential(b=0.8,normalize=0.5),
+                 NFWPotential(a=3.,normalize=0.5)]]:
+        aAS= actionAngleSpherical(pot=pot)
+        aASc= actionAngleSpherical(pot=pot,c=True)
+        jp= aAS(R,vR,vT,z,vz)
+        jc= aASc(R,vR,vT,z,vz)
+        for ii in range(3):
+            assert numpy.all(numpy.fabs(jp[ii]-jc[ii]) < 10.**-7.), 'C and Python actionAngleSpherical actions do not agree'
+        jop= aAS.actionsFreqs(R,vR,vT,z,vz)
+        joc= aASc.actionsFreqs(R,vR,vT,z,vz)
+        for ii in range(6):
+            assert numpy.all(numpy.fabs(jop[ii]-joc[ii]) < 10.**-6.), 'C and Python actionAngleSpherical actions and frequencies do not agree'
+        joap= aAS.actionsFreqsAngles(R,vR,vT,z,vz,phi)
+        joac= aASc.actionsFreqsAngles(R,vR,vT,z,vz,phi)
+        for ii in range(6):
+            assert numpy.all(numpy.fabs(joap[ii]-joac[ii]) < 10.**-6.), 'C and Python actionAngleSpherical actions and frequencies do not agree'
+        for ii in range(6,9):
+            da= numpy.fabs(((joap[ii]-joac[ii]+numpy.pi) % (2.*numpy.pi))
+                           -numpy.pi)
+            assert numpy.all(da < 10.**-6.), 'C and Python actionAngleSpherical angles do not agree'
+    return None
+
+def test_actionAngleSpherical_c_otherIsochrone():
+    from galpy.potential import IsochronePotential
+    from galpy.actionAngle import actionAngleSpherical, \
+        actionAngleIsochrone
+    ip= IsochronePotential(normalize=1.,b=1.2)
+    aAI= actionAngleIsochrone(ip=ip)
+    aAS= actionAngleSpherical(pot=ip,c=True)
+    R,vR,vT,z,vz,phi= 1.1, 0.3, 1.2, 0.2,0.5,2.
+    jiO= aAI.actionsFreqsAngles(R,vR,vT,z,vz,phi)
+    jiaO= aAS.actionsFreqsAngles(R,vR,vT,z,vz,phi)
+    for ii,name in enumerate(['jr','lz','jz','Or','Op','Oz','ar','ap','az']):
+        d= numpy.fabs((jiO[ii]-jiaO[ii])/jiO[ii])
+        assert d < 10.**-6., 'actionAngleSpherical with c=True applied to isochrone potential fails for %s at %g%%' % (name,d*100.)
+    #circular orbit
+    R,vR,vT,z,vz= 1.,0.,ip.vcirc(1.),0.,0.
+    jos= aAS.actionsFreqs(R,vR,vT,z,vz)
+    assert numpy.fabs(jos[0]) < 10.**-10., 'Circular orbit in the isochrone potential does not have Jr=0 with c=True'
+    assert numpy.fabs((jos[3]-ip.epifreq(1.))/ip.epifreq(1.)) < 10.**-6., 'Circular orbit in the isochrone potential does not have Or=kappa with c=True'
+    assert numpy.fabs((jos[4]-ip.omegac(1.))/ip.omegac(1.)) < 10.**-10., 'Circular orbit in the isochrone potential does not have Op=Omega with c=True'
+    return None
+
 #Basic sanity checking of the actionAngleAdiabatic actions
 def test_actionAngleAdiabatic_basic_actions():
     from galpy.actionAngle import actionAngleAdiabatic
@@ -557,6 +613,78 @@ def test_actionAngleAdiabaticGrid_conserved_actions_c():
                                         -1.4,-8.,-1.7,ntimes=101)
     return None
 
+#Test saving and restoring the grids of an actionAngleAdiabaticGrid
+def test_actionAngleAdiabaticGrid_savefilename():
+    import shutil, tempfile
+    from galpy.potential import MWPotential, MiyamotoNagaiPotential
+    from galpy.actionAngle import actionAngleAdiabaticGrid, \
+        actionAngleStaeckelGrid
+    savedir= tempfile.mkdtemp()
+    try:
+        savefilename= os.path.join(savedir,'aAAG.dat')
+        aAA= actionAngleAdiabaticGrid(pot=MWPotential,c=True,
+                                      savefilename=savefilename)
+        assert os.path.exists(savefilename), 'actionAngleAdiabaticGrid with savefilename did not save its grids'
+        aAAl= actionAngleAdiabaticGrid(pot=MWPotential,c=True,
+                                       savefilename=savefilename)
+        assert isinstance(aAAl._jr,numpy.memmap), 'actionAngleAdiabaticGrid with savefilename did not memory-map the saved grids'
+        assert not aAAl._jr.flags.writeable, 'actionAngleAdiabaticGrid grids restored from savefilename are not read-only'
+        R= numpy.array([1.,0.9,1.1,0.5])
+        vR= numpy.array([0.1,0.05,-0.1,0.2])
+        vT= numpy.array([1.,0.9,1.1,0.6])
+        z= numpy.array([0.05,0.,-0.1,0.2])
+        vz= numpy.array([0.02,0.1,0.,-0.05])
+        js= aAA(R,vR,vT,z,vz)
+        jsl= aAAl(R,vR,vT,z,vz)
+        for ii in range(3):
+            assert numpy.all(numpy.fabs(js[ii]-jsl[ii]) < 10.**-12.), 'actionAngleAdiabaticGrid restored from savefilename does not agree with the original'
+        # Grids for a different potential, grid, or class are not restored
+        mp= MiyamotoNagaiPotential(normalize=1.,a=0.5,b=0.05)
+        for kwargs in [{'pot':mp},{'pot':MWPotential,'nEz':17},
+                       {'pot':MWPotential,'gamma':0.}]:
+            try:
+                actionAngleAdiabaticGrid(c=True,savefilename=savefilename,
+                                         **kwargs)
+            except IOError: pass
+            else: raise AssertionError('actionAngleAdiabaticGrid restored grids saved for different parameters')
+        # Grids computed with different integration settings are not restored
+        for kwargs in [{'c':False},{'c':True,'epsrel':10.**-6.}]:
+            try:
+                actionAngleAdiabaticGrid(pot=MWPotential,
+                                         savefilename=savefilename,**kwargs)
+            except IOError: pass
+            else: raise AssertionError('actionAngleAdiabaticGrid restored grids saved for different integration keywords')
+        # Grids for a potential with parameters that cannot be fingerprinted
+        # are neither saved nor restored
+        mp._func= lambda x: x
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter("always",galpyWarning)
+            aAAf= actionAngleAdiabaticGrid(pot=mp,c=True,nR=8,nEz=8,
+                                           nEr=11,nLz=11,
+                                           savefilename=os.path.join(savedir,'aAAGf.dat'))
+            assert any(['cannot be fingerprinted' in str(wa.message)
+                        for wa in w]), 'actionAngleAdiabaticGrid with a potential that cannot be fingerprinted does not warn that the grids are not saved'
+        assert not os.path.exists(os.path.join(savedir,'aAAGf.dat')), 'actionAngleAdiabaticGrid with a potential that cannot be fingerprinted saved its grids'
+        try:
+            aAAf.save(os.path.join(savedir,'aAAGf.dat'))
+        except ValueError: pass
+        else: raise AssertionError('actionAngleAdiabaticGrid.save with a potential that cannot be fingerprinted did not raise ValueError')
+        try:
+            actionAngleStaeckelGrid(pot=MWPotential,delta=0.71,c=True,
+                                    savefilename=savefilename)
+        except IOError: pass
+        else: raise AssertionError('actionAngleStaeckelGrid restored grids saved by actionAngleAdiabaticGrid')
+        # save
+        aAA.save(os.path.join(savedir,'aAAG2.dat'))
+        aAAl= actionAngleAdiabaticGrid(pot=MWPotential,c=True,
+                                       savefilename=os.path.join(savedir,'aAAG2.dat'))
+        jsl= aAAl(R,vR,vT,z,vz)
+        for ii in range(3):
+            assert numpy.all(numpy.fabs(js[ii]-jsl[ii]) < 10.**-12.), 'actionAngleAdiabaticGrid restored from a file written with save does not agree with the original'
+    finally:
+        shutil.rmtree(savedir)
+    return None
+
 #Test the actionAngleAdiabatic against an isochrone potential: actions
 def test_actionAngleAdiabaticGrid_Isochrone_actions():
     from galpy.potential import IsochronePotential
@@ -1112,6 +1240,74 @@ def test_actionAngleStaeckel_otherIsochrone_angles():
     assert daz < 10.**-4., 'actionAngleStaeckel applied to isochrone potential fails for az at %g%%' % (daz*100.)
     return None
 
+#Test that an array of deltas gives the same actions as individual deltas
+def test_actionAngleStaeckel_indivdelta_actions_c():
+    from galpy.actionAngle import actionAngleStaeckel
+    from galpy.potential import MWPotential2014
+    R= numpy.array([1.,0.5,1.5,0.9])
+    vR= numpy.array([0.1,0.2,-0.1,0.05])
+    vT= numpy.array([1.,0.9,1.1,0.8])
+    z= numpy.array([0.1,0.,-0.3,0.5])
+    vz= numpy.array([0.05,0.1,0.,-0.2])
+    deltas= numpy.array([0.4,0.3,0.5,0.6])
+    aAS= actionAngleStaeckel(pot=MWPotential2014,delta=deltas,c=True)
+    jos= aAS.actionsFreqsAngles(R,vR,vT,z,vz,numpy.zeros(len(R)))
+    for ii in range(len(R)):
+        aASi= actionAngleStaeckel(pot=MWPotential2014,delta=deltas[ii],c=True)
+        josi= aASi.actionsFreqsAngles(R[ii],vR[ii],vT[ii],z[ii],vz[ii],0.)
+        for jj in range(9):
+            assert numpy.fabs(jos[jj][ii]-josi[jj]) < 10.**-10., 'actionAngleStaeckel with an array of deltas does not agree with individual deltas'
+    # Also for the Python code
+    aAS= actionAngleStaeckel(pot=MWPotential2014,delta=deltas,c=False)
+    js= aAS(R,vR,vT,z,vz)
+    for ii in range(len(R)):
+        aASi= actionAngleStaeckel(pot=MWPotential2014,delta=deltas[ii],c=False)
+        jsi= aASi(R[ii],vR[ii],vT[ii],z[ii],vz[ii])
+        for jj in range(3):
+            assert numpy.fabs(js[jj][ii]-jsi[jj]) < 10.**-10., 'actionAngleStaeckel with an array of deltas does not agree with individual deltas'
+    return None
+
+#Test that estimating delta for each object in C agrees with doing this in Python
+def test_actionAngleStaeckel_adaptivedelta_c():
+    from galpy.actionAngle import actionAngleStaeckel, estimateDeltaStaeckel
+    from galpy.potential import MWPotential2014
+    R= numpy.array([1.,0.5,1.5,0.9])
+    vR= numpy.array([0.1,0.2,-0.1,0.05])
+    vT= numpy.array([1.,0.9,1.1,0.8])
+    z= numpy.array([0.1,0.,-0.3,0.5])
+    vz= numpy.array([0.05,0.1,0.,-0.2])
+    aAS= actionAngleStaeckel(pot=MWPotential2014,adaptive_delta=True,c=True)
+    # Estimated delta should agree with estimateDeltaStaeckel off the plane
+    from galpy.actionAngle_src.actionAngleStaeckel_c import \
+        actionAngleStaeckel_estimateDelta_c
+    deltas= actionAngleStaeckel_estimateDelta_c(MWPotential2014,R,z)[0]
+    for ii in [0,2,3]:
+        assert numpy.fabs(deltas[ii]-estimateDeltaStaeckel(MWPotential2014,R[ii],z[ii])) < 10.**-5., 'Delta estimated in C does not agree with estimateDeltaStaeckel'
+    # Actions with adaptive delta should agree with those for the estimated deltas, in C and Python
+    aASd= actionAngleStaeckel(pot=MWPotential2014,delta=deltas,c=True)
+    jos= aAS.actionsFreqsAngles(R,vR,vT,z,vz,numpy.zeros(len(R)))
+    josd= aASd.actionsFreqsAngles(R,vR,vT,z,vz,numpy.zeros(len(R)))
+    for jj in range(9):
+        assert numpy.all(numpy.fabs(jos[jj]-josd[jj]) < 10.**-10.), 'actionAngleStaeckel with adaptive_delta does not agree with using the estimated deltas'
+    jos= aAS.actionsFreqs(R,vR,vT,z,vz)
+    for jj in range(6):
+        assert numpy.all(numpy.fabs(jos[jj]-josd[jj]) < 10.**-10.), 'actionAngleStaeckel with adaptive_delta does not agree with using the estimated deltas'
+    aASp= actionAngleStaeckel(pot=MWPotential2014,adaptive_delta=True,c=False)
+    js= aAS(R,vR,vT,z,vz)
+    jsp= aASp(R,vR,vT,z,vz)
+    for jj in range(3):
+        assert numpy.all(numpy.fabs(js[jj]-jsp[jj]) < 10.**-4.), 'actionAngleStaeckel with adaptive_delta does not agree between C and Python'
+    # With u0
+    aAS= actionAngleStaeckel(pot=MWPotential2014,adaptive_delta=True,c=True,
+                             useu0=True)
+    aASd= actionAngleStaeckel(pot=MWPotential2014,delta=deltas,c=True,
+                              useu0=True)
+    js= aAS(R,vR,vT,z,vz)
+    jsd= aASd(R,vR,vT,z,vz)
+    for jj in range(3):
+        assert numpy.all(numpy.fabs(js[jj]-jsd[jj]) < 10.**-10.), 'actionAngleStaeckel with adaptive_delta and useu0 does not agree with using the estimated deltas'
+    return None
+
 #Basic sanity checking of the actionAngleStaeckelGrid actions (incl. conserved, bc takes a lot of time)
 def test_actionAngleStaeckelGrid_basicAndConserved_actions():
     from galpy.actionAngle import actionAngleStaeckelGrid
@@ -1181,6 +1377,52 @@ def test_actionAngleStaeckelGrid_setuperrs():
     else: raise AssertionError('actionAngleStaeckelGrid w/o delta does not give IOError')
     return None
 
+#Test saving and restoring the grids of an actionAngleStaeckelGrid
+def test_actionAngleStaeckelGrid_savefilename():
+    import shutil, tempfile
+    from galpy.potential import MWPotential
+    from galpy.actionAngle import actionAngleStaeckelGrid
+    savedir= tempfile.mkdtemp()
+    try:
+        savefilename= os.path.join(savedir,'aASG.dat')
+        aAA= actionAngleStaeckelGrid(pot=MWPotential,delta=0.71,c=True,
+                                     nE=15,npsi=15,nLz=20,
+                                     savefilename=savefilename)
+        aAAl= actionAngleStaeckelGrid(pot=MWPotential,delta=0.71,c=True,
+                                      nE=15,npsi=15,nLz=20,
+                                      savefilename=savefilename)
+        for name in ['_jr','_jz','_u0','_jrFiltered','_jzFiltered']:
+            assert isinstance(getattr(aAAl,name),numpy.memmap), 'actionAngleStaeckelGrid with savefilename did not memory-map the saved grid %s' % name
+            assert numpy.all(getattr(aAAl,name) == getattr(aAA,name)), 'actionAngleStaeckelGrid grid %s restored from savefilename differs from the computed grid' % name
+        R= numpy.array([1.,0.9,1.1,0.5])
+        vR= numpy.array([0.1,0.05,-0.1,0.2])
+        vT= numpy.array([1.,0.9,1.1,0.6])
+        z= numpy.array([0.05,0.,-0.1,0.2])
+        vz= numpy.array([0.02,0.1,0.,-0.05])
+        js= aAA(R,vR,vT,z,vz)
+        jsl= aAAl(R,vR,vT,z,vz)
+        for ii in range(3):
+            assert numpy.all(numpy.fabs(js[ii]-jsl[ii]) < 10.**-12.), 'actionAngleStaeckelGrid restored from savefilename does not agree with the original'
+        # Grids for a different delta are not restored
+        try:
+            actionAngleStaeckelGrid(pot=MWPotential,delta=0.5,c=True,
+                                    nE=15,npsi=15,nLz=20,
+                                    savefilename=savefilename)
+        except IOError: pass
+        else: raise AssertionError('actionAngleStaeckelGrid restored grids saved for a different delta')
+        # Files that are not grid files are not restored
+        with open(os.path.join(savedir,'junk.dat'),'w') as junkfile:
+            junkfile.write('junk')
+        try:
+            actionAngleStaeckelGrid(pot=MWPotential,delta=0.71,c=True,
+                                    nE=15,npsi=15,nLz=20,
+                                    savefilename=os.path.join(savedir,'junk.dat'))
+        except IOError: pass
+        else: raise AssertionError('actionAngleStaeckelGrid restored grids from a file that is not a grid file')
+    finally:
+        shutil.rmtree(savedir)
+    return None
+
 #Test the actionAngleStaeckel against an isochrone potential: actions
 def test_actionAngleStaeckelGrid_Isochrone_actions():
     from galpy.potential import IsochronePotential
@@ -1529,6 +1771,34 @@ def test_actionAngleIsochroneApprox_bovy14():
     assert maxdj[2] < 2.*10.**-2., 'Jz conservation for the GD-1 like orbit of Bovy (2014) fails at %f%%' % (100.*maxdj[2])
     return None
 
+#Test that evaluating actionAngleIsochroneApprox for arrays, which integrates all orbits at once, agrees with evaluating it for a list of Orbits
+def test_actionAngleIsochroneApprox_arrays_vs_orbits():
+    from galpy.potential import LogarithmicHaloPotential
+    from galpy.actionAngle import actionAngleIsochroneApprox
+    from galpy.orbit import Orbit
+    lp= LogarithmicHaloPotential(normalize=1.,q=0.9)
+    aAI= actionAngleIsochroneApprox(pot=lp,b=0.8,tintJ=50.,ntintJ=2000)
+    R= numpy.array([1.56148083,1.1,0.9])
+    vR= numpy.array([0.35081535,0.3,-0.1])
+    vT= numpy.array([-1.15481504,1.2,0.8])
+    z= numpy.array([0.88719443,0.2,-0.1])
+    vz= numpy.array([-0.47713334,0.5,0.2])
+    phi= numpy.array([0.12019596,2.,4.])
+    js= aAI(R,vR,vT,z,vz,phi)
+    jso= aAI([Orbit([R[ii],vR[ii],vT[ii],z[ii],vz[ii],phi[ii]])
+              for ii in range(len(R))])
+    for jj in range(3):
+        assert numpy.all(numpy.fabs(js[jj]-jso[jj]) < 10.**-8.*numpy.fabs(jso[jj])), 'actionAngleIsochroneApprox actions for arrays do not agree with those for a list of Orbits'
+    jfa= aAI.actionsFreqsAngles(R,vR,vT,z,vz,phi)
+    jfao= aAI.actionsFreqsAngles([Orbit([R[ii],vR[ii],vT[ii],z[ii],vz[ii],
+                                         phi[ii]])
+                                  for ii in range(len(R))])
+    for jj in range(6):
+        assert numpy.all(numpy.fabs(jfa[jj]-jfao[jj]) < 10.**-5.*numpy.fabs(jfao[jj])), 'actionAngleIsochroneApprox actions and frequencies for arrays do not agree with those for a list of Orbits'
+    for jj in range(6,9):
+        assert numpy.all(numpy.fabs(((jfa[jj]-jfao[jj]+numpy.pi) % (2.*numpy.pi))-numpy.pi) < 10.**-5.), 'actionAngleIsochroneApprox angles for arrays do not agree with those for a list of Orbits'
+    return None
+
 #Test the actionAngleIsochroneApprox for a triaxial potential
 def test_actionAngleIsochroneApprox_triaxialnfw_conserved_actions():   
     from galpy.potential import TriaxialNFWPotential
@@ -2368,6 +2638,68 @@ def test_estimateDeltaStaeckel_spherical():
         'Estimated focal parameter delta when estimateDeltaStaeckel is applied to a spherical potential is wrong'
     return None
 
+# Test that computeActionsChunked agrees with evaluating all objects at once
+def test_computeActionsChunked():
+    import tempfile
+    from galpy.potential import IsochronePotential
+    from galpy.actionAngle import actionAngleIsochrone, computeActionsChunked
+    ip= IsochronePotential(normalize=1.,b=1.2)
+    aAI= actionAngleIsochrone(ip=ip)
+    numpy.random.seed(1)
+    ndata= 1003
+    data= numpy.empty((ndata,6))
+    data[:,0]= numpy.random.uniform(size=ndata)+0.5
+    data[:,1]= numpy.random.normal(size=ndata)*0.1
+    data[:,2]= numpy.random.normal(size=ndata)*0.1+1.
+    data[:,3]= numpy.random.normal(size=ndata)*0.1
+    data[:,4]= numpy.random.normal(size=ndata)*0.1
+    data[:,5]= numpy.random.uniform(size=ndata)*2.*numpy.pi
+    jfa= aAI.actionsFreqsAngles(*data.T.copy())
+    tmpdir= tempfile.mkdtemp()
+    try:
+        numpy.save(os.path.join(tmpdir,'data.npy'),data)
+        # .npy input and output, serial and on multiple cores
+        for numcores in [1,2]:
+            out= computeActionsChunked(aAI,os.path.join(tmpdir,'data.npy'),
+                                       os.path.join(tmpdir,'out.npy'),
+                                       method='actionsFreqsAngles',
+                                       chunksize=100,numcores=numcores)
+            assert out.shape == (ndata,9), 'computeActionsChunked output does not have the expected shape'
+            for ii in range(9):
+                assert numpy.all(numpy.fabs(out[:,ii]-jfa[ii]) < 10.**-10.), 'computeActionsChunked does not agree with evaluating all objects at once'
+            del out
+            out= numpy.load(os.path.join(tmpdir,'out.npy'))
+            for ii in range(9):
+                assert numpy.all(numpy.fabs(out[:,ii]-jfa[ii]) < 10.**-10.), 'computeActionsChunked output file does not agree with evaluating all objects at once'
+        # phi is passed to the actionAngle method whenever the input has it
+        nargs= []
+        def aAphi(*args,**kwargs):
+            nargs.append(len(args))
+            return aAI(*args,**kwargs)
+        out= computeActionsChunked(aAphi,os.path.join(tmpdir,'data.npy'),
+                                   os.path.join(tmpdir,'out.npy'),
+                                   chunksize=500)
+        assert numpy.all(numpy.array(nargs) == 6), 'computeActionsChunked does not pass phi to the actionAngle method when the input has it'
+        for ii in range(3):
+            assert numpy.all(numpy.fabs(out[:,ii]-jfa[ii]) < 10.**-10.), 'computeActionsChunked does not agree with evaluating all objects at once'
+        del out
+        # List of columns as input and function output
+        outjs= numpy.empty((ndata,3))
+        def output(indx,js):
+            for ii in range(3): outjs[indx,ii]= js[ii]
+            return None
+        out= computeActionsChunked(aAI,list(data.T[:5]),output,
+                                   chunksize=300,numcores=2)
+        assert out is None, 'computeActionsChunked with function output should return None'
+        for ii in range(3):
+            assert numpy.all(numpy.fabs(outjs[:,ii]-jfa[ii]) < 10.**-10.), 'computeActionsChunked with function output does not agree with evaluating all objects at once'
+    finally:
+        for filename in ['data.npy','out.npy']:
+            if os.path.exists(os.path.join(tmpdir,filename)):
+                os.remove(os.path.join(tmpdir,filename))
+        os.rmdir(tmpdir)
+    return None
+
 # Test that setting up the non-spherical actionAngle routines raises a warning when using MWPotential, see #229
 def test_MWPotential_warning_adiabatic():
     # Test that using MWPotential throws a warning, see #229
@@ -949,3 +949,129 @@ def test_interpolation_potential_verticalfreq_notinterpolated():
         assert vfdiff < 10.**-10., 'RZPot interpolation w/ interpRZPotential fails when the potential was not interpolated at R = %g by %g' % (r,vfdiff)
     return None
 
+
+def test_interpolation_cache():
+    # Test that grids are stored in and loaded from the on-disk cache
+    import os, shutil, tempfile
+    cachedir= tempfile.mkdtemp()
+    try:
+        kwargs= {'rgrid':(0.01,2.,21),'zgrid':(0.,0.2,11),'logR':False,
+                 'interpPot':True,'interpRforce':True,'interpzforce':True,
+                 'interpDens':True,'interpvcirc':True,'interpdvcircdr':True,
+                 'interpepifreq':True,'interpverticalfreq':True,
+                 'zsym':True}
+        rzpot= potential.interpRZPotential(RZPot=potential.MWPotential,
+                                           **kwargs)
+        rzpot_cache= potential.interpRZPotential(RZPot=potential.MWPotential,
+                                                 cachedir=cachedir,**kwargs)
+        assert len(os.listdir(cachedir)) == 1, 'interpRZPotential grid cache should contain a single entry'
+        rzpot_load= potential.interpRZPotential(RZPot=potential.MWPotential,
+                                                cachedir=cachedir,**kwargs)
+        for name in ['_potGrid','_rforceGrid','_zforceGrid','_densGrid',
+                     '_vcircGrid','_dvcircdrGrid','_epifreqGrid',
+                     '_verticalfreqGrid']:
+            assert isinstance(getattr(rzpot_load,name),numpy.memmap), 'interpRZPotential grid %s was not loaded from the cache' % name
+            assert numpy.all(numpy.fabs(getattr(rzpot_load,name)-getattr(rzpot_cache,name)) < 10.**-16.), 'interpRZPotential grid %s loaded from the cache differs from the computed grid' % name
+        rs= numpy.linspace(0.1,1.9,11)
+        zs= numpy.linspace(0.,0.19,11)
+        assert numpy.all(numpy.fabs(rzpot_load(rs,zs)-rzpot(rs,zs)) < 10.**-10.), 'interpRZPotential loaded from the cache does not agree with that computed without the cache'
+        assert numpy.all(numpy.fabs(rzpot_load.Rforce(rs,zs)-rzpot.Rforce(rs,zs)) < 10.**-10.), 'interpRZPotential loaded from the cache does not agree with that computed without the cache'
+        assert numpy.all(numpy.fabs(rzpot_load.vcirc(rs)-rzpot.vcirc(rs)) < 10.**-10.), 'interpRZPotential loaded from the cache does not agree with that computed without the cache'
+        # Spline coefficients for the C interpolation are also cached
+        kwargs['enable_c']= True
+        rzpot_cache= potential.interpRZPotential(RZPot=potential.MWPotential,
+                                                 cachedir=cachedir,**kwargs)
+        rzpot_load= potential.interpRZPotential(RZPot=potential.MWPotential,
+                                                cachedir=cachedir,**kwargs)
+        for name in ['_potGrid_splinecoeffs','_rforceGrid_splinecoeffs',
+                     '_zforceGrid_splinecoeffs']:
+            assert isinstance(getattr(rzpot_load,name),numpy.memmap), 'interpRZPotential spline coefficients %s were not loaded from the cache' % name
+            assert numpy.all(numpy.fabs(getattr(rzpot_load,name)-getattr(rzpot_cache,name)) < 10.**-16.), 'interpRZPotential spline coefficients %s loaded from the cache differ from the computed ones' % name
+        assert len(os.listdir(cachedir)) == 1, 'interpRZPotential grid cache should contain a single entry'
+        kwargs['enable_c']= False
+        # A different potential or grid gives a new entry
+        lp= potential.LogarithmicHaloPotential(normalize=1.)
+        potential.interpRZPotential(RZPot=lp,cachedir=cachedir,**kwargs)
+        kwargs['rgrid']= (0.01,2.,31)
+        potential.interpRZPotential(RZPot=potential.MWPotential,
+                                    cachedir=cachedir,**kwargs)
+        assert len(os.listdir(cachedir)) == 3, 'interpRZPotential grid cache should contain three entries'
+        # A potential with parameters that cannot be fingerprinted does not
+        # use the cache, because the grids of a different potential could
+        # be returned
+        import warnings
+        from galpy.util import galpyWarning
+        lp= potential.LogarithmicHaloPotential(normalize=1.)
+        lp._func= lambda x: x
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter("always",galpyWarning)
+            potential.interpRZPotential(RZPot=lp,cachedir=cachedir,**kwargs)
+            assert any(['cannot be fingerprinted' in str(wa.message)
+                        for wa in w]), 'interpRZPotential with a potential that cannot be fingerprinted does not warn that the cache is not used'
+        assert len(os.listdir(cachedir)) == 3, 'interpRZPotential with a potential that cannot be fingerprinted should not add to the grid cache'
+    finally:
+        shutil.rmtree(cachedir)
+    return None
+
+def test_interp3d_potential():
+    # Test that interp3DPotential interpolates a non-axisymmetric potential
+    from galpy.orbit import Orbit
+    lp= potential.LogarithmicHaloPotential(normalize=1.)
+    bp= potential.SoftenedNeedleBarPotential(normalize=0.1,a=1.,c=0.5,
+                                             omegab=1.5)
+    pot= [lp,bp]
+    ip= potential.interp3DPotential(pot=pot,
+                                    rgrid=(numpy.log(0.1),numpy.log(5.),101),
+                                    zgrid=(0.,1.,51),nphi=64,omegab=1.5)
+    numpy.random.seed(1)
+    rs= numpy.random.uniform(0.3,3.,101)
+    zs= numpy.random.uniform(-0.5,0.5,101)
+    phis= numpy.random.uniform(0.,2.*numpy.pi,101)
+    ts= numpy.random.uniform(0.,3.,101)
+    for func,tol in zip([potential.evaluatePotentials,
+                         potential.evaluateRforces,
+                         potential.evaluatezforces,
+                         potential.evaluatephiforces],
+                        [10.**-6.,10.**-5.,10.**-4.,10.**-4.]):
+        assert numpy.all(numpy.fabs(func(ip,rs,zs,phi=phis,t=ts,c=False)
+                                    -func(pot,rs,zs,phi=phis,t=ts,c=False)) < tol), 'interp3DPotential interpolation of %s fails' % func.__name__
+        # Python and C implementations should agree
+        assert numpy.all(numpy.fabs(func(ip,rs,zs,phi=phis,t=ts,c=False)
+                                    -func(ip,rs,zs,phi=phis,t=ts,c=True)) < 10.**-12.), 'interp3DPotential C and Python implementations of %s disagree' % func.__name__
+    # Scalar input
+    assert numpy.fabs(ip(1.,0.1,phi=0.3,t=1.)-potential.evaluatePotentials(pot,1.,0.1,phi=0.3,t=1.)) < 10.**-6., 'interp3DPotential interpolation fails for scalar input'
+    # Orbits integrated in C in the interpolated and original potentials agree
+    o= Orbit([1.,0.1,1.1,0.1,0.,0.])
+    oi= o()
+    times= numpy.linspace(0.,20.,1001)
+    o.integrate(times,pot,method='dopr54_c')
+    oi.integrate(times,ip,method='dopr54_c')
+    assert numpy.all(numpy.fabs(o.x(times)-oi.x(times)) < 10.**-4.), 'Orbit integrated in interp3DPotential does not agree with that in the original potential'
+    assert numpy.all(numpy.fabs(o.y(times)-oi.y(times)) < 10.**-4.), 'Orbit integrated in interp3DPotential does not agree with that in the original potential'
+    # Jacobi integral is conserved in the rotating interpolated potential
+    oi.integrate(times,ip,method='symplec4_c')
+    assert numpy.std(oi.Jacobi(times,pot=ip,OmegaP=1.5)) < 10.**-8., 'Jacobi integral is not conserved for orbit integrated in interp3DPotential'
+    # Planar orbits
+    o= Orbit([1.,0.1,1.1,0.])
+    oi= o()
+    o.integrate(times,potential.toPlanarPotential(pot),method='dopr54_c')
+    oi.integrate(times,potential.toPlanarPotential(ip),method='dopr54_c')
+    assert numpy.all(numpy.fabs(o.x(times)-oi.x(times)) < 10.**-4.), 'Planar orbit integrated in interp3DPotential does not agree with that in the original potential'
+    return None
+
+def test_interp3d_potential_pythongrid():
+    # Test interp3DPotential for a potential without C implementation and
+    # w/o zsym and logR
+    fp= potential.FerrersPotential(normalize=0.2,a=1.,b=0.5,c=0.3)
+    ip= potential.interp3DPotential(pot=fp,rgrid=(0.3,1.5,13),
+                                    zgrid=(-0.2,0.2,9),nphi=16,
+                                    logR=False,zsym=False)
+    assert numpy.fabs(ip(1.,0.1,phi=0.3)-fp(1.,0.1,phi=0.3)) < 10.**-3., 'interp3DPotential interpolation fails for FerrersPotential'
+    # Grid points are reproduced exactly
+    assert numpy.fabs(ip(0.7,-0.05,phi=numpy.pi/4.)-fp(0.7,-0.05,phi=numpy.pi/4.)) < 10.**-10., 'interp3DPotential does not reproduce the potential at the grid points'
+    # Setting up an interp3DPotential w/ another interp3DPotential raises an error
+    try:
+        potential.interp3DPotential(pot=ip)
+    except potential.PotentialError: pass
+    else: raise AssertionError('Setting up an interp3DPotential w/ another interp3DPotential did not raise PotentialError')
+    return None
@@ -113,7 +113,8 @@ def test_energy_jacobi_conservation():
     pots.append('mockSlowFlatDehnenSmoothBarPotential')
     rmpots= ['Potential','MWPotential','MWPotential2014',
              'MovingObjectPotential',
-             'interpRZPotential', 'linearPotential', 'planarAxiPotential',
+             'interpRZPotential', 'interp3DPotential', 'linearPotential',
+             'planarAxiPotential',
              'planarPotential', 'verticalPotential','PotentialError',
              'SnapshotRZPotential','InterpSnapshotRZPotential']
     if False: #_TRAVIS: #travis CI
@@ -159,8 +160,7 @@ def test_energy_jacobi_conservation():
                     and ('Spiral' in p or 'Lopsided' in p \
                              or 'Dehnen' in p): ttimes= growtimes
             elif integrator == 'dopr54_c' \
-                    and not 'MovingObject' in p \
-                    and not p == 'FerrersPotential': ttimes= times
+                    and not 'MovingObject' in p: ttimes= times
             else: ttimes= fasttimes
             #First track azimuth
             o= setup_orbit_energy(tp,axi=False)
@@ -500,7 +500,8 @@ def test_liouville_planar():
     pots.append('mockSlowFlatDehnenSmoothBarPotential')
     rmpots= ['Potential','MWPotential','MWPotential2014',
              'MovingObjectPotential',
-             'interpRZPotential', 'linearPotential', 'planarAxiPotential',
+             'interpRZPotential', 'interp3DPotential', 'linearPotential',
+             'planarAxiPotential',
              'planarPotential', 'verticalPotential','PotentialError',
              'SnapshotRZPotential','InterpSnapshotRZPotential']
     #rmpots.append('BurkertPotential')
@@ -522,7 +523,6 @@ def test_liouville_planar():
     tol['default']= -8.
     tol['KeplerPotential']= -7. #more difficult
     tol['TriaxialNFWPotential']= -4. #more difficult
-    tol['FerrersPotential']= -2.
     firstTest= True
     for p in pots:
         #Setup instance of potential
@@ -538,8 +538,7 @@ def test_liouville_planar():
         if hasattr(tp,'toPlanar'):
             ptp= tp.toPlanar()
         for integrator in integrators:
-            if integrator == 'odeint' or not tp.hasC \
-                and not p == 'FerrersPotential' : ttol= -4.
+            if integrator == 'odeint' or not tp.hasC: ttol= -4.
             if True: ttimes= times
             o= setup_orbit_liouville(ptp,axi=False)
             #Calculate the Jacobian d x / d x
@@ -613,7 +612,8 @@ def test_eccentricity():
     pots.append('testplanarMWPotential')
     rmpots= ['Potential','MWPotential','MWPotential2014',
              'MovingObjectPotential',
-             'interpRZPotential', 'linearPotential', 'planarAxiPotential',
+             'interpRZPotential', 'interp3DPotential', 'linearPotential',
+             'planarAxiPotential',
              'planarPotential', 'verticalPotential','PotentialError',
              'SnapshotRZPotential','InterpSnapshotRZPotential']
     if False: #_TRAVIS: #travis CI
@@ -733,7 +733,8 @@ def test_pericenter():
     pots.append('testplanarMWPotential')
     rmpots= ['Potential','MWPotential','MWPotential2014',
              'MovingObjectPotential',
-             'interpRZPotential', 'linearPotential', 'planarAxiPotential',
+             'interpRZPotential', 'interp3DPotential', 'linearPotential',
+             'planarAxiPotential',
              'planarPotential', 'verticalPotential','PotentialError',
              'SnapshotRZPotential','InterpSnapshotRZPotential']
     if False: #_TRAVIS: #travis CI
@@ -852,7 +853,8 @@ def test_apocenter():
     pots.append('testplanarMWPotential')
     rmpots= ['Potential','MWPotential','MWPotential2014',
              'MovingObjectPotential',
-             'interpRZPotential', 'linearPotential', 'planarAxiPotential',
+             'interpRZPotential', 'interp3DPotential', 'linearPotential',
+             'planarAxiPotential',
              'planarPotential', 'verticalPotential','PotentialError',
              'SnapshotRZPotential','InterpSnapshotRZPotential']
     if False: #_TRAVIS: #travis CI
@@ -971,7 +973,8 @@ def test_zmax():
     pots.append('testMWPotential')
     rmpots= ['Potential','MWPotential','MWPotential2014',
              'MovingObjectPotential',
-             'interpRZPotential', 'linearPotential', 'planarAxiPotential',
+             'interpRZPotential', 'interp3DPotential', 'linearPotential',
+             'planarAxiPotential',
              'planarPotential', 'verticalPotential','PotentialError',
              'SnapshotRZPotential','InterpSnapshotRZPotential']
     if False: #_TRAVIS: #travis CI
@@ -1077,7 +1080,8 @@ def test_analytic_ecc_rperi_rap():
     pots.append('testplanarMWPotential')
     rmpots= ['Potential','MWPotential','MWPotential2014',
              'MovingObjectPotential',
-             'interpRZPotential', 'linearPotential', 'planarAxiPotential',
+             'interpRZPotential', 'interp3DPotential', 'linearPotential',
+             'planarAxiPotential',
              'planarPotential', 'verticalPotential','PotentialError',
              'SnapshotRZPotential','InterpSnapshotRZPotential']
     if False: #_TRAVIS: #travis CI
@@ -1283,7 +1287,8 @@ def test_analytic_zmax():
     pots.append('testMWPotential')
     rmpots= ['Potential','MWPotential','MWPotential2014',
              'MovingObjectPotential',
-             'interpRZPotential', 'linearPotential', 'planarAxiPotential',
+             'interpRZPotential', 'interp3DPotential', 'linearPotential',
+             'planarAxiPotential',
              'planarPotential', 'verticalPotential','PotentialError',
              'SnapshotRZPotential','InterpSnapshotRZPotential']
     if False: #_TRAVIS: #travis CI
@@ -3222,6 +3227,472 @@ def test_orbitint_pythonfallback():
         assert raisedWarning, "Orbit integration did not raise fallback warning"
     return None
 
+# Test that integrating multiple orbits at once in C gives the same result as
+# integrating them one at a time
+def test_integrateFullOrbit_c_multiple():
+    from galpy.orbit_src.integrateFullOrbit import integrateFullOrbit_c
+    integrators= ['dopr54_c',
+                  'leapfrog_c',
+                  'rk4_c','rk6_c',
+                  'symplec4_c','symplec6_c']
+    pot= potential.MWPotential2014
+    yos= numpy.array([[1.,0.,0.,0.1,1.1,0.1],
+                      [0.9,0.1,0.05,-0.1,1.,0.2],
+                      [1.2,-0.1,-0.1,0.3,0.8,-0.05]])
+    ts= numpy.linspace(0.,10.,101)
+    for integrator in integrators:
+        out, err= integrateFullOrbit_c(pot,yos,ts,integrator)
+        assert out.shape == (3,len(ts),6), 'integrateFullOrbit_c for multiple objects does not return an array with the expected shape'
+        assert err.shape == (3,), 'integrateFullOrbit_c for multiple objects does not return an error array with the expected shape'
+        for ii in range(len(yos)):
+            oout, oerr= integrateFullOrbit_c(pot,yos[ii],ts,integrator)
+            assert numpy.all(numpy.fabs(out[ii]-oout) < 10.**-10.), 'integrateFullOrbit_c for multiple objects does not agree with integrating each object separately for integrator %s' % integrator
+            assert err[ii] == oerr, 'integrateFullOrbit_c for multiple objects does not return the same error as integrating each object separately'
+    return None
+
+# Test that integrating multiple orbits in parallel with OpenMP gives the
+# same result independent of the number of threads
+def test_integrateOrbit_c_multiple_numcores():
+    from galpy.orbit_src.integrateFullOrbit import integrateFullOrbit_c
+    from galpy.orbit_src.integratePlanarOrbit import integratePlanarOrbit_c
+    integrators= ['dopr54_c','leapfrog_c','rk4_c','symplec4_c']
+    ts= numpy.linspace(0.,10.,101)
+    numpy.random.seed(1)
+    nobj= 11
+    # Full orbits, include interpRZPotential, which caches in the accelerators
+    fpot= [potential.MWPotential2014[0],
+           potential.interpRZPotential(RZPot=potential.MWPotential2014[1],
+                                       rgrid=(0.5,1.5,51),
+                                       zgrid=(0.,0.5,51),
+                                       logR=False,
+                                       interpPot=True,interpRforce=True,
+                                       interpzforce=True,enable_c=True,
+                                       zsym=True),
+           potential.MWPotential2014[2]]
+    fyos= numpy.tile(numpy.array([1.,0.,0.,0.1,1.,0.1]),(nobj,1))
+    fyos[:,0]+= 0.1*numpy.random.uniform(size=nobj)-0.05
+    fyos[:,3]+= 0.1*numpy.random.normal(size=nobj)
+    # Planar orbits
+    ppot= [p.toPlanar() for p in potential.MWPotential2014]
+    pyos= fyos[:,[0,3,4,5]]
+    for integrator in integrators:
+        fout1, ferr1= integrateFullOrbit_c(fpot,fyos,ts,integrator,numcores=1)
+        fout, ferr= integrateFullOrbit_c(fpot,fyos,ts,integrator,numcores=4)
+        assert numpy.all(numpy.fabs(fout1-fout) < 10.**-10.), 'integrateFullOrbit_c with multiple threads does not agree with a single thread for integrator %s' % integrator
+        assert numpy.all(ferr1 == ferr), 'integrateFullOrbit_c with multiple threads does not return the same errors as a single thread'
+        pout1, perr1= integratePlanarOrbit_c(ppot,pyos,ts,integrator,numcores=1)
+        pout, perr= integratePlanarOrbit_c(ppot,pyos,ts,integrator)
+        assert pout.shape == (nobj,len(ts),4), 'integratePlanarOrbit_c for multiple objects does not return an array with the expected shape'
+        assert numpy.all(numpy.fabs(pout1-pout) < 10.**-10.), 'integratePlanarOrbit_c with multiple threads does not agree with a single thread for integrator %s' % integrator
+        assert numpy.all(perr1 == perr), 'integratePlanarOrbit_c with multiple threads does not return the same errors as a single thread'
+        for ii in range(nobj):
+            oout, oerr= integratePlanarOrbit_c(ppot,pyos[ii],ts,integrator)
+            assert numpy.all(numpy.fabs(pout[ii]-oout) < 10.**-10.), 'integratePlanarOrbit_c for multiple objects does not agree with integrating each object separately for integrator %s' % integrator
+    return None
+
+# Test that the dense output of the Runge-Kutta integrators agrees with
+# integrating on a fine time grid
+def test_integrate_dense():
+    from galpy.orbit import Orbit
+    ts= numpy.linspace(0.,20.,21)
+    tsf= numpy.linspace(0.,20.,2001)
+    for vxvv in [[1.,0.1,1.1,0.1,0.05,0.3],[1.,0.1,1.1,0.3]]:
+        for integrator in ['rk4_c','rk6_c','dopr54_c']:
+            for sgn in [1.,-1.]:
+                o= Orbit(vxvv)
+                o.integrate(sgn*ts,potential.MWPotential2014,method=integrator,
+                            dense=True)
+                oc= Orbit(vxvv)
+                oc.integrate(sgn*ts,potential.MWPotential2014,
+                             method=integrator)
+                assert numpy.all(numpy.fabs(o.getOrbit()-oc.getOrbit()) < 10.**-10.), 'Orbit integration with dense output does not agree with that without at the output times for integrator %s' % integrator
+                of= Orbit(vxvv)
+                of.integrate(sgn*tsf,potential.MWPotential2014,
+                             method=integrator)
+                for func in ['x','y','vx','vy','R','vR','vT','z','vz']:
+                    if len(vxvv) == 4 and func in ['z','vz']: continue
+                    assert numpy.all(numpy.fabs(getattr(o,func)(sgn*tsf)-getattr(of,func)(sgn*tsf)) < 10.**-5.), 'Orbit.%s using dense output does not agree with integrating on a fine grid for integrator %s' % (func,integrator)
+                assert numpy.fabs(o.phi(sgn*1.2345)-of.phi(sgn*1.2345)) < 10.**-5., 'Orbit.phi using dense output does not agree with integrating on a fine grid for integrator %s' % integrator
+                # Outside of the integrated range should raise
+                with pytest.raises(ValueError) as excinfo:
+                    o.x(sgn*21.)
+    # Re-integrating without dense output should remove the dense output
+    o.integrate(ts,potential.MWPotential2014,method='dopr54_c')
+    assert not hasattr(o._orb,'_dense'), 'Re-integrating without dense output does not remove the dense output'
+    # Dense output is only supported for the Runge-Kutta integrators
+    with pytest.raises(ValueError) as excinfo:
+        o.integrate(ts,potential.MWPotential2014,method='symplec4_c',
+                    dense=True)
+    # and for orbits that include phi
+    o= Orbit([1.,0.1,1.1,0.1,0.05])
+    with pytest.raises(NotImplementedError) as excinfo:
+        o.integrate(ts,potential.MWPotential2014,method='dopr54_c',
+                    dense=True)
+    # Without C, requesting dense output should warn
+    bp= BurkertPotentialNoC()
+    bp.normalize(1.)
+    for vxvv in [[1.,0.1,1.1,0.1,0.05,0.3],[1.,0.1,1.1,0.3]]:
+        o= Orbit(vxvv)
+        with pytest.warns(galpyWarning) as record:
+            o.integrate(ts,bp,method='dopr54_c',dense=True)
+        assert any(['Dense output was requested' in str(rec.message)
+                    for rec in record]), 'Requesting dense output without C did not warn'
+        assert not hasattr(o._orb,'_dense'), 'Orbit has dense output even though it was not integrated in C'
+    return None
+
+# Test that the events detected during the integration are accurate
+def test_integrate_events():
+    from galpy.orbit import Orbit
+    ts= numpy.linspace(0.,50.,101)
+    tsf= numpy.linspace(0.,50.,100001)
+    vxvv= [1.,0.1,1.1,0.1,0.05,0.3]
+    of= Orbit(vxvv)
+    of.integrate(tsf,potential.MWPotential2014,method='dopr54_c')
+    # Expected numbers of events from sign changes along the finely-sampled
+    # orbit: dr/dt from - to + (pericenter) and + to - (apocenter), z, vz,
+    # and y=R sin(phi) with vy > 0
+    drdt= of.R(tsf)*of.vR(tsf)+of.z(tsf)*of.vz(tsf)
+    y= of.R(tsf)*numpy.sin(of.phi(tsf))
+    expected_nevents= [numpy.sum((drdt[:-1] < 0.)*(drdt[1:] >= 0.)),
+                       numpy.sum((drdt[:-1] > 0.)*(drdt[1:] <= 0.)),
+                       numpy.sum(numpy.diff(numpy.sign(of.z(tsf))) != 0),
+                       numpy.sum(numpy.diff(numpy.sign(of.vz(tsf))) != 0),
+                       numpy.sum((y[:-1] < 0.)*(y[1:] >= 0.))]
+    for integrator in ['leapfrog_c','symplec4_c','symplec6_c','rk4_c',
+                       'rk6_c','dopr54_c']:
+        o= Orbit(vxvv)
+        o.integrate(ts,potential.MWPotential2014,method=integrator,
+                    events=['pericenter','apocenter','zcross','zmax',
+                            ([0.,1.,0.,0.,0.,0.],0.,1)])
+        ev= o.getEvents()
+        assert [len(e[0]) for e in ev] == expected_nevents, 'Number of detected events is not as expected for integrator %s' % integrator
+        # Pericenters and apocenters: vR=0
+        assert numpy.all(numpy.fabs(ev[0][1][:,1]*ev[0][1][:,0]+ev[0][1][:,3]*ev[0][1][:,4]) < 10.**-8.), 'Pericenter events do not have dr/dt=0 for integrator %s' % integrator
+        assert numpy.all(numpy.fabs(ev[1][1][:,1]*ev[1][1][:,0]+ev[1][1][:,3]*ev[1][1][:,4]) < 10.**-8.), 'Apocenter events do not have dr/dt=0 for integrator %s' % integrator
+        assert numpy.all(ev[1][1][:,0]**2.+ev[1][1][:,3]**2. > ev[0][1][0,0]**2.+ev[0][1][0,3]**2.), 'Apocenter events are not further out than pericenter events for integrator %s' % integrator
+        assert numpy.all(numpy.fabs(of.R(ev[0][0])-ev[0][1][:,0]) < 10.**-7.), 'Pericenter events are not on the orbit for integrator %s' % integrator
+        # z=0 crossings and vertical turning points
+        assert numpy.all(numpy.fabs(ev[2][1][:,3]) < 10.**-10.), 'z crossing events do not have z=0 for integrator %s' % integrator
+        assert numpy.all(numpy.fabs(ev[3][1][:,4]) < 10.**-10.), 'zmax events do not have vz=0 for integrator %s' % integrator
+        # Surface of section y=0 with vy > 0
+        assert numpy.all(numpy.fabs(numpy.sin(ev[4][1][:,5])) < 10.**-10.), 'Surface of section events are not on the surface for integrator %s' % integrator
+        assert numpy.all(ev[4][1][:,2]*numpy.cos(ev[4][1][:,5]) > 0.), 'Surface of section events do not cross in the requested direction for integrator %s' % integrator
+        assert numpy.all(numpy.fabs(numpy.diff(ev[0][0])) > 0.), 'Pericenter events are not ordered in time'
+        # rperi, rap, and zmax should now agree with those of the finely-sampled orbit
+        assert numpy.fabs(o.rperi()-of.rperi()) < 10.**-7., 'Orbit.rperi using events does not agree with that of a finely sampled orbit for integrator %s' % integrator
+        assert numpy.fabs(o.rap()-of.rap()) < 10.**-7., 'Orbit.rap using events does not agree with that of a finely sampled orbit for integrator %s' % integrator
+        assert numpy.fabs(o.zmax()-of.zmax()) < 10.**-7., 'Orbit.zmax using events does not agree with that of a finely sampled orbit for integrator %s' % integrator
+        assert numpy.fabs(o.e()-of.e()) < 10.**-7., 'Orbit.e using events does not agree with that of a finely sampled orbit for integrator %s' % integrator
+    # Planar orbit, also integrate backwards
+    po= Orbit([1.,0.1,1.1,0.3])
+    pof= Orbit([1.,0.1,1.1,0.3])
+    pof.integrate(-tsf,potential.MWPotential2014,method='dopr54_c')
+    for integrator in ['symplec4_c','dopr54_c']:
+        po.integrate(-ts,potential.MWPotential2014,method=integrator,
+                     events=['pericenter','apocenter'])
+        ev= po.getEvents()
+        assert numpy.all(numpy.fabs(ev[0][1][:,1]) < 10.**-8.), 'Pericenter events do not have vR=0 for planar orbit for integrator %s' % integrator
+        assert numpy.all(numpy.diff(ev[0][0]) < 0.), 'Pericenter events are not ordered in time for backward integration for integrator %s' % integrator
+        assert numpy.fabs(po.rperi()-pof.rperi()) < 10.**-7., 'Orbit.rperi using events does not agree with that of a finely sampled orbit for integrator %s' % integrator
+        assert numpy.fabs(po.rap()-pof.rap()) < 10.**-7., 'Orbit.rap using events does not agree with that of a finely sampled orbit for integrator %s' % integrator
+    # Errors
+    with pytest.raises(ValueError) as excinfo:
+        po.integrate(ts,potential.MWPotential2014,method='dopr54_c',
+                     events=['zcross'])
+    with pytest.raises(ValueError) as excinfo:
+        po.integrate(ts,potential.MWPotential2014,method='odeint',
+                     events=['pericenter'])
+    with pytest.raises(ValueError) as excinfo:
+        po.integrate(ts,potential.MWPotential2014,method='dopr54_c',
+                     events=[([1.,0.,0.],0.)])
+    po.integrate(ts,potential.MWPotential2014,method='dopr54_c')
+    with pytest.raises(AttributeError) as excinfo:
+        po.getEvents()
+    return None
+
+# Test that the block-timestep symplectic integrators accurately integrate
+# highly eccentric orbits without long-term energy drift
+def test_integrate_block():
+    from galpy.orbit import Orbit
+    pot= potential.HernquistPotential(normalize=1.,a=0.5)
+    ts= numpy.linspace(0.,200.,1001)
+    tsl= numpy.linspace(0.,4000.,1001)
+    vxvv= [2.,0.,0.05,0.,0.01,0.]
+    for integrator in ['symplec4_block_c','symplec6_block_c']:
+        for planar in [False,True]:
+            if planar:
+                o= Orbit([2.,0.,0.05,0.])
+                ob= Orbit([2.,0.,0.05,0.])
+                od= Orbit([2.,0.,0.05,0.])
+            else:
+                o= Orbit(vxvv)
+                ob= Orbit(vxvv)
+                od= Orbit(vxvv)
+            od.integrate(ts,pot,method='dopr54_c')
+            o.integrate(ts,pot,method=integrator)
+            assert numpy.all(numpy.fabs(o.x(ts)-od.x(ts)) < 10.**-4.), 'Block-timestep integrator %s does not agree with dopr54_c for a highly eccentric orbit' % integrator
+            assert numpy.fabs(o.rperi()/od.rperi()-1.) < 10.**-4., 'Block-timestep integrator %s does not agree with dopr54_c for a highly eccentric orbit' % integrator
+            # Energy does not drift
+            ob.integrate(tsl,pot,method=integrator)
+            E= ob.E(tsl)
+            assert numpy.all(numpy.fabs(E/E[0]-1.) < 10.**-6.), 'Block-timestep integrator %s does not conserve energy' % integrator
+        # Fixed-step integrator with the same tolerance fails for this orbit
+        o= Orbit(vxvv)
+        o.integrate(ts,pot,method=integrator.replace('_block',''))
+        assert numpy.amax(numpy.fabs(o.E(ts)/o.E(0.)-1.)) > 10.**-3., 'Fixed-step integrator unexpectedly integrates a highly eccentric orbit accurately'
+        # Events are detected using the dense output of the variable steps
+        od= Orbit(vxvv)
+        od.integrate(ts,pot,method='dopr54_c',events=['pericenter'])
+        o= Orbit(vxvv)
+        o.integrate(ts,pot,method=integrator,events=['pericenter'])
+        assert len(o.getEvents()[0][0]) == len(od.getEvents()[0][0]), 'Block-timestep integrator %s does not detect the same number of pericenters as dopr54_c' % integrator
+        assert numpy.all(numpy.fabs(o.getEvents()[0][0]-od.getEvents()[0][0]) < 10.**-4.), 'Block-timestep integrator %s does not detect pericenters at the same time as dopr54_c' % integrator
+    return None
+
+# Test that streaming the orbit to a file in chunks gives the same orbit
+def test_integrate_output():
+    from galpy.orbit import Orbit
+    from galpy.orbit_src.integrateFullOrbit import integrateFullOrbit_c, \
+        integrateFullOrbit_stream_c
+    ts= numpy.linspace(0.,50.,1001)
+    vxvv= [1.,0.1,1.1,0.1,0.05,0.3]
+    for integrator in ['symplec4_c','rk4_c','dopr54_c']:
+        o= Orbit(vxvv)
+        o.integrate(ts,potential.MWPotential2014,method=integrator)
+        os_= Orbit(vxvv)
+        try:
+            os_.integrate(ts,potential.MWPotential2014,method=integrator,
+                          output='orb_stream.npy',chunksize=77)
+            assert isinstance(os_._orb.orbit,numpy.memmap), 'Orbit streamed to a file is not memory-mapped'
+            assert numpy.all(numpy.fabs(os_.getOrbit()-o.getOrbit()) < 10.**-6.), 'Orbit streamed to a file in chunks does not agree with the direct integration for integrator %s' % integrator
+            assert numpy.all(numpy.fabs(os_.R(ts[12:500])-o.R(ts[12:500])) < 10.**-6.), 'Orbit accessors do not work for an orbit streamed to a file'
+            assert numpy.fabs(os_.zmax()-o.zmax()) < 10.**-6., 'Orbit accessors do not work for an orbit streamed to a file'
+            assert numpy.all(numpy.fabs(numpy.load('orb_stream.npy')-o.getOrbit()) < 10.**-6.), 'Orbit file written by streaming does not contain the orbit'
+            del os_
+        finally:
+            os.remove('orb_stream.npy')
+    # Streaming to a function, chunk by chunk
+    yo= numpy.array([1.,0.,0.1,0.1,1.1,0.05])
+    res, err= integrateFullOrbit_c(potential.MWPotential2014,yo,ts,'rk4_c')
+    chunks= []
+    out, err= integrateFullOrbit_stream_c(potential.MWPotential2014,yo,ts,
+                                          'rk4_c',
+                                          lambda t,y: chunks.append((t,y)),
+                                          chunksize=100)
+    assert out is None, 'integrateFullOrbit_stream_c with a function output does not return None'
+    assert len(chunks) == 11, 'integrateFullOrbit_stream_c does not call the output function for each chunk'
+    assert numpy.all(numpy.hstack([c[0] for c in chunks]) == ts), 'integrateFullOrbit_stream_c does not pass the correct times to the output function'
+    assert numpy.all(numpy.fabs(numpy.vstack([c[1] for c in chunks])-res) < 10.**-6.), 'integrateFullOrbit_stream_c does not pass the correct orbit to the output function'
+    # Errors
+    o= Orbit(vxvv)
+    with pytest.raises(ValueError) as excinfo:
+        o.integrate(ts,potential.MWPotential2014,method='odeint',
+                    output='orb_stream.npy')
+    with pytest.raises(ValueError) as excinfo:
+        o.integrate(ts,potential.MWPotential2014,method='dopr54_c',
+                    dense=True,output='orb_stream.npy')
+    o= Orbit(vxvv[:5])
+    with pytest.raises(NotImplementedError) as excinfo:
+        o.integrate(ts,potential.MWPotential2014,method='dopr54_c',
+                    output='orb_stream.npy')
+    return None
+
+# Test that the deviation vectors of three-dimensional orbits agree with the
+# difference between two nearby orbits
+def test_integrate_dxdv_full():
+    from galpy.orbit import Orbit
+    ts= numpy.linspace(0.,10.,101)
+    vxvv= numpy.array([1.,0.1,1.1,0.1,0.05,0.3])
+    eps= 10.**-6.
+    o0= Orbit(list(vxvv))
+    o0.integrate(ts,potential.MWPotential2014,method='dopr54_c')
+    for integrator in ['rk6_c','dopr54_c']:
+        for ii in range(6):
+            dxdv= numpy.zeros(6)
+            dxdv[ii]= eps
+            o= Orbit(list(vxvv))
+            o.integrate_dxdv(dxdv,ts,potential.MWPotential2014,
+                             method=integrator)
+            assert o.getOrbit_dxdv().shape == (len(ts),6), 'Orbit.getOrbit_dxdv for a three-dimensional orbit does not return an array of the expected shape'
+            assert numpy.all(numpy.fabs(o.getOrbit()-o0.getOrbit()) < 10.**-6.), 'Orbit integrated alongside dxdv does not agree with the regular orbit integration'
+            od= Orbit(list(vxvv+dxdv))
+            od.integrate(ts,potential.MWPotential2014,method='dopr54_c')
+            assert numpy.all(numpy.fabs(o.getOrbit_dxdv()-(od.getOrbit()-o0.getOrbit()))/eps < 10.**-2.), 'Deviation vector of a three-dimensional orbit integrated with %s does not agree with the difference between two nearby orbits' % integrator
+    # rectIn and rectOut should round-trip
+    o= Orbit(list(vxvv))
+    o.integrate_dxdv([0.,0.,0.,eps,0.,0.],ts,potential.MWPotential2014,
+                     rectOut=True)
+    orect= Orbit(list(vxvv))
+    orect.integrate_dxdv([0.,0.,eps,0.,0.,0.],ts,potential.MWPotential2014,
+                         rectIn=True,rectOut=True)
+    assert numpy.all(numpy.fabs(o.getOrbit_dxdv()-orect.getOrbit_dxdv()) < 10.**-12.), 'rectIn and rectOut do not work for three-dimensional integrate_dxdv'
+    # Errors
+    with pytest.raises(NotImplementedError) as excinfo:
+        o.integrate_dxdv([0.,0.,0.,eps,0.,0.],ts,potential.MWPotential2014,
+                         method='symplec4_c')
+    return None
+
+# Test that the Lyapunov exponent is small for a regular orbit and large for a
+# chaotic orbit in a barred potential
+def test_lyapunov():
+    from galpy.orbit import Orbit
+    ts= numpy.linspace(0.,1000.,1001)
+    lp= potential.LogarithmicHaloPotential(normalize=1.)
+    dp= potential.DehnenBarPotential(tform=-100.,tsteady=1.,alpha=0.05,
+                                     rolr=0.9)
+    o= Orbit([1.,0.05,1.,0.])
+    lyap= o.lyapunov(ts,lp)
+    assert lyap.shape == ts.shape, 'Orbit.lyapunov does not return an array of the expected shape'
+    assert lyap[-1] < 0.01 and lyap[-1] < lyap[100], 'Lyapunov exponent of a regular orbit does not converge to zero'
+    o= Orbit([0.6,0.5,0.6,0.3])
+    assert o.lyapunov(ts,[lp,dp])[-1] > 0.2, 'Lyapunov exponent of a chaotic orbit is not positive'
+    o= Orbit([1.,0.1,1.1,0.1,0.05,0.])
+    assert o.lyapunov(ts,potential.MWPotential2014,method='rk6_c')[-1] < 0.02, 'Lyapunov exponent of a regular three-dimensional orbit does not converge to zero'
+    return None
+
+# Test that the cached C arguments of a potential are re-used and updated
+# when the potential's parameters change
+def test_parse_pot_cache():
+    from galpy.orbit import Orbit
+    from galpy.orbit_src.integrateFullOrbit import _parse_pot, \
+        _parse_pot_nocache
+    from galpy.orbit_src.integratePlanarOrbit import _parsed_pot_cache
+    ts= numpy.linspace(0.,10.,101)
+    Acos= numpy.zeros((5,3,3))
+    Acos[0,0,0]= 1.
+    Acos[2,2,1]= 0.2
+    Asin= numpy.zeros((5,3,3))
+    Asin[2,2,1]= 0.1
+    scfp= potential.SCFPotential(Acos=Acos,Asin=Asin)
+    npot, pot_type, pot_args= _parse_pot([scfp,potential.MWPotential2014[0]])
+    assert scfp in _parsed_pot_cache, 'Parsed C arguments of SCFPotential were not cached'
+    cnpot, cpot_type, cpot_args= _parse_pot([scfp,potential.MWPotential2014[0]])
+    assert cnpot == npot and numpy.all(cpot_type == pot_type) \
+        and numpy.all(cpot_args == pot_args), 'Cached C arguments do not agree with the original ones'
+    o= Orbit([1.,0.1,1.1,0.1,0.05,0.3])
+    o.integrate(ts,scfp,method='dopr54_c')
+    # Change the coefficients in place, cache should be updated
+    scfp._Acos[2,2,1]= 0.3
+    scfp._amp= 1.2
+    npot, pot_type, pot_args= _parse_pot(scfp)
+    unpot, upot_type, upot_args= _parse_pot_nocache([scfp])
+    assert numpy.all(pot_args == upot_args), 'Cached C arguments are not updated when the potential parameters change'
+    on= Orbit([1.,0.1,1.1,0.1,0.05,0.3])
+    on.integrate(ts,scfp,method='dopr54_c')
+    # Compare to a potential with the same changes that was never cached
+    scfpn= potential.SCFPotential(Acos=Acos,Asin=Asin)
+    scfpn._Acos[2,2,1]= 0.3
+    scfpn._amp= 1.2
+    of= Orbit([1.,0.1,1.1,0.1,0.05,0.3])
+    of.integrate(ts,scfpn,method='dopr54_c')
+    assert numpy.all(numpy.fabs(on.getOrbit()-of.getOrbit()) < 10.**-10.), 'Orbit integration after changing the potential parameters does not use the updated parameters'
+    assert numpy.amax(numpy.fabs(on.getOrbit()-o.getOrbit())) > 10.**-4., 'Orbit integration after changing the potential parameters does not use the updated parameters'
+    return None
+
+# Test that integrating backward and forward from t=0 in the interior of t
+# agrees with separate backward and forward integrations
+def test_integrate_twosided():
+    from galpy.orbit import Orbit, Orbits
+    lp= potential.LogarithmicHaloPotential(normalize=1.,q=0.9)
+    ts= numpy.linspace(0.,10.,101)
+    ts= numpy.concatenate((-ts[:0:-1],ts))
+    for vxvv in [[1.,0.1,1.1,0.1,0.05,0.3],[1.,0.1,1.1,0.3],
+                 [1.,0.1,1.1,0.1,0.05],[1.,0.1]]:
+        for method,dt in [('dopr54_c',None),('symplec4_c',0.01),
+                          ('leapfrog_c',None),('odeint',None),
+                          ('leapfrog',None)]:
+            if len(vxvv) == 2: tpot= potential.RZToverticalPotential(lp,1.)
+            else: tpot= lp
+            o= Orbit(vxvv)
+            o.integrate(ts,tpot,method=method,dt=dt,t0index=100)
+            ob= Orbit(vxvv)
+            # A fixed stepsize has to be negative when integrating backward
+            ob.integrate(ts[100::-1],tpot,method=method,
+                         dt=None if dt is None else -dt)
+            of= Orbit(vxvv)
+            of.integrate(ts[100:],tpot,method=method,dt=dt)
+            oo= numpy.concatenate((ob.getOrbit()[:0:-1],of.getOrbit()))
+            assert numpy.all(numpy.fabs(o.getOrbit()-oo) < 10.**-8.), 'Integrating backward and forward from t=0 does not agree with separate backward and forward integrations for method %s and dim %i' % (method,len(vxvv))
+            assert numpy.all(numpy.fabs(o.getOrbit()[100]-numpy.array(vxvv)) < 10.**-10.), 'Integrating backward and forward from t=0 does not have the initial condition at t=0'
+    # Orbits with the C integrators
+    vxvvs= numpy.array([[1.,0.1,1.1,0.1,0.05,0.3],[0.9,-0.2,0.8,0.,0.1,1.]])
+    os= Orbits(vxvvs)
+    os.integrate(ts,lp,method='dopr54_c',t0index=100)
+    for ii in range(len(vxvvs)):
+        o= Orbit(list(vxvvs[ii]))
+        o.integrate(ts,lp,method='dopr54_c',t0index=100)
+        assert numpy.all(numpy.fabs(os.getOrbit()[ii]-o.getOrbit()) < 10.**-10.), 'Orbits integrated backward and forward from t=0 do not agree with Orbit'
+    # Without t0index, the initial condition is at t[0]
+    o= Orbit([1.,0.1,1.1,0.1,0.05,0.3])
+    o.integrate(ts,lp,method='dopr54_c')
+    assert numpy.all(numpy.fabs(o.getOrbit()[0]-numpy.array([1.,0.1,1.1,0.1,0.05,0.3])) < 10.**-10.), 'Integrating without t0index does not have the initial condition at t[0]'
+    # Dense output cannot be combined with two-sided integration
+    with pytest.raises(ValueError) as excinfo:
+        o.integrate(ts,lp,method='dopr54_c',dense=True,t0index=100)
+    # t[t0index] has to be zero and t has to be monotonic
+    with pytest.raises(ValueError) as excinfo:
+        o.integrate(ts,lp,method='dopr54_c',t0index=99)
+    tnm= numpy.copy(ts)
+    tnm[50]= tnm[60]
+    with pytest.raises(ValueError) as excinfo:
+        o.integrate(tnm,lp,method='dopr54_c',t0index=100)
+    return None
+
+# Test that orbits in the presence of many moving objects integrated in C
+# agree with those integrated in Python
+def test_integrate_movingobjects_c():
+    from galpy.orbit import Orbit
+    from galpy.potential_src.interpRZPotential import eval_potentials_c
+    lp= potential.LogarithmicHaloPotential(normalize=1.)
+    numpy.random.seed(1)
+    times= numpy.linspace(0.,-10.,1001)
+    mps= []
+    for ii in range(10):
+        os= Orbit([numpy.random.uniform(0.5,1.5),
+                   numpy.random.normal()*0.1,numpy.random.uniform(0.8,1.2),
+                   numpy.random.normal()*0.2,numpy.random.normal()*0.1,
+                   numpy.random.uniform(0.,2.*numpy.pi)])
+        os.integrate(times,lp,method='dopr54_c')
+        mps.append(potential.MovingObjectPotential(os,GM=0.01,
+                                                   softening_length=0.1))
+        assert mps[-1].hasC, 'MovingObjectPotential with Plummer softening should have a C implementation'
+    # Forces agree with the Python implementation
+    Rs= numpy.random.uniform(0.3,2.,11)
+    zs= numpy.random.uniform(-0.5,0.5,11)
+    phis= numpy.random.uniform(0.,2.*numpy.pi,11)
+    ts= numpy.random.uniform(-10.,0.,11)
+    for quantity, func in [('potential',potential.evaluatePotentials),
+                           ('Rforce',potential.evaluateRforces),
+                           ('zforce',potential.evaluatezforces),
+                           ('phiforce',potential.evaluatephiforces)]:
+        pyvals= numpy.array([func(mps,R,z,phi=phi,t=t)
+                             for R,z,phi,t in zip(Rs,zs,phis,ts)])
+        assert numpy.all(numpy.fabs(eval_potentials_c(mps,Rs,zs,phis,ts,quantity=quantity)[0]-pyvals) < 10.**-10.), 'C implementation of MovingObjectPotential does not agree with the Python implementation for %s' % quantity
+    # Orbits agree
+    pot= [lp]+mps
+    ts= numpy.linspace(0.,-9.,901)
+    for vxvv in [[1.,0.1,1.1,0.1,0.,0.5],[1.,0.1,1.1,0.5]]:
+        o= Orbit(vxvv)
+        o.integrate(ts,pot,method='dopr54_c')
+        op= Orbit(vxvv)
+        op.integrate(ts,pot,method='odeint')
+        for func in ['x','y','vx','vy']:
+            assert numpy.all(numpy.fabs(getattr(o,func)(ts)-getattr(op,func)(ts)) < 10.**-5.), 'Orbit in the presence of moving objects integrated in C does not agree with the orbit integrated in Python'
+    # Outside of the time range of the objects' orbits, the C implementation
+    # does not extrapolate and orbits cannot be integrated
+    assert numpy.all(numpy.isnan(eval_potentials_c(mps,Rs,zs,phis,numpy.random.uniform(1.,9.,11),quantity='Rforce')[0])), 'C implementation of MovingObjectPotential does not return NaN outside of the time range of the orbit of the object'
+    for vxvv in [[1.,0.1,1.1,0.1,0.,0.5],[1.,0.1,1.1,0.5]]:
+        o= Orbit(vxvv)
+        with pytest.raises(ValueError) as excinfo:
+            o.integrate(numpy.linspace(0.,-11.,1101),pot,method='dopr54_c')
+        with pytest.raises(ValueError) as excinfo:
+            o.integrate(numpy.linspace(0.,1.,101),pot,method='odeint')
+    # Only Plummer softening is implemented in C
+    from galpy.potential_src.ForceSoftening import ForceSoftening
+    mp= potential.MovingObjectPotential(os,softening=ForceSoftening())
+    assert not mp.hasC, 'MovingObjectPotential with non-Plummer softening should not have a C implementation'
+    return None
+
 # Test that the functions that supposedly *always* return output in physical 
 # units actually do so; see issue #294
 def test_intrinsic_physical_output():
@@ -0,0 +1,226 @@
+##########################TESTS ON MULTIPLE ORBITS#############################
+import numpy
+from galpy import potential
+
+def _setup_vxvvs(nobj=7,planar=False):
+    numpy.random.seed(1)
+    vxvvs= numpy.empty((nobj,6))
+    vxvvs[:,0]= 1.+0.2*numpy.random.uniform(size=nobj)-0.1
+    vxvvs[:,1]= 0.1*numpy.random.normal(size=nobj)
+    vxvvs[:,2]= 1.+0.1*numpy.random.normal(size=nobj)
+    vxvvs[:,3]= 0.05*numpy.random.normal(size=nobj)
+    vxvvs[:,4]= 0.1*numpy.random.normal(size=nobj)
+    vxvvs[:,5]= 2.*numpy.pi*numpy.random.uniform(size=nobj)
+    if planar:
+        return vxvvs[:,[0,1,2,5]]
+    else:
+        return vxvvs
+
+# Test that integrating an Orbits instance gives the same as integrating
+# each Orbit separately
+def test_integration_vs_orbit():
+    from galpy.orbit import Orbit, Orbits
+    ts= numpy.linspace(0.,10.,1001)
+    for planar in [False,True]:
+        vxvvs= _setup_vxvvs(planar=planar)
+        os= Orbits(vxvvs)
+        for method in ['dopr54_c','symplec4_c','leapfrog']:
+            os.integrate(ts,potential.MWPotential2014,method=method)
+            assert os.getOrbit().shape == (len(vxvvs),len(ts),vxvvs.shape[1]), 'Orbits.getOrbit does not return an array of the expected shape'
+            for ii in range(len(vxvvs)):
+                o= Orbit(list(vxvvs[ii]))
+                o.integrate(ts,potential.MWPotential2014,method=method)
+                assert numpy.all(numpy.fabs(os.R(ts)[ii]-o.R(ts)) < 10.**-8.), 'Orbits integration does not agree with Orbit integration for method %s' % method
+                assert numpy.all(numpy.fabs(os.vR(ts)[ii]-o.vR(ts)) < 10.**-8.), 'Orbits integration does not agree with Orbit integration for method %s' % method
+                assert numpy.all(numpy.fabs(os.vT(ts)[ii]-o.vT(ts)) < 10.**-8.), 'Orbits integration does not agree with Orbit integration for method %s' % method
+                assert numpy.all(numpy.fabs(os.x(ts)[ii]-o.x(ts)) < 10.**-8.), 'Orbits integration does not agree with Orbit integration for method %s' % method
+                assert numpy.all(numpy.fabs(os.vy(ts)[ii]-o.vy(ts)) < 10.**-8.), 'Orbits integration does not agree with Orbit integration for method %s' % method
+                if not planar:
+                    assert numpy.all(numpy.fabs(os.z(ts)[ii]-o.z(ts)) < 10.**-8.), 'Orbits integration does not agree with Orbit integration for method %s' % method
+                    assert numpy.all(numpy.fabs(os.vz(ts)[ii]-o.vz(ts)) < 10.**-8.), 'Orbits integration does not agree with Orbit integration for method %s' % method
+    return None
+
+# Test that the accessors at a single time, at the initial condition, and at
+# times that require interpolation agree with those of Orbit
+def test_accessors_vs_orbit():
+    from galpy.orbit import Orbit, Orbits
+    ts= numpy.linspace(0.,10.,1001)
+    vxvvs= _setup_vxvvs()
+    os= Orbits(vxvvs,ro=8.,vo=220.)
+    os.integrate(ts,potential.MWPotential2014)
+    tsi= numpy.array([0.05,1.2345,9.876])
+    assert os.R().shape == (len(vxvvs),), 'Orbits.R() does not return an array of shape [N]'
+    assert os.R(tsi).shape == (len(vxvvs),len(tsi)), 'Orbits.R(t) does not return an array of shape [N,nt]'
+    for ii in range(len(vxvvs)):
+        o= Orbit(list(vxvvs[ii]),ro=8.,vo=220.)
+        o.integrate(ts,potential.MWPotential2014)
+        for func in ['R','r','vR','vT','z','vz','phi','vphi','x','y','vx','vy',
+                     'ra','dec','ll','bb','dist','pmra','pmdec','pmll','pmbb',
+                     'vlos','helioX','helioY','helioZ','U','V','W']:
+            assert numpy.fabs(getattr(os,func)()[ii]-getattr(o,func)()) < 10.**-8., 'Orbits.%s() does not agree with Orbit.%s()' % (func,func)
+            assert numpy.fabs(getattr(os,func)(ts[3])[ii]-getattr(o,func)(ts[3])) < 10.**-8., 'Orbits.%s(t) does not agree with Orbit.%s(t)' % (func,func)
+            assert numpy.all(numpy.fabs(getattr(os,func)(tsi)[ii]-getattr(o,func)(tsi)) < 10.**-8.), 'Orbits.%s(t) for interpolated t does not agree with Orbit.%s(t)' % (func,func)
+        assert numpy.all(numpy.fabs(os.E(ts)[ii]-o.E(ts)) < 10.**-8.), 'Orbits.E does not agree with Orbit.E'
+        assert numpy.all(numpy.fabs(os.ER(ts)[ii]-o.ER(ts)) < 10.**-8.), 'Orbits.ER does not agree with Orbit.ER'
+        assert numpy.all(numpy.fabs(os.Ez(ts)[ii]-o.Ez(ts)) < 10.**-8.), 'Orbits.Ez does not agree with Orbit.Ez'
+        assert numpy.all(numpy.fabs(os.L(ts)[ii]-o.L(ts)) < 10.**-8.), 'Orbits.L does not agree with Orbit.L'
+    return None
+
+# Test that the actions of Orbits agree with those of each Orbit
+def test_actions_vs_orbit():
+    from galpy.orbit import Orbit, Orbits
+    vxvvs= _setup_vxvvs()
+    os= Orbits(vxvvs)
+    pot= potential.MWPotential2014
+    for ii in range(len(vxvvs)):
+        o= Orbit(list(vxvvs[ii]))
+        assert numpy.fabs(os.jr(pot=pot,type='staeckel',delta=0.4)[ii]-o.jr(pot=pot,type='staeckel',delta=0.4)) < 10.**-8., 'Orbits.jr does not agree with Orbit.jr'
+        assert numpy.fabs(os.jz(pot=pot,type='staeckel',delta=0.4)[ii]-o.jz(pot=pot,type='staeckel',delta=0.4)) < 10.**-8., 'Orbits.jz does not agree with Orbit.jz'
+        assert numpy.fabs(os.Or(pot=pot,type='staeckel',delta=0.4)[ii]-o.Or(pot=pot,type='staeckel',delta=0.4)) < 10.**-8., 'Orbits.Or does not agree with Orbit.Or'
+        assert numpy.fabs(os.wz(pot=pot,type='staeckel',delta=0.4)[ii]-o.wz(pot=pot,type='staeckel',delta=0.4)) < 10.**-8., 'Orbits.wz does not agree with Orbit.wz'
+    return None
+
+# Test that an unknown actionAngle type raises an error
+def test_actions_unknowntype():
+    from galpy.orbit import Orbits
+    os= Orbits(_setup_vxvvs())
+    try:
+        os.jr(pot=potential.MWPotential2014,type='unknown')
+    except ValueError: pass
+    else: raise AssertionError('Orbits.jr with an unknown actionAngle type did not raise ValueError')
+    return None
+
+# Test that setting up an Orbits instance from observed coordinates gives
+# the same as setting up each Orbit
+def test_radec_setup():
+    from galpy.orbit import Orbit, Orbits
+    numpy.random.seed(2)
+    nobj= 5
+    radecs= numpy.empty((nobj,6))
+    radecs[:,0]= 360.*numpy.random.uniform(size=nobj)
+    radecs[:,1]= 60.*numpy.random.uniform(size=nobj)-30.
+    radecs[:,2]= 0.1+numpy.random.uniform(size=nobj)
+    radecs[:,3]= 10.*numpy.random.normal(size=nobj)
+    radecs[:,4]= 10.*numpy.random.normal(size=nobj)
+    radecs[:,5]= 50.*numpy.random.normal(size=nobj)
+    for radec,lb in [[True,False],[False,True]]:
+        os= Orbits(radecs,radec=radec,lb=lb,ro=8.,vo=220.)
+        for ii in range(nobj):
+            o= Orbit(list(radecs[ii]),radec=radec,lb=lb,ro=8.,vo=220.)
+            assert numpy.all(numpy.fabs(os()[ii]-o._orb.vxvv) < 10.**-10.), 'Orbits setup from observed coordinates does not agree with Orbit setup'
+            assert numpy.fabs(os.pmra()[ii]-o.pmra()) < 10.**-8., 'Orbits.pmra does not agree with Orbit.pmra for Orbits setup from observed coordinates'
+    # Setup from a list of Orbits
+    os= Orbits([Orbit(list(radecs[ii]),radec=True,ro=8.,vo=220.)
+                for ii in range(nobj)])
+    assert os._roSet and numpy.fabs(os._ro-8.) < 10.**-10., 'Orbits setup from a list of Orbits does not carry over ro'
+    assert numpy.all(numpy.fabs(os.ra()-radecs[:,0]) < 10.**-8.), 'Orbits setup from a list of Orbits does not return the correct ra'
+    return None
+
+# Test that indexing an Orbits instance returns the individual orbits
+def test_getitem():
+    from galpy.orbit import Orbit, Orbits
+    ts= numpy.linspace(0.,10.,101)
+    vxvvs= _setup_vxvvs()
+    os= Orbits(vxvvs)
+    os.integrate(ts,potential.MWPotential2014)
+    assert len(os) == len(vxvvs), 'len(Orbits) does not return the number of orbits'
+    o= os[2]
+    assert isinstance(o,Orbit), 'Orbits[int] does not return an Orbit instance'
+    assert numpy.all(numpy.fabs(o.R(ts)-os.R(ts)[2]) < 10.**-10.), 'Orbits[int] does not carry over the integrated orbit'
+    assert numpy.fabs(o.E(ts[-1])-os.E(ts[-1])[2]) < 10.**-10., 'Orbits[int] does not carry over the integrated orbit'
+    sos= os[1:4]
+    assert isinstance(sos,Orbits), 'Orbits[slice] does not return an Orbits instance'
+    assert numpy.all(numpy.fabs(sos.z(ts)-os.z(ts)[1:4]) < 10.**-10.), 'Orbits[slice] does not carry over the integrated orbits'
+    return None
+
+# Test that streaming Orbits to a file in chunks gives the same orbits
+def test_integrate_output():
+    import os
+    from galpy.orbit import Orbits
+    ts= numpy.linspace(0.,10.,1001)
+    vxvvs= _setup_vxvvs()
+    os_= Orbits(vxvvs)
+    os_.integrate(ts,potential.MWPotential2014,method='rk6_c')
+    oss= Orbits(vxvvs)
+    try:
+        oss.integrate(ts,potential.MWPotential2014,method='rk6_c',
+                      output='orbs_stream.npy',chunksize=123)
+        assert oss.getOrbit().shape == (len(vxvvs),len(ts),6), 'Orbits streamed to a file do not have the expected shape'
+        assert numpy.all(numpy.fabs(oss.getOrbit()-os_.getOrbit()) < 10.**-8.), 'Orbits streamed to a file in chunks do not agree with the direct integration'
+        assert numpy.all(numpy.fabs(oss.E(ts)-os_.E(ts)) < 10.**-8.), 'Orbits accessors do not work for orbits streamed to a file'
+        del oss
+    finally:
+        os.remove('orbs_stream.npy')
+    return None
+
+# Test that integrating the deviation vectors of an Orbits instance and its
+# Lyapunov exponents gives the same as doing this for each Orbit separately
+def test_integrate_dxdv_vs_orbit():
+    from galpy.orbit import Orbit, Orbits
+    ts= numpy.linspace(0.,10.,101)
+    tsl= numpy.linspace(0.,100.,101)
+    for planar in [False,True]:
+        vxvvs= _setup_vxvvs(planar=planar)
+        numpy.random.seed(3)
+        dxdvs= 10.**-4.*numpy.random.normal(size=vxvvs.shape)
+        os= Orbits(vxvvs)
+        os.integrate_dxdv(dxdvs,ts,potential.MWPotential2014,method='rk6_c')
+        assert os.getOrbit_dxdv().shape == vxvvs.shape[:1]+(len(ts),)+vxvvs.shape[1:], 'Orbits.getOrbit_dxdv does not return an array of the expected shape'
+        lyaps= os.lyapunov(tsl,potential.MWPotential2014,numcores=2)
+        assert lyaps.shape == (len(vxvvs),len(tsl)), 'Orbits.lyapunov does not return an array of the expected shape'
+        for ii in range(len(vxvvs)):
+            o= Orbit(list(vxvvs[ii]))
+            o.integrate_dxdv(dxdvs[ii],ts,potential.MWPotential2014,
+                             method='rk6_c')
+            assert numpy.all(numpy.fabs(os.getOrbit_dxdv()[ii]-o.getOrbit_dxdv()) < 10.**-10.), 'Orbits.integrate_dxdv does not agree with Orbit.integrate_dxdv'
+            assert numpy.all(numpy.fabs(os.R(ts)[ii]-o.R(ts)) < 10.**-8.), 'Orbits.integrate_dxdv does not agree with Orbit.integrate_dxdv'
+            assert numpy.all(numpy.fabs(lyaps[ii]-o.lyapunov(tsl,potential.MWPotential2014)) < 10.**-8.), 'Orbits.lyapunov does not agree with Orbit.lyapunov'
+    return None
+
+# Test that the orbital parameters, periods, sky velocities, and
+# transformations of Orbits agree with those of each Orbit
+def test_orbitparams_vs_orbit():
+    from galpy.orbit import Orbit, Orbits
+    ts= numpy.linspace(0.,10.,1001)
+    tsi= numpy.array([0.05,1.2345,9.876])
+    pot= potential.MWPotential2014
+    for planar in [False,True]:
+        vxvvs= _setup_vxvvs(planar=planar)
+        if planar: events= ['pericenter','apocenter']
+        else: events= ['pericenter','apocenter','zmax']
+        os= Orbits(vxvvs,ro=8.,vo=220.)
+        os.integrate(ts,pot,method='dopr54_c',events=events)
+        assert len(os.getEvents()) == len(vxvvs), 'Orbits.getEvents does not return the events of each orbit'
+        fos= os.flip()
+        os_list= []
+        for ii in range(len(vxvvs)):
+            o= Orbit(list(vxvvs[ii]),ro=8.,vo=220.)
+            o.integrate(ts,pot,method='dopr54_c',events=events)
+            os_list.append(o)
+            funcs= ['e','rperi','rap']
+            if not planar: funcs.append('zmax')
+            for func in funcs:
+                assert numpy.fabs(getattr(os,func)()[ii]-getattr(o,func)()) < 10.**-8., 'Orbits.%s() does not agree with Orbit.%s()' % (func,func)
+                assert numpy.fabs(getattr(os,func)(analytic=True,pot=pot)[ii]-getattr(o,func)(analytic=True,pot=pot)) < 10.**-8., 'Orbits.%s(analytic=True) does not agree with Orbit.%s(analytic=True)' % (func,func)
+            assert numpy.all(numpy.fabs(os.Jacobi(ts)[ii]-o.Jacobi(ts)) < 10.**-8.), 'Orbits.Jacobi does not agree with Orbit.Jacobi'
+            assert numpy.all(numpy.fabs(os.Jacobi(ts,OmegaP=0.5)[ii]-o.Jacobi(ts,OmegaP=0.5)) < 10.**-8.), 'Orbits.Jacobi does not agree with Orbit.Jacobi'
+            for func in ['vra','vdec','vll','vbb']:
+                assert numpy.fabs(getattr(os,func)()[ii]-getattr(o,func)()) < 10.**-8., 'Orbits.%s() does not agree with Orbit.%s()' % (func,func)
+                assert numpy.all(numpy.fabs(getattr(os,func)(tsi)[ii]-getattr(o,func)(tsi)) < 10.**-8.), 'Orbits.%s(t) does not agree with Orbit.%s(t)' % (func,func)
+            assert numpy.all(numpy.fabs(os.SkyCoord(ts[3])[ii].ra.deg-o.SkyCoord(ts[3]).ra.deg) < 10.**-8.), 'Orbits.SkyCoord does not agree with Orbit.SkyCoord'
+            assert numpy.all(numpy.fabs(os.SkyCoord(ts[3])[ii].distance.to('kpc').value-o.SkyCoord(ts[3]).distance.to('kpc').value) < 10.**-8.), 'Orbits.SkyCoord does not agree with Orbit.SkyCoord'
+            assert numpy.all(numpy.fabs(fos()[ii]-o.flip()._orb.vxvv) < 10.**-10.), 'Orbits.flip does not agree with Orbit.flip'
+            if not planar:
+                for func in ['Tr','Tp','TrTp','Tz']:
+                    assert numpy.fabs(getattr(os,func)(pot=pot,type='staeckel',delta=0.4)[ii]-getattr(o,func)(pot=pot,type='staeckel',delta=0.4)) < 10.**-8., 'Orbits.%s does not agree with Orbit.%s' % (func,func)
+                assert numpy.all(numpy.fabs(os.toPlanar()()[ii]-o.toPlanar()._orb.vxvv) < 10.**-10.), 'Orbits.toPlanar does not agree with Orbit.toPlanar'
+        # Now reverse and flip in-place
+        os.reverse()
+        os.flip(inplace=True)
+        for ii, o in enumerate(os_list):
+            o.reverse()
+            o.flip(inplace=True)
+            assert numpy.all(numpy.fabs(os.R(ts)[ii]-o.R(ts)) < 10.**-10.), 'Orbits.reverse does not agree with Orbit.reverse'
+            assert numpy.all(numpy.fabs(os.vR(ts)[ii]-o.vR(ts)) < 10.**-10.), 'Orbits.flip(inplace=True) does not agree with Orbit.flip(inplace=True)'
+            assert numpy.all(numpy.fabs(os.vT(tsi)[ii]-o.vT(tsi)) < 10.**-8.), 'Orbits.flip(inplace=True) does not agree with Orbit.flip(inplace=True)'
+    return None
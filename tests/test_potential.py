@@ -28,7 +28,8 @@ def test_normalize_potential():
     pots.append('specialMN3ExponentialDiskPotentialSECH')
     rmpots= ['Potential','MWPotential','MWPotential2014',
              'MovingObjectPotential',
-             'interpRZPotential', 'linearPotential', 'planarAxiPotential',
+             'interpRZPotential', 'interp3DPotential', 'linearPotential',
+             'planarAxiPotential',
              'planarPotential', 'verticalPotential','PotentialError',
              'SnapshotRZPotential','InterpSnapshotRZPotential']
     if False: #_TRAVIS: #travis CI
@@ -135,7 +136,8 @@ def test_forceAsDeriv_potential():
     pots.append('mockDehnenSmoothBarPotentialTm5')
     rmpots= ['Potential','MWPotential','MWPotential2014',
              'MovingObjectPotential',
-             'interpRZPotential', 'linearPotential', 'planarAxiPotential',
+             'interpRZPotential', 'interp3DPotential', 'linearPotential',
+             'planarAxiPotential',
              'planarPotential', 'verticalPotential','PotentialError',
              'SnapshotRZPotential','InterpSnapshotRZPotential']
     if False: #_TRAVIS: #travis CI
@@ -293,7 +295,8 @@ def test_2ndDeriv_potential():
     pots.append('mockDehnenSmoothBarPotentialTm5')
     rmpots= ['Potential','MWPotential','MWPotential2014',
              'MovingObjectPotential',
-             'interpRZPotential', 'linearPotential', 'planarAxiPotential',
+             'interpRZPotential', 'interp3DPotential', 'linearPotential',
+             'planarAxiPotential',
              'planarPotential', 'verticalPotential','PotentialError',
              'SnapshotRZPotential','InterpSnapshotRZPotential']
     if False: #_TRAVIS: #travis CI
@@ -507,7 +510,8 @@ def test_poisson_potential():
     pots.append('DehnenSmoothDehnenBarPotential')
     rmpots= ['Potential','MWPotential','MWPotential2014',
              'MovingObjectPotential',
-             'interpRZPotential', 'linearPotential', 'planarAxiPotential',
+             'interpRZPotential', 'interp3DPotential', 'linearPotential',
+             'planarAxiPotential',
              'planarPotential', 'verticalPotential','PotentialError',
              'SnapshotRZPotential','InterpSnapshotRZPotential']
     if False: #_TRAVIS: #travis CI
@@ -619,7 +623,8 @@ def test_evaluateAndDerivs_potential():
     pots.append('mockDehnenSmoothBarPotentialTm5')
     rmpots= ['Potential','MWPotential','MWPotential2014',
              'MovingObjectPotential',
-             'interpRZPotential', 'linearPotential', 'planarAxiPotential',
+             'interpRZPotential', 'interp3DPotential', 'linearPotential',
+             'planarAxiPotential',
              'planarPotential', 'verticalPotential','PotentialError',
              'SnapshotRZPotential','InterpSnapshotRZPotential']
     if False: #_TRAVIS: #travis CI
@@ -864,7 +869,8 @@ def test_toVertical_toPlanar():
                and not 'evaluate' in p and not 'Wrapper' in p)]
     rmpots= ['Potential','MWPotential','MWPotential2014',
              'MovingObjectPotential',
-             'interpRZPotential', 'linearPotential', 'planarAxiPotential',
+             'interpRZPotential', 'interp3DPotential', 'linearPotential',
+             'planarAxiPotential',
              'planarPotential', 'verticalPotential','PotentialError',
              'SnapshotRZPotential','InterpSnapshotRZPotential']
     if False: #_TRAVIS: #travis CI
@@ -1080,6 +1086,30 @@ def test_lindbladR():
         raise AssertionError("lindbladR w/ wrong m input should have raised IOError, but didn't")
     return None
 
+def test_rl_lindbladR_array():
+    # Array input should give the same result as looping over scalars
+    from galpy.potential import MWPotential2014
+    lzs= numpy.linspace(0.05,3.,11)
+    rls= potential.rl(MWPotential2014,lzs)
+    for ii in range(len(lzs)):
+        assert numpy.fabs(rls[ii]-potential.rl(MWPotential2014,lzs[ii])) < 10.**-10., 'rl for array input does not agree with rl for scalar input'
+    # Negative and zero angular momentum
+    lp= potential.LogarithmicHaloPotential(normalize=1.)
+    assert numpy.all(numpy.fabs(lp.rl(numpy.array([-0.5,0.,2.]))-numpy.array([0.5,0.,2.])) < 10.**-10.), 'rl for array input is wrong for LogarithmicHaloPotential'
+    # Shape is preserved
+    assert potential.rl(lp,numpy.ones((2,3))).shape == (2,3), 'rl for array input does not preserve the shape of the input'
+    OmegaPs= numpy.linspace(0.3,2.,7)
+    for m in [2,-2,'corotation']:
+        lrs= potential.lindbladR(MWPotential2014,OmegaPs,m=m)
+        for ii in range(len(OmegaPs)):
+            assert numpy.fabs(lrs[ii]-potential.lindbladR(MWPotential2014,OmegaPs[ii],m=m)) < 10.**-10., 'lindbladR for array input does not agree with lindbladR for scalar input'
+    # Non-existent resonances are NaN
+    mp= potential.MiyamotoNagaiPotential(normalize=1.,a=0.3)
+    lrs= mp.lindbladR(numpy.array([0.5,6.]),'corotation')
+    assert not numpy.isnan(lrs[0]), 'lindbladR for array input should exist for OmegaP=0.5 (corotation)'
+    assert numpy.isnan(lrs[1]), 'lindbladR for array input should be NaN when there is no resonance'
+    return None
+
 def test_vterm():
     lp= potential.LogarithmicHaloPotential(normalize=1.)
     assert numpy.fabs(lp.vterm(30.,deg=True)-0.5*(lp.omegac(0.5)-1.)) < 10.**-10., 'vterm for LogarithmicHaloPotential at l=30 is incorrect'
@@ -1665,6 +1695,78 @@ def test_FerrersPotential_nNegative():
         dummy= potential.FerrersPotential(n=-1.)
     return None
 
+# Test the C implementation of FerrersPotential against the Python one
+def test_FerrersPotential_c():
+    fp= potential.FerrersPotential(normalize=1.,a=1.,b=0.5,c=0.3,omegab=0.5,
+                                   pa=0.3)
+    numpy.random.seed(1)
+    Rs= numpy.random.uniform(0.1,3.,11)
+    zs= numpy.random.uniform(-0.5,0.5,11)
+    phis= numpy.random.uniform(0.,2.*numpy.pi,11)
+    ts= numpy.random.uniform(0.,3.,11)
+    for func in [potential.evaluatePotentials,potential.evaluateRforces,
+                 potential.evaluatezforces,potential.evaluatephiforces]:
+        pyvals= numpy.array([func(fp,R,z,phi=phi,t=t,c=False)
+                             for R,z,phi,t in zip(Rs,zs,phis,ts)])
+        assert numpy.all(numpy.fabs(func(fp,Rs,zs,phi=phis,t=ts,c=True)-pyvals) < 10.**-8.), 'C implementation of FerrersPotential does not agree with the Python implementation for %s' % func.__name__
+    return None
+
+# Test the second derivatives of a rotated FerrersPotential against
+# finite differences of the forces
+def test_FerrersPotential_rotated_2ndDerivs():
+    fp= potential.FerrersPotential(normalize=1.,a=1.,b=0.5,c=0.3,omegab=0.5,
+                                   pa=0.3)
+    R,z,phi,t= 0.8,0.1,0.7,1.
+    dx= 10.**-6.
+    assert numpy.fabs(fp.R2deriv(R,z,phi=phi,t=t)+(fp.Rforce(R+dx,z,phi=phi,t=t)-fp.Rforce(R,z,phi=phi,t=t))/dx) < 10.**-4., 'R2deriv of rotated FerrersPotential does not agree with the finite-difference derivative of Rforce'
+    assert numpy.fabs(fp.Rzderiv(R,z,phi=phi,t=t)+(fp.zforce(R+dx,z,phi=phi,t=t)-fp.zforce(R,z,phi=phi,t=t))/dx) < 10.**-4., 'Rzderiv of rotated FerrersPotential does not agree with the finite-difference derivative of zforce'
+    assert numpy.fabs(fp.phi2deriv(R,z,phi=phi,t=t)+(fp.phiforce(R,z,phi=phi+dx,t=t)-fp.phiforce(R,z,phi=phi,t=t))/dx) < 10.**-4., 'phi2deriv of rotated FerrersPotential does not agree with the finite-difference derivative of phiforce'
+    assert numpy.fabs(fp.Rphideriv(R,z,phi=phi,t=t)+(fp.Rforce(R,z,phi=phi+dx,t=t)-fp.Rforce(R,z,phi=phi,t=t))/dx) < 10.**-4., 'Rphideriv of rotated FerrersPotential does not agree with the finite-difference derivative of Rforce'
+    return None
+
+# Test that DoubleExponentialDiskPotential gives the same results for array
+# and scalar input
+def test_DoubleExponentialDiskPotential_vectorized():
+    Rs= numpy.array([0.,0.05,0.5,1.,3.,8.])
+    zs= numpy.array([0.,-0.1,0.2,-0.5,1.,0.3])
+    for dp in [potential.DoubleExponentialDiskPotential(normalize=1.),
+               potential.DoubleExponentialDiskPotential(normalize=1.,
+                                                        de_h=10.**-2.)]:
+        for func in ['_evaluate','_Rforce','_zforce','_R2deriv','_z2deriv',
+                     '_Rzderiv']:
+            vals= getattr(dp,func)(Rs,zs)
+            assert vals.shape == Rs.shape, 'DoubleExponentialDiskPotential %s does not return an array of the same shape as the input' % func
+            svals= numpy.array([getattr(dp,func)(R,z) for R,z in zip(Rs,zs)])
+            assert numpy.all(numpy.fabs(vals-svals) < 10.**-10.), 'DoubleExponentialDiskPotential %s for array input does not agree with scalar input' % func
+    return None
+
+# Test the double-exponential quadrature for DoubleExponentialDiskPotential
+def test_DoubleExponentialDiskPotential_de():
+    dp= potential.DoubleExponentialDiskPotential(normalize=1.)
+    dpde= potential.DoubleExponentialDiskPotential(normalize=1.,
+                                                   de_h=10.**-3.)
+    numpy.random.seed(1)
+    Rs= numpy.random.uniform(0.5,3.,11)
+    zs= numpy.random.uniform(-0.5,0.5,11)
+    # Agrees with the Gaussian quadrature
+    for func in [potential.evaluatePotentials,potential.evaluateRforces,
+                 potential.evaluatezforces]:
+        assert numpy.all(numpy.fabs(func(dpde,Rs,zs,c=False)/func(dp,Rs,zs,c=False)-1.) < 10.**-3.), 'DoubleExponentialDiskPotential with double-exponential quadrature does not agree with Gaussian quadrature for %s' % func.__name__
+    # Forces and second derivatives are derivatives of the potential
+    dR= 10.**-5.
+    assert numpy.all(numpy.fabs(dpde.Rforce(Rs,zs)+(dpde(Rs+dR,zs)-dpde(Rs-dR,zs))/2./dR) < 10.**-7.), 'DoubleExponentialDiskPotential with double-exponential quadrature Rforce is not the derivative of the potential'
+    assert numpy.all(numpy.fabs(dpde.zforce(Rs,zs)+(dpde(Rs,zs+dR)-dpde(Rs,zs-dR))/2./dR) < 10.**-7.), 'DoubleExponentialDiskPotential with double-exponential quadrature zforce is not the derivative of the potential'
+    assert numpy.all(numpy.fabs(dpde.R2deriv(Rs,zs)+(dpde.Rforce(Rs+dR,zs)-dpde.Rforce(Rs-dR,zs))/2./dR) < 10.**-6.), 'DoubleExponentialDiskPotential with double-exponential quadrature R2deriv is not the derivative of Rforce'
+    assert numpy.all(numpy.fabs(dpde.z2deriv(Rs,zs)+(dpde.zforce(Rs,zs+dR)-dpde.zforce(Rs,zs-dR))/2./dR) < 10.**-6.), 'DoubleExponentialDiskPotential with double-exponential quadrature z2deriv is not the derivative of zforce'
+    assert numpy.all(numpy.fabs(dpde.Rzderiv(Rs,zs)+(dpde.Rforce(Rs,zs+dR)-dpde.Rforce(Rs,zs-dR))/2./dR) < 10.**-6.), 'DoubleExponentialDiskPotential with double-exponential quadrature Rzderiv is not the derivative of Rforce'
+    # C implementation agrees with the Python implementation, also at
+    # large R where the Gaussian quadrature uses a point-mass approximation
+    Rs[-1]= 8.
+    for func in [potential.evaluatePotentials,potential.evaluateRforces,
+                 potential.evaluatezforces]:
+        assert numpy.all(numpy.fabs(func(dpde,Rs,zs,c=True)/func(dpde,Rs,zs,c=False)-1.) < 10.**-10.), 'C implementation of DoubleExponentialDiskPotential with double-exponential quadrature does not agree with the Python implementation for %s' % func.__name__
+    return None
+
 def test_planeRotatedNFWPotential():
     # Test that the rotation according to pa works as expected
     tnp= potential.TriaxialNFWPotential(normalize=1.,a=1.5,b=0.5,
@@ -1782,6 +1884,69 @@ def test_SoftenedNeedleBarPotential_density():
     # Another one
     assert sbp.dens(4.,0.,phi=numpy.pi/4.) > sbp.dens(2.*numpy.sqrt(2.),2.*numpy.sqrt(2.),phi=0.), 'SoftenedNeedleBarPotential with flattened softening kernel does not appear to have a consistent'
     return None
+
+def test_force_cache():
+    # Test the LRU cache of the rectangular forces shared between Rforce,
+    # zforce, and phiforce
+    pots= [potential.SoftenedNeedleBarPotential(normalize=1.,omegab=0.5),
+           potential.FerrersPotential(normalize=1.,b=0.8,c=0.5,omegab=0.5),
+           potential.TriaxialNFWPotential(normalize=1.,b=0.8,c=0.6,
+                                          zvec=[0.,1.,1.]),
+           potential.SCFPotential(Acos=numpy.array([[[1.,0.],[0.2,0.1]]]),
+                                  Asin=numpy.array([[[0.,0.],[0.,0.3]]]))]
+    Rs= [1.,0.8]
+    zs= [0.1,-0.2]
+    phis= [0.3,2.]
+    ts= [1.,1.]
+    for pot in pots:
+        # Reference values computed with a cache that is always cleared
+        ref= []
+        for R,z,phi,t in zip(Rs,zs,phis,ts):
+            tref= []
+            for func in [pot.Rforce,pot.zforce,pot.phiforce]:
+                pot.force_cache_clear()
+                tref.append(func(R,z,phi=phi,t=t))
+            ref.append(tref)
+        pot.force_cache_clear()
+        # Alternate between positions: each position should only miss once
+        for ii in range(3):
+            for jj,(R,z,phi,t) in enumerate(zip(Rs,zs,phis,ts)):
+                for kk,func in enumerate([pot.Rforce,pot.zforce,
+                                          pot.phiforce]):
+                    assert numpy.fabs(func(R,z,phi=phi,t=t)-ref[jj][kk]) < 10.**-14., 'Cached force of %s differs from uncached force' % pot.__class__.__name__
+        info= pot.force_cache_info()
+        assert info.misses == len(Rs), 'Force cache of %s misses more often than expected when alternating between positions' % pot.__class__.__name__
+        assert info.hits == 9*len(Rs)-len(Rs), 'Force cache of %s hits less often than expected when alternating between positions' % pot.__class__.__name__
+        assert info.currsize == len(Rs), 'Force cache of %s does not have the expected size' % pot.__class__.__name__
+        # The cache is bounded: with a single entry, alternating always misses
+        pot.force_cache_clear(maxsize=1)
+        for jj,(R,z,phi,t) in enumerate(zip(Rs,zs,phis,ts)):
+            assert numpy.fabs(pot.Rforce(R,z,phi=phi,t=t)-ref[jj][0]) < 10.**-14., 'Cached force of %s differs from uncached force' % pot.__class__.__name__
+        pot.Rforce(Rs[0],zs[0],phi=phis[0],t=ts[0])
+        info= pot.force_cache_info()
+        assert info.misses == 3 and info.hits == 0 and info.currsize == 1, 'Force cache of %s with maxsize=1 does not behave as expected' % pot.__class__.__name__
+    # Scalar and shape-(1,) input do not share cache entries
+    from galpy.potential_src.forceCache import force_cache_key
+    assert force_cache_key(1.,0.1) != force_cache_key(numpy.array([1.]),0.1), 'force_cache_key does not distinguish between scalar and array input'
+    assert force_cache_key(numpy.array([1.]),0.1) != force_cache_key(numpy.array([[1.]]),0.1), 'force_cache_key does not distinguish between arrays of different shapes'
+    pot= potential.SoftenedNeedleBarPotential(normalize=1.,omegab=0.5)
+    assert isinstance(pot.Rforce(1.,0.1,phi=0.3),float), 'Rforce of scalar input is not a float'
+    assert numpy.shape(pot.Rforce(numpy.array([1.]),numpy.array([0.1]),
+                                  phi=numpy.array([0.3]))) == (1,), 'Rforce of shape-(1,) input returned from the force cache does not have shape (1,)'
+    # At most one entry for array input is retained, next to those for scalars
+    from galpy.potential_src.forceCache import _is_array_key
+    pot.force_cache_clear()
+    pot.Rforce(1.,0.1,phi=0.3)
+    for ii in range(5):
+        Rs= numpy.linspace(0.5,1.5,101)+0.01*ii
+        pot.Rforce(Rs,0.1*numpy.ones(101),phi=0.3*numpy.ones(101))
+        assert numpy.all(numpy.fabs(pot.zforce(Rs,0.1*numpy.ones(101),phi=0.3*numpy.ones(101))[::25]-numpy.array([pot.zforce(R,0.1,phi=0.3) for R in Rs[::25]])) < 10.**-14.), 'Cached force for array input differs from the force for scalar input'
+        assert len([key for key in pot._force_cache._cache
+                    if _is_array_key(key)]) == 1, 'Force cache retains more than one entry for array input'
+    assert pot.force_cache_info().currsize == 27, 'Force cache does not retain the entries for scalar input next to the one for array input'
+    # Potentials without a force cache
+    assert potential.MiyamotoNagaiPotential().force_cache_info() is None, 'force_cache_info of a potential without a force cache is not None'
+    return None
     
 def test_DiskSCFPotential_SigmaDerivs():
     # Test that the derivatives of Sigma are correctly implemented in DiskSCF
@@ -1881,6 +2046,58 @@ def test_DiskSCFPotential_againstDoubleExp_dens():
     assert numpy.all(numpy.fabs((dp.dens(testR,testzs)-dscfp.dens(testR,testzs))/dscfp.dens(testRs,testz)) < 10.**-1.), "DiskSCFPotential for double-exponential disk does not agree with DoubleExponentialDiskPotential"
     return None
 
+# Test that evaluating potentials and forces for arrays in C agrees with Python
+def test_evaluate_c():
+    Rs= numpy.linspace(0.1,2.,21)
+    zs= numpy.linspace(-0.5,0.5,21)
+    phis= numpy.linspace(0.,2.*numpy.pi,21)
+    pots= [potential.MWPotential2014,
+           potential.TriaxialNFWPotential(normalize=1.,b=0.7,c=0.5),
+           potential.DehnenSmoothWrapperPotential(\
+            pot=potential.PlummerPotential(normalize=1.),tform=-1.,
+            tsteady=2.),
+           [potential.LogarithmicHaloPotential(normalize=1.),
+            potential.DehnenBarPotential()]]
+    funcs= [potential.evaluatePotentials,potential.evaluateRforces,
+            potential.evaluatezforces,potential.evaluatephiforces]
+    for pot in pots:
+        for func in funcs:
+            if func == potential.evaluatePotentials \
+                    and isinstance(pot,list) and len(pot) == 2:
+                continue # DehnenBarPotential's potential not in C
+            cout= func(pot,Rs,zs,phi=phis,t=0.3,c=True)
+            pyout= numpy.array([func(pot,R,z,phi=phi,t=0.3)
+                                for R,z,phi in zip(Rs,zs,phis)])
+            assert numpy.all(numpy.fabs(cout-pyout) < 10.**-10.), 'Evaluating %s in C does not agree with Python' % func.__name__
+            # By default, C is used for array input
+            assert numpy.all(numpy.fabs(func(pot,Rs,zs,phi=phis,t=0.3)-cout) < 10.**-14.), 'Evaluating %s for arrays does not use C by default' % func.__name__
+            # Scalar input and broadcasting
+            assert numpy.fabs(func(pot,Rs[3],zs[3],phi=phis[3],t=0.3,c=True)
+                              -pyout[3]) < 10.**-10., 'Evaluating %s in C for scalar input does not agree with Python' % func.__name__
+            cout= func(pot,Rs,zs[3],phi=phis[3],t=0.3,c=True)
+            assert numpy.all(numpy.fabs(cout-numpy.array([func(pot,R,zs[3],phi=phis[3],t=0.3) for R in Rs])) < 10.**-10.), 'Evaluating %s in C does not broadcast its inputs correctly' % func.__name__
+    # Potentials whose C implementation only approximates the Python one use
+    # Python by default, such that array and scalar input agree
+    dp= potential.DoubleExponentialDiskPotential(normalize=1.)
+    for func in funcs:
+        if func == potential.evaluatephiforces: continue
+        pyout= numpy.array([func(dp,R,z) for R,z in zip(Rs,zs)])
+        assert numpy.all(numpy.fabs(func(dp,Rs,zs)-pyout) < 10.**-10.*numpy.fabs(pyout)), 'Evaluating %s for arrays of a potential with an approximate C implementation does not use Python by default' % func.__name__
+    # Potentials without a C implementation fall back to Python with a warning
+    import warnings
+    from galpy.util import galpyWarning
+    tp= potential.TwoPowerSphericalPotential(normalize=1.,alpha=1.5,beta=3.5)
+    with warnings.catch_warnings(record=True) as w:
+        warnings.simplefilter("always",galpyWarning)
+        out= potential.evaluateRforces(tp,Rs,zs,c=True)
+        raisedWarning= False
+        for wa in w:
+            raisedWarning= ('Cannot evaluate the Rforce in C' in str(wa.message))
+            if raisedWarning: break
+        assert raisedWarning, "evaluateRforces with c=True for a potential without a C implementation did not raise galpyWarning"
+    assert numpy.all(numpy.fabs(out-tp.Rforce(Rs,zs)) < 10.**-10.), 'Evaluating the Rforce for a potential without a C implementation does not fall back to Python'
+    return None
+
 def test_plotting():
     import tempfile
     #Some tests of the plotting routines, to make sure they don't fail
@@ -139,8 +139,49 @@ def testArrayBroadcasting():
     phi = numpy.zeros((10,20))[:,:,None]
     
     ArrayTest(scf, [R, z, phi])
-    
-    
+
+## Tests that the vectorized (and C) evaluation for many points agrees with evaluating point by point for a non-axisymmetric expansion
+def testArray_nonaxi_vectorized():
+    from galpy.potential_src import SCFPotential as scfmodule
+    numpy.random.seed(1)
+    N, L = 6, 5
+    Acos = numpy.tril(numpy.random.normal(size=(N,L,L)))*0.1
+    Acos[0,0,0] = 1.
+    Asin = numpy.tril(numpy.random.normal(size=(N,L,L)))*0.1
+    Asin[:,:,0] = 0.
+    scf = SCFPotential(Acos=Acos, Asin=Asin, a=1.3)
+    R = numpy.random.uniform(0.1, 3., 101)
+    z = numpy.random.uniform(-2., 2., 101)
+    phi = numpy.random.uniform(0., 2.*numpy.pi, 101)
+    funcs = [scf, scf.dens, scf.Rforce, scf.zforce, scf.phiforce]
+    singles = [numpy.array([func(R[i], z[i], phi[i]) for i in range(len(R))])
+               for func in funcs]
+    ext_loaded = scfmodule.ext_loaded
+    try:
+        for use_c in [True, False]:
+            scfmodule.ext_loaded = use_c and ext_loaded
+            for func, single in zip(funcs, singles):
+                assert numpy.all(numpy.fabs(func(R, z, phi) - single) < 10.**-10.*numpy.fabs(single).max()), "Vectorized SCFPotential evaluation does not agree with point-by-point evaluation"
+    finally:
+        scfmodule.ext_loaded = ext_loaded
+    return None
+
+## Tests the vectorized associated Legendre functions against scipy's lpmn
+def test_legendre_vectorized():
+    from scipy.special import lpmn
+    from galpy.potential_src.SCFPotential import _legendre
+    L = 6
+    x = numpy.linspace(-0.99, 0.99, 11)
+    PP, dPP = _legendre(L, L, x, deriv=True)
+    for ii in range(len(x)):
+        P, dP = lpmn(L-1, L-1, x[ii])
+        assert numpy.all(numpy.fabs(PP[ii] - P.T) < 10.**-10.), "Vectorized Legendre functions do not agree with lpmn"
+        assert numpy.all(numpy.fabs(dPP[ii] + numpy.sqrt(1.-x[ii]**2.)*dP.T) < 10.**-10.), "Derivatives of the vectorized Legendre functions do not agree with lpmn"
+    # Regular at the poles
+    assert numpy.all(numpy.isfinite(_legendre(L, L, numpy.array([-1.,1.]), deriv=True)[1])), "Derivatives of the vectorized Legendre functions are not finite at the poles"
+    return None
+
+
  
 ## tests whether scf_compute_spherical computes the correct coefficients for a Hernquist Potential
 def test_scf_compute_spherical_hernquist():
@@ -258,7 +299,62 @@ def test_scf_ZeeuwCoeffs_ReducesToSpherical():
     Aaxi = potential.scf_compute_coeffs(rho_Zeeuw, 5,5,radial_order=20,
                                         costheta_order=20)
     reducesto_spherical(Aspherical,Aaxi, "Zeeuw Potential")
-    
+
+## Tests whether the coefficients computed from an N-body sample of a Hernquist sphere agree with those of the Hernquist density
+def test_scf_compute_nbody_hernquist():
+    numpy.random.seed(1)
+    npart = 100000
+    u = numpy.random.uniform(size=npart)
+    r = numpy.sqrt(u)/(1.-numpy.sqrt(u)) # Hernquist with a=1
+    costheta = numpy.random.uniform(-1., 1., size=npart)
+    phi = numpy.random.uniform(0., 2.*numpy.pi, size=npart)
+    sintheta = numpy.sqrt(1.-costheta**2.)
+    pos = numpy.array([r*sintheta*numpy.cos(phi), r*sintheta*numpy.sin(phi),
+                       r*costheta])
+    # Total mass of 1/2 (HernquistPotential with amp=1) corresponds to Acos = delta_{0n}delta_{0l}delta_{0m}
+    Acos, Asin = potential.scf_compute_coeffs_nbody(pos, 5, 3,
+                                                    mass=0.5/npart,
+                                                    chunksize=30000)
+    assert numpy.fabs(Acos[0,0,0]-1.) < 10.**-2., "Lowest-order coefficient from an N-body Hernquist sphere is not close to one"
+    Acos[0,0,0] = 0.
+    assert numpy.all(numpy.fabs(Acos) < 2.*10.**-2.), "Higher-order cosine coefficients from an N-body Hernquist sphere are not close to zero"
+    assert numpy.all(numpy.fabs(Asin) < 2.*10.**-2.), "Sine coefficients from an N-body Hernquist sphere are not close to zero"
+    assert numpy.all(Asin[:,:,0] == 0.), "Sine coefficients with m=0 are not zero"
+    return None
+
+## Tests that the N-body coefficients do not depend on the chunking, the number of cores, or on whether the particles are memory-mapped
+def test_scf_compute_nbody_chunks_memmap():
+    import tempfile
+    numpy.random.seed(2)
+    npart = 5000
+    pos = numpy.random.normal(size=(3,npart))*numpy.array([[1.],[0.7],[0.4]])
+    mass = numpy.random.uniform(size=npart)/npart
+    Acos, Asin = potential.scf_compute_coeffs_nbody(pos, 4, 3, mass=mass,
+                                                    a=0.5)
+    Acos2, Asin2 = potential.scf_compute_coeffs_nbody(pos, 4, 3, mass=mass,
+                                                      a=0.5, chunksize=700,
+                                                      numcores=2)
+    assert numpy.all(numpy.fabs(Acos-Acos2) < 10.**-12.), "N-body SCF coefficients depend on the chunking"
+    assert numpy.all(numpy.fabs(Asin-Asin2) < 10.**-12.), "N-body SCF coefficients depend on the chunking"
+    tmpdir = tempfile.mkdtemp()
+    try:
+        numpy.save(os.path.join(tmpdir,'pos.npy'), pos)
+        numpy.save(os.path.join(tmpdir,'mass.npy'), mass)
+        Acos3, Asin3 = potential.scf_compute_coeffs_nbody(\
+            numpy.load(os.path.join(tmpdir,'pos.npy'),mmap_mode='r'), 4, 3,
+            mass=numpy.load(os.path.join(tmpdir,'mass.npy'),mmap_mode='r'),
+            a=0.5, chunksize=1000)
+    finally:
+        for filename in ['pos.npy','mass.npy']:
+            os.remove(os.path.join(tmpdir,filename))
+        os.rmdir(tmpdir)
+    assert numpy.all(numpy.fabs(Acos-Acos3) < 10.**-12.), "N-body SCF coefficients from memory-mapped particles differ"
+    assert numpy.all(numpy.fabs(Asin-Asin3) < 10.**-12.), "N-body SCF coefficients from memory-mapped particles differ"
+    # Check that the coefficients describe the density: compare the potential to the direct sum at a far-away point, where the monopole and quadrupole dominate
+    scf = SCFPotential(Acos=Acos, Asin=Asin, a=0.5)
+    assert numpy.fabs(scf(10.,0.,0.)/(-numpy.sum(mass)/10.)-1.) < 10.**-2., "Potential of the N-body SCF expansion at large radius does not match that of the particles"
+    return None
+
 ## Tests whether scf density matches with Hernquist density
 def test_densMatches_hernquist():
     h = potential.HernquistPotential()